@@ -0,0 +1,489 @@
+"""
+Long-running daemon for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Keeps one FutarchyBot (contracts, RPC connections, nonce and allowance
+ledgers, caches) alive and serves commands over local HTTP or a Unix
+socket, so short-lived invocations (cron jobs, scripts) skip the startup
+cost of building the bot. Every main.py subcommand can be run through the
+daemon; prices, balances and status are also available as JSON. Market
+prices are refreshed once per new block in the background, and the
+conditional pools' state is followed from their logs.
+
+Protocol (HTTP and Unix socket carry the same JSON objects):
+    {"argv": ["balances"]}   -> {"ok": true, "output": "...", "elapsed": 0.1}
+    {"query": "prices"}      -> {"ok": true, "result": {...}}
+HTTP routes: POST /command with {"argv": [...]}, GET /prices, /balances, /status.
+Every HTTP request must carry the secret from the 0600 token file in the
+X-Futarchy-Token header; requests with an Origin header (sent by browsers)
+and POSTs that are not application/json are rejected, so a web page cannot
+make the bot trade.
+Unix socket: one JSON request line per connection, one JSON reply line
+(access is limited by the socket's 0600 permissions).
+"""
+
+import hmac
+import http.client
+import io
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Shared secret of the HTTP server (override with FUTARCHY_DAEMON_TOKEN_FILE)
+DEFAULT_TOKEN_PATH = os.path.join(os.path.expanduser("~"), ".futarchy", "daemon.token")
+TOKEN_HEADER = "X-Futarchy-Token"
+
+# Commands that need a terminal or would start another daemon
+UNSUPPORTED_COMMANDS = ("serve", "interactive")
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening: nothing was sent, so the command can safely run locally"""
+
+
+def token_path() -> str:
+    """Path of the HTTP token file."""
+    return os.environ.get("FUTARCHY_DAEMON_TOKEN_FILE", DEFAULT_TOKEN_PATH)
+
+
+def read_token(path: Optional[str] = None) -> Optional[str]:
+    """
+    Read the HTTP token.
+
+    Args:
+        path: Token file (defaults to token_path())
+
+    Returns:
+        str: Token, or None if the file does not exist
+    """
+    try:
+        with open(path or token_path()) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def create_token(path: Optional[str] = None) -> str:
+    """
+    Get the HTTP token, creating the file readable by the owner only if needed.
+
+    Args:
+        path: Token file (defaults to token_path())
+
+    Returns:
+        str: Token
+    """
+    path = path or token_path()
+    token = read_token(path)
+    if token is not None:
+        return token
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    token = secrets.token_hex(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token
+
+
+class _ThreadOutput:
+    """Stand-in for sys.stdout/sys.stderr sending writes of a capturing thread to its buffer"""
+
+    def __init__(self, stream, local: threading.local):
+        self.stream = stream
+        self._local = local
+
+    def _target(self):
+        buffer = getattr(self._local, "buffer", None)
+        return self.stream if buffer is None else buffer
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+_capture = threading.local()
+_capture_lock = threading.Lock()
+_capture_users = 0
+_original_streams = None
+
+
+@contextmanager
+def capture_output(buffer):
+    """
+    Send the current thread's stdout and stderr to a buffer.
+
+    Unlike contextlib.redirect_stdout, which swaps the process-wide streams,
+    prints from other threads (block follower, keepalives, servers) keep
+    going to the real streams instead of into a client's command output.
+
+    Args:
+        buffer: Writable text buffer, e.g. io.StringIO()
+    """
+    global _capture_users, _original_streams
+    with _capture_lock:
+        if _capture_users == 0:
+            _original_streams = (sys.stdout, sys.stderr)
+            sys.stdout, sys.stderr = _ThreadOutput(sys.stdout, _capture), _ThreadOutput(sys.stderr, _capture)
+        _capture_users += 1
+    _capture.buffer = buffer
+    try:
+        yield buffer
+    finally:
+        _capture.buffer = None
+        with _capture_lock:
+            _capture_users -= 1
+            if _capture_users == 0:
+                sys.stdout, sys.stderr = _original_streams
+
+
+class BotDaemon:
+    """Runs commands against one long-lived bot"""
+
+    def __init__(self, bot, run_command: Callable[[List[str]], Any], follow_blocks: bool = True):
+        """
+        Initialize the daemon.
+
+        Args:
+            bot: FutarchyBot instance kept warm between commands
+            run_command: Callable running one CLI command from its argv on the bot (prints its output)
+            follow_blocks: Refresh cached market prices once per new block in the background
+        """
+        self.bot = bot
+        self.run_command = run_command
+        self.follow_blocks = follow_blocks
+        self.started = time.time()
+        self.commands = 0
+        self.errors = 0
+        self.block_number = None
+        self.prices = None
+        self.stream = None
+        self._command_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._follower = None
+
+    # ----------------------------------------------------------- execution
+
+    def execute(self, argv: List[str]) -> Dict[str, Any]:
+        """
+        Run one CLI command and capture its output.
+
+        Commands run one at a time, and never alongside the block follower
+        or a query: they share the account's nonces, balances and pool
+        trackers. Output printed by the command's thread is captured.
+
+        Args:
+            argv: Command line arguments, e.g. ["swap_gno_yes", "0.1"]
+
+        Returns:
+            dict: ok, output and elapsed seconds
+        """
+        if not argv or argv[0] in UNSUPPORTED_COMMANDS:
+            return {"ok": False, "output": f"❌ Command not available through the daemon: {argv[0] if argv else ''}\n"}
+
+        with self._command_lock:
+            start = time.perf_counter()
+            output = io.StringIO()
+            ok = True
+            with capture_output(output):
+                try:
+                    self.run_command(argv)
+                except SystemExit as e:
+                    ok = e.code in (None, 0)
+                except Exception as e:
+                    print(f"❌ Error running {argv[0]}: {e}")
+                    ok = False
+            self.commands += 1
+            if not ok:
+                self.errors += 1
+            return {"ok": ok, "output": output.getvalue(), "elapsed": round(time.perf_counter() - start, 3)}
+
+    def query(self, name: str) -> Dict[str, Any]:
+        """
+        Answer a structured query.
+
+        Args:
+            name: "prices", "balances" or "status"
+
+        Returns:
+            dict: ok and result (or error)
+        """
+        try:
+            if name == "prices":
+                if self._follower is not None and self.prices:
+                    return {"ok": True, "result": self.prices}
+                with self._command_lock:
+                    prices = self.bot.get_market_prices()
+                return {"ok": prices is not None, "result": prices}
+            if name == "balances":
+                with self._command_lock:
+                    return {"ok": True, "result": self.bot.get_balances()}
+            if name == "status":
+                return {"ok": True, "result": self.status()}
+            return {"ok": False, "error": f"Unknown query: {name}"}
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch a decoded request.
+
+        Args:
+            request: {"argv": [...]} or {"query": name}
+
+        Returns:
+            dict: Response object
+        """
+        if isinstance(request.get("argv"), list):
+            return self.execute([str(arg) for arg in request["argv"]])
+        if request.get("query"):
+            return self.query(str(request["query"]))
+        return {"ok": False, "error": "Request needs 'argv' or 'query'"}
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Get daemon statistics.
+
+        Returns:
+            dict: uptime, commands served, followed block and connection statistics
+        """
+        status = {
+            "uptime": round(time.time() - self.started, 1),
+            "commands": self.commands,
+            "errors": self.errors,
+            "block_number": self.block_number,
+            "block_source": self.stream.mode if self.stream is not None else None,
+            "address": self.bot.address,
+        }
+        provider = self.bot.w3.provider
+        if hasattr(provider, "stats"):
+            status["rpc_pool"] = provider.stats()
+        if getattr(self.bot.w3, "call_cache", None) is not None:
+            status["call_cache"] = self.bot.w3.call_cache.stats()
+        if getattr(self.bot, "pool_trackers", None):
+            status["pool_trackers"] = {address: tracker.stats() for address, tracker in self.bot.pool_trackers.items()}
+        if getattr(self.bot.w3, "rpc_metrics", None) is not None:
+            status["rpc_metrics"] = self.bot.w3.rpc_metrics.summary()
+        return status
+
+    # ------------------------------------------------------ block follower
+
+    def start(self):
+        """Start following new blocks, if enabled."""
+        if not self.follow_blocks or self._follower is not None:
+            return
+        from futarchy.experimental.core.block_stream import BlockStream
+        from futarchy.experimental.utils.rpc_metrics import rpc_operation
+        self.stream = BlockStream(self.bot.w3)
+        # Pool prices are then read from state replayed from each block's logs
+        self.bot.track_pools()
+
+        def follow():
+            for block_number in self.stream.blocks():
+                if self._stop.is_set():
+                    break
+                try:
+                    # Commands use the same pool trackers and connection state
+                    with self._command_lock, rpc_operation("follow blocks"):
+                        self.bot.sync_pools(block_number)
+                        prices = self.bot.get_market_prices(self.bot.get_market_snapshot(block_number))
+                except Exception as e:
+                    print(f"⚠️ Error refreshing prices at block {block_number}: {e}")
+                    continue
+                self.block_number, self.prices = block_number, prices
+
+        self._follower = threading.Thread(target=follow, name="daemon-blocks", daemon=True)
+        self._follower.start()
+
+    def stop(self):
+        """Stop following new blocks."""
+        self._stop.set()
+        if self.stream is not None:
+            self.stream.close()
+
+
+def _reply(obj) -> bytes:
+    return json.dumps(obj, default=str).encode()
+
+
+def make_http_server(daemon: BotDaemon, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                     token: Optional[str] = None) -> ThreadingHTTPServer:
+    """
+    Create the local HTTP control server.
+
+    Args:
+        daemon: BotDaemon serving the requests
+        host: Interface to bind (keep it local: the API can move funds)
+        port: Port to bind
+        token: Secret clients must send in X-Futarchy-Token (defaults to create_token())
+
+    Returns:
+        ThreadingHTTPServer (call serve_forever())
+    """
+    token = token or create_token()
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, response, status=200):
+            body = _reply(response)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self) -> bool:
+            """Reject browser requests and requests without the token (replies with the error)."""
+            if self.headers.get("Origin") is not None:
+                self._send({"ok": False, "error": "Cross-origin requests are not allowed"}, 403)
+                return False
+            if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), token):
+                self._send({"ok": False, "error": "Missing or invalid token"}, 401)
+                return False
+            return True
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            name = self.path.strip("/")
+            if name not in ("prices", "balances", "status"):
+                return self._send({"ok": False, "error": f"Unknown path: {self.path}"}, 404)
+            self._send(daemon.query(name))
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            if self.path.strip("/") != "command":
+                return self._send({"ok": False, "error": f"Unknown path: {self.path}"}, 404)
+            if self.headers.get("Content-Type", "").split(";")[0].strip() != "application/json":
+                return self._send({"ok": False, "error": "Content-Type must be application/json"}, 415)
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            except ValueError:
+                return self._send({"ok": False, "error": "Invalid JSON"}, 400)
+            self._send(daemon.handle(request))
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def make_unix_server(daemon: BotDaemon, path: str) -> socketserver.ThreadingUnixStreamServer:
+    """
+    Create the Unix socket control server.
+
+    Args:
+        daemon: BotDaemon serving the requests
+        path: Socket path (replaced if it exists; only the owner may connect)
+
+    Returns:
+        ThreadingUnixStreamServer (call serve_forever())
+    """
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline() or b"{}")
+            except ValueError:
+                request = {}
+            self.wfile.write(_reply(daemon.handle(request)) + b"\n")
+
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    os.chmod(path, 0o600)
+    return server
+
+
+def serve(daemon: BotDaemon, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None):
+    """
+    Serve commands until interrupted.
+
+    Args:
+        daemon: BotDaemon serving the requests
+        host: HTTP interface (ignored with socket_path)
+        port: HTTP port (ignored with socket_path)
+        socket_path: Serve on this Unix socket instead of HTTP
+    """
+    server = make_unix_server(daemon, socket_path) if socket_path else make_http_server(daemon, host, port)
+    daemon.start()
+    print(f"🟢 Serving on {socket_path or f'http://{host}:{port}'} (Ctrl+C to stop)")
+    if not socket_path:
+        print(f"🔑 Clients must send the token stored in {token_path()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping daemon")
+    finally:
+        daemon.stop()
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def send_request(address: str, request: Dict[str, Any], timeout: Optional[float] = None,
+                 token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Send one request to a running daemon.
+
+    Only uses the standard library so clients start quickly.
+
+    Args:
+        address: http://host:port URL or Unix socket path
+        request: {"argv": [...]} or {"query": name}
+        timeout: Seconds to wait for the reply (None waits for the command to finish)
+        token: HTTP token (defaults to read_token())
+
+    Returns:
+        dict: Response object
+
+    Raises:
+        DaemonUnavailable: Nothing listens at the address (the request was not sent)
+        OSError: The connection failed after the request was sent
+    """
+    body = json.dumps(request).encode()
+    if address.startswith("http://"):
+        url = urlsplit(address)
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+        try:
+            connection.connect()
+        except ConnectionRefusedError as e:
+            raise DaemonUnavailable(str(e)) from e
+        try:
+            connection.request("POST", "/command", body=body, headers={
+                "Content-Type": "application/json", TOKEN_HEADER: token or read_token() or "",
+            })
+            return json.loads(connection.getresponse().read())
+        finally:
+            connection.close()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(str(e)) from e
+        sock.sendall(body + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply)
@@ -5,28 +5,38 @@ This package is currently in EXPERIMENTAL status.
 Contains all contract ABIs organized by protocol/type.
 """
 
-from .erc20 import ERC20_ABI
-from .uniswap import (
-    UNISWAP_V3_POOL_ABI,
-    UNISWAP_V3_PASSTHROUGH_ROUTER_ABI
-)
-from .sushiswap import (
-    SUSHISWAP_V3_ROUTER_ABI,
-    SUSHISWAP_V3_NFPM_ABI
-)
-from .balancer import (
-    BALANCER_VAULT_ABI,
-    BALANCER_POOL_ABI,
-    BALANCER_BATCH_ROUTER_ABI
-)
-from .futarchy import FUTARCHY_ROUTER_ABI
-from .misc import (
-    SDAI_RATE_PROVIDER_ABI,
-    WXDAI_ABI,
-    SDAI_DEPOSIT_ABI,
-    WAGNO_ABI,
-    PERMIT2_ABI
-)
+# ABIs are imported from their submodule on first access (PEP 562), so
+# importing the package does not build every ABI literal up front
+_ABI_MODULES = {
+    'ERC20_ABI': 'erc20',
+    'UNISWAP_V3_POOL_ABI': 'uniswap',
+    'UNISWAP_V3_PASSTHROUGH_ROUTER_ABI': 'uniswap',
+    'SUSHISWAP_V3_ROUTER_ABI': 'sushiswap',
+    'SUSHISWAP_V3_NFPM_ABI': 'sushiswap',
+    'BALANCER_VAULT_ABI': 'balancer',
+    'BALANCER_POOL_ABI': 'balancer',
+    'BALANCER_BATCH_ROUTER_ABI': 'balancer',
+    'BALANCER_V3_VAULT_ABI': 'balancer',
+    'BALANCER_V3_POOL_ABI': 'balancer',
+    'FUTARCHY_ROUTER_ABI': 'futarchy',
+    'CONDITIONAL_TOKENS_ABI': 'futarchy',
+    'SDAI_RATE_PROVIDER_ABI': 'misc',
+    'WXDAI_ABI': 'misc',
+    'SDAI_DEPOSIT_ABI': 'misc',
+    'WAGNO_ABI': 'misc',
+    'PERMIT2_ABI': 'misc',
+    'MULTICALL3_ABI': 'misc',
+}
+
+
+def __getattr__(name):
+    if name not in _ABI_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{_ABI_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # ERC20
@@ -44,14 +54,18 @@ __all__ = [
     'BALANCER_VAULT_ABI',
     'BALANCER_POOL_ABI',
     'BALANCER_BATCH_ROUTER_ABI',
+    'BALANCER_V3_VAULT_ABI',
+    'BALANCER_V3_POOL_ABI',
     
     # Futarchy
     'FUTARCHY_ROUTER_ABI',
+    'CONDITIONAL_TOKENS_ABI',
     
     # Misc
     'SDAI_RATE_PROVIDER_ABI',
     'WXDAI_ABI',
     'SDAI_DEPOSIT_ABI',
     'WAGNO_ABI',
-    'PERMIT2_ABI'
+    'PERMIT2_ABI',
+    'MULTICALL3_ABI'
 ] 
\ No newline at end of file
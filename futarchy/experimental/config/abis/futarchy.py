@@ -2,10 +2,15 @@
 Futarchy interface ABIs.
 
 This module is currently in EXPERIMENTAL status.
-Contains ABIs for Futarchy Router contract.
+Contains ABIs for the Futarchy Router and the ConditionalTokens events it emits.
 """
 
 FUTARCHY_ROUTER_ABI = [
     {"inputs": [{"internalType": "contract FutarchyProposal", "name": "proposal", "type": "address"}, {"internalType": "contract IERC20", "name": "collateralToken", "type": "address"}, {"internalType": "uint256", "name": "amount", "type": "uint256"}], "name": "splitPosition", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
     {"inputs": [{"internalType": "contract FutarchyProposal", "name": "proposal", "type": "address"}, {"internalType": "contract IERC20", "name": "collateralToken", "type": "address"}, {"internalType": "uint256", "name": "amount", "type": "uint256"}], "name": "mergePositions", "outputs": [], "stateMutability": "nonpayable", "type": "function"}
-] 
\ No newline at end of file
+]
+
+CONDITIONAL_TOKENS_ABI = [
+    {"anonymous": False, "inputs": [{"indexed": True, "internalType": "address", "name": "stakeholder", "type": "address"}, {"indexed": False, "internalType": "contract IERC20", "name": "collateralToken", "type": "address"}, {"indexed": True, "internalType": "bytes32", "name": "parentCollectionId", "type": "bytes32"}, {"indexed": True, "internalType": "bytes32", "name": "conditionId", "type": "bytes32"}, {"indexed": False, "internalType": "uint256[]", "name": "partition", "type": "uint256[]"}, {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"}], "name": "PositionSplit", "type": "event"},
+    {"anonymous": False, "inputs": [{"indexed": True, "internalType": "address", "name": "stakeholder", "type": "address"}, {"indexed": False, "internalType": "contract IERC20", "name": "collateralToken", "type": "address"}, {"indexed": True, "internalType": "bytes32", "name": "parentCollectionId", "type": "bytes32"}, {"indexed": True, "internalType": "bytes32", "name": "conditionId", "type": "bytes32"}, {"indexed": False, "internalType": "uint256[]", "name": "partition", "type": "uint256[]"}, {"indexed": False, "internalType": "uint256", "name": "amount", "type": "uint256"}], "name": "PositionsMerge", "type": "event"}
+]
@@ -34,33 +34,7 @@ from futarchy.experimental.config import (
     get_base_token
 )
 
-from futarchy.experimental.config.abis import (
-    # ERC20
-    ERC20_ABI,
-    
-    # Uniswap
-    UNISWAP_V3_POOL_ABI,
-    UNISWAP_V3_PASSTHROUGH_ROUTER_ABI,
-    
-    # SushiSwap
-    SUSHISWAP_V3_ROUTER_ABI,
-    SUSHISWAP_V3_NFPM_ABI,
-    
-    # Balancer
-    BALANCER_VAULT_ABI,
-    BALANCER_POOL_ABI,
-    BALANCER_BATCH_ROUTER_ABI,
-    
-    # Futarchy
-    FUTARCHY_ROUTER_ABI,
-    
-    # Misc
-    SDAI_RATE_PROVIDER_ABI,
-    WXDAI_ABI,
-    SDAI_DEPOSIT_ABI,
-    WAGNO_ABI,
-    PERMIT2_ABI
-)
+from futarchy.experimental.config import abis as _abis
 
 # Re-export everything for backward compatibility
 __all__ = [
@@ -100,10 +74,21 @@ __all__ = [
     'BALANCER_VAULT_ABI',
     'BALANCER_POOL_ABI',
     'BALANCER_BATCH_ROUTER_ABI',
+    'BALANCER_V3_VAULT_ABI',
+    'BALANCER_V3_POOL_ABI',
     'FUTARCHY_ROUTER_ABI',
+    'CONDITIONAL_TOKENS_ABI',
     'SDAI_RATE_PROVIDER_ABI',
     'WXDAI_ABI',
     'SDAI_DEPOSIT_ABI',
     'WAGNO_ABI',
-    'PERMIT2_ABI'
-]
\ No newline at end of file
+    'PERMIT2_ABI',
+    'MULTICALL3_ABI'
+]
+
+
+def __getattr__(name):
+    # ABIs are loaded on first access, see futarchy.experimental.config.abis
+    if name in _abis.__all__:
+        return getattr(_abis, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
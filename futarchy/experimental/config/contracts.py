@@ -44,7 +44,9 @@ CONTRACT_ADDRESSES: Dict[str, str] = {
     "permit2": "0x000000000022D473030F116dDEE9F6B43aC78BA3",
     "batchRouter": "0xe2fa4e1d17725e72dcdAfe943Ecf45dF4B9E285b",
     "balancerVault": "0xBA12222222228d8Ba445958a75a0704d566BF2C8",
+    "balancerV3Vault": "0xbA1333333333a1BA1108E8412f11850A5C319bA9",  # Balancer V3 Vault (pool state for the BatchRouter)
     "balancerPool": "0xd1d7fa8871d84d0e77020fc28b7cd5718c446522",
+    "multicall3": "0xcA11bde05977b3631167028862bE2a173976CA11",  # Multicall3 (same address on all chains)
 }
 
 # Contract warnings and notes
@@ -11,9 +11,14 @@ from typing import List
 DEFAULT_RPC_URLS: List[str] = [
     "https://gnosis-mainnet.public.blastapi.io",  # Primary
     "https://rpc.gnosischain.com",                # Backup 1
-    "https://rpc.ankr.com/gnosis"                 # Backup 2
+    "https://rpc.ankr.com/gnosis",                # Backup 2
+    "https://gnosis.publicnode.com",              # Backup 3
+    "https://gnosis.drpc.org",                    # Backup 4
 ]
 
+# WebSocket RPC URL for newHeads subscriptions (fallback if GNOSIS_WS_URL is not set)
+DEFAULT_WS_URL: str = "wss://rpc.gnosischain.com/wss"
+
 # API Endpoints
 COWSWAP_API_URL: str = "https://api.cow.fi/xdai"  # Gnosis Chain (Production)
 
@@ -0,0 +1,461 @@
+"""
+Async engine for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Runs independent reads (market Multicall3 batch, balances batch, CoW quote,
+gas price) concurrently on an AsyncWeb3 connection, so a monitoring round
+takes as long as its slowest request rather than the sum of all of them.
+Calldata is still encoded and decoded with the synchronous bot's contract
+objects; nonces and allowances come from the bot's NonceManager and
+AllowanceLedger, so sync and async code can be mixed on one account.
+"""
+
+import asyncio
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from web3 import AsyncWeb3, AsyncHTTPProvider
+
+from futarchy.experimental.config.constants import (
+    TOKEN_CONFIG, POOL_CONFIG_YES, CONTRACT_ADDRESSES, BALANCER_CONFIG, COWSWAP_API_URL,
+    ERC20_ABI, PERMIT2_ABI, BALANCER_BATCH_ROUTER_ABI, UNISWAP_V3_POOL_ABI, UNISWAP_V3_PASSTHROUGH_ROUTER_ABI
+)
+from futarchy.experimental.core.market_snapshot import MarketSnapshot
+from futarchy.experimental.core.transaction import decode_receipt
+from futarchy.experimental.utils.http_pool import get_http_pool
+from futarchy.experimental.utils.multicall import AsyncMulticall, encode_call, decode_call
+from futarchy.experimental.utils.uniswap_v3_math import MIN_SQRT_RATIO, MAX_SQRT_RATIO, sqrt_price_x96_to_price
+from futarchy.experimental.utils.web3_utils import get_raw_transaction
+
+MAX_UINT256 = 2**256 - 1
+MAX_UINT160 = 2**160 - 1
+DEADLINE_SECONDS = 1800
+PERMIT2_EXPIRATION_SECONDS = 24 * 60 * 60
+
+
+class AsyncFutarchyEngine:
+    """AsyncWeb3 counterpart of the FutarchyBot read and swap paths"""
+
+    def __init__(self, bot, rpc_url: Optional[str] = None, request_timeout: int = 30,
+                 receipt_timeout: int = 120, poll_latency: float = 0.5):
+        """
+        Initialize the engine.
+
+        Args:
+            bot: FutarchyBot instance providing contracts, account, nonces and allowances
+            rpc_url: RPC URL (defaults to the bot's provider URL)
+            request_timeout: Seconds before an HTTP request times out
+            receipt_timeout: Seconds to wait for each receipt
+            poll_latency: Seconds between receipt polls
+        """
+        self.bot = bot
+        self.rpc_url = rpc_url or bot.w3.provider.endpoint_uri
+        self.w3 = AsyncWeb3(AsyncHTTPProvider(self.rpc_url, request_kwargs={"timeout": request_timeout}))
+        self.multicall = AsyncMulticall(self.w3, bot.multicall)
+        self.request_timeout = request_timeout
+        self.receipt_timeout = receipt_timeout
+        self.poll_latency = poll_latency
+        self.chain_id = None
+        self._session = None
+        self.batch_router = bot.w3.eth.contract(
+            address=bot.w3.to_checksum_address(CONTRACT_ADDRESSES["batchRouter"]), abi=BALANCER_BATCH_ROUTER_ABI
+        )
+        self.permit2 = bot.w3.eth.contract(
+            address=bot.w3.to_checksum_address(CONTRACT_ADDRESSES["permit2"]), abi=PERMIT2_ABI
+        )
+
+    async def close(self):
+        """Close the HTTP session used for RPC and CoW Swap requests."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self._http_session()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def call(self, function, block_identifier="latest"):
+        """
+        Execute one bound contract function with eth_call.
+
+        Args:
+            function: Bound function of a synchronous contract (only used for encoding)
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            Decoded return value
+        """
+        data = await self.w3.eth.call({"to": function.address, "data": encode_call(function)}, block_identifier)
+        return decode_call(function, data)
+
+    # ------------------------------------------------------------------ reads
+
+    async def get_market_snapshot(self, block_identifier=None) -> Optional[MarketSnapshot]:
+        """
+        Async counterpart of FutarchyBot.get_market_snapshot.
+
+        Returns:
+            MarketSnapshot: Snapshot of the market, or None if the batch failed
+        """
+        try:
+            snapshot = await MarketSnapshot.fetch_async(self.bot, self.multicall, block_identifier)
+        except Exception as e:
+            print(f"⚠️ Batched market read failed: {e}")
+            return None
+        self.bot.last_market_snapshot = snapshot
+        return snapshot
+
+    async def get_market_prices(self, snapshot: Optional[MarketSnapshot] = None) -> Dict[str, Any]:
+        """
+        Async counterpart of FutarchyBot.get_market_prices.
+
+        Args:
+            snapshot: MarketSnapshot to derive prices from (fetched if None)
+
+        Returns:
+            dict: Market prices and probabilities
+        """
+        if snapshot is None:
+            snapshot = await self.get_market_snapshot()
+        if snapshot is None:
+            print("⚠️ Falling back to individual price calls")
+            return await asyncio.to_thread(self.bot._get_market_prices_sequential)
+
+        wagno_price = snapshot.wagno_price()
+        if wagno_price is None:
+            wagno_price = await asyncio.to_thread(self.bot._get_wagno_sdai_price_from_vault)
+        return snapshot.to_prices(wagno_price=wagno_price)
+
+    async def get_balances_many(self, addresses: List[str], block_identifier=None) -> Dict[str, Dict[str, Any]]:
+        """
+        Async counterpart of FutarchyBot.get_balances_many.
+
+        Args:
+            addresses: List of addresses to check
+            block_identifier: Block number or tag to read at (defaults to latest)
+
+        Returns:
+            dict: Mapping of checksum address -> balances dict
+        """
+        addresses = [self.bot.w3.to_checksum_address(address) for address in addresses]
+        tokens = [contract.address for _, _, contract in self.bot._balance_token_contracts()]
+        block_identifier = block_identifier or "latest"
+        try:
+            block_number, raw = await self.multicall.get_token_balances(tokens, addresses, block_identifier)
+            self.bot.last_balances_block = block_number
+        except Exception as e:
+            if self.bot.verbose:
+                print(f"⚠️ Multicall balance read failed, falling back to individual calls: {e}")
+            return await asyncio.to_thread(self.bot.get_balances_many, addresses, block_identifier)
+        return await asyncio.to_thread(self.bot._format_balances, addresses, raw, block_identifier)
+
+    async def get_balances(self, address: Optional[str] = None, block_identifier=None) -> Dict[str, Any]:
+        """
+        Async counterpart of FutarchyBot.get_balances.
+
+        Args:
+            address: Address to check (defaults to the bot's address)
+            block_identifier: Block number or tag to read at (defaults to latest)
+
+        Returns:
+            dict: Token balances with exact values (not rounded)
+        """
+        if address is None:
+            if self.bot.address is None:
+                raise ValueError("No address provided")
+            address = self.bot.address
+        address = self.bot.w3.to_checksum_address(address)
+        return (await self.get_balances_many([address], block_identifier))[address]
+
+    async def _http_session(self):
+        if self._session is None:
+            import aiohttp
+            self._session = get_http_pool().aiohttp_session(timeout=aiohttp.ClientTimeout(total=self.request_timeout))
+            # RPC requests share the keep-alive connections (AsyncHTTPProvider otherwise opens its own session)
+            if hasattr(self.w3.provider, "cache_async_session"):
+                await self.w3.provider.cache_async_session(self._session)
+        return self._session
+
+    async def get_gno_sdai_price(self) -> float:
+        """
+        Async counterpart of FutarchyBot.get_gno_sdai_price.
+
+        Returns:
+            float: GNO price in sDAI from a CoW Swap quote, falling back to the YES pool price
+        """
+        quote_data = {
+            "sellToken": TOKEN_CONFIG["currency"]["address"],
+            "buyToken": TOKEN_CONFIG["company"]["address"],
+            "sellAmountBeforeFee": "1000000000000000000",  # 1 sDAI
+            "from": self.bot.address,
+            "kind": "sell",
+        }
+        try:
+            session = await self._http_session()
+            async with session.post(f"{COWSWAP_API_URL}/api/v1/quote", json=quote_data) as response:
+                if response.status == 200:
+                    quote = (await response.json()).get("quote", {})
+                    sell_amount = int(quote.get("sellAmount", 0))
+                    buy_amount = int(quote.get("buyAmount", 0))
+                    if sell_amount > 0 and buy_amount > 0:
+                        return sell_amount / buy_amount
+        except Exception as e:
+            print(f"⚠️ CoW Swap quote failed: {e}")
+
+        print("⚠️ Using fallback price estimation from YES pool")
+        try:
+            slot0 = await self.call(self.bot.yes_pool.functions.slot0())
+            return sqrt_price_x96_to_price(int(slot0[0]), invert=POOL_CONFIG_YES["tokenCompanySlot"] == 1)
+        except Exception as e:
+            print(f"❌ Error getting GNO/sDAI price: {e}")
+            return 100.0  # Same default as the synchronous bot
+
+    async def get_market_state(self, address: Optional[str] = None, include_cow: bool = False,
+                               block_identifier=None) -> Dict[str, Any]:
+        """
+        Read prices, balances and (optionally) the CoW Swap GNO price concurrently.
+
+        Args:
+            address: Address whose balances are read (defaults to the bot's address)
+            include_cow: Also request a CoW Swap quote
+            block_identifier: Block to read prices and balances at (defaults to latest)
+
+        Returns:
+            dict: prices, balances, cow_gno_price (None unless requested) and elapsed seconds
+        """
+        start = time.perf_counter()
+        async def prices():
+            snapshot = await self.get_market_snapshot(block_identifier) if block_identifier is not None else None
+            return await self.get_market_prices(snapshot)
+
+        reads = [prices(), self.get_balances(address, block_identifier)]
+        if include_cow:
+            reads.append(self.get_gno_sdai_price())
+        results = await asyncio.gather(*reads)
+        return {
+            "prices": results[0],
+            "balances": results[1],
+            "cow_gno_price": results[2] if include_cow else None,
+            "elapsed": time.perf_counter() - start,
+        }
+
+    # ----------------------------------------------------------- transactions
+
+    async def _transaction_params(self) -> Dict[str, Any]:
+        """Gas price and chain id, read concurrently (the chain id only once)."""
+        if self.chain_id is None:
+            gas_price, self.chain_id = await asyncio.gather(self.w3.eth.gas_price, self.w3.eth.chain_id)
+        else:
+            gas_price = await self.w3.eth.gas_price
+        return {"gasPrice": gas_price, "chainId": self.chain_id}
+
+    async def send_transactions(self, calls: List[Any], params: Dict[str, Any], gases: List[int]) -> List[Any]:
+        """
+        Sign calls with consecutive nonces and broadcast them back to back.
+
+        Args:
+            calls: Bound contract functions
+            params: Gas price and chain id (see _transaction_params)
+            gases: Gas limit of each call
+
+        Returns:
+            list: Transaction hashes of the calls that were sent, in order
+        """
+        bot = self.bot
+        if bot.nonces is not None:
+            nonces = await asyncio.to_thread(bot.nonces.allocate, bot.address, len(calls))
+        else:
+            first = await self.w3.eth.get_transaction_count(bot.address, "pending")
+            nonces = list(range(first, first + len(calls)))
+        hashes = []
+        for call, gas, nonce in zip(calls, gases, nonces):
+            try:
+                tx = call.build_transaction(dict(params, **{"from": bot.address, "nonce": nonce, "gas": gas}))
+                signed = bot.account.sign_transaction(tx)
+                tx_hash = await self.w3.eth.send_raw_transaction(get_raw_transaction(signed))
+            except Exception as e:
+                print(f"❌ Could not send transaction with nonce {nonce}: {e}")
+                # Later nonces were never sent, so the local count must be rebuilt
+                if bot.nonces is not None:
+                    bot.nonces.resync(bot.address)
+                break
+            if bot.nonces is not None:
+                bot.nonces.mark_sent(bot.address, nonce, tx_hash.hex())
+            if bot.allowances is not None:
+                bot.allowances.record_sent(tx_hash, bot.address, call.address)
+            print(f"⏳ Transaction sent: {tx_hash.hex()}")
+            hashes.append(tx_hash)
+        return hashes
+
+    async def wait_for_receipt(self, tx_hash):
+        """
+        Wait for a receipt and apply it to the allowance ledger.
+
+        Returns:
+            Receipt, or None on timeout
+        """
+        try:
+            receipt = await self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=self.receipt_timeout, poll_latency=self.poll_latency
+            )
+        except Exception as e:
+            print(f"❌ No receipt for {tx_hash.hex()}: {e}")
+            return None
+        if self.bot.allowances is not None:
+            self.bot.allowances.apply_receipt(receipt)
+        return receipt
+
+    async def _run(self, calls: List[Any], gases: List[int], params: Dict[str, Any]):
+        """Send calls back to back and wait for all their receipts; the last call is the trade."""
+        hashes = await self.send_transactions(calls, params, gases)
+        if len(hashes) < len(calls):
+            return None, None
+        receipts = await asyncio.gather(*(self.wait_for_receipt(tx_hash) for tx_hash in hashes))
+        for tx_hash, receipt in zip(hashes[:-1], receipts[:-1]):
+            if receipt is None or receipt["status"] != 1:
+                print(f"❌ Preparatory transaction failed: https://gnosisscan.io/tx/{tx_hash.hex()}")
+        return hashes[-1], receipts[-1]
+
+    def _result(self, tx_hash, receipt, token_in: str, token_out: str) -> Dict[str, Any]:
+        """Swap result dict in the layout of BalancerSwapHandler.swap_exact_in."""
+        if receipt is None or receipt["status"] != 1:
+            print("❌ Swap transaction failed")
+            return {"success": False, "tx_hash": tx_hash.hex() if tx_hash else None}
+        print("✅ Swap successful!")
+        token_deltas = decode_receipt(receipt, self.bot.address)["token_deltas"]
+        delta_in = token_deltas.get(token_in.lower(), 0)
+        delta_out = token_deltas.get(token_out.lower(), 0)
+        return {
+            "success": True,
+            "tx_hash": tx_hash.hex(),
+            "balance_changes": {
+                "token_in": float(self.bot.w3.from_wei(delta_in, "ether")),
+                "token_out": float(self.bot.w3.from_wei(delta_out, "ether")),
+            },
+            "token_deltas": {"token_in": delta_in, "token_out": delta_out},
+        }
+
+    async def _allowance(self, token: str, spender: str) -> int:
+        return await asyncio.to_thread(self.bot.get_allowance, token, spender)
+
+    async def _permit2_ok(self, token: str, spender: str, amount: int) -> bool:
+        return await asyncio.to_thread(self.bot.has_permit2_allowance, token, spender, amount)
+
+    async def swap_balancer(self, token_in: str, token_out: str, amount: float,
+                            pool_address: Optional[str] = None, slippage: float = 0.05) -> Dict[str, Any]:
+        """
+        Async counterpart of BalancerSwapHandler.swap_exact_in.
+
+        The quote, gas price and both approval checks run concurrently; missing
+        approvals are sent immediately before the swap without waiting for them.
+
+        Args:
+            token_in: Address of input token
+            token_out: Address of output token
+            amount: Amount of token_in to swap (in ether)
+            pool_address: Balancer pool (defaults to the waGNO/sDAI pool)
+            slippage: Maximum acceptable slippage
+
+        Returns:
+            dict: success flag, tx hash, balance changes (ether) and token deltas (wei)
+        """
+        w3 = self.bot.w3
+        token_in = w3.to_checksum_address(token_in)
+        token_out = w3.to_checksum_address(token_out)
+        pool_address = w3.to_checksum_address(pool_address or BALANCER_CONFIG["pool_address"])
+        permit2 = self.permit2.address
+        batch_router = self.batch_router
+        amount_wei = w3.to_wei(amount, "ether")
+
+        swap_path = {
+            "tokenIn": token_in,
+            "steps": [{"pool": pool_address, "tokenOut": token_out, "isBuffer": False}],
+            "exactAmountIn": amount_wei,
+            "minAmountOut": 0,  # For query only
+        }
+        query, params, erc20_allowance, permit2_ok = await asyncio.gather(
+            self.call(batch_router.functions.querySwapExactIn([swap_path], self.bot.address, b"")),
+            self._transaction_params(),
+            self._allowance(token_in, permit2),
+            self._permit2_ok(token_in, batch_router.address, amount_wei),
+        )
+        expected_amount = query[0][0]
+        swap_path["minAmountOut"] = int(expected_amount * (1 - slippage))
+        print(f"Expected output: {w3.from_wei(expected_amount, 'ether')}, minimum: {w3.from_wei(swap_path['minAmountOut'], 'ether')}")
+
+        now = int(time.time())
+        calls, gases = [], []
+        if erc20_allowance < amount_wei:
+            calls.append(w3.eth.contract(address=token_in, abi=ERC20_ABI).functions.approve(permit2, MAX_UINT256))
+            gases.append(100000)
+        if not permit2_ok:
+            calls.append(self.permit2.functions.approve(
+                token_in, batch_router.address, min(amount_wei, MAX_UINT160), now + PERMIT2_EXPIRATION_SECONDS
+            ))
+            gases.append(100000)
+        calls.append(batch_router.functions.swapExactIn([swap_path], now + DEADLINE_SECONDS, False, b""))
+        gases.append(500000)
+
+        tx_hash, receipt = await self._run(calls, gases, params)
+        return self._result(tx_hash, receipt, token_in, token_out)
+
+    async def swap_passthrough(self, pool_address: str, token_in: str, token_out: str, amount: float,
+                               slippage: float = 0.01, router_address: Optional[str] = None,
+                               authorize_pool: bool = True) -> Dict[str, Any]:
+        """
+        Async counterpart of PassthroughRouter.execute_swap (exact input).
+
+        The price limit is derived from the current pool price and slippage
+        instead of being passed in. Pool slot0, gas price and the allowance
+        check run concurrently.
+
+        Args:
+            pool_address: Uniswap V3 style pool
+            token_in: Address of input token
+            token_out: Address of output token
+            amount: Amount of token_in to swap (in ether)
+            slippage: Maximum price move accepted
+            router_address: Passthrough router (defaults to V3_PASSTHROUGH_ROUTER_ADDRESS)
+            authorize_pool: Send authorizePool before the swap, like the synchronous router
+
+        Returns:
+            dict: success flag, tx hash, balance changes (ether) and token deltas (wei)
+        """
+        w3 = self.bot.w3
+        pool_address = w3.to_checksum_address(pool_address)
+        token_in = w3.to_checksum_address(token_in)
+        token_out = w3.to_checksum_address(token_out)
+        router = w3.eth.contract(
+            address=w3.to_checksum_address(router_address or os.environ.get("V3_PASSTHROUGH_ROUTER_ADDRESS")),
+            abi=UNISWAP_V3_PASSTHROUGH_ROUTER_ABI
+        )
+        pool = w3.eth.contract(address=pool_address, abi=UNISWAP_V3_POOL_ABI)
+        amount_wei = w3.to_wei(amount, "ether")
+
+        slot0, params, allowance = await asyncio.gather(
+            self.call(pool.functions.slot0()),
+            self._transaction_params(),
+            self._allowance(token_in, router.address),
+        )
+        zero_for_one = token_in.lower() == self.bot.metadata.token0(pool_address).lower()
+        # sqrtPrice moves down when selling token0 and up when selling token1
+        factor = math.sqrt(1 - slippage) if zero_for_one else 1 / math.sqrt(1 - slippage)
+        limit = min(max(int(slot0[0] * factor), MIN_SQRT_RATIO + 1), MAX_SQRT_RATIO - 1)
+
+        calls, gases = [], []
+        if allowance < amount_wei:
+            calls.append(w3.eth.contract(address=token_in, abi=ERC20_ABI).functions.approve(router.address, MAX_UINT256))
+            gases.append(100000)
+        if authorize_pool:
+            calls.append(router.functions.authorizePool(pool_address))
+            gases.append(200000)
+        calls.append(router.functions.swap(pool_address, self.bot.address, zero_for_one, amount_wei, limit, b""))
+        gases.append(1000000)
+
+        tx_hash, receipt = await self._run(calls, gases, params)
+        return self._result(tx_hash, receipt, token_in, token_out)
@@ -1,12 +1,15 @@
 import sys
 import os
+import time
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from eth_abi import decode, encode
 from web3 import Web3
 from web3.exceptions import ContractLogicError
 from utils.web3_utils import setup_web3_connection, get_account_from_private_key, get_raw_transaction
+from futarchy.experimental.utils.allowance_ledger import EXPIRATION_MARGIN, PERMIT2_ALLOWANCE_SELECTOR
 from config.constants import CONTRACT_ADDRESSES, ERC20_ABI
 
 class BaseBot:
@@ -22,11 +25,85 @@ class BaseBot:
         # Set up Web3 connection
         self.w3 = setup_web3_connection(rpc_url)
         
+        # Local nonce allocator shared by every component using this connection
+        self.nonces = self.w3.nonce_manager
+        
+        # Allowance ledger, so approvals are only checked against the chain once
+        self.allowances = self.w3.allowance_ledger
+        
         # Check connection
         self.check_connection()
         
         # Set up account
         self.account, self.address = get_account_from_private_key()
+        # Without a private key the bot is read-only and there is no account to track
+        if self.address and self.nonces is not None:
+            self.nonces.track(self.address)
+        if self.address and self.allowances is not None:
+            self.allowances.track(self.address)
+    
+    def get_nonce(self):
+        """
+        Get the nonce for the next transaction of the bot account.
+        
+        Returns:
+            int: Next nonce (local count, or the chain's pending count without a nonce manager)
+        """
+        if self.nonces is None:
+            return self.w3.eth.get_transaction_count(self.address, 'pending')
+        return self.nonces.get_nonce(self.address)
+    
+    def get_allowance(self, token_address, spender_address):
+        """
+        Get the ERC20 allowance the bot account has given a spender.
+        
+        Args:
+            token_address: Token address
+            spender_address: Spender address
+            
+        Returns:
+            int: Allowance in wei (from the allowance ledger, or the chain without one)
+        """
+        if self.allowances is None:
+            token = self.w3.eth.contract(address=self.w3.to_checksum_address(token_address), abi=ERC20_ABI)
+            return token.functions.allowance(self.address, self.w3.to_checksum_address(spender_address)).call()
+        return self.allowances.allowance(self.address, token_address, spender_address)
+    
+    def get_permit2_allowance(self, token_address, spender_address):
+        """
+        Get the Permit2 allowance the bot account has given a spender.
+        
+        Args:
+            token_address: Token address
+            spender_address: Spender address
+            
+        Returns:
+            tuple: (amount, expiration, nonce), from the allowance ledger or the chain without one
+        """
+        if self.allowances is None:
+            data = PERMIT2_ALLOWANCE_SELECTOR + encode(
+                ["address", "address", "address"],
+                [self.address, self.w3.to_checksum_address(token_address), self.w3.to_checksum_address(spender_address)]
+            ).hex()
+            permit2 = self.w3.to_checksum_address(CONTRACT_ADDRESSES["permit2"])
+            return tuple(decode(["uint160", "uint48", "uint48"], bytes(self.w3.eth.call({"to": permit2, "data": data}))))
+        return self.allowances.permit2_allowance(self.address, token_address, spender_address)
+    
+    def has_permit2_allowance(self, token_address, spender_address, amount, margin=EXPIRATION_MARGIN):
+        """
+        Check whether the bot account's Permit2 allowance covers an amount and is not about to expire.
+        
+        Args:
+            token_address: Token address
+            spender_address: Spender address
+            amount: Amount needed in wei
+            margin: Seconds the allowance must stay valid
+            
+        Returns:
+            bool: True if no new Permit2 approval is needed
+        """
+        allowed, expiration, _ = self.get_permit2_allowance(token_address, spender_address)
+        return allowed >= amount and expiration > time.time() + margin
     
     def check_connection(self):
         """
@@ -35,14 +112,15 @@ class BaseBot:
         Raises:
             ConnectionError: If connection fails
         """
-        if self.w3.is_connected():
+        # Reading the chain id and head proves the connection, without a separate is_connected() probe
+        try:
             chain_id = self.w3.eth.chain_id
             latest_block = self.w3.eth.block_number
-            print(f"✅ Connected to Gnosis Chain (Chain ID: {chain_id})")
-            print(f"📊 Latest block: {latest_block}")
-        else:
-            print("❌ Failed to connect to Gnosis Chain")
+        except Exception as e:
+            print(f"❌ Failed to connect to Gnosis Chain: {e}")
             raise ConnectionError("Failed to connect to Gnosis Chain")
+        print(f"✅ Connected to Gnosis Chain (Chain ID: {chain_id})")
+        print(f"📊 Latest block: {latest_block}")
     
     def approve_token(self, token_contract, spender_address, amount_wei=None):
         """
@@ -63,11 +141,8 @@ class BaseBot:
             # Convert address to checksum format
             spender_address = self.w3.to_checksum_address(spender_address)
             
-            # Get current allowance
-            current_allowance = token_contract.functions.allowance(
-                self.address, 
-                spender_address
-            ).call()
+            # Get current allowance from the ledger
+            current_allowance = self.get_allowance(token_contract.address, spender_address)
             
             # If already approved, return true
             if amount_wei and current_allowance >= amount_wei:
@@ -86,7 +161,7 @@ class BaseBot:
                 amount_wei
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.get_nonce(),
                 'gas': 200000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
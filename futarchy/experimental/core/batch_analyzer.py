@@ -0,0 +1,333 @@
+"""
+Batch transaction analyzer for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Analyzes thousands of transactions at once: transactions and receipts are
+fetched with JSON-RPC batch requests (one HTTP round trip per 100 calls
+instead of two per transaction), every log is decoded by the shared
+EventDecoder (ERC20 transfers, pool swaps and the ConditionalTokens
+split/merge events, named after the market's tokens and pools), and the result is a columnar summary (dict of column
+lists per table) ready for CSV export or a DataFrame.
+"""
+
+import csv
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from futarchy.experimental.core.log_indexer import backoff_delay, is_range_error, is_transient_error
+from futarchy.experimental.core.transaction import TRANSFER_TOPIC
+from futarchy.experimental.utils.event_decoder import EventDecoder
+from futarchy.experimental.utils.helpers import to_hex
+from futarchy.experimental.utils.http_pool import get_http_pool
+
+# Calls per JSON-RPC batch request
+BATCH_SIZE = 100
+
+# Blocks per eth_getLogs request when finding an account's transactions
+LOG_CHUNK_BLOCKS = 10000
+
+TABLE_COLUMNS = {
+    "transactions": ("tx_hash", "block_number", "from", "to", "status", "gas_used", "fee"),
+    "transfers": ("tx_hash", "log_index", "token", "name", "from", "to", "value"),
+    "swaps": ("tx_hash", "log_index", "pool", "name", "sender", "recipient", "amount0", "amount1",
+              "sqrt_price_x96", "liquidity", "tick"),
+    "splits": ("tx_hash", "log_index", "kind", "stakeholder", "collateral_token", "name", "condition_id", "amount"),
+    "deltas": ("tx_hash", "account", "token", "name", "delta"),
+}
+
+
+def _int(value) -> int:
+    """Integer from a JSON-RPC quantity (hex string) or an int."""
+    return int(value, 16) if isinstance(value, str) else int(value or 0)
+
+
+def _transfer_row(record) -> Dict[str, Any]:
+    return {"token": record.address, "from": record.from_, "to": record.to, "value": record.value}
+
+
+def _swap_row(record) -> Dict[str, Any]:
+    return {
+        "pool": record.address,
+        "sender": record.sender,
+        "recipient": record.recipient,
+        "amount0": record.amount0,
+        "amount1": record.amount1,
+        "sqrt_price_x96": record.sqrtPriceX96,
+        "liquidity": record.liquidity,
+        "tick": record.tick,
+    }
+
+
+def _split_merge_row(record) -> Dict[str, Any]:
+    return {
+        "kind": "split" if record.event == "PositionSplit" else "merge",
+        "stakeholder": record.stakeholder,
+        "collateral_token": record.collateralToken,
+        "condition_id": to_hex(record.conditionId),
+        "amount": record.amount,
+    }
+
+
+# Decoded event name -> (table, row builder)
+EVENT_TABLES: Dict[str, Tuple[str, Callable[[Any], Dict[str, Any]]]] = {
+    "Transfer": ("transfers", _transfer_row),
+    "Swap": ("swaps", _swap_row),
+    "PositionSplit": ("splits", _split_merge_row),
+    "PositionsMerge": ("splits", _split_merge_row),
+}
+
+
+def rpc_batch(w3, calls: List[Tuple[str, list]], batch_size: int = BATCH_SIZE, workers: int = 4) -> List[Any]:
+    """
+    Execute JSON-RPC calls as batch requests.
+
+    Batches go straight to the provider's HTTP endpoint (bypassing web3
+    middleware); providers without one, and nodes that reject batches, get
+    the calls one by one instead.
+
+    Args:
+        w3: Web3 instance
+        calls: (method, params) pairs
+        batch_size: Calls per batch request
+        workers: Batch requests in flight at once
+
+    Returns:
+        list: Raw JSON results in call order (None for calls that returned an error)
+    """
+    endpoint = getattr(w3.provider, "endpoint_uri", None)
+    if not isinstance(endpoint, str) or not endpoint.startswith("http"):
+        return [w3.provider.make_request(method, params).get("result") for method, params in calls]
+
+    pool = get_http_pool()
+    metrics = getattr(w3, "rpc_metrics", None)
+
+    def send(offset: int) -> List[Any]:
+        chunk = calls[offset:offset + batch_size]
+        payload = [
+            {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+            for index, (method, params) in enumerate(chunk)
+        ]
+        start = time.perf_counter()
+        try:
+            response = pool.session.post(endpoint, json=payload, timeout=pool.timeout)
+            response.raise_for_status()
+            replies = response.json()
+        except Exception as e:
+            print(f"⚠️ Batch request failed ({e}), sending {len(chunk)} calls one by one")
+            replies = None
+        if metrics is not None:
+            metrics.record("batch", None, time.perf_counter() - start, error=not isinstance(replies, list))
+        if not isinstance(replies, list):
+            return [w3.provider.make_request(method, params).get("result") for method, params in chunk]
+        results = [None] * len(chunk)
+        for reply in replies:
+            if isinstance(reply, dict) and isinstance(reply.get("id"), int) and reply["id"] < len(chunk):
+                results[reply["id"]] = reply.get("result")
+        return results
+
+    offsets = range(0, len(calls), batch_size)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return [result for results in executor.map(send, offsets) for result in results]
+
+
+def find_transactions(w3, address: str, from_block: int, to_block: int,
+                      chunk_blocks: int = LOG_CHUNK_BLOCKS, retries: int = 5) -> List[str]:
+    """
+    Hashes of the transactions in a block range that moved tokens to or from an account.
+
+    Args:
+        w3: Web3 instance
+        address: Account address
+        from_block: First block
+        to_block: Last block
+        chunk_blocks: Blocks per eth_getLogs request (halved when a node rejects the range)
+        retries: Attempts per range for rate limits and timeouts
+
+    Returns:
+        list: Transaction hashes in chain order
+    """
+    padded = "0x" + "0" * 24 + address.lower()[2:]
+    queries = [[TRANSFER_TOPIC, padded], [TRANSFER_TOPIC, None, padded]]
+    seen = {}
+    start = from_block
+    attempt = 0
+    while start <= to_block:
+        end = min(to_block, start + chunk_blocks - 1)
+        try:
+            logs = [log for topics in queries for log in w3.eth.get_logs({"fromBlock": start, "toBlock": end, "topics": topics})]
+        except Exception as e:
+            if is_transient_error(e) and attempt < retries - 1:
+                time.sleep(backoff_delay(attempt))
+                attempt += 1
+                continue
+            if not is_range_error(e) or chunk_blocks == 1:
+                raise
+            chunk_blocks = max(1, chunk_blocks // 2)
+            continue
+        attempt = 0
+        for log in logs:
+            seen.setdefault(to_hex(log["transactionHash"]), (_int(log["blockNumber"]), _int(log["transactionIndex"])))
+        start = end + 1
+    return sorted(seen, key=seen.get)
+
+
+class BatchAnalyzer:
+    """Batched fetch and table-driven decoding of many transactions"""
+
+    def __init__(self, w3, batch_size: int = BATCH_SIZE, workers: int = 4):
+        """
+        Initialize the analyzer.
+
+        Args:
+            w3: Web3 instance
+            batch_size: Calls per JSON-RPC batch request
+            workers: Batch requests in flight at once
+        """
+        self.w3 = w3
+        self.batch_size = batch_size
+        self.workers = workers
+        self.decoder = EventDecoder()
+        self.names = {address: info["name"] for address, info in self.decoder.contracts.items()}
+
+    def fetch(self, tx_hashes: List[str]) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """
+        Fetch transactions and receipts with batch requests.
+
+        Args:
+            tx_hashes: Transaction hashes
+
+        Returns:
+            list: (transaction, receipt) raw JSON pairs, None where the node doesn't know the hash
+        """
+        calls = []
+        for tx_hash in tx_hashes:
+            calls.append(("eth_getTransactionByHash", [tx_hash]))
+            calls.append(("eth_getTransactionReceipt", [tx_hash]))
+        results = rpc_batch(self.w3, calls, self.batch_size, self.workers)
+        return list(zip(results[0::2], results[1::2]))
+
+    def analyze(self, tx_hashes: List[str], account: Optional[str] = None) -> Dict[str, Dict[str, List[Any]]]:
+        """
+        Fetch, decode and summarize transactions.
+
+        Args:
+            tx_hashes: Transaction hashes
+            account: Account whose token deltas are computed (defaults to each transaction's sender)
+
+        Returns:
+            dict: Table name -> {column: values}. Tables: transactions, transfers, swaps,
+                splits (splits and merges) and deltas (net wei per account and token).
+                Amounts are exact integers; names come from the decoder's known contracts.
+        """
+        tables = {name: {column: [] for column in columns} for name, columns in TABLE_COLUMNS.items()}
+
+        def append(table: str, row: Dict[str, Any]):
+            columns = tables[table]
+            for column in TABLE_COLUMNS[table]:
+                columns[column].append(row.get(column))
+
+        for tx_hash, (tx, receipt) in zip(tx_hashes, self.fetch(tx_hashes)):
+            if tx is None or receipt is None:
+                print(f"⚠️ Transaction {tx_hash} not found")
+                continue
+            sender = (account or tx["from"]).lower()
+            gas_used = _int(receipt["gasUsed"])
+            append("transactions", {
+                "tx_hash": tx_hash,
+                "block_number": _int(receipt["blockNumber"]),
+                "from": tx["from"].lower(),
+                "to": (tx.get("to") or "").lower() or None,
+                "status": _int(receipt["status"]),
+                "gas_used": gas_used,
+                "fee": gas_used * _int(receipt.get("effectiveGasPrice") or tx["gasPrice"]),
+            })
+
+            deltas: Dict[str, int] = {}
+            for record in self.decoder.decode_many(receipt["logs"]):
+                if record.event not in EVENT_TABLES:
+                    continue
+                table, build = EVENT_TABLES[record.event]
+                row = build(record)
+                row["tx_hash"] = tx_hash
+                row["log_index"] = record.log_index
+                contract = row.get("token") or row.get("pool") or row.get("collateral_token")
+                row["name"] = self.names.get(contract, contract)
+                append(table, row)
+                if table == "transfers":
+                    if row["to"] == sender:
+                        deltas[row["token"]] = deltas.get(row["token"], 0) + row["value"]
+                    if row["from"] == sender:
+                        deltas[row["token"]] = deltas.get(row["token"], 0) - row["value"]
+
+            for token, delta in deltas.items():
+                append("deltas", {
+                    "tx_hash": tx_hash, "account": sender, "token": token,
+                    "name": self.names.get(token, token), "delta": delta,
+                })
+        return tables
+
+    def analyze_account(self, address: str, from_block: int, to_block: int) -> Dict[str, Dict[str, List[Any]]]:
+        """
+        Analyze every transaction that moved tokens to or from an account in a block range.
+
+        Args:
+            address: Account address
+            from_block: First block
+            to_block: Last block
+
+        Returns:
+            dict: Tables as returned by analyze(), with deltas for the account
+        """
+        return self.analyze(find_transactions(self.w3, address, from_block, to_block), account=address)
+
+
+def totals(tables: Dict[str, Dict[str, List[Any]]]) -> Dict[str, Any]:
+    """
+    Aggregate an analysis.
+
+    Args:
+        tables: Result of BatchAnalyzer.analyze()
+
+    Returns:
+        dict: transaction and failure counts, total fee (wei) and net delta per token name
+    """
+    deltas: Dict[str, int] = {}
+    for name, delta in zip(tables["deltas"]["name"], tables["deltas"]["delta"]):
+        deltas[name] = deltas.get(name, 0) + delta
+    transactions = tables["transactions"]
+    return {
+        "transactions": len(transactions["tx_hash"]),
+        "failed": sum(1 for status in transactions["status"] if status != 1),
+        "fee": sum(transactions["fee"]),
+        "deltas": deltas,
+    }
+
+
+def write_csv(tables: Dict[str, Dict[str, List[Any]]], directory: str) -> List[str]:
+    """
+    Write each table to <directory>/<table>.csv.
+
+    Args:
+        tables: Result of BatchAnalyzer.analyze()
+        directory: Output directory (created if needed)
+
+    Returns:
+        list: Paths written
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, columns in tables.items():
+        path = os.path.join(directory, f"{name}.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns.keys())
+            writer.writerows(zip(*columns.values()))
+        paths.append(path)
+    return paths
+
+
+def read_hashes(lines: Iterable[str]) -> List[str]:
+    """Transaction hashes from lines of text (blank lines and # comments skipped)."""
+    return [line.split("#")[0].strip().lower() for line in lines if line.split("#")[0].strip()]
@@ -0,0 +1,141 @@
+"""
+New-block stream for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Yields each new chain head once, so strategies refresh their snapshot and
+evaluate exactly once per block instead of sleeping a fixed interval.
+Heads come from a WebSocket eth_subscribe("newHeads") subscription when a
+WebSocket endpoint is reachable, and from eth_blockNumber polling over the
+bot's HTTP connection otherwise. When several heads arrive while the
+consumer is busy, only the latest one is yielded.
+"""
+
+import json
+import os
+import time
+from typing import Iterator, Optional
+
+from futarchy.experimental.config.network import BLOCK_TIME, DEFAULT_WS_URL
+
+
+class BlockStream:
+    """Iterator over new block numbers, from WebSocket heads or HTTP polling"""
+
+    def __init__(self, w3, ws_url: Optional[str] = None, use_websocket: bool = True,
+                 poll_interval: float = 1.0, block_time: float = BLOCK_TIME, open_timeout: float = 5):
+        """
+        Initialize the stream.
+
+        Args:
+            w3: Web3 instance used for polling
+            ws_url: WebSocket RPC URL (defaults to env GNOSIS_WS_URL, then the public Gnosis endpoint)
+            use_websocket: Try a newHeads subscription before falling back to polling
+            poll_interval: Seconds between eth_blockNumber polls once a block is due
+            block_time: Expected seconds between blocks
+            open_timeout: Seconds to wait for the WebSocket connection
+        """
+        self.w3 = w3
+        self.ws_url = ws_url or os.getenv("GNOSIS_WS_URL") or DEFAULT_WS_URL
+        self.use_websocket = use_websocket
+        self.poll_interval = poll_interval
+        self.block_time = block_time
+        self.open_timeout = open_timeout
+        self.mode = None
+        self.last_block = None
+        self.skipped = 0
+        self._ws = None
+
+    def __iter__(self) -> Iterator[int]:
+        return self.blocks()
+
+    def blocks(self, limit: Optional[int] = None) -> Iterator[int]:
+        """
+        Yield new block numbers.
+
+        Args:
+            limit: Stop after this many blocks (None for no limit)
+
+        Yields:
+            int: Number of the latest block, strictly increasing
+        """
+        count = 0
+        sources = [self._websocket_heads, self._polled_heads] if self.use_websocket else [self._polled_heads]
+        for source in sources:
+            for number in source():
+                if self.last_block is not None and number <= self.last_block:
+                    continue
+                if self.last_block is not None:
+                    self.skipped += number - self.last_block - 1
+                self.last_block = number
+                yield number
+                count += 1
+                if limit is not None and count >= limit:
+                    self.close()
+                    return
+
+    def _websocket_heads(self) -> Iterator[int]:
+        """Heads from a newHeads subscription; returns when the socket fails or goes quiet."""
+        try:
+            from websockets.sync.client import connect
+            self._ws = connect(self.ws_url, open_timeout=self.open_timeout)
+            self._ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+            reply = json.loads(self._ws.recv(timeout=self.open_timeout))
+            if "result" not in reply:
+                raise ConnectionError(reply.get("error", reply))
+        except Exception as e:
+            print(f"⚠️ newHeads subscription on {self.ws_url} unavailable ({e}), polling for new blocks")
+            self.close()
+            return
+
+        self.mode = "websocket"
+        try:
+            while True:
+                # A silent socket for several block times is treated as dead
+                messages = [self._ws.recv(timeout=3 * self.block_time)]
+                # Drain heads that queued up while the consumer was busy and keep only the latest
+                while True:
+                    try:
+                        messages.append(self._ws.recv(timeout=0))
+                    except TimeoutError:
+                        break
+                numbers = [self._head_number(message) for message in messages]
+                numbers = [number for number in numbers if number is not None]
+                if numbers:
+                    yield max(numbers)
+        except Exception as e:
+            print(f"⚠️ newHeads subscription lost ({e}), polling for new blocks")
+        finally:
+            self.close()
+
+    @staticmethod
+    def _head_number(message) -> Optional[int]:
+        head = json.loads(message).get("params", {}).get("result") or {}
+        number = head.get("number")
+        return int(number, 16) if isinstance(number, str) else None
+
+    def _polled_heads(self) -> Iterator[int]:
+        """Heads from eth_blockNumber, polled quickly only around the time the next block is due."""
+        self.mode = "polling"
+        due = None
+        while True:
+            if due is not None:
+                time.sleep(max(due - time.monotonic(), self.poll_interval))
+            due = time.monotonic()
+            try:
+                number = self.w3.eth.block_number
+            except Exception as e:
+                print(f"⚠️ Error polling block number: {e}")
+                continue
+            if self.last_block is None or number > self.last_block:
+                # The next block is not expected before roughly one block time from now
+                due += self.block_time - self.poll_interval
+                yield number
+
+    def close(self):
+        """Close the WebSocket connection, if any."""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
@@ -9,6 +9,7 @@ import time
 import sys
 import os
 from decimal import Decimal
+from functools import cached_property
 from typing import Optional, Dict, List, Tuple, Any
 from web3 import Web3
 from eth_typing import ChecksumAddress
@@ -23,82 +24,158 @@ from config.constants import (
     COWSWAP_API_URL, BALANCER_CONFIG, BALANCER_VAULT_ABI, BALANCER_BATCH_ROUTER_ABI
 )
 from futarchy.experimental.utils.web3_utils import get_raw_transaction
-from futarchy.experimental.exchanges.cowswap import CowSwapExchange
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.metadata_cache import get_metadata_cache
+from futarchy.experimental.utils.rpc_metrics import track_operation
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
+from futarchy.experimental.core.market_snapshot import MarketSnapshot
+from futarchy.experimental.core.pool_tracker import PoolStateTracker
+from futarchy.experimental.config.network import BLOCK_TIME
+from futarchy.experimental.core.transaction import decode_receipt
 from futarchy.experimental.core.base_bot import BaseBot
-from futarchy.experimental.exchanges.aave_balancer import AaveBalancerHandler
 from futarchy.experimental.exchanges.sushiswap import SushiSwapExchange
 
 class FutarchyBot(BaseBot):
     """Main Futarchy Trading Bot implementation"""
     
+    # Lazily created contracts and handlers, built eagerly by initialize_contracts()
+    CONTRACT_ATTRIBUTES = (
+        "sdai_token", "gno_token", "sdai_yes_token", "sdai_no_token", "gno_yes_token", "gno_no_token", "wagno_token",
+        "yes_pool", "no_pool", "futarchy_router", "sushiswap_router", "sdai_rate_provider", "cowswap", "aave_balancer",
+    )
+    
     # In futarchy_bot.py, add to the __init__ method:
     def __init__(self, rpc_url=None, verbose=False):
         """Initialize the Futarchy Bot"""
         self.verbose = verbose
         
-        # Use default RPC URL if none provided
+        # Use RPC_URL if none provided; without either, setup_web3_connection pools the public endpoints
         if not rpc_url:
-            rpc_url = os.environ.get('RPC_URL', 'https://gnosis-mainnet.public.blastapi.io')
+            rpc_url = os.environ.get('RPC_URL')
         
         super().__init__(rpc_url)
         
-        # Initialize contract instances
-        self.initialize_contracts()
+        # Contract instances and exchange handlers are created on first use (see initialize_contracts)
+        
+        # Multicall3 helper for batched reads
+        self.multicall = Multicall(self.w3, CONTRACT_ADDRESSES.get("multicall3"))
         
-        # Initialize exchange handlers
-        self.cowswap = CowSwapExchange(self)
+        # Immutable pool/token metadata, persisted across runs
+        self.metadata = get_metadata_cache(self.w3)
+        self.metadata.warm_pools(
+            [POOL_CONFIG_YES["address"], POOL_CONFIG_NO["address"], CONTRACT_ADDRESSES["sdaiYesPool"]],
+            self.multicall
+        )
+        self.last_balances_block = None
+        self.last_market_snapshot = None
         
-        # Initialize Aave/Balancer handler
-        self.aave_balancer = AaveBalancerHandler(self)
+        # Pool states kept current from their logs, keyed by lowercase pool address (see track_pools)
+        self.pool_trackers = {}
         
         # Store current strategy
         self.current_strategy = None
     
     def initialize_contracts(self):
-        """Initialize all contract instances"""
-        # ERC20 token contracts
-        self.sdai_token = self.get_token_contract(TOKEN_CONFIG["currency"]["address"])
-        self.gno_token = self.get_token_contract(TOKEN_CONFIG["company"]["address"])
-        self.sdai_yes_token = self.get_token_contract(TOKEN_CONFIG["currency"]["yes_address"])
-        self.sdai_no_token = self.get_token_contract(TOKEN_CONFIG["currency"]["no_address"])
-        self.gno_yes_token = self.get_token_contract(TOKEN_CONFIG["company"]["yes_address"])
-        self.gno_no_token = self.get_token_contract(TOKEN_CONFIG["company"]["no_address"])
-        self.wagno_token = self.get_token_contract(TOKEN_CONFIG["wagno"]["address"])
-        
-        # Pool contracts
-        self.yes_pool = self.w3.eth.contract(
+        """
+        Create all contract instances and exchange handlers now.
+        
+        They are otherwise created on first use, so short commands only pay
+        for the contracts they touch; long-running processes call this once
+        to keep the first trade fast.
+        """
+        for name in self.CONTRACT_ATTRIBUTES:
+            getattr(self, name)
+    
+    # ERC20 token contracts
+    @cached_property
+    def sdai_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["currency"]["address"])
+    
+    @cached_property
+    def gno_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["company"]["address"])
+    
+    @cached_property
+    def sdai_yes_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["currency"]["yes_address"])
+    
+    @cached_property
+    def sdai_no_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["currency"]["no_address"])
+    
+    @cached_property
+    def gno_yes_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["company"]["yes_address"])
+    
+    @cached_property
+    def gno_no_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["company"]["no_address"])
+    
+    @cached_property
+    def wagno_token(self):
+        return self.get_token_contract(TOKEN_CONFIG["wagno"]["address"])
+    
+    # Pool contracts
+    @cached_property
+    def yes_pool(self):
+        return self.w3.eth.contract(
             address=self.w3.to_checksum_address(POOL_CONFIG_YES["address"]),
             abi=UNISWAP_V3_POOL_ABI
         )
-        self.no_pool = self.w3.eth.contract(
+    
+    @cached_property
+    def no_pool(self):
+        return self.w3.eth.contract(
             address=self.w3.to_checksum_address(POOL_CONFIG_NO["address"]),
             abi=UNISWAP_V3_POOL_ABI
         )
-        
-        # Futarchy router contract
-        self.futarchy_router = self.w3.eth.contract(
+    
+    # Futarchy router contract
+    @cached_property
+    def futarchy_router(self):
+        return self.w3.eth.contract(
             address=self.w3.to_checksum_address(CONTRACT_ADDRESSES["futarchyRouter"]),
             abi=FUTARCHY_ROUTER_ABI
         )
-        
-        # SushiSwap V3 router contract
-        self.sushiswap_router = self.w3.eth.contract(
+    
+    # SushiSwap V3 router contract
+    @cached_property
+    def sushiswap_router(self):
+        return self.w3.eth.contract(
             address=self.w3.to_checksum_address(CONTRACT_ADDRESSES["sushiswap"]),
             abi=SUSHISWAP_V3_ROUTER_ABI
         )
-        
-        # SDAI rate provider contract
-        self.sdai_rate_provider = self.w3.eth.contract(
+    
+    # SDAI rate provider contract
+    @cached_property
+    def sdai_rate_provider(self):
+        return self.w3.eth.contract(
             address=self.w3.to_checksum_address(CONTRACT_ADDRESSES["sdaiRateProvider"]),
             abi=SDAI_RATE_PROVIDER_ABI
         )
     
-    def get_balances(self, address=None):
+    # Exchange handlers (the CoW Swap signing stack is only imported when needed)
+    @cached_property
+    def cowswap(self):
+        from futarchy.experimental.exchanges.cowswap import CowSwapExchange
+        return CowSwapExchange(self)
+    
+    @cached_property
+    def aave_balancer(self):
+        from futarchy.experimental.exchanges.aave_balancer import AaveBalancerHandler
+        return AaveBalancerHandler(self)
+    
+    @track_operation()
+    def get_balances(self, address=None, block_identifier=None):
         """
         Get all token balances for an address.
         
+        All balances are read in a single Multicall3 call pinned to one block,
+        falling back to individual balanceOf calls if the batch fails.
+        
         Args:
             address: Address to check (defaults to self.address)
+            block_identifier: Block number or tag to read at (defaults to latest)
             
         Returns:
             dict: Token balances with exact values (not rounded)
@@ -110,33 +187,82 @@ class FutarchyBot(BaseBot):
         
         address = self.w3.to_checksum_address(address)
         
-        # Get token balances
-        sdai_balance = self.sdai_token.functions.balanceOf(address).call()
-        gno_balance = self.gno_token.functions.balanceOf(address).call()
-        sdai_yes_balance = self.sdai_yes_token.functions.balanceOf(address).call()
-        sdai_no_balance = self.sdai_no_token.functions.balanceOf(address).call()
-        gno_yes_balance = self.gno_yes_token.functions.balanceOf(address).call()
-        gno_no_balance = self.gno_no_token.functions.balanceOf(address).call()
-        wagno_balance = self.wagno_token.functions.balanceOf(address).call()
-        
-        # Format balances with exact precision (no rounding)
-        balances = {
-            "currency": {
-                "wallet": self.w3.from_wei(sdai_balance, 'ether'),
-                "yes": self.w3.from_wei(sdai_yes_balance, 'ether'),
-                "no": self.w3.from_wei(sdai_no_balance, 'ether'),
-            },
-            "company": {
-                "wallet": self.w3.from_wei(gno_balance, 'ether'),
-                "yes": self.w3.from_wei(gno_yes_balance, 'ether'),
-                "no": self.w3.from_wei(gno_no_balance, 'ether'),
-            },
-            "wagno": {
-                "wallet": self.w3.from_wei(wagno_balance, 'ether')
+        return self.get_balances_many([address], block_identifier=block_identifier)[address]
+    
+    def _balance_token_contracts(self):
+        """Return (section, key, contract) entries for every tracked token balance"""
+        return [
+            ("currency", "wallet", self.sdai_token),
+            ("currency", "yes", self.sdai_yes_token),
+            ("currency", "no", self.sdai_no_token),
+            ("company", "wallet", self.gno_token),
+            ("company", "yes", self.gno_yes_token),
+            ("company", "no", self.gno_no_token),
+            ("wagno", "wallet", self.wagno_token),
+        ]
+    
+    @track_operation()
+    def get_balances_many(self, addresses, block_identifier=None):
+        """
+        Get all token balances for several addresses in one batched read.
+        
+        Args:
+            addresses: List of addresses to check
+            block_identifier: Block number or tag to read at (defaults to latest)
+            
+        Returns:
+            dict: Mapping of checksum address -> balances dict (same layout as get_balances)
+        """
+        addresses = [self.w3.to_checksum_address(a) for a in addresses]
+        entries = self._balance_token_contracts()
+        tokens = [contract.address for _, _, contract in entries]
+        if block_identifier is None:
+            block_identifier = "latest"
+        
+        try:
+            block_number, raw = self.multicall.get_token_balances(tokens, addresses, block_identifier=block_identifier)
+            self.last_balances_block = block_number
+            # Retries of failed calls must read the block the batch was read at, not a newer head
+            block_identifier = block_number
+        except Exception as e:
+            if self.verbose:
+                print(f"⚠️ Multicall balance read failed, falling back to individual calls: {e}")
+            raw = {
+                address: {
+                    contract.address: contract.functions.balanceOf(address).call(block_identifier=block_identifier)
+                    for _, _, contract in entries
+                }
+                for address in addresses
             }
-        }
         
-        return balances
+        return self._format_balances(addresses, raw, block_identifier)
+    
+    def _format_balances(self, addresses, raw, block_identifier="latest"):
+        """
+        Turn raw balanceOf results into balance dicts.
+        
+        Args:
+            addresses: Checksum addresses that were read
+            raw: {address: {token: balance_wei or None}}
+            block_identifier: Block the balances were read at (used to retry failed calls)
+            
+        Returns:
+            dict: Mapping of checksum address -> balances dict (same layout as get_balances)
+        """
+        entries = self._balance_token_contracts()
+        result = {}
+        for address in addresses:
+            # Format balances with exact precision (no rounding)
+            balances = {"currency": {}, "company": {}, "wagno": {}}
+            for section, key, contract in entries:
+                balance = raw[address].get(contract.address)
+                if balance is None:
+                    # Individual call failed inside the batch; retry it on its own
+                    balance = contract.functions.balanceOf(address).call(block_identifier=block_identifier)
+                balances[section][key] = self.w3.from_wei(balance, 'ether')
+            result[address] = balances
+        
+        return result
     
     def print_balances(self, balances=None):
         """
@@ -193,10 +319,8 @@ class FutarchyBot(BaseBot):
             yes_sqrt_price = int(yes_slot0[0])
             
             # Calculate the raw price from sqrtPriceX96
-            yes_raw_price = (yes_sqrt_price ** 2) / (2 ** 192)
-            
             # In the YES pool, depending on the token order, this might need to be inverted
-            price_ratio = 1 / yes_raw_price if POOL_CONFIG_YES["tokenCompanySlot"] == 1 else yes_raw_price
+            price_ratio = sqrt_price_x96_to_price(yes_sqrt_price, invert=POOL_CONFIG_YES["tokenCompanySlot"] == 1)
             
             # For a prediction market, the price should be between 0 and 1
             # If it's outside this range, normalize it
@@ -208,6 +332,67 @@ class FutarchyBot(BaseBot):
             print(f"❌ Error calculating YES token price ratio: {e}")
             return 0.5  # Default to 50% if calculation fails
     
+    def track_pools(self, pool_addresses=None):
+        """
+        Keep the state of pools current from their Swap, Mint and Burn logs.
+        
+        Once tracked, price reads of these pools (get_token_price,
+        PoolPriceChecker.get_pool_data) are answered from the local state,
+        which long-running processes bring up to date once per block with
+        sync_pools().
+        
+        Args:
+            pool_addresses: Pools to track (defaults to the YES, NO and sDAI-YES pools)
+            
+        Returns:
+            dict: Trackers keyed by lowercase pool address
+        """
+        if pool_addresses is None:
+            pool_addresses = [POOL_CONFIG_YES["address"], POOL_CONFIG_NO["address"], CONTRACT_ADDRESSES["sdaiYesPool"]]
+        for pool_address in pool_addresses:
+            if pool_address.lower() not in self.pool_trackers:
+                self.pool_trackers[pool_address.lower()] = PoolStateTracker(
+                    self.w3, pool_address, multicall=self.multicall, metadata=self.metadata
+                )
+        return self.pool_trackers
+    
+    def sync_pools(self, block_number=None):
+        """
+        Bring every tracked pool up to a block.
+        
+        Args:
+            block_number: Block to follow to (defaults to the current head)
+        """
+        for pool_address, tracker in self.pool_trackers.items():
+            try:
+                tracker.sync(block_number)
+            except Exception as e:
+                print(f"⚠️ Error syncing pool {pool_address}: {e}")
+    
+    def get_pool_sqrt_price(self, pool_address):
+        """
+        Get a pool's sqrtPriceX96, from its tracker when the pool is tracked.
+        
+        Args:
+            pool_address: V3 pool address
+            
+        Returns:
+            int: Current sqrtPriceX96
+        """
+        tracker = self.pool_trackers.get(pool_address.lower())
+        if tracker is not None:
+            try:
+                tracker.sync(max_age=BLOCK_TIME)
+                return tracker.sqrt_price_x96
+            except Exception as e:
+                print(f"⚠️ Error syncing pool {pool_address}, reading slot0: {e}")
+        
+        pool = self.w3.eth.contract(
+            address=self.w3.to_checksum_address(pool_address),
+            abi=UNISWAP_V3_POOL_ABI
+        )
+        return int(pool.functions.slot0().call()[0])
+    
     def get_token_price(self, token_in_address, token_out_address):
         """
         Get the price of token_in in terms of token_out.
@@ -237,21 +422,14 @@ class FutarchyBot(BaseBot):
                     return self.get_gno_sdai_price()
                 return 0
                 
-            # Get the pool contract
-            pool = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(pool_address),
-                abi=UNISWAP_V3_POOL_ABI
-            )
-            
-            # Get current price from slot0
-            slot0 = pool.functions.slot0().call()
-            sqrt_price_x96 = int(slot0[0])
+            # Get current price from the tracked pool state or slot0
+            sqrt_price_x96 = self.get_pool_sqrt_price(pool_address)
             
             # Calculate raw price from sqrtPriceX96
-            raw_price = (sqrt_price_x96 ** 2) / (2 ** 192)
+            raw_price = sqrt_price_x96_to_price(sqrt_price_x96)
             
-            # Get token order to determine if we need to invert
-            token0 = pool.functions.token0().call().lower()
+            # Get token order to determine if we need to invert (cached on disk)
+            token0 = self.metadata.token0(pool_address)
             token_in_lower = token_in_address.lower()
             
             # Determine token order and calculate price
@@ -280,22 +458,15 @@ class FutarchyBot(BaseBot):
             float: Raw price ratio of sDAI per sDAI-YES
         """
         try:
-            # Get the pool contract
+            # Get current price from the tracked pool state or slot0
             pool_address = CONTRACT_ADDRESSES["sdaiYesPool"]
-            pool = self.w3.eth.contract(
-                address=self.w3.to_checksum_address(pool_address),
-                abi=UNISWAP_V3_POOL_ABI
-            )
-            
-            # Get current price from slot0
-            slot0 = pool.functions.slot0().call()
-            sqrt_price_x96 = int(slot0[0])
+            sqrt_price_x96 = self.get_pool_sqrt_price(pool_address)
             
             # Calculate raw price from sqrtPriceX96
-            raw_price = (sqrt_price_x96 ** 2) / (2 ** 192)
+            raw_price = sqrt_price_x96_to_price(sqrt_price_x96)
             
-            # Get token order to determine if we need to invert
-            token0 = pool.functions.token0().call().lower()
+            # Get token order to determine if we need to invert (cached on disk)
+            token0 = self.metadata.token0(pool_address)
             sdai_yes_address = TOKEN_CONFIG["currency"]["yes_address"].lower()
             sdai_address = TOKEN_CONFIG["currency"]["address"].lower()
             
@@ -329,8 +500,6 @@ class FutarchyBot(BaseBot):
             float: waGNO price in sDAI, or a default value if estimation fails
         """
         try:
-            from config.constants import CONTRACT_ADDRESSES, BALANCER_CONFIG, BALANCER_BATCH_ROUTER_ABI
-            
             # Get the Balancer batch router contract
             batch_router_address = self.w3.to_checksum_address(CONTRACT_ADDRESSES["batchRouter"])
             batch_router = self.w3.eth.contract(
@@ -488,10 +657,54 @@ class FutarchyBot(BaseBot):
             # Default to 1:1 if there's an error
             return 1.0
 
-    def get_market_prices(self):
+    @track_operation()
+    def get_market_snapshot(self, block_identifier=None):
+        """
+        Read all market price inputs in one batched call at a single block.
+        
+        Args:
+            block_identifier: Block number or tag to read at (defaults to latest)
+            
+        Returns:
+            MarketSnapshot: Snapshot of pool, Balancer and rate provider state, or None if the batch failed
+        """
+        try:
+            snapshot = MarketSnapshot.fetch(self, block_identifier)
+        except Exception as e:
+            print(f"⚠️ Batched market read failed: {e}")
+            return None
+        
+        self.last_market_snapshot = snapshot
+        return snapshot
+    
+    @track_operation()
+    def get_market_prices(self, snapshot=None):
         """
         Get market prices and probabilities.
         
+        Args:
+            snapshot: MarketSnapshot to derive prices from (fetched if None)
+            
+        Returns:
+            dict: Market prices and probabilities
+        """
+        if snapshot is None:
+            snapshot = self.get_market_snapshot()
+        if snapshot is None:
+            print("⚠️ Falling back to individual price calls")
+            return self._get_market_prices_sequential()
+        
+        # Only hit the vault fallback if the batched Balancer query failed
+        wagno_price = snapshot.wagno_price()
+        if wagno_price is None:
+            wagno_price = self._get_wagno_sdai_price_from_vault()
+        
+        return snapshot.to_prices(wagno_price=wagno_price)
+    
+    def _get_market_prices_sequential(self):
+        """
+        Get market prices with one RPC call per input (used when Multicall3 is unavailable).
+        
         Returns:
             dict: Market prices and probabilities
         """
@@ -533,20 +746,24 @@ class FutarchyBot(BaseBot):
             "synthetic_price": synthetic_price
         }
     
-    def calculate_synthetic_price(self):
+    def calculate_synthetic_price(self, snapshot=None):
         """
         Calculate the synthetic price of GNO based on YES/NO token prices and probability.
         
         Synthetic price = (YES_price * probability) + (NO_price * (1 - probability))
         
+        Args:
+            snapshot: MarketSnapshot to reuse (fetched if None)
+            
         Returns:
             tuple: (synthetic_price, spot_price)
         """
-        prices = self.get_market_prices()
+        prices = self.get_market_prices(snapshot)
         synthetic_price = prices.get('synthetic_price', 0)
         spot_price = prices.get('gno_price', 0)
         return synthetic_price, spot_price
     
+    @track_operation()
     def get_gno_sdai_price(self):
         """
         Get the GNO/sDAI price from CoW Swap.
@@ -557,7 +774,7 @@ class FutarchyBot(BaseBot):
         try:
             # Try getting price from CoW Swap API directly
             print("Requesting GNO/sDAI price from CoW Swap...")
-            import requests  # Import here to avoid global import issues
+            from futarchy.experimental.utils.http_pool import get_http_pool
             
             sell_token = TOKEN_CONFIG["currency"]["address"]  # sDAI
             buy_token = TOKEN_CONFIG["company"]["address"]    # GNO
@@ -572,7 +789,7 @@ class FutarchyBot(BaseBot):
                 "kind": "sell"
             }
             
-            response = requests.post(quote_url, json=quote_data)
+            response = get_http_pool().post(quote_url, json=quote_data)
             if response.status_code == 200:
                 quote_result = response.json()
                 if "quote" in quote_result:
@@ -590,8 +807,7 @@ class FutarchyBot(BaseBot):
             print("⚠️ Using fallback price estimation from YES pool")
             yes_slot0 = self.yes_pool.functions.slot0().call()
             yes_sqrt_price = int(yes_slot0[0])
-            yes_raw_price = (yes_sqrt_price ** 2) / (2 ** 192)
-            yes_company_price = 1 / yes_raw_price if POOL_CONFIG_YES["tokenCompanySlot"] == 1 else yes_raw_price
+            yes_company_price = sqrt_price_x96_to_price(yes_sqrt_price, invert=POOL_CONFIG_YES["tokenCompanySlot"] == 1)
             
             return yes_company_price
                 
@@ -663,6 +879,7 @@ class FutarchyBot(BaseBot):
                 else:
                     print("Suggestion: Buy synthetic exposure through YES/NO tokens, sell GNO at spot price")
     
+    @track_operation()
     def add_collateral(self, token_type, amount):
         """
         Add collateral by splitting positions.
@@ -717,10 +934,7 @@ class FutarchyBot(BaseBot):
             return False
         
         # Check and display allowance
-        allowance = token_contract.functions.allowance(
-            self.address,
-            CONTRACT_ADDRESSES["futarchyRouter"]
-        ).call()
+        allowance = self.get_allowance(token_contract.address, CONTRACT_ADDRESSES["futarchyRouter"])
         print(f"{token_name} allowance for Router: {self.w3.from_wei(allowance, 'ether')} {token_name}")
         
         # Approve router to spend tokens
@@ -741,7 +955,7 @@ class FutarchyBot(BaseBot):
                 amount_wei
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.get_nonce(),
                 'gas': 500000,  # Higher gas limit for complex operation
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -758,17 +972,15 @@ class FutarchyBot(BaseBot):
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
             
             if receipt['status'] == 1:
-                # Check new balances
-                yes_token = self.get_token_contract(yes_token_address)
-                no_token = self.get_token_contract(no_token_address)
-                
-                yes_balance = yes_token.functions.balanceOf(self.address).call()
-                no_balance = no_token.functions.balanceOf(self.address).call()
+                # Read the minted amounts from the receipt instead of re-reading balances
+                token_deltas = decode_receipt(receipt, self.address)['token_deltas']
+                yes_received = token_deltas.get(yes_token_address.lower(), 0)
+                no_received = token_deltas.get(no_token_address.lower(), 0)
                 
                 print(f"\n✅ Successfully split {token_name} into conditional tokens!")
-                print(f"New balances:")
-                print(f"{token_name} YES: {self.w3.from_wei(yes_balance, 'ether')}")
-                print(f"{token_name} NO: {self.w3.from_wei(no_balance, 'ether')}")
+                print(f"Received:")
+                print(f"{token_name} YES: {self.w3.from_wei(yes_received, 'ether')}")
+                print(f"{token_name} NO: {self.w3.from_wei(no_received, 'ether')}")
                 return True
             else:
                 print(f"❌ Split transaction failed!")
@@ -781,6 +993,7 @@ class FutarchyBot(BaseBot):
             traceback.print_exc()
             return False
     
+    @track_operation()
     def remove_collateral(self, token_type, amount):
         """
         Remove collateral by merging positions.
@@ -842,7 +1055,7 @@ class FutarchyBot(BaseBot):
                 amount_wei
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.get_nonce(),
                 'gas': 500000,  # Higher gas limit for complex operation
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -868,6 +1081,7 @@ class FutarchyBot(BaseBot):
             print(f"❌ Error removing collateral: {e}")
             return False
     
+    @track_operation()
     def execute_swap(self, token_in, token_out, amount, slippage_percentage=0.5):
         """
         Execute a swap between tokens.
@@ -895,12 +1109,7 @@ class FutarchyBot(BaseBot):
             return self.execute_balancer_swap(token_in, token_out, amount, slippage_percentage)
         
         # Determine if this is a zero_for_one swap
-        pool_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(pool_address),
-            abi=UNISWAP_V3_POOL_ABI
-        )
-        
-        token0 = pool_contract.functions.token0().call()
+        token0 = self.metadata.token0(pool_address)
         zero_for_one = token_in.lower() == token0.lower()
         
         # Execute swap using SushiSwap
@@ -1061,6 +1270,7 @@ class FutarchyBot(BaseBot):
         # Add liquidity
         return self.add_liquidity_v3(pool_address, token0_amount, token1_amount, price_range_percentage, slippage_percentage)
     
+    @track_operation()
     def swap_sdai_to_gno_via_cowswap(self, amount, min_buy_amount=None):
         """
         Swap sDAI for GNO using CoW Swap.
@@ -1173,6 +1383,7 @@ class FutarchyBot(BaseBot):
             traceback.print_exc()
             return None
     
+    @track_operation()
     def swap_gno_to_sdai_via_cowswap(self, amount, min_buy_amount=None):
         """
         Swap GNO for sDAI using CoW Swap.
@@ -0,0 +1,371 @@
+"""
+Historical log indexer for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Backfills the Transfer logs of the conditional tokens, the Swap logs of the
+conditional pools and the ConditionalTokens split/merge logs of the Futarchy
+router into a local SQLite database, so PnL and strategy research can query
+weeks of history without touching the RPC. Block ranges are fetched with
+eth_getLogs by several workers at once; the chunk size adapts, halving when
+a node rejects a range as too large and growing while chunks come back
+small. Rate limits and timeouts are retried with exponential backoff instead
+of splitting the range. Logs are decoded with the precompiled utils/event_decoder tables.
+Indexing resumes from the last fully indexed block.
+"""
+
+import os
+import random
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from futarchy.experimental.config.constants import CONTRACT_ADDRESSES
+from futarchy.experimental.core.transaction import MERGE_TOPIC, SPLIT_TOPIC, SWAP_TOPIC, TRANSFER_TOPIC
+from futarchy.experimental.utils.event_decoder import EventDecoder
+from futarchy.experimental.utils.helpers import to_hex
+
+# Override with the FUTARCHY_LOG_DB environment variable
+DEFAULT_DB_PATH = os.path.join(os.path.expanduser("~"), ".futarchy", "logs.sqlite")
+
+# Blocks left unindexed at the head so reorgs never reach the store
+CONFIRMATIONS = 12
+
+# Default backfill depth for an empty store (about four weeks of 5 second blocks)
+DEFAULT_LOOKBACK_BLOCKS = 4 * 7 * 24 * 720
+
+# Messages of nodes refusing a block range, or a result set, as too large
+RANGE_ERRORS = (
+    "block range", "range too large", "range is too large", "range too wide", "range is too wide",
+    "exceed maximum block range", "too many blocks", "query returned more than", "more than 10000 results",
+    "too many logs", "log response size", "response size exceeded", "response size is too large",
+)
+
+# Messages of rate limits and transient failures, retried with backoff
+TRANSIENT_ERRORS = (
+    "rate limit", "too many requests", "429", "timeout", "timed out", "temporarily unavailable",
+    "try again", "busy", "capacity", "503", "502",
+)
+
+# Seconds of the first retry delay and the largest one
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    block_number INTEGER NOT NULL, log_index INTEGER NOT NULL, tx_hash TEXT NOT NULL,
+    token TEXT NOT NULL, sender TEXT NOT NULL, recipient TEXT NOT NULL,
+    value TEXT NOT NULL, value_decimal REAL NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS transfers_sender ON transfers (sender, block_number);
+CREATE INDEX IF NOT EXISTS transfers_recipient ON transfers (recipient, block_number);
+CREATE INDEX IF NOT EXISTS transfers_token ON transfers (token, block_number);
+
+CREATE TABLE IF NOT EXISTS swaps (
+    block_number INTEGER NOT NULL, log_index INTEGER NOT NULL, tx_hash TEXT NOT NULL,
+    pool TEXT NOT NULL, sender TEXT NOT NULL, recipient TEXT NOT NULL,
+    amount0 TEXT NOT NULL, amount1 TEXT NOT NULL, amount0_decimal REAL NOT NULL, amount1_decimal REAL NOT NULL,
+    sqrt_price_x96 TEXT NOT NULL, liquidity TEXT NOT NULL, tick INTEGER NOT NULL, price REAL NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS swaps_pool ON swaps (pool, block_number);
+CREATE INDEX IF NOT EXISTS swaps_recipient ON swaps (recipient, block_number);
+
+CREATE TABLE IF NOT EXISTS splits (
+    block_number INTEGER NOT NULL, log_index INTEGER NOT NULL, tx_hash TEXT NOT NULL,
+    kind TEXT NOT NULL, stakeholder TEXT NOT NULL, collateral_token TEXT NOT NULL,
+    condition_id TEXT NOT NULL, amount TEXT NOT NULL, amount_decimal REAL NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS splits_collateral ON splits (collateral_token, block_number);
+
+CREATE TABLE IF NOT EXISTS progress (
+    name TEXT PRIMARY KEY, block_number INTEGER NOT NULL
+);
+"""
+
+
+def _address_topic(address: str) -> str:
+    """Left-pad an address into an indexed topic."""
+    return "0x" + "0" * 24 + address.lower()[2:]
+
+
+def default_sources() -> List[Dict[str, Any]]:
+    """
+    eth_getLogs filters for the market's contracts.
+
+    Returns:
+        list: Filters (address, topics) fetched for every block range
+    """
+    tokens = [
+        CONTRACT_ADDRESSES[name]
+        for name in ("currencyYesToken", "currencyNoToken", "companyYesToken", "companyNoToken")
+    ]
+    pools = [CONTRACT_ADDRESSES[name] for name in ("poolYes", "poolNo", "sdaiYesPool")]
+    return [
+        {"address": tokens + pools, "topics": [[TRANSFER_TOPIC, SWAP_TOPIC]]},
+        # ConditionalTokens is shared by every market: only the router's splits and merges
+        {
+            "address": [CONTRACT_ADDRESSES["conditionalTokens"]],
+            "topics": [[SPLIT_TOPIC, MERGE_TOPIC], _address_topic(CONTRACT_ADDRESSES["futarchyRouter"])],
+        },
+    ]
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an RPC error is a rate limit or timeout worth retrying as is."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in TRANSIENT_ERRORS)
+
+
+def is_range_error(error: Exception) -> bool:
+    """Whether an eth_getLogs error means the block range should be split."""
+    if is_transient_error(error):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in RANGE_ERRORS)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt (0-based): exponential with jitter."""
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+class LogIndexer:
+    """Concurrent, adaptive eth_getLogs backfill into SQLite"""
+
+    def __init__(self, w3, db_path: Optional[str] = None, sources: Optional[List[Dict[str, Any]]] = None,
+                 chunk_size: int = 2000, min_chunk_size: int = 10, max_chunk_size: int = 50000,
+                 target_logs: int = 2000, workers: int = 4, retries: int = 5):
+        """
+        Initialize the indexer and create the store if needed.
+
+        Args:
+            w3: Web3 instance
+            db_path: SQLite file (defaults to FUTARCHY_LOG_DB or ~/.futarchy/logs.sqlite; ":memory:" for tests)
+            sources: eth_getLogs filters without block range (defaults to default_sources())
+            chunk_size: Initial blocks per eth_getLogs request
+            min_chunk_size: Smallest range to split down to
+            max_chunk_size: Largest range to grow up to
+            target_logs: Chunks returning fewer logs than half of this grow the chunk size
+            workers: Concurrent eth_getLogs requests
+            retries: Attempts for rate limits, timeouts and other errors that are not about the range size
+        """
+        self.w3 = w3
+        self.db_path = db_path or os.environ.get("FUTARCHY_LOG_DB", DEFAULT_DB_PATH)
+        self.sources = sources if sources is not None else default_sources()
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.target_logs = target_logs
+        self.workers = workers
+        self.retries = retries
+        self.decoder = EventDecoder()
+        # Growth stops at half the smallest range a node has rejected
+        self.chunk_ceiling = max_chunk_size
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.executescript(SCHEMA)
+
+        self.requests = 0
+        self.splits = 0
+        self.logs_indexed = 0
+
+    # -------------------------------------------------------------- progress
+
+    def indexed_to(self) -> Optional[int]:
+        """Last block up to which every block is indexed, or None for an empty store."""
+        row = self.db.execute("SELECT block_number FROM progress WHERE name = 'backfill'").fetchone()
+        return row[0] if row else None
+
+    def _set_indexed_to(self, block_number: int):
+        self.db.execute(
+            "INSERT INTO progress (name, block_number) VALUES ('backfill', ?) "
+            "ON CONFLICT(name) DO UPDATE SET block_number = excluded.block_number",
+            (block_number,)
+        )
+
+    # -------------------------------------------------------------- fetching
+
+    def _fetch(self, start: int, end: int) -> List[Any]:
+        """Fetch every source's logs in [start, end] (runs on a worker thread)."""
+        logs = []
+        for source in self.sources:
+            query = dict(source, fromBlock=start, toBlock=end)
+            for attempt in range(self.retries):
+                try:
+                    self.requests += 1
+                    logs.extend(self.w3.eth.get_logs(query))
+                    break
+                except Exception as e:
+                    if is_range_error(e) or attempt == self.retries - 1:
+                        raise
+                    time.sleep(backoff_delay(attempt))
+        return logs
+
+    def backfill(self, from_block: Optional[int] = None, to_block: Optional[int] = None,
+                 progress: bool = True) -> Dict[str, Any]:
+        """
+        Index every block in a range.
+
+        Args:
+            from_block: First block (defaults to the block after the last indexed one,
+                or DEFAULT_LOOKBACK_BLOCKS before the head for an empty store)
+            to_block: Last block (defaults to the head minus CONFIRMATIONS)
+            progress: Print progress as ranges complete
+
+        Returns:
+            dict: from_block, to_block, logs indexed, requests, range splits and seconds taken
+        """
+        started = time.perf_counter()
+        if to_block is None:
+            to_block = self.w3.eth.block_number - CONFIRMATIONS
+        if from_block is None:
+            indexed_to = self.indexed_to()
+            from_block = indexed_to + 1 if indexed_to is not None else max(0, to_block - DEFAULT_LOOKBACK_BLOCKS)
+        logs_before, requests_before, splits_before = self.logs_indexed, self.requests, self.splits
+
+        cursor = from_block
+        retry: List[Tuple[int, int]] = []
+        completed: Dict[int, int] = {}
+        # Contiguous progress is only recorded for a backfill continuing the stored one
+        watermark = from_block - 1 if self.indexed_to() in (None, from_block - 1) else None
+        pending = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while cursor <= to_block or retry or pending:
+                while len(pending) < self.workers and (retry or cursor <= to_block):
+                    if retry:
+                        start, end = retry.pop()
+                    else:
+                        start, end = cursor, min(to_block, cursor + self.chunk_size - 1)
+                        cursor = end + 1
+                    pending[executor.submit(self._fetch, start, end)] = (start, end)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = pending.pop(future)
+                    try:
+                        logs = future.result()
+                    except Exception as e:
+                        if not is_range_error(e) or end - start + 1 <= self.min_chunk_size:
+                            raise
+                        # Split the range and shrink the chunks still to be scheduled
+                        middle = (start + end) // 2
+                        retry.extend([(middle + 1, end), (start, middle)])
+                        self.chunk_ceiling = max(self.min_chunk_size, min(self.chunk_ceiling, (end - start + 1) // 2))
+                        self.chunk_size = min(self.chunk_size, self.chunk_ceiling)
+                        self.splits += 1
+                        continue
+
+                    if len(logs) < self.target_logs // 2:
+                        self.chunk_size = min(self.chunk_ceiling, self.chunk_size * 2)
+                    self.store(logs)
+                    completed[start] = end
+                    if watermark is not None:
+                        while watermark + 1 in completed:
+                            watermark = completed.pop(watermark + 1)
+                        self._set_indexed_to(watermark)
+                    self.db.commit()
+                    if progress:
+                        print(f"📚 Indexed blocks {start}-{end}: {len(logs)} logs (next chunk {self.chunk_size} blocks)")
+
+        return {
+            "from_block": from_block,
+            "to_block": to_block,
+            "logs": self.logs_indexed - logs_before,
+            "requests": self.requests - requests_before,
+            "splits": self.splits - splits_before,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+
+    # --------------------------------------------------------------- storing
+
+    def store(self, logs: List[Any]):
+        """
+        Decode logs and insert them (already indexed logs are replaced).
+
+        Args:
+            logs: Raw logs from eth_getLogs
+        """
+        transfers, swaps, splits = [], [], []
+        for record in self.decoder.decode_many(logs):
+            key = (record.block_number, record.log_index, to_hex(record.transaction_hash))
+            event = record.event
+            if event == "Transfer":
+                transfers.append(key + (
+                    record.address, record.from_, record.to, str(record.value), record.value / 10**18,
+                ))
+            elif event == "Swap":
+                swaps.append(key + (
+                    record.address, record.sender, record.recipient, str(record.amount0), str(record.amount1),
+                    record.amount0 / 10**18, record.amount1 / 10**18, str(record.sqrtPriceX96),
+                    str(record.liquidity), record.tick, record.sqrtPriceX96 ** 2 / 2**192,
+                ))
+            elif event in ("PositionSplit", "PositionsMerge"):
+                splits.append(key + (
+                    "split" if event == "PositionSplit" else "merge", record.stakeholder, record.collateralToken,
+                    "0x" + record.conditionId.hex(), str(record.amount), record.amount / 10**18,
+                ))
+
+        self.db.executemany("INSERT OR REPLACE INTO transfers VALUES (?, ?, ?, ?, ?, ?, ?, ?)", transfers)
+        self.db.executemany("INSERT OR REPLACE INTO swaps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", swaps)
+        self.db.executemany("INSERT OR REPLACE INTO splits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", splits)
+        self.logs_indexed += len(transfers) + len(swaps) + len(splits)
+
+    # --------------------------------------------------------------- queries
+
+    def token_flows(self, account: str, from_block: int = 0, to_block: Optional[int] = None) -> Dict[str, int]:
+        """
+        Net amount of each indexed token received by an account.
+
+        Args:
+            account: Account address
+            from_block: First block
+            to_block: Last block (defaults to everything indexed)
+
+        Returns:
+            dict: Lowercase token address -> wei received minus wei sent
+        """
+        account = account.lower()
+        to_block = to_block if to_block is not None else 2**62
+        flows: Dict[str, int] = {}
+        rows = self.db.execute(
+            "SELECT token, sender, recipient, value FROM transfers "
+            "WHERE (sender = ? OR recipient = ?) AND block_number BETWEEN ? AND ?",
+            (account, account, from_block, to_block)
+        )
+        for token, sender, recipient, value in rows:
+            if recipient == account:
+                flows[token] = flows.get(token, 0) + int(value)
+            if sender == account:
+                flows[token] = flows.get(token, 0) - int(value)
+        return flows
+
+    def swaps(self, pool: str, from_block: int = 0, to_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Indexed swaps of a pool in block order.
+
+        Args:
+            pool: Pool address
+            from_block: First block
+            to_block: Last block (defaults to everything indexed)
+
+        Returns:
+            list: One dict per swap (amounts and prices as stored)
+        """
+        cursor = self.db.execute(
+            "SELECT * FROM swaps WHERE pool = ? AND block_number BETWEEN ? AND ? ORDER BY block_number, log_index",
+            (pool.lower(), from_block, to_block if to_block is not None else 2**62)
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
@@ -0,0 +1,254 @@
+"""
+Market snapshot for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Reads every input of the market price calculation (pool slot0s, Balancer
+query, waGNO conversion rate, sDAI rate) in one Multicall3 batch so that
+all derived prices refer to the same block. Pool token order comes from the
+metadata cache.
+"""
+
+from typing import Optional, Dict, Any
+
+from futarchy.experimental.config.constants import (
+    TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, CONTRACT_ADDRESSES, BALANCER_CONFIG,
+    UNISWAP_V3_POOL_ABI, BALANCER_BATCH_ROUTER_ABI, SDAI_RATE_PROVIDER_ABI, WAGNO_ABI
+)
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
+
+ONE_TOKEN = 10**18  # All tokens involved use 18 decimals
+
+
+class MarketSnapshot:
+    """Raw market state read at a single block, with the derived prices"""
+
+    def __init__(self, block_number: Optional[int], pools: Dict[str, Dict[str, Any]],
+                 wagno_sdai_out: Optional[int], wagno_gno_assets: Optional[int],
+                 sdai_rate: Optional[int]):
+        """
+        Initialize the snapshot from raw on-chain values.
+
+        Args:
+            block_number: Block the values were read at
+            pools: Pool name ("yes", "no", "sdai_yes") -> {"sqrt_price_x96", "tick", "token0"}
+            wagno_sdai_out: sDAI wei returned by the Balancer query for 1 waGNO (None if it failed)
+            wagno_gno_assets: GNO wei returned by waGNO convertToAssets(1e18) (None if it failed)
+            sdai_rate: sDAI rate provider getRate() value (None if it failed)
+        """
+        self.block_number = block_number
+        self.pools = pools
+        self.wagno_sdai_out = wagno_sdai_out
+        self.wagno_gno_assets = wagno_gno_assets
+        self.sdai_rate = sdai_rate
+
+    @staticmethod
+    def build_calls(bot):
+        """
+        Build the contract calls read by a snapshot.
+
+        Args:
+            bot: FutarchyBot instance (provides w3, multicall and address)
+
+        Returns:
+            tuple: (pool name -> address, bound contract functions in batch order)
+        """
+        w3 = bot.w3
+        pool_addresses = {
+            "yes": POOL_CONFIG_YES["address"],
+            "no": POOL_CONFIG_NO["address"],
+            "sdai_yes": CONTRACT_ADDRESSES["sdaiYesPool"],
+        }
+        pool_contracts = {
+            name: w3.eth.contract(address=w3.to_checksum_address(address), abi=UNISWAP_V3_POOL_ABI)
+            for name, address in pool_addresses.items()
+        }
+
+        batch_router = w3.eth.contract(
+            address=w3.to_checksum_address(CONTRACT_ADDRESSES["batchRouter"]),
+            abi=BALANCER_BATCH_ROUTER_ABI
+        )
+        wagno = w3.eth.contract(
+            address=w3.to_checksum_address(TOKEN_CONFIG["wagno"]["address"]),
+            abi=WAGNO_ABI
+        )
+        rate_provider = w3.eth.contract(
+            address=w3.to_checksum_address(CONTRACT_ADDRESSES["sdaiRateProvider"]),
+            abi=SDAI_RATE_PROVIDER_ABI
+        )
+
+        # Query selling 1 waGNO for sDAI on Balancer
+        # (tokenIn, [(pool, tokenOut, isBuffer)], exactAmountIn, minAmountOut)
+        swap_path = (
+            w3.to_checksum_address(TOKEN_CONFIG["wagno"]["address"]),
+            [(
+                w3.to_checksum_address(BALANCER_CONFIG["pool_address"]),
+                w3.to_checksum_address(TOKEN_CONFIG["currency"]["address"]),
+                False
+            )],
+            ONE_TOKEN,
+            0  # For query only
+        )
+        sender = bot.address or bot.multicall.address
+
+        functions = [pool_contracts[name].functions.slot0() for name in pool_addresses]
+        functions.append(batch_router.functions.querySwapExactIn([swap_path], sender, b''))
+        functions.append(wagno.functions.convertToAssets(ONE_TOKEN))
+        functions.append(rate_provider.functions.getRate())
+        return pool_addresses, functions
+
+    @classmethod
+    def from_results(cls, bot, pool_addresses, block_number, results):
+        """
+        Build a snapshot from the decoded results of the build_calls batch.
+
+        Args:
+            bot: FutarchyBot instance (provides the metadata cache)
+            pool_addresses: Pool name -> address, as returned by build_calls
+            block_number: Block the batch was read at
+            results: Decoded results in batch order (None for failed calls)
+
+        Returns:
+            MarketSnapshot: Snapshot of the market at that block
+        """
+        pools = {}
+        for name, slot0 in zip(pool_addresses, results):
+            pools[name] = {
+                "sqrt_price_x96": int(slot0[0]) if slot0 is not None else None,
+                "tick": int(slot0[1]) if slot0 is not None else None,
+                # Token order never changes, so it comes from the metadata cache
+                "token0": bot.metadata.token0(pool_addresses[name]),
+            }
+
+        query_result, wagno_assets, sdai_rate = results[-3:]
+        wagno_sdai_out = int(query_result[0][0]) if query_result is not None else None
+
+        return cls(block_number, pools, wagno_sdai_out, wagno_assets, sdai_rate)
+
+    @classmethod
+    def fetch(cls, bot, block_identifier=None):
+        """
+        Read all market inputs in one batched eth_call.
+
+        Args:
+            bot: FutarchyBot instance (provides w3, multicall, metadata and address)
+            block_identifier: Block number or tag to read at (defaults to latest)
+
+        Returns:
+            MarketSnapshot: Snapshot of the market at the pinned block
+        """
+        pool_addresses, functions = cls.build_calls(bot)
+        block_number, results = bot.multicall.call_functions(
+            functions, block_identifier=block_identifier or "latest"
+        )
+        return cls.from_results(bot, pool_addresses, block_number, results)
+
+    @classmethod
+    async def fetch_async(cls, bot, async_multicall, block_identifier=None):
+        """
+        Async counterpart of fetch.
+
+        Args:
+            bot: FutarchyBot instance (provides w3, metadata and address)
+            async_multicall: AsyncMulticall the batch is sent through
+            block_identifier: Block number or tag to read at (defaults to latest)
+
+        Returns:
+            MarketSnapshot: Snapshot of the market at the pinned block
+        """
+        pool_addresses, functions = cls.build_calls(bot)
+        block_number, results = await async_multicall.call_functions(functions, block_identifier or "latest")
+        return cls.from_results(bot, pool_addresses, block_number, results)
+
+    def price_of(self, pool_name: str, token_address: str) -> float:
+        """
+        Get the price of a token in terms of the other token of a pool.
+
+        Args:
+            pool_name: "yes", "no" or "sdai_yes"
+            token_address: Address of the token being priced
+
+        Returns:
+            float: Price, or 0 if the pool state is unavailable
+        """
+        pool = self.pools.get(pool_name, {})
+        sqrt_price_x96 = pool.get("sqrt_price_x96")
+        if not sqrt_price_x96 or pool.get("token0") is None:
+            return 0
+
+        # sqrtPriceX96 encodes token1 per token0
+        return sqrt_price_x96_to_price(sqrt_price_x96, invert=pool["token0"] != token_address.lower())
+
+    @property
+    def yes_price(self) -> float:
+        """GNO-YES price in sDAI-YES"""
+        return self.price_of("yes", TOKEN_CONFIG["company"]["yes_address"])
+
+    @property
+    def no_price(self) -> float:
+        """GNO-NO price in sDAI-NO"""
+        return self.price_of("no", TOKEN_CONFIG["company"]["no_address"])
+
+    @property
+    def raw_probability(self) -> Optional[float]:
+        """sDAI received per sDAI-YES sold (may exceed 1.0), None if unavailable"""
+        ratio = self.price_of("sdai_yes", TOKEN_CONFIG["currency"]["yes_address"])
+        return ratio if ratio else None
+
+    @property
+    def wagno_gno_ratio(self) -> float:
+        """Conversion ratio (1 GNO = X waGNO), 1.0 if unavailable"""
+        if not self.wagno_gno_assets:
+            return 1.0
+        return ONE_TOKEN / self.wagno_gno_assets
+
+    def wagno_price(self) -> Optional[float]:
+        """waGNO price in sDAI from the Balancer query, None if the query failed"""
+        if self.wagno_sdai_out is None:
+            return None
+        if self.wagno_sdai_out <= 0:
+            return 100.0  # Same default as FutarchyBot.get_wagno_sdai_price
+        return self.wagno_sdai_out / ONE_TOKEN
+
+    def to_prices(self, wagno_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Derive the market price dict used throughout the bot.
+
+        Args:
+            wagno_price: Override for the waGNO price (used when the Balancer query failed)
+
+        Returns:
+            dict: Same keys as FutarchyBot.get_market_prices plus block_number and sdai_rate
+        """
+        sdai_yes_ratio = self.raw_probability
+
+        # The probability is capped at 100% for display, but we keep the actual ratio
+        probability = min(1.0, sdai_yes_ratio) if sdai_yes_ratio is not None else 0.5
+        raw_probability = sdai_yes_ratio if sdai_yes_ratio is not None else 0.5
+
+        yes_price = self.yes_price
+        no_price = self.no_price
+
+        if wagno_price is None:
+            wagno_price = self.wagno_price()
+        if wagno_price is None:
+            wagno_price = 100.0
+        wagno_gno_ratio = self.wagno_gno_ratio
+
+        # Spot GNO price, calculated as waGNO price / waGNO to GNO ratio
+        gno_price = wagno_price / wagno_gno_ratio if wagno_gno_ratio != 0 else 0
+
+        # Synthetic price uses the capped probability
+        synthetic_price = (yes_price * probability) + (no_price * (1 - probability))
+
+        return {
+            "yes_price": yes_price,
+            "no_price": no_price,
+            "gno_price": gno_price,
+            "wagno_price": wagno_price,
+            "wagno_gno_ratio": wagno_gno_ratio,
+            "probability": probability,
+            "raw_probability": raw_probability,
+            "synthetic_price": synthetic_price,
+            "sdai_rate": self.sdai_rate / ONE_TOKEN if self.sdai_rate else None,
+            "block_number": self.block_number
+        }
@@ -0,0 +1,235 @@
+"""
+Pipelined transaction executor for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Runs a multi-transaction plan modelled as a DAG of steps. Steps only wait
+for a receipt when they need an amount produced by an earlier step; every
+other dependency is expressed through nonce order. Each wave of ready steps
+is built, signed with consecutive nonces and broadcast together, so a plan
+takes as many blocks as its longest chain of data dependencies. Amounts are
+passed between waves from receipts (see core.transaction.decode_receipt).
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from futarchy.experimental.utils.web3_utils import get_raw_transaction
+
+
+class PipelineStep:
+    """One transaction of a plan"""
+
+    def __init__(self, name: str, build: Callable[[Dict[str, Dict[str, Any]]], Any],
+                 needs: Iterable[str] = (), after: Iterable[str] = (), gas: int = 500000,
+                 outputs: Optional[Callable[[Any, Dict[str, Dict[str, Any]]], Dict[str, Any]]] = None,
+                 required: bool = True):
+        """
+        Initialize a step.
+
+        Args:
+            name: Unique step name
+            build: Function of the outputs of earlier steps returning a contract function
+                call, a transaction dict ("to", "data", optional "value"), or None to skip the step
+            needs: Steps whose outputs the builder reads; they must be mined first
+            after: Steps that only have to be ordered before this one (same wave, lower nonce)
+            gas: Gas limit of the transaction
+            outputs: Function of (receipt, outputs of earlier steps) returning this step's outputs
+            required: If False a reverted transaction does not stop the plan
+        """
+        self.name = name
+        self.build = build
+        self.needs = tuple(needs)
+        self.after = tuple(after)
+        self.gas = gas
+        self.outputs = outputs
+        self.required = required
+
+
+class TransactionPipeline:
+    """Executes a DAG of transaction steps in as few blocks as possible"""
+
+    def __init__(self, w3, account, nonce_manager=None, receipt_timeout: int = 120, poll_latency: float = 0.5):
+        """
+        Initialize the pipeline.
+
+        Args:
+            w3: Web3 instance
+            account: LocalAccount signing every transaction
+            nonce_manager: NonceManager used to reserve consecutive nonces
+                (defaults to w3.nonce_manager)
+            receipt_timeout: Seconds to wait for each receipt
+            poll_latency: Seconds between receipt polls
+        """
+        self.w3 = w3
+        self.account = account
+        self.nonces = nonce_manager if nonce_manager is not None else getattr(w3, "nonce_manager", None)
+        self.receipt_timeout = receipt_timeout
+        self.poll_latency = poll_latency
+        self.steps: Dict[str, PipelineStep] = {}
+
+    def add(self, name: str, build, **kwargs) -> PipelineStep:
+        """
+        Add a step to the plan (see PipelineStep for the arguments).
+
+        Returns:
+            PipelineStep: The added step
+        """
+        if name in self.steps:
+            raise ValueError(f"Duplicate pipeline step: {name}")
+        for dependency in tuple(kwargs.get("needs", ())) + tuple(kwargs.get("after", ())):
+            if dependency not in self.steps:
+                raise ValueError(f"Step {name} depends on unknown step {dependency}")
+        step = PipelineStep(name, build, **kwargs)
+        self.steps[name] = step
+        return step
+
+    def waves(self) -> List[List[str]]:
+        """
+        Group steps into broadcast waves.
+
+        A step joins the wave after its latest data dependency, and the same
+        wave as its ordering-only dependencies. Steps are added in dependency
+        order, so insertion order is a valid nonce order within each wave.
+
+        Returns:
+            list: Step names per wave, in nonce order
+        """
+        wave_of: Dict[str, int] = {}
+        for name, step in self.steps.items():
+            wave_of[name] = max(
+                [wave_of[dependency] + 1 for dependency in step.needs] +
+                [wave_of[dependency] for dependency in step.after] + [0]
+            )
+        waves: List[List[str]] = [[] for _ in range(max(wave_of.values(), default=-1) + 1)]
+        for name, wave in wave_of.items():
+            waves[wave].append(name)
+        return waves
+
+    def _transaction(self, built, nonce: int, gas: int, gas_price: int, chain_id: int) -> Dict[str, Any]:
+        """Turn a builder result into a complete transaction dict."""
+        params = {
+            "from": self.account.address,
+            "nonce": nonce,
+            "gas": gas,
+            "gasPrice": gas_price,
+            "chainId": chain_id,
+        }
+        if isinstance(built, dict):
+            tx = dict(params, value=0)
+            tx.update(built)
+            return tx
+        return built.build_transaction(params)
+
+    def _wait(self, tx_hash):
+        """Wait for a receipt, returning None on timeout."""
+        try:
+            return self.w3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=self.receipt_timeout, poll_latency=self.poll_latency
+            )
+        except Exception as e:
+            print(f"❌ No receipt for {tx_hash.hex()}: {e}")
+            return None
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute the plan.
+
+        Returns:
+            dict: success flag, failed step (if any), per-step results (tx hash,
+            status, block, gas used, outputs), blocks used and elapsed seconds
+        """
+        start = time.perf_counter()
+        address = self.account.address
+        gas_price = self.w3.eth.gas_price
+        chain_id = self.w3.eth.chain_id
+        outputs: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Dict[str, Any]] = {}
+        blocks = set()
+
+        def finish(success: bool, failed_step: Optional[str] = None) -> Dict[str, Any]:
+            elapsed = time.perf_counter() - start
+            print(f"{'✅' if success else '❌'} Pipeline finished in {elapsed:.1f}s over {len(blocks)} block(s)")
+            return {
+                "success": success,
+                "failed_step": failed_step,
+                "steps": results,
+                "outputs": outputs,
+                "blocks": sorted(blocks),
+                "elapsed": elapsed,
+            }
+
+        for index, wave in enumerate(self.waves()):
+            # Build everything first so a failing builder sends nothing from this wave
+            built = []
+            for name in wave:
+                step = self.steps[name]
+                try:
+                    call = step.build(outputs)
+                except Exception as e:
+                    print(f"❌ Could not build step {name}: {e}")
+                    return finish(False, name)
+                if call is None:
+                    print(f"⏭️ Skipping step {name}")
+                    outputs[name] = {}
+                    results[name] = {"skipped": True}
+                else:
+                    built.append((step, call))
+            if not built:
+                continue
+
+            nonces = self.nonces.allocate(address, len(built)) if self.nonces else [
+                self.w3.eth.get_transaction_count(address, "pending") + offset for offset in range(len(built))
+            ]
+            signed = []
+            for (step, call), nonce in zip(built, nonces):
+                try:
+                    tx = self._transaction(call, nonce, step.gas, gas_price, chain_id)
+                    signed.append((step, self.account.sign_transaction(tx)))
+                except Exception as e:
+                    print(f"❌ Could not sign step {step.name}: {e}")
+                    if self.nonces:
+                        self.nonces.resync(address)
+                    return finish(False, step.name)
+
+            print(f"\n🚀 Wave {index + 1}: broadcasting {', '.join(step.name for step, _ in signed)}")
+            sent = []
+            for step, signed_tx in signed:
+                try:
+                    tx_hash = self.w3.eth.send_raw_transaction(get_raw_transaction(signed_tx))
+                except Exception as e:
+                    print(f"❌ Could not send step {step.name}: {e}")
+                    # Later nonces of this wave were never sent; drop them
+                    if self.nonces:
+                        self.nonces.resync(address)
+                    if not sent:
+                        return finish(False, step.name)
+                    break
+                print(f"⏳ {step.name}: {tx_hash.hex()}")
+                sent.append((step, tx_hash))
+
+            failed = None
+            for step, tx_hash in sent:
+                receipt = self._wait(tx_hash)
+                status = receipt["status"] if receipt is not None else None
+                results[step.name] = {
+                    "tx_hash": tx_hash.hex(),
+                    "status": status,
+                    "block_number": receipt["blockNumber"] if receipt is not None else None,
+                    "gas_used": receipt["gasUsed"] if receipt is not None else None,
+                }
+                if receipt is not None:
+                    blocks.add(receipt["blockNumber"])
+                if status == 1:
+                    outputs[step.name] = step.outputs(receipt, outputs) if step.outputs else {}
+                    results[step.name]["outputs"] = outputs[step.name]
+                elif step.required or receipt is None:
+                    print(f"❌ Step {step.name} failed: https://gnosisscan.io/tx/{tx_hash.hex()}")
+                    failed = failed or step.name
+                else:
+                    print(f"⚠️ Optional step {step.name} reverted, continuing")
+                    outputs[step.name] = {}
+
+            if failed is not None or len(sent) < len(signed):
+                return finish(False, failed or signed[len(sent)][0].name)
+
+        return finish(True)
@@ -0,0 +1,323 @@
+"""
+Event-sourced pool state tracker for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Keeps a local copy of a Uniswap V3 pool's swap state (slot0 price and
+tick, active liquidity, tick bitmap and per-tick liquidity) current by
+applying the pool's Swap, Mint and Burn logs block by block, starting
+from one full V3PoolSnapshot. Following a block costs one header and one
+eth_getLogs request instead of reloading the pool. The state is checked
+against on-chain slot0 and liquidity every few blocks, and reloaded on a
+mismatch, a reorg or a gap too large to replay.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from futarchy.experimental.config.constants import UNISWAP_V3_POOL_ABI
+from futarchy.experimental.utils.helpers import to_hex
+from futarchy.experimental.utils.metadata_cache import get_metadata_cache
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.uniswap_v3_simulator import DEFAULT_WORD_RADIUS, V3PoolSnapshot, tick_position
+
+# keccak256 of the UniswapV3Pool event signatures
+SWAP_TOPIC = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
+MINT_TOPIC = "0x7a53080ba414158be7ec69b987b5fb7d07dee101fe85488f0853ae16239d0bde"
+BURN_TOPIC = "0x0c396cd989a39f4459b5fa1aed6a9a8dcdbc45908acfd67e028cd568da98982c"
+
+# Blocks replayed from logs before a full reload is cheaper
+MAX_REPLAY_BLOCKS = 2000
+
+
+def tracked_snapshot(w3, trackers: Dict[str, "PoolStateTracker"], pool_address: str,
+                     refresh: bool = False) -> Optional[V3PoolSnapshot]:
+    """
+    Get a pool's snapshot from a tracker, creating the tracker on first use.
+
+    A refresh replays the pool's Swap, Mint and Burn logs since the last
+    load instead of reloading every tick.
+
+    Args:
+        w3: Web3 instance
+        trackers: Trackers keyed by pool address (updated in place)
+        pool_address: Pool address
+        refresh: Bring the snapshot up to the current block
+
+    Returns:
+        V3PoolSnapshot: Pool snapshot, or None if it could not be loaded
+    """
+    if pool_address not in trackers:
+        trackers[pool_address] = PoolStateTracker(
+            w3, pool_address, multicall=Multicall(w3), metadata=get_metadata_cache(w3)
+        )
+    tracker = trackers[pool_address]
+    try:
+        if refresh or tracker.block_number is None:
+            return tracker.sync()
+        return tracker.snapshot()
+    except Exception as e:
+        print(f"Error loading pool snapshot for {pool_address}: {e}")
+        return None
+
+
+def _words(data) -> List[int]:
+    """Split ABI encoded log data into signed 256-bit words."""
+    raw = bytes.fromhex(to_hex(data)[2:])
+    return [int.from_bytes(raw[i:i + 32], "big", signed=True) for i in range(0, len(raw), 32)]
+
+
+def _topic_int(topic) -> int:
+    """Decode a signed integer from an indexed topic."""
+    return int.from_bytes(bytes.fromhex(to_hex(topic)[2:]), "big", signed=True)
+
+
+class PoolStateTracker:
+    """Local V3 pool state kept current from Swap, Mint and Burn logs"""
+
+    def __init__(self, w3, pool_address: str, multicall=None, metadata=None, verify_every: int = 20,
+                 word_radius: int = DEFAULT_WORD_RADIUS, max_replay_blocks: int = MAX_REPLAY_BLOCKS):
+        """
+        Initialize the tracker (the pool is loaded on the first sync).
+
+        Args:
+            w3: Web3 instance
+            pool_address: V3 pool address
+            multicall: Optional utils.multicall.Multicall instance for full loads and checks
+            metadata: Optional MetadataCache for fee, tick spacing and tokens
+            verify_every: Check the state against slot0/liquidity after this many followed blocks (0 to disable)
+            word_radius: Bitmap words to load on each side of the current tick's word
+            max_replay_blocks: Larger gaps are reloaded instead of replayed
+        """
+        self.w3 = w3
+        self.pool_address = w3.to_checksum_address(pool_address)
+        self.multicall = multicall
+        self.metadata = metadata
+        self.verify_every = verify_every
+        self.word_radius = word_radius
+        self.max_replay_blocks = max_replay_blocks
+
+        self.block_number: Optional[int] = None
+        self.block_hash: Optional[str] = None
+        self.sqrt_price_x96: Optional[int] = None
+        self.tick: Optional[int] = None
+        self.liquidity: Optional[int] = None
+        self.synced_at = 0.0
+        self._base: Optional[V3PoolSnapshot] = None
+        self._snapshot: Optional[V3PoolSnapshot] = None
+        self._blocks_since_check = 0
+        # Reentrant: sync() calls resync() and verify(), which are public too
+        self._lock = threading.RLock()
+
+        self.resyncs = 0
+        self.reorgs = 0
+        self.mismatches = 0
+        self.checks = 0
+        self.events_applied = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get tracker counters.
+
+        Returns:
+            dict: block followed, events applied, checks, mismatches, reorgs and full reloads
+        """
+        return {
+            "block_number": self.block_number,
+            "events_applied": self.events_applied,
+            "checks": self.checks,
+            "mismatches": self.mismatches,
+            "reorgs": self.reorgs,
+            "resyncs": self.resyncs,
+        }
+
+    # ------------------------------------------------------------- loading
+
+    def resync(self, block_identifier: Any = "latest") -> V3PoolSnapshot:
+        """
+        Reload the full pool state.
+
+        Args:
+            block_identifier: Block number or tag to load at
+
+        Returns:
+            V3PoolSnapshot: Freshly loaded state
+        """
+        with self._lock:
+            snapshot = V3PoolSnapshot.load(
+                self.w3, self.pool_address, multicall=self.multicall, metadata=self.metadata,
+                word_radius=self.word_radius, block_identifier=block_identifier
+            )
+            self._base = snapshot
+            self._snapshot = snapshot
+            self.sqrt_price_x96, self.tick, self.liquidity = snapshot.sqrt_price_x96, snapshot.tick, snapshot.liquidity
+            self._ticks = dict(snapshot.ticks)
+            self._gross = dict(snapshot.liquidity_gross or {})
+            self._bitmap = dict(snapshot.bitmap)
+            self.block_number = snapshot.block_number
+            self.block_hash = to_hex(self.w3.eth.get_block(self.block_number)["hash"])
+            self.synced_at = time.monotonic()
+            self._blocks_since_check = 0
+            self.resyncs += 1
+            return snapshot
+
+    def snapshot(self) -> Optional[V3PoolSnapshot]:
+        """
+        Get the current state as an immutable snapshot.
+
+        Returns:
+            V3PoolSnapshot: State at self.block_number (None before the first sync)
+        """
+        with self._lock:
+            if self._snapshot is None and self._base is not None:
+                base = self._base
+                self._snapshot = V3PoolSnapshot(
+                    self.sqrt_price_x96, self.tick, self.liquidity, base.fee, base.tick_spacing,
+                    dict(self._bitmap), dict(self._ticks), token0=base.token0, token1=base.token1,
+                    block_number=self.block_number, pool_address=base.pool_address, liquidity_gross=dict(self._gross)
+                )
+            return self._snapshot
+
+    # ------------------------------------------------------------ following
+
+    def sync(self, block_number: Optional[int] = None, max_age: Optional[float] = None) -> V3PoolSnapshot:
+        """
+        Bring the state up to a block.
+
+        Args:
+            block_number: Block to follow to (defaults to the current head)
+            max_age: Skip the head check if the state was synced less than this many seconds ago
+
+        Returns:
+            V3PoolSnapshot: State at the block
+        """
+        with self._lock:
+            if self._base is None:
+                self.resync(block_number if block_number is not None else "latest")
+                return self.snapshot()
+            if block_number is None:
+                if max_age is not None and time.monotonic() - self.synced_at < max_age:
+                    return self.snapshot()
+                block_number = self.w3.eth.block_number
+            if block_number <= self.block_number:
+                return self.snapshot()
+            if block_number - self.block_number > self.max_replay_blocks:
+                self.resync(block_number)
+                return self.snapshot()
+
+            header = self.w3.eth.get_block(block_number)
+            # A reorg replaced the block our state ends at
+            if block_number == self.block_number + 1:
+                reorged = to_hex(header["parentHash"]) != self.block_hash
+            else:
+                reorged = to_hex(self.w3.eth.get_block(self.block_number)["hash"]) != self.block_hash
+            if reorged:
+                self.reorgs += 1
+                self.resync(block_number)
+                return self.snapshot()
+
+            logs = self.w3.eth.get_logs({
+                "address": self.pool_address,
+                "fromBlock": self.block_number + 1,
+                "toBlock": block_number,
+                "topics": [[SWAP_TOPIC, MINT_TOPIC, BURN_TOPIC]],
+            })
+            head_hash = to_hex(header["hash"])
+            if any(log["blockNumber"] == block_number and to_hex(log["blockHash"]) != head_hash for log in logs):
+                # The head changed between the two requests
+                self.reorgs += 1
+                self.resync(block_number)
+                return self.snapshot()
+
+            self.apply_logs(logs)
+            self.block_number = block_number
+            self.block_hash = head_hash
+            self.synced_at = time.monotonic()
+            self._snapshot = None
+
+            self._blocks_since_check += 1
+            if self.verify_every and self._blocks_since_check >= self.verify_every:
+                self.verify()
+            return self.snapshot()
+
+    def apply_logs(self, logs: List[Dict[str, Any]]):
+        """
+        Apply Swap, Mint and Burn logs to the state, in chain order.
+
+        Args:
+            logs: Raw logs of this pool
+        """
+        with self._lock:
+            for log in sorted(logs, key=lambda log: (log["blockNumber"], log["logIndex"])):
+                topic = to_hex(log["topics"][0])
+                if topic == SWAP_TOPIC:
+                    # Swap(sender, recipient, amount0, amount1, sqrtPriceX96, liquidity, tick)
+                    _, _, self.sqrt_price_x96, self.liquidity, self.tick = _words(log["data"])
+                elif topic == MINT_TOPIC:
+                    # Mint(sender, owner indexed, tickLower indexed, tickUpper indexed, amount, amount0, amount1)
+                    amount = _words(log["data"])[1]
+                    self._modify_position(_topic_int(log["topics"][2]), _topic_int(log["topics"][3]), amount)
+                elif topic == BURN_TOPIC:
+                    # Burn(owner indexed, tickLower indexed, tickUpper indexed, amount, amount0, amount1)
+                    amount = _words(log["data"])[0]
+                    self._modify_position(_topic_int(log["topics"][2]), _topic_int(log["topics"][3]), -amount)
+                else:
+                    continue
+                self.events_applied += 1
+            self._snapshot = None
+
+    def _modify_position(self, tick_lower: int, tick_upper: int, liquidity_delta: int):
+        """UniswapV3Pool._modifyPosition: update both ticks and, if in range, the active liquidity."""
+        if liquidity_delta == 0:
+            return
+        self._update_tick(tick_lower, liquidity_delta, upper=False)
+        self._update_tick(tick_upper, liquidity_delta, upper=True)
+        if tick_lower <= self.tick < tick_upper:
+            self.liquidity += liquidity_delta
+
+    def _update_tick(self, tick: int, liquidity_delta: int, upper: bool):
+        """Tick.update plus the bitmap flip when the tick becomes (un)initialized."""
+        word, bit = tick_position(tick // self._base.tick_spacing)
+        if word not in self._bitmap:
+            # Outside the loaded words: the swap engine treats this range as unknown anyway
+            return
+        gross = self._gross.get(tick, 0) + liquidity_delta
+        net = self._ticks.get(tick, 0) + (-liquidity_delta if upper else liquidity_delta)
+        if gross == 0:
+            self._gross.pop(tick, None)
+            self._ticks.pop(tick, None)
+            self._bitmap[word] &= ~(1 << bit)
+        else:
+            self._gross[tick] = gross
+            self._ticks[tick] = net
+            self._bitmap[word] |= 1 << bit
+
+    def verify(self) -> bool:
+        """
+        Check the tracked price, tick and liquidity against the chain, reloading on a mismatch.
+
+        Returns:
+            bool: True if the state matched
+        """
+        with self._lock:
+            self.checks += 1
+            pool = self.w3.eth.contract(address=self.pool_address, abi=UNISWAP_V3_POOL_ABI)
+            if self.multicall is not None:
+                _, (slot0, liquidity) = self.multicall.call_functions(
+                    [pool.functions.slot0(), pool.functions.liquidity()], self.block_number
+                )
+            else:
+                slot0 = pool.functions.slot0().call(block_identifier=self.block_number)
+                liquidity = pool.functions.liquidity().call(block_identifier=self.block_number)
+
+            if slot0 is None or liquidity is None:
+                # Nothing is known to be wrong: check again on the next block
+                print(f"⚠️ Could not read pool {self.pool_address} at block {self.block_number} to verify its tracked state")
+                return False
+            self._blocks_since_check = 0
+            if (int(slot0[0]), int(slot0[1]), int(liquidity)) == (self.sqrt_price_x96, self.tick, self.liquidity):
+                return True
+            self.mismatches += 1
+            print(f"⚠️ Tracked state of pool {self.pool_address} drifted at block {self.block_number}, reloading")
+            self.resync(self.block_number)
+            return False
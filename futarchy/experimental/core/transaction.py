@@ -14,26 +14,46 @@ import os
 import json
 from typing import Dict, List, Union, Optional
 
+from futarchy.experimental.utils.helpers import to_hex
+from futarchy.experimental.utils.http_pool import get_http_pool
+
 # Load environment variables
 load_dotenv()
 RPC_URL = os.environ.get('RPC_URL')
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+_w3 = None
+
+
+def get_w3() -> Web3:
+    """Web3 instance for RPC_URL on the shared HTTP pool, created on first use."""
+    global _w3
+    if _w3 is None:
+        _w3 = Web3(get_http_pool().provider(RPC_URL))
+    return _w3
+
+# Event topics
+TRANSFER_TOPIC = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+SWAP_TOPIC = '0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67'
+# ConditionalTokens PositionSplit / PositionsMerge (emitted when the Futarchy router splits or merges collateral)
+SPLIT_TOPIC = '0x2e6bb91f8cbcda0c93623c54d0403a43514fabc40084ec96b6d5379a74786298'
+MERGE_TOPIC = '0x6f13ca62553fcc2bcd2372180a43949c1e4cebba603901ede2f4e14f36b282ca'
 
 # Configure token addresses 
 GNO_NO_ADDRESS = '0xf1B3E5Ffc0219A4F8C0ac69EC98C97709EdfB6c9'
 SDAI_NO_ADDRESS = '0xE1133Ef862f3441880adADC2096AB67c63f6E102'
 NO_POOL_ADDRESS = '0x6E33153115Ab58dab0e0F1E3a2ccda6e67FA5cD7'
 
-def analyze_transaction(tx_hash: str) -> Dict[str, Union[str, float, Dict]]:
+def analyze_transaction(tx_hash: str, w3: Optional[Web3] = None) -> Dict[str, Union[str, float, Dict]]:
     """
     Analyze a transaction and return detailed information about token transfers and swaps.
     
     Args:
         tx_hash: The transaction hash to analyze
+        w3: Web3 instance to read with (defaults to one connected to RPC_URL)
         
     Returns:
         Dict containing transaction details, token transfers, and swap information
     """
+    w3 = w3 or get_w3()
     tx = w3.eth.get_transaction(tx_hash)
     tx_receipt = w3.eth.get_transaction_receipt(tx_hash)
     
@@ -63,22 +83,79 @@ def process_log(log: Dict) -> Optional[Dict]:
     """Process a single transaction log and return structured information."""
     log_info = {
         'address': log['address'],
-        'topics': [topic.hex() for topic in log['topics']],
-        'data': log['data'].hex() if isinstance(log['data'], bytes) else log['data']
+        'topics': [to_hex(topic) for topic in log['topics']],
+        'data': to_hex(log['data'])
     }
     
-    # Process ERC20 Transfer events
-    if (len(log_info['topics']) > 0 and 
-        log_info['topics'][0] == '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'):
+    # Process ERC20 Transfer events (ERC721 transfers index the token id as a fourth topic)
+    if (len(log_info['topics']) == 3 and log_info['topics'][0] == TRANSFER_TOPIC
+            and len(log_info['data']) > 2):
         return process_transfer_event(log_info)
     
     # Process Uniswap V3 Swap events
-    elif (len(log_info['topics']) > 0 and 
-          log_info['topics'][0] == '0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67'):
+    elif len(log_info['topics']) > 0 and log_info['topics'][0] == SWAP_TOPIC:
         return process_swap_event(log_info)
     
+    # Process ConditionalTokens split/merge events
+    elif len(log_info['topics']) == 4 and log_info['topics'][0] in (SPLIT_TOPIC, MERGE_TOPIC):
+        return process_split_merge_event(log_info)
+    
     return log_info
 
+def decode_receipt(receipt: Dict, address: str) -> Dict[str, Union[int, Dict, List]]:
+    """
+    Decode a transaction receipt into exact token deltas for one account.
+    
+    Balance changes are read from the receipt's Transfer logs, so no balanceOf
+    calls are needed before or after a trade.
+    
+    Args:
+        receipt: Transaction receipt
+        address: Account whose token deltas are computed
+        
+    Returns:
+        Dict with status, token_deltas (lowercase token address -> net wei received,
+        negative when sent), transfers and swaps involving the account
+    """
+    address = address.lower()
+    token_deltas: Dict[str, int] = {}
+    transfers = []
+    swaps = []
+    
+    for log in receipt['logs']:
+        log_info = process_log(log)
+        if log_info.get('type') == 'transfer':
+            token = log_info['token_address'].lower()
+            if log_info['to'].lower() == address:
+                token_deltas[token] = token_deltas.get(token, 0) + log_info['value']
+            if log_info['from'].lower() == address:
+                token_deltas[token] = token_deltas.get(token, 0) - log_info['value']
+            if address in (log_info['to'].lower(), log_info['from'].lower()):
+                transfers.append(log_info)
+        elif log_info.get('type') == 'swap' and 'error' not in log_info:
+            swaps.append(log_info)
+    
+    return {
+        'status': receipt.get('status'),
+        'token_deltas': token_deltas,
+        'transfers': transfers,
+        'swaps': swaps
+    }
+
+def get_token_delta(receipt: Dict, token: str, address: str) -> int:
+    """
+    Net amount of one token received by an account in a transaction.
+    
+    Args:
+        receipt: Transaction receipt
+        token: Token address
+        address: Account address
+        
+    Returns:
+        int: Wei received minus wei sent
+    """
+    return decode_receipt(receipt, address)['token_deltas'].get(token.lower(), 0)
+
 def process_transfer_event(log_info: Dict) -> Dict:
     """Process an ERC20 transfer event log."""
     token_address = log_info['address']
@@ -125,6 +202,8 @@ def process_swap_event(log_info: Dict) -> Dict:
             amount0 = amount0 - 2**256
         if amount1 >= 2**255:
             amount1 = amount1 - 2**256
+        if tick >= 2**255:
+            tick = tick - 2**256
         
         amount0_decimal = amount0 / (10**18)
         amount1_decimal = amount1 / (10**18)
@@ -156,6 +235,27 @@ def process_swap_event(log_info: Dict) -> Dict:
             'raw_data': log_info
         }
 
+def process_split_merge_event(log_info: Dict) -> Dict:
+    """Process a ConditionalTokens PositionSplit or PositionsMerge event log."""
+    data_clean = log_info['data'][2:] if log_info['data'].startswith('0x') else log_info['data']
+    
+    # data: collateralToken, offset of partition, amount, partition length, partition...
+    collateral_token = '0x' + data_clean[24:64]
+    amount = int(data_clean[128:192], 16)
+    partition_length = int(data_clean[192:256], 16)
+    partition = [int(data_clean[256 + 64 * i:320 + 64 * i], 16) for i in range(partition_length)]
+    
+    return {
+        'type': 'split' if log_info['topics'][0] == SPLIT_TOPIC else 'merge',
+        'stakeholder': '0x' + log_info['topics'][1][26:],
+        'collateral_token': collateral_token,
+        'parent_collection_id': log_info['topics'][2],
+        'condition_id': log_info['topics'][3],
+        'partition': partition,
+        'amount': amount,
+        'amount_decimal': amount / (10**18)
+    }
+
 def calculate_transaction_summary(logs: List[Dict], user_address: str) -> Dict:
     """Calculate summary of token transfers and swaps for a transaction."""
     gno_no_transferred = 0
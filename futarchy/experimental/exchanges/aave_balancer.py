@@ -133,7 +133,7 @@ class AaveBalancerHandler:
                 self.address
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': int(gas_estimate * 1.2) if gas_estimate != 500000 else 500000,  # Add 20% buffer if estimated
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -221,7 +221,7 @@ class AaveBalancerHandler:
                 self.address   # owner
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': int(gas_estimate * 1.2),  # Add 20% buffer
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -385,7 +385,7 @@ class AaveBalancerHandler:
                 deadline
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': int(gas_estimate * 1.2) if gas_estimate != 700000 else 700000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -497,7 +497,7 @@ class AaveBalancerHandler:
                     'from': self.address,
                     'gas': 500000,
                     'gasPrice': self.w3.eth.gas_price,
-                    'nonce': self.w3.eth.get_transaction_count(self.address),
+                    'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                     'chainId': self.w3.eth.chain_id,
                 })
                 print("✅ deposit function can build transaction")
@@ -515,7 +515,7 @@ class AaveBalancerHandler:
                     'from': self.address,
                     'gas': 500000,
                     'gasPrice': self.w3.eth.gas_price,
-                    'nonce': self.w3.eth.get_transaction_count(self.address),
+                    'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                     'chainId': self.w3.eth.chain_id,
                 })
                 print("✅ redeem function can build transaction")
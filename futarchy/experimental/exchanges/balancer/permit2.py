@@ -6,6 +6,7 @@ This module provides functionality to check and create Permit2 authorizations.
 from web3 import Web3
 import json
 import os
+import time
 from eth_account.messages import encode_typed_data
 from hexbytes import HexBytes
 from config.constants import CONTRACT_ADDRESSES
@@ -159,19 +160,17 @@ class BalancerPermit2Handler:
         
         # First check if token is approved for Permit2
         token_contract = self.bot.get_token_contract(token_address)
-        permit2_allowance = token_contract.functions.allowance(self.address, self.permit2_address).call()
+        permit2_allowance = self.bot.get_allowance(token_address, self.permit2_address)
         
         # Get token balance
         token_balance = token_contract.functions.balanceOf(self.address).call()
         
         # Check Permit2 allowance for spender
         try:
-            current_allowance = self.permit2.functions.allowance(
-                self.address, token_address, spender_address
-            ).call()
+            current_allowance = self.bot.get_permit2_allowance(token_address, spender_address)
             amount, expiration, nonce = current_allowance
             
-            current_time = self.w3.eth.get_block('latest')['timestamp']
+            current_time = int(time.time())
             is_valid = amount > 0 and expiration > current_time
             
             if required_amount is not None:
@@ -242,7 +241,7 @@ class BalancerPermit2Handler:
         
         # Check if token is approved for Permit2
         token_contract = self.bot.get_token_contract(token_address)
-        permit2_allowance = token_contract.functions.allowance(self.address, self.permit2_address).call()
+        permit2_allowance = self.bot.get_allowance(token_address, self.permit2_address)
         
         if permit2_allowance == 0:
             print(f"Token not approved for Permit2. Approving...")
@@ -252,9 +251,7 @@ class BalancerPermit2Handler:
         
         # 1. Check current allowance and nonce
         try:
-            current_allowance = self.permit2.functions.allowance(
-                self.address, token_address, spender_address
-            ).call()
+            current_allowance = self.bot.get_permit2_allowance(token_address, spender_address)
             current_amount, expiration, current_nonce = current_allowance
             
             if self.verbose:
@@ -263,7 +260,7 @@ class BalancerPermit2Handler:
                 print(f"Expiration: {expiration}")
                 print(f"Nonce from allowance: {current_nonce}")
                 
-                timestamp = self.w3.eth.get_block('latest')['timestamp']
+                timestamp = int(time.time())
                 print(f"Current timestamp: {timestamp}")
                 
                 if expiration > timestamp:
@@ -278,8 +275,9 @@ class BalancerPermit2Handler:
 
         # 2. Create and sign a permit message
         # Permit2 expects the exact current nonce
-        expiration_time = int(self.w3.eth.get_block('latest')['timestamp'] + 60 * 60 * expiration_hours)
-        sig_deadline = int(self.w3.eth.get_block('latest')['timestamp'] + 60 * 60 * sig_deadline_hours)
+        now = int(time.time())
+        expiration_time = int(now + 60 * 60 * expiration_hours)
+        sig_deadline = int(now + 60 * 60 * sig_deadline_hours)
 
         if self.verbose:
             print(f"\nCreating permit with:")
@@ -354,7 +352,7 @@ class BalancerPermit2Handler:
                 signature_bytes
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 300000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id
@@ -376,7 +374,8 @@ class BalancerPermit2Handler:
             if self.verbose:
                 print("\nVerifying allowance after permit...")
             
-            new_allowance = self.permit2.functions.allowance(self.address, token_address, spender_address).call()
+            # The ledger has already applied the Permit log of the receipt
+            new_allowance = self.bot.get_permit2_allowance(token_address, spender_address)
             new_amount, new_expiration, new_nonce = new_allowance
             
             if self.verbose:
@@ -384,7 +383,7 @@ class BalancerPermit2Handler:
                 print(f"New expiration: {new_expiration}")
                 print(f"New nonce: {new_nonce}")
             
-            if new_amount > 0 and new_expiration > self.w3.eth.get_block('latest')['timestamp']:
+            if new_amount > 0 and new_expiration > time.time():
                 print("✅ PERMIT SUCCESSFUL: Spender now has permission to spend your tokens through Permit2")
                 return tx_hash_hex
             else:
@@ -449,10 +448,7 @@ class BalancerPermit2Handler:
         try:
             # Check if BatchRouter is already approved
             token_contract = self.bot.get_token_contract(token_address)
-            current_allowance = token_contract.functions.allowance(
-                self.address,
-                self.permit2_address
-            ).call()
+            current_allowance = self.bot.get_allowance(token_address, self.permit2_address)
             
             if current_allowance >= amount:
                 if self.verbose:
@@ -467,7 +463,7 @@ class BalancerPermit2Handler:
                 amount
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 100000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id
@@ -14,6 +14,8 @@ from config.constants import (
     BALANCER_VAULT_ABI, BALANCER_POOL_ABI, BALANCER_BATCH_ROUTER_ABI,
     PERMIT2_ABI, ERC20_ABI
 )
+from futarchy.experimental.core.transaction import decode_receipt
+from futarchy.experimental.utils.rpc_metrics import track_operation
 from .permit2 import BalancerPermit2Handler
 
 class BalancerSwapHandler:
@@ -102,10 +104,7 @@ class BalancerSwapHandler:
     def _ensure_permit2_approval(self, token, amount):
         """Ensure token is approved for Permit2"""
         token_contract = self.w3.eth.contract(address=token, abi=ERC20_ABI)
-        permit2_allowance = token_contract.functions.allowance(
-            self.address,
-            CONTRACT_ADDRESSES["permit2"]
-        ).call()
+        permit2_allowance = self.bot.get_allowance(token, CONTRACT_ADDRESSES["permit2"])
         
         if permit2_allowance < amount:
             print(f"Approving {token_contract.functions.symbol().call()} for Permit2...")
@@ -114,7 +113,7 @@ class BalancerSwapHandler:
                 2**256 - 1  # Max approval
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 100000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id
@@ -131,9 +130,13 @@ class BalancerSwapHandler:
             print("✅ Token already approved for Permit2")
     
     def _approve_batch_router(self, token, amount):
-        """Approve BatchRouter to spend tokens through Permit2"""
+        """Approve BatchRouter to spend tokens through Permit2, unless the current approval still covers amount"""
+        if self.bot.has_permit2_allowance(token, CONTRACT_ADDRESSES["batchRouter"], amount):
+            print("✅ BatchRouter already approved through Permit2")
+            return
+        
         print("\nApproving BatchRouter to spend tokens through Permit2...")
-        expiration = self.w3.eth.get_block('latest')['timestamp'] + 24 * 60 * 60
+        expiration = int(time.time()) + 24 * 60 * 60
         
         approve_tx = self.permit2.functions.approve(
             token,
@@ -142,7 +145,7 @@ class BalancerSwapHandler:
             expiration
         ).build_transaction({
             'from': self.address,
-            'nonce': self.w3.eth.get_transaction_count(self.address),
+            'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
             'gas': 100000,
             'gasPrice': self.w3.eth.gas_price,
             'chainId': self.w3.eth.chain_id
@@ -156,6 +159,7 @@ class BalancerSwapHandler:
             raise Exception("BatchRouter approval through Permit2 failed")
         print("✅ BatchRouter approval through Permit2 successful")
     
+    @track_operation()
     def swap_exact_in(self, token_in, token_out, amount, pool_address, slippage=0.05):
         """
         Swap exact amount of token_in for token_out using Balancer BatchRouter
@@ -168,7 +172,7 @@ class BalancerSwapHandler:
             slippage: Maximum acceptable slippage (default 5%)
         
         Returns:
-            dict: Transaction result with success status and balance changes
+            dict: Transaction result with success status, balance changes (ether) and token deltas (wei)
         """
         # Convert addresses to checksum format
         token_in = self.w3.to_checksum_address(token_in)
@@ -225,12 +229,11 @@ class BalancerSwapHandler:
         # Approve BatchRouter through Permit2
         self._approve_batch_router(token_in, amount_wei)
         
-        # Wait for nonce to be ready
-        time.sleep(2)
-        nonce = self.w3.eth.get_transaction_count(self.address)
+        # The approval above already advanced the local nonce, no need to wait for the node
+        nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
         
         # Set deadline (30 minutes)
-        deadline = self.w3.eth.get_block('latest')['timestamp'] + 1800
+        deadline = int(time.time()) + 1800
         
         # Build and send swap transaction
         swap_tx = self.batch_router.functions.swapExactIn(
@@ -256,12 +259,16 @@ class BalancerSwapHandler:
         
         print("✅ Swap successful!")
         
-        # Check final balances and calculate changes
-        final_balance_in, final_balance_out = self._print_balances(token_in, token_out, "\nFinal ")
+        # Exact balance changes from the receipt's Transfer logs, no balance re-reads
+        token_deltas = decode_receipt(receipt, self.address)['token_deltas']
+        delta_in = token_deltas.get(token_in.lower(), 0)
+        delta_out = token_deltas.get(token_out.lower(), 0)
+        balance_in_change = float(self.w3.from_wei(delta_in, 'ether'))
+        balance_out_change = float(self.w3.from_wei(delta_out, 'ether'))
         
-        # Calculate precise balance changes
-        balance_in_change = float(self.w3.from_wei(final_balance_in - initial_balance_in, 'ether'))
-        balance_out_change = float(self.w3.from_wei(final_balance_out - initial_balance_out, 'ether'))
+        print("\nFinal Balances:")
+        print(f"  {token_in}: {self.w3.from_wei(initial_balance_in + delta_in, 'ether')} ({initial_balance_in + delta_in} wei)")
+        print(f"  {token_out}: {self.w3.from_wei(initial_balance_out + delta_out, 'ether')} ({initial_balance_out + delta_out} wei)")
         
         print("\nBalance Changes:")
         print(f"  {token_in}: {balance_in_change:+.18f}")
@@ -273,6 +280,10 @@ class BalancerSwapHandler:
             'balance_changes': {
                 'token_in': balance_in_change,
                 'token_out': balance_out_change
+            },
+            'token_deltas': {
+                'token_in': delta_in,
+                'token_out': delta_out
             }
         }
     
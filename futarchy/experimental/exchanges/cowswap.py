@@ -2,19 +2,18 @@
 import os
 import json
 import time
-import requests
 import sys
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import requests
 import time
 import json
 from eth_utils import to_checksum_address
 from eth_account.messages import encode_defunct
 from config.constants import COWSWAP_API_URL, CONTRACT_ADDRESSES
 from utils.web3_utils import get_raw_transaction
+from futarchy.experimental.utils.http_pool import get_http_pool
 
 
 class CowSwapExchange:
@@ -437,7 +436,7 @@ class CowSwapExchange:
                 "kind": "sell"
             }
             
-            quote_response = requests.post(quote_url, json=quote_data)
+            quote_response = get_http_pool().post(quote_url, json=quote_data)
             
             if quote_response.status_code != 200:
                 print(f"❌ Failed to get quote: {quote_response.text}")
@@ -751,7 +750,7 @@ class CowSwapExchange:
                 print("======================================\n")
                 
             # Make the submission request
-            response = requests.post(submit_url, json=order)
+            response = get_http_pool().post(submit_url, json=order)
             
             print(f"Response status: {response.status_code}")
             print(f"Response text: {response.text}")
@@ -811,7 +810,7 @@ class CowSwapExchange:
         """
         try:
             print(f"Checking order status for {order_uid}...")
-            response = requests.get(f"{COWSWAP_API_URL}/api/v1/orders/{order_uid}")
+            response = get_http_pool().get(f"{COWSWAP_API_URL}/api/v1/orders/{order_uid}")
             
             if response.status_code == 200:
                 order_data = response.json()
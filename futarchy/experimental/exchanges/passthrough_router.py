@@ -17,6 +17,8 @@ from dotenv import load_dotenv
 load_dotenv(override=False)
 
 from futarchy.experimental.config.constants import TOKEN_CONFIG, ERC20_ABI
+from futarchy.experimental.core.transaction import get_token_delta
+from futarchy.experimental.utils.rpc_metrics import track_operation
 
 class PassthroughRouter:
     """
@@ -78,7 +80,7 @@ class PassthroughRouter:
         """Authorize a pool for the router."""
         try:
             print("\n🔑 Authorizing pool for the router...")
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
             
             authorize_tx = self.router_contract.functions.authorizePool(
                 pool_address
@@ -121,7 +123,7 @@ class PassthroughRouter:
                 return True
 
             print(f"🔑 Approving pass-through router to spend tokens...")
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
             
             approve_tx = token_contract.functions.approve(
                 self.router_address,
@@ -151,6 +153,7 @@ class PassthroughRouter:
             print(f"❌ Approval error: {str(e)}")
             return False
 
+    @track_operation()
     def execute_swap(
         self,
         pool_address: str,
@@ -168,12 +171,9 @@ class PassthroughRouter:
             # Convert amount to Wei
             amount_wei = self.w3.to_wei(amount, 'ether')
             
-            # Check balances
+            # Check balance
             token_in_contract = self.w3.eth.contract(address=token_in, abi=ERC20_ABI)
-            token_out_contract = self.w3.eth.contract(address=token_out, abi=ERC20_ABI)
-            
             token_in_balance = token_in_contract.functions.balanceOf(self.account.address).call()
-            token_out_balance_before = token_out_contract.functions.balanceOf(self.account.address).call()
             
             print(f"💰 Current balance: {self.w3.from_wei(token_in_balance, 'ether')} tokens")
             print(f"💰 Required amount: {amount} tokens")
@@ -210,7 +210,7 @@ class PassthroughRouter:
             print(f"Amount: {amount_wei} ({amount} tokens)")
             print(f"Sqrt Price Limit X96: {sqrt_price_limit_x96}")
             
-            nonce = self.w3.eth.get_transaction_count(self.account.address)
+            nonce = self.w3.eth.get_transaction_count(self.account.address, 'pending')
             
             swap_tx = self.router_contract.functions.swap(
                 pool_address,
@@ -237,10 +237,10 @@ class PassthroughRouter:
             if receipt.status == 1:
                 print("✅ Swap successful!")
                 
-                # Check final balance
-                token_out_balance_after = token_out_contract.functions.balanceOf(self.account.address).call()
-                print(f"🔹 Token out balance: {self.w3.from_wei(token_out_balance_after, 'ether')}")
-                gained = token_out_balance_after - token_out_balance_before
+                # Exact amounts from the receipt's Transfer logs
+                spent = -get_token_delta(receipt, token_in, self.account.address)
+                gained = get_token_delta(receipt, token_out, self.account.address)
+                print(f"🔹 Spent: {self.w3.from_wei(spent, 'ether')} tokens")
                 print(f"🔹 Gained: {self.w3.from_wei(gained, 'ether')} tokens")
                 
                 print(f"\n🔗 Explorer: https://gnosisscan.io/tx/{tx_hash.hex()}")
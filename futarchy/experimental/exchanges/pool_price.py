@@ -14,6 +14,8 @@ from web3 import Web3
 
 from futarchy.experimental.core.futarchy_bot import FutarchyBot
 from futarchy.experimental.config.constants import CONTRACT_ADDRESSES, TOKEN_CONFIG
+from futarchy.experimental.config.network import BLOCK_TIME
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
 
 class PoolPriceChecker:
     """Class for checking and analyzing Uniswap V3 pool prices."""
@@ -51,17 +53,26 @@ class PoolPriceChecker:
         Returns:
             Dict containing pool data including tokens, price, and tick
         """
-        pool_contract = self.get_pool_contract(pool_address)
-        
-        # Get pool data
-        token0 = pool_contract.functions.token0().call()
-        token1 = pool_contract.functions.token1().call()
-        slot0 = pool_contract.functions.slot0().call()
-        sqrt_price_x96 = slot0[0]
-        tick = slot0[1]
+        tracker = getattr(self.bot, 'pool_trackers', {}).get(pool_address.lower())
+        if tracker is not None:
+            # Tracked pools are answered from state kept current by their logs
+            snapshot = tracker.sync(max_age=BLOCK_TIME)
+            token0 = self.bot.w3.to_checksum_address(snapshot.token0)
+            token1 = self.bot.w3.to_checksum_address(snapshot.token1)
+            sqrt_price_x96 = snapshot.sqrt_price_x96
+            tick = snapshot.tick
+        else:
+            pool_contract = self.get_pool_contract(pool_address)
+            
+            # Get pool data
+            token0 = pool_contract.functions.token0().call()
+            token1 = pool_contract.functions.token1().call()
+            slot0 = pool_contract.functions.slot0().call()
+            sqrt_price_x96 = slot0[0]
+            tick = slot0[1]
         
         # Calculate price
-        price = (sqrt_price_x96 ** 2) / (2 ** 192)
+        price = sqrt_price_x96_to_price(sqrt_price_x96)
         
         return {
             'pool_address': pool_address,
@@ -13,8 +13,11 @@ from futarchy.experimental.config.constants import (
     ERC20_ABI
 )
 from futarchy.experimental.utils.web3_utils import get_raw_transaction
+from futarchy.experimental.utils.rpc_metrics import track_operation
+from futarchy.experimental.utils.uniswap_v3_math import (
+    sqrt_price_x96_to_price, tick_to_price, price_to_tick, nearest_usable_ticks
+)
 import time
-import math
 
 class SushiSwapExchange:
     """Class for interacting with SushiSwap V3"""
@@ -47,6 +50,7 @@ class SushiSwapExchange:
             abi=SUSHISWAP_V3_NFPM_ABI
         )
     
+    @track_operation()
     def swap(self, pool_address, token_in, token_out, amount, zero_for_one):
         """
         Execute a swap on SushiSwap V3.
@@ -72,10 +76,7 @@ class SushiSwapExchange:
         
         # Check current allowance and balance
         token_in_contract = self.bot.get_token_contract(token_in)
-        current_allowance = token_in_contract.functions.allowance(
-            self.address,
-            sushiswap_address
-        ).call()
+        current_allowance = self.bot.get_allowance(token_in, sushiswap_address)
         current_balance = token_in_contract.functions.balanceOf(self.address).call()
         
         print(f"Current allowance: {self.w3.from_wei(current_allowance, 'ether')}")
@@ -127,7 +128,7 @@ class SushiSwapExchange:
                 b''  # data - empty bytes
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 1000000,  # INCREASED gas limit substantially
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -188,7 +189,7 @@ class SushiSwapExchange:
         tick = slot0[1]
         
         # Calculate price from sqrtPriceX96
-        price = (sqrt_price_x96 ** 2) / (2 ** 192)
+        price = sqrt_price_x96_to_price(sqrt_price_x96)
         
         return {
             'token0': token0,
@@ -198,13 +199,14 @@ class SushiSwapExchange:
             'price': price  # Price of token1 in terms of token0
         }
     
-    def calculate_tick_range(self, current_tick, price_range_percentage):
+    def calculate_tick_range(self, current_tick, price_range_percentage, tick_spacing=60):
         """
         Calculate tick range based on current tick and desired price range percentage.
         
         Args:
             current_tick: Current tick of the pool
             price_range_percentage: Percentage range around current price (e.g., 10 for ±10%)
+            tick_spacing: Tick spacing of the pool (60 is common for the 0.3% fee tier)
             
         Returns:
             tuple: (tick_lower, tick_upper)
@@ -212,18 +214,11 @@ class SushiSwapExchange:
         # Calculate price range
         price_factor = 1 + (price_range_percentage / 100)
         
-        # Calculate ticks (log base 1.0001 of price)
-        tick_spacing = 60  # Common tick spacing for 0.3% fee tier
-        
-        # Calculate lower and upper ticks based on price range
-        tick_lower = math.floor(current_tick - (math.log(price_factor) / math.log(1.0001)))
-        tick_upper = math.ceil(current_tick + (math.log(price_factor) / math.log(1.0001)))
-        
-        # Round to nearest tick spacing
-        tick_lower = math.floor(tick_lower / tick_spacing) * tick_spacing
-        tick_upper = math.ceil(tick_upper / tick_spacing) * tick_spacing
+        # Number of ticks covering the price factor, rounded outwards (exact TickMath)
+        tick_delta = price_to_tick(price_factor, round_up=True)
         
-        return (tick_lower, tick_upper)
+        # Round outwards to the tick spacing, within the valid tick range
+        return nearest_usable_ticks(current_tick - tick_delta, current_tick + tick_delta, tick_spacing)
     
     def add_liquidity(self, pool_address, token0_amount, token1_amount, price_range_percentage=10, slippage_percentage=0.5):
         """
@@ -250,7 +245,9 @@ class SushiSwapExchange:
             current_tick = pool_info['tick']
             
             # Calculate tick range based on price range percentage
-            tick_lower, tick_upper = self.calculate_tick_range(current_tick, price_range_percentage)
+            metadata = getattr(self.bot, "metadata", None)
+            tick_spacing = metadata.tick_spacing(pool_address) if metadata else 60
+            tick_lower, tick_upper = self.calculate_tick_range(current_tick, price_range_percentage, tick_spacing)
             
             print(f"📝 Adding liquidity to SushiSwap V3 pool")
             print(f"Pool address: {pool_address}")
@@ -297,7 +294,7 @@ class SushiSwapExchange:
                 deadline  # deadline
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 1000000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -413,7 +410,7 @@ class SushiSwapExchange:
                 deadline  # deadline
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 500000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -527,7 +524,7 @@ class SushiSwapExchange:
                 deadline  # deadline
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 500000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -618,7 +615,7 @@ class SushiSwapExchange:
                 max_uint128  # amount1Max
             ).build_transaction({
                 'from': self.address,
-                'nonce': self.w3.eth.get_transaction_count(self.address),
+                'nonce': self.w3.eth.get_transaction_count(self.address, 'pending'),
                 'gas': 300000,
                 'gasPrice': self.w3.eth.gas_price,
                 'chainId': self.w3.eth.chain_id,
@@ -718,8 +715,8 @@ class SushiSwapExchange:
             token1_decimals = token1_contract.functions.decimals().call()
             
             # Calculate price range
-            price_lower = 1.0001 ** tick_lower
-            price_upper = 1.0001 ** tick_upper
+            price_lower = tick_to_price(tick_lower)
+            price_upper = tick_to_price(tick_upper)
             
             return {
                 'tokenId': token_id,
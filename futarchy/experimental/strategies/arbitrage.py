@@ -13,8 +13,9 @@ def arbitrage_strategy(bot, min_difference=0.02, amount=0.1):
     print(f"\n📊 Arbitrage Strategy")
     print(f"🎯 Execute when |YES price - (1 - NO price)| > {min_difference:.2f}")
     
-    # Get market prices
-    prices = bot.get_market_prices()
+    # Get market prices from a single-block snapshot
+    snapshot = bot.get_market_snapshot()
+    prices = bot.get_market_prices(snapshot)
     if not prices:
         print("❌ Failed to get market prices, cannot execute strategy")
         return False
@@ -22,8 +23,8 @@ def arbitrage_strategy(bot, min_difference=0.02, amount=0.1):
     bot.print_market_prices(prices)
     
     # Check for arbitrage opportunity
-    yes_price = prices['yes_company_price']
-    no_price = prices['no_company_price']
+    yes_price = prices['yes_price']
+    no_price = prices['no_price']
     
     # In a perfect market, YES price + NO price should equal 1
     # If not, there's an arbitrage opportunity
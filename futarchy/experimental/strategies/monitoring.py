@@ -1,13 +1,47 @@
 import time
 
-def simple_monitoring_strategy(bot, iterations=5, interval=60):
+from futarchy.experimental.core.block_stream import BlockStream
+
+def monitoring_rounds(bot, iterations, interval=None, stream=None):
+    """
+    Yield the block each monitoring round should read at.
+    
+    Without an interval, rounds follow new blocks: one round per new head
+    (WebSocket newHeads, or polling when no WebSocket endpoint answers).
+    With an interval, rounds are spaced by sleeping and read the latest block.
+    
+    Args:
+        bot: FutarchyBot instance
+        iterations: Number of monitoring iterations
+        interval: Seconds between rounds, or None to run once per new block
+        stream: BlockStream to follow (created from bot.w3 if None)
+        
+    Yields:
+        int or None: Block number to read at (None in interval mode)
+    """
+    if interval:
+        for i in range(iterations):
+            print(f"\n⏳ Monitoring iteration {i+1}/{iterations}, waiting {interval} seconds...")
+            time.sleep(interval)
+            yield None
+        return
+    
+    stream = stream or BlockStream(bot.w3)
+    print("\n⏳ Waiting for new blocks...")
+    for i, block_number in enumerate(stream.blocks(limit=iterations)):
+        skipped = f", {stream.skipped} skipped so far" if stream.skipped else ""
+        print(f"\n🧱 Block {block_number} ({stream.mode}{skipped}), monitoring iteration {i+1}/{iterations}")
+        yield block_number
+
+def simple_monitoring_strategy(bot, iterations=5, interval=None, stream=None):
     """
     Simple strategy that monitors prices and balances.
     
     Args:
         bot: FutarchyBot instance
         iterations: Number of monitoring iterations
-        interval: Time between updates in seconds
+        interval: Time between updates in seconds, or None to update once per new block
+        stream: BlockStream to follow when interval is None
         
     Returns:
         dict: Final price data
@@ -18,30 +52,27 @@ def simple_monitoring_strategy(bot, iterations=5, interval=60):
     balances = bot.get_balances()
     bot.print_balances(balances)
     
-    # Get market prices
-    prices = bot.get_market_prices()
+    # Get market prices from a single-block snapshot
+    prices = bot.get_market_prices(bot.get_market_snapshot())
     if prices:
         bot.print_market_prices(prices)
     else:
         print("❌ Failed to get initial market prices")
         return None
     
-    # Monitor for iterations with interval seconds between updates
-    for i in range(iterations):
-        print(f"\n⏳ Monitoring iteration {i+1}/{iterations}, waiting {interval} seconds...")
-        time.sleep(interval)
-        
-        # Get updated prices and balances
-        updated_prices = bot.get_market_prices()
-        updated_balances = bot.get_balances()
+    # Monitor once per new block (or every interval seconds)
+    for block_number in monitoring_rounds(bot, iterations, interval, stream):
+        # Get updated prices and balances, both at the new block
+        updated_prices = bot.get_market_prices(bot.get_market_snapshot(block_number))
+        updated_balances = bot.get_balances(block_identifier=block_number)
         
         # Calculate price changes
         if prices and updated_prices:
-            prob_change = updated_prices['event_probability'] - prices['event_probability']
+            prob_change = updated_prices['probability'] - prices['probability']
             print(f"\n📈 Probability change: {prob_change:.2%}")
             
-            yes_price_change = updated_prices['yes_company_price'] - prices['yes_company_price']
-            no_price_change = updated_prices['no_company_price'] - prices['no_company_price']
+            yes_price_change = updated_prices['yes_price'] - prices['yes_price']
+            no_price_change = updated_prices['no_price'] - prices['no_price']
             print(f"📈 YES price change: {yes_price_change:.6f}")
             print(f"📈 NO price change: {no_price_change:.6f}")
             
@@ -54,3 +85,53 @@ def simple_monitoring_strategy(bot, iterations=5, interval=60):
             bot.print_market_prices(updated_prices)
     
     return prices
+
+def async_monitoring_strategy(bot, iterations=5, interval=None, stream=None):
+    """
+    Monitoring strategy whose reads run concurrently on an AsyncWeb3 engine.
+    
+    Prices and balances of each round are requested at the same time, so a
+    round costs one round trip instead of one per read.
+    
+    Args:
+        bot: FutarchyBot instance
+        iterations: Number of monitoring iterations
+        interval: Time between updates in seconds, or None to update once per new block
+        stream: BlockStream to follow when interval is None
+        
+    Returns:
+        dict: Final price data
+    """
+    import asyncio
+    from futarchy.experimental.core.async_engine import AsyncFutarchyEngine
+    
+    async def run():
+        async with AsyncFutarchyEngine(bot) as engine:
+            print("\n📊 Monitoring prices and balances (async)")
+            state = await engine.get_market_state()
+            prices = state["prices"]
+            bot.print_balances(state["balances"])
+            bot.print_market_prices(prices)
+            
+            # The block stream blocks, so it waits in a worker thread
+            rounds = monitoring_rounds(bot, iterations, interval, stream)
+            while True:
+                block_number = await asyncio.to_thread(next, rounds, StopIteration)
+                if block_number is StopIteration:
+                    break
+                
+                state = await engine.get_market_state(block_identifier=block_number)
+                updated_prices = state["prices"]
+                print(f"\n⚡ Round read in {state['elapsed'] * 1000:.0f} ms")
+                
+                prob_change = updated_prices['probability'] - prices['probability']
+                print(f"📈 Probability change: {prob_change:.2%}")
+                print(f"📈 YES price change: {updated_prices['yes_price'] - prices['yes_price']:.6f}")
+                print(f"📈 NO price change: {updated_prices['no_price'] - prices['no_price']:.6f}")
+                prices = updated_prices
+                
+                bot.print_balances(state["balances"])
+                bot.print_market_prices(prices)
+            return prices
+    
+    return asyncio.run(run())
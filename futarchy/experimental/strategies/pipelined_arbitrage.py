@@ -0,0 +1,332 @@
+"""
+Pipelined synthetic GNO arbitrage plans.
+
+This module is currently in EXPERIMENTAL status.
+Builds the sell and buy synthetic GNO routes as TransactionPipeline plans.
+Approvals, pool authorizations and every leg whose amount is known in advance
+are pre-signed into the same wave; only legs whose input is the output of a
+previous leg wait for its receipt. The sell route runs in three waves
+(buy waGNO; unwrap, split and sell both conditional legs; balance and merge),
+the buy route in two (everything up to wrapping; sell waGNO).
+"""
+
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from futarchy.experimental.config.constants import (
+    CONTRACT_ADDRESSES, TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, BALANCER_CONFIG,
+    ERC20_ABI, WAGNO_ABI, PERMIT2_ABI, BALANCER_BATCH_ROUTER_ABI, UNISWAP_V3_PASSTHROUGH_ROUTER_ABI
+)
+from futarchy.experimental.core.pipeline import TransactionPipeline
+from futarchy.experimental.core.transaction import get_token_delta
+from futarchy.experimental.utils.uniswap_v3_math import MIN_SQRT_RATIO, MAX_SQRT_RATIO
+
+MAX_UINT256 = 2**256 - 1
+MAX_UINT160 = 2**160 - 1
+DEFAULT_SLIPPAGE = 0.01
+# Extra input kept for exact-output legs so small price moves don't make them revert
+EXACT_OUTPUT_BUFFER = 0.002
+DEADLINE_SECONDS = 1800
+
+
+def v3_swap_args(snapshot, token_in: str, amount: int, exact_output: bool = False,
+                 slippage: float = DEFAULT_SLIPPAGE) -> Tuple[bool, int, int]:
+    """
+    Passthrough router swap arguments with a price limit derived from the simulated trade.
+
+    The limit sits `slippage` beyond the price the pool would reach after the
+    trade, so the swap fills completely unless the pool moves against us.
+
+    Args:
+        snapshot: V3PoolSnapshot of the pool
+        token_in: Token sold
+        amount: Amount sold (exact input) or bought (exact output), in wei
+        exact_output: Whether amount is the output
+        slippage: Allowed price move beyond the simulated final price
+
+    Returns:
+        tuple: (zero_for_one, amount_specified, sqrt_price_limit_x96)
+    """
+    zero_for_one = snapshot.is_token0(token_in)
+    amount_specified = -int(amount) if exact_output else int(amount)
+    sqrt_after = snapshot.swap(zero_for_one, amount_specified)["sqrt_price_x96_after"]
+    if zero_for_one:
+        limit = max(int(sqrt_after * math.sqrt(1 - slippage)), MIN_SQRT_RATIO + 1)
+    else:
+        limit = min(int(sqrt_after * math.sqrt(1 + slippage)), MAX_SQRT_RATIO - 1)
+    return zero_for_one, amount_specified, limit
+
+
+class SyntheticArbitragePlanner:
+    """Builds pipelined plans for both synthetic GNO arbitrage routes"""
+
+    def __init__(self, bot, solver, slippage: float = DEFAULT_SLIPPAGE, router_address: Optional[str] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            bot: FutarchyBot instance (w3, account, multicall, futarchy_router)
+            solver: SyntheticArbitrageSolver loaded at the current block
+            slippage: Slippage tolerance applied to every leg
+            router_address: Uniswap V3 passthrough router (defaults to V3_PASSTHROUGH_ROUTER_ADDRESS)
+        """
+        self.bot = bot
+        self.w3 = bot.w3
+        self.address = bot.address
+        self.solver = solver
+        self.slippage = slippage
+        self.deadline = None
+
+        w3 = self.w3
+        router_address = router_address or os.environ.get(
+            "V3_PASSTHROUGH_ROUTER_ADDRESS", CONTRACT_ADDRESSES["uniswapV3PassthroughRouter"]
+        )
+        self.router = w3.eth.contract(address=w3.to_checksum_address(router_address), abi=UNISWAP_V3_PASSTHROUGH_ROUTER_ABI)
+        self.batch_router = w3.eth.contract(
+            address=w3.to_checksum_address(CONTRACT_ADDRESSES["batchRouter"]), abi=BALANCER_BATCH_ROUTER_ABI
+        )
+        self.permit2 = w3.eth.contract(address=w3.to_checksum_address(CONTRACT_ADDRESSES["permit2"]), abi=PERMIT2_ABI)
+        self.wagno = w3.eth.contract(address=w3.to_checksum_address(TOKEN_CONFIG["wagno"]["address"]), abi=WAGNO_ABI)
+
+        self.sdai = w3.to_checksum_address(TOKEN_CONFIG["currency"]["address"])
+        self.sdai_yes = w3.to_checksum_address(TOKEN_CONFIG["currency"]["yes_address"])
+        self.sdai_no = w3.to_checksum_address(TOKEN_CONFIG["currency"]["no_address"])
+        self.gno = w3.to_checksum_address(TOKEN_CONFIG["company"]["address"])
+        self.gno_yes = w3.to_checksum_address(TOKEN_CONFIG["company"]["yes_address"])
+        self.gno_no = w3.to_checksum_address(TOKEN_CONFIG["company"]["no_address"])
+        self.wagno_address = self.wagno.address
+        self.market = w3.to_checksum_address(CONTRACT_ADDRESSES["market"])
+        self.pools = {
+            "yes": (w3.to_checksum_address(POOL_CONFIG_YES["address"]), solver.yes_pool),
+            "no": (w3.to_checksum_address(POOL_CONFIG_NO["address"]), solver.no_pool),
+            "sdai_yes": (w3.to_checksum_address(CONTRACT_ADDRESSES["sdaiYesPool"]), solver.sdai_yes_pool),
+        }
+
+    def _pipeline(self) -> TransactionPipeline:
+        return TransactionPipeline(self.w3, self.bot.account, getattr(self.bot, "nonces", None))
+
+    def _add_approvals(self, pipeline: TransactionPipeline, approvals: List[Tuple[str, str, str, int]]):
+        """
+        Add max approvals for every (label, token, spender, amount) whose allowance is too low.
+
+        Allowances come from the bot's ledger; those it does not track yet (all
+        of them without a ledger) are read in one multicall and recorded.
+        """
+        ledger = self.bot.allowances
+        contracts = [self.w3.eth.contract(address=token, abi=ERC20_ABI) for _, token, _, _ in approvals]
+        spenders = [self.w3.to_checksum_address(spender) for _, _, spender, _ in approvals]
+        allowances = [ledger.known_allowance(self.address, contract.address, spender) if ledger is not None else None
+                      for contract, spender in zip(contracts, spenders)]
+        missing = [index for index, allowance in enumerate(allowances) if allowance is None]
+        if missing:
+            _, loaded = self.bot.multicall.call_functions(
+                [contracts[index].functions.allowance(self.address, spenders[index]) for index in missing]
+            )
+            for index, allowance in zip(missing, loaded):
+                allowances[index] = allowance
+                if allowance is not None and ledger is not None:
+                    ledger.set_allowance(self.address, contracts[index].address, spenders[index], allowance)
+        for (label, _, _, amount), contract, spender, allowance in zip(approvals, contracts, spenders, allowances):
+            if allowance is not None and allowance >= amount:
+                continue
+            pipeline.add(
+                f"approve_{label}",
+                lambda outputs, contract=contract, spender=spender: contract.functions.approve(spender, MAX_UINT256),
+                gas=100000,
+            )
+
+    def _add_pool_authorizations(self, pipeline: TransactionPipeline, pools: List[str]):
+        """Authorize pools on the passthrough router; reverts (already authorized) are tolerated."""
+        for pool in pools:
+            pool_address = self.pools[pool][0]
+            pipeline.add(
+                f"authorize_{pool}_pool",
+                lambda outputs, pool_address=pool_address: self.router.functions.authorizePool(pool_address),
+                gas=200000, required=False,
+            )
+
+    def _permit2_approval(self, token: str, amount: int):
+        """Permit2 allowance for the Balancer BatchRouter valid for the plan's deadline, or None if one is in place."""
+        if self.bot.has_permit2_allowance(token, self.batch_router.address, amount, margin=DEADLINE_SECONDS):
+            return None
+        return self.permit2.functions.approve(token, self.batch_router.address, min(amount, MAX_UINT160), self._deadline())
+
+    def _deadline(self) -> int:
+        """Deadline shared by every leg of the plan."""
+        if self.deadline is None:
+            self.deadline = int(time.time()) + DEADLINE_SECONDS
+        return self.deadline
+
+    def _balancer_swap(self, token_in: str, token_out: str, amount_in: int, min_amount_out: int):
+        swap_path = {
+            "tokenIn": token_in,
+            "steps": [{"pool": self.w3.to_checksum_address(BALANCER_CONFIG["pool_address"]), "tokenOut": token_out, "isBuffer": False}],
+            "exactAmountIn": amount_in,
+            "minAmountOut": min_amount_out,
+        }
+        return self.batch_router.functions.swapExactIn([swap_path], self._deadline(), False, b"")
+
+    def _v3_swap(self, pool: str, token_in: str, amount: int, exact_output: bool = False):
+        pool_address, snapshot = self.pools[pool]
+        zero_for_one, amount_specified, limit = v3_swap_args(snapshot, token_in, amount, exact_output, self.slippage)
+        return self.router.functions.swap(pool_address, self.address, zero_for_one, amount_specified, limit, b"")
+
+    def _received(self, token: str, key: str):
+        """outputs callback recording the amount of token received."""
+        return lambda receipt, outputs: {key: get_token_delta(receipt, token, self.address)}
+
+    def sell_plan(self, sdai_in: int) -> TransactionPipeline:
+        """
+        Plan the sell route: buy waGNO, unwrap, split, sell GNO-YES/NO, balance sDAI-YES and merge.
+
+        Args:
+            sdai_in: sDAI spent, in wei
+
+        Returns:
+            TransactionPipeline: Plan ready to run
+        """
+        legs = self.solver.sell_synthetic(sdai_in)
+        if legs is None:
+            raise ValueError("The sell route cannot absorb this size at the current block")
+
+        pipeline = self._pipeline()
+        # Amounts fixed at build time, shared by the steps of one wave
+        plan: Dict[str, Any] = {}
+        router = self.router.address
+        futarchy_router = CONTRACT_ADDRESSES["futarchyRouter"]
+        self._add_approvals(pipeline, [
+            ("sdai_permit2", self.sdai, CONTRACT_ADDRESSES["permit2"], sdai_in),
+            ("gno_futarchy_router", self.gno, futarchy_router, legs["gno"]),
+            ("gno_yes_router", self.gno_yes, router, legs["gno"]),
+            ("gno_no_router", self.gno_no, router, legs["gno"]),
+            ("sdai_yes_router", self.sdai_yes, router, legs["sdai_yes"]),
+            ("sdai_router", self.sdai, router, abs(legs["balance_sdai"])),
+            ("sdai_yes_futarchy_router", self.sdai_yes, futarchy_router, legs["sdai_no"]),
+            ("sdai_no_futarchy_router", self.sdai_no, futarchy_router, legs["sdai_no"]),
+        ])
+        self._add_pool_authorizations(pipeline, ["yes", "no", "sdai_yes"])
+        pipeline.add("permit2_sdai", lambda outputs: self._permit2_approval(self.sdai, sdai_in), gas=100000)
+
+        min_wagno = int(legs["wagno"] * (1 - self.slippage))
+        pipeline.add(
+            "buy_wagno", lambda outputs: self._balancer_swap(self.sdai, self.wagno_address, sdai_in, min_wagno),
+            gas=500000, outputs=self._received(self.wagno_address, "wagno"),
+        )
+
+        def unwrap(outputs):
+            # Withdraw a fixed GNO amount so the next legs can be signed now; the
+            # share price only grows, so the shares received always cover it
+            plan["gno"] = self.wagno.functions.convertToAssets(outputs["buy_wagno"]["wagno"]).call()
+            return self.wagno.functions.withdraw(plan["gno"], self.address, self.address)
+
+        pipeline.add("unwrap_wagno", unwrap, needs=["buy_wagno"], gas=400000)
+        pipeline.add(
+            "split_gno",
+            lambda outputs: self.bot.futarchy_router.functions.splitPosition(self.market, self.gno, plan["gno"]),
+            after=["unwrap_wagno"], gas=500000,
+        )
+        pipeline.add(
+            "sell_gno_yes", lambda outputs: self._v3_swap("yes", self.gno_yes, plan["gno"]),
+            after=["split_gno"], gas=1000000, outputs=self._received(self.sdai_yes, "sdai_yes"),
+        )
+        pipeline.add(
+            "sell_gno_no", lambda outputs: self._v3_swap("no", self.gno_no, plan["gno"]),
+            after=["split_gno"], gas=1000000, outputs=self._received(self.sdai_no, "sdai_no"),
+        )
+
+        def balance(outputs):
+            sdai_yes, sdai_no = outputs["sell_gno_yes"]["sdai_yes"], outputs["sell_gno_no"]["sdai_no"]
+            plan["merge"] = min(sdai_yes, sdai_no)
+            if sdai_yes > sdai_no:
+                return self._v3_swap("sdai_yes", self.sdai_yes, sdai_yes - sdai_no)
+            if sdai_no > sdai_yes:
+                # Buy exactly the missing sDAI-YES so every sDAI-NO can be merged
+                plan["merge"] = sdai_no
+                return self._v3_swap("sdai_yes", self.sdai, sdai_no - sdai_yes, exact_output=True)
+            return None
+
+        pipeline.add("balance_sdai_yes", balance, needs=["sell_gno_yes", "sell_gno_no"], gas=1000000)
+        pipeline.add(
+            "merge_sdai",
+            lambda outputs: self.bot.futarchy_router.functions.mergePositions(self.market, self.sdai, plan["merge"]),
+            after=["balance_sdai_yes"], gas=500000,
+        )
+        return pipeline
+
+    def buy_plan(self, gno_out: int) -> TransactionPipeline:
+        """
+        Plan the buy route: split sDAI, balance sDAI-YES, buy GNO-YES/NO, merge, wrap and sell waGNO.
+
+        Every leg up to wrapping uses exact outputs, so only the final waGNO
+        sale waits for a receipt.
+
+        Args:
+            gno_out: GNO-YES and GNO-NO bought (and GNO merged), in wei
+
+        Returns:
+            TransactionPipeline: Plan ready to run
+        """
+        legs = self.solver.buy_synthetic(gno_out)
+        if legs is None:
+            raise ValueError("The buy route cannot absorb this size at the current block")
+
+        buffered = lambda amount: int(amount * (1 + EXACT_OUTPUT_BUFFER))
+        # Split enough for the NO leg; the buffer covers small price moves on exact-output legs
+        split = buffered(legs["sdai_no"])
+        max_wagno = buffered(legs["wagno"])
+        pipeline = self._pipeline()
+        router = self.router.address
+        futarchy_router = CONTRACT_ADDRESSES["futarchyRouter"]
+        self._add_approvals(pipeline, [
+            ("sdai_futarchy_router", self.sdai, futarchy_router, split),
+            ("sdai_router", self.sdai, router, buffered(abs(legs["balance_sdai"]))),
+            ("sdai_yes_router", self.sdai_yes, router, buffered(max(legs["sdai_yes"], legs["sdai_no"]))),
+            ("sdai_no_router", self.sdai_no, router, split),
+            ("gno_yes_futarchy_router", self.gno_yes, futarchy_router, gno_out),
+            ("gno_no_futarchy_router", self.gno_no, futarchy_router, gno_out),
+            ("gno_wagno", self.gno, self.wagno_address, gno_out),
+            ("wagno_permit2", self.wagno_address, CONTRACT_ADDRESSES["permit2"], max_wagno),
+        ])
+        self._add_pool_authorizations(pipeline, ["yes", "no", "sdai_yes"])
+        pipeline.add("permit2_wagno", lambda outputs: self._permit2_approval(self.wagno_address, max_wagno), gas=100000)
+
+        pipeline.add(
+            "split_sdai", lambda outputs: self.bot.futarchy_router.functions.splitPosition(self.market, self.sdai, split),
+            gas=500000,
+        )
+        if legs["balance_sdai"] > 0:
+            balance = lambda outputs: self._v3_swap("sdai_yes", self.sdai, legs["sdai_yes"] - legs["sdai_no"], exact_output=True)
+        elif legs["balance_sdai"] < 0:
+            balance = lambda outputs: self._v3_swap("sdai_yes", self.sdai_yes, legs["sdai_no"] - legs["sdai_yes"])
+        else:
+            balance = lambda outputs: None
+        pipeline.add("balance_sdai_yes", balance, after=["split_sdai"], gas=1000000)
+        pipeline.add(
+            "buy_gno_yes", lambda outputs: self._v3_swap("yes", self.sdai_yes, gno_out, exact_output=True),
+            after=["balance_sdai_yes"], gas=1000000,
+        )
+        pipeline.add(
+            "buy_gno_no", lambda outputs: self._v3_swap("no", self.sdai_no, gno_out, exact_output=True),
+            after=["split_sdai"], gas=1000000,
+        )
+        pipeline.add(
+            "merge_gno", lambda outputs: self.bot.futarchy_router.functions.mergePositions(self.market, self.gno, gno_out),
+            after=["buy_gno_yes", "buy_gno_no"], gas=500000,
+        )
+        pipeline.add(
+            "wrap_gno", lambda outputs: self.wagno.functions.deposit(gno_out, self.address),
+            after=["merge_gno"], gas=400000, outputs=self._received(self.wagno_address, "wagno"),
+        )
+
+        def sell_wagno(outputs):
+            wagno = outputs["wrap_gno"]["wagno"]
+            min_sdai = int(legs["sdai_out"] * wagno / legs["wagno"] * (1 - self.slippage))
+            return self._balancer_swap(self.wagno_address, self.sdai, wagno, min_sdai)
+
+        pipeline.add(
+            "sell_wagno", sell_wagno, needs=["wrap_gno"], gas=500000,
+            outputs=self._received(self.sdai, "sdai"),
+        )
+        return pipeline
@@ -15,15 +15,16 @@ def probability_threshold_strategy(bot, buy_threshold=0.7, sell_threshold=0.3, a
     print(f"\n📊 Probability Threshold Strategy")
     print(f"🎯 Buy when probability > {buy_threshold:.2f}, Sell when probability < {sell_threshold:.2f}")
     
-    # Get market prices
-    prices = bot.get_market_prices()
+    # Get market prices from a single-block snapshot
+    snapshot = bot.get_market_snapshot()
+    prices = bot.get_market_prices(snapshot)
     if not prices:
         print("❌ Failed to get market prices, cannot execute strategy")
         return False
     
     bot.print_market_prices(prices)
     
-    probability = prices['event_probability']
+    probability = prices['probability']
     print(f"📊 Current probability: {probability:.2f}")
     
     # Execute strategy based on probability
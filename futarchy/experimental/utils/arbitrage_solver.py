@@ -0,0 +1,396 @@
+"""
+Optimal trade size solver for synthetic GNO arbitrage.
+
+This module is currently in EXPERIMENTAL status.
+Chains local quotes of every leg of the two synthetic GNO arbitrage routes
+(Balancer waGNO/sDAI, waGNO wrapping, the YES/NO conditional pools and the
+sDAI-YES/sDAI pool) on a snapshot pinned to one block, and searches for the
+input size that maximizes profit net of pool fees and gas. No RPC calls are
+made after the snapshot is loaded.
+"""
+
+import math
+from typing import Any, Callable, Dict, Optional
+
+from futarchy.experimental.config.constants import (
+    TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, CONTRACT_ADDRESSES, BALANCER_CONFIG,
+    SDAI_RATE_PROVIDER_ABI, WAGNO_ABI
+)
+from futarchy.experimental.utils.balancer_math import BalancerPoolState, MAX_IN_RATIO
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot
+
+ONE = 10**18
+
+# Rough gas totals of each route across all legs (token approvals excluded)
+SELL_SYNTHETIC_GAS = 1_300_000
+BUY_SYNTHETIC_GAS = 1_400_000
+
+# Golden-section search settings
+GOLDEN_RATIO = (math.sqrt(5) - 1) / 2
+SEARCH_TOLERANCE = 1e-3  # Relative to the search interval; profit is flat near the optimum
+PROBE_FRACTION = 1e-4  # Size of the first profitability probe, relative to the search interval
+MAX_SEARCH_ITERATIONS = 48
+MIN_TRADE_SIZE = 10**9  # Smallest size worth evaluating, in wei
+
+
+def gas_cost_in_sdai(gas_units: int, gas_price_wei: int, sdai_rate: Optional[int]) -> int:
+    """
+    Convert a gas budget to sDAI wei.
+
+    Args:
+        gas_units: Gas used by the route
+        gas_price_wei: Gas price in xDAI wei
+        sdai_rate: sDAI rate provider value (xDAI per sDAI, 18 decimals)
+
+    Returns:
+        int: Gas cost in sDAI wei
+    """
+    cost = gas_units * gas_price_wei
+    return cost * ONE // sdai_rate if sdai_rate else cost
+
+
+def maximize(profit: Callable[[int], Optional[int]], upper: int) -> Optional[Dict[str, int]]:
+    """
+    Maximize a unimodal profit function of the trade size on [0, upper].
+
+    Sizes the function rejects (None) are assumed to lie above every
+    accepted size, so the upper bound is halved until it is feasible.
+
+    Args:
+        profit: Gross profit in wei for a size in wei, or None if infeasible
+        upper: Largest size to consider
+
+    Returns:
+        dict: "size" and "profit" of the best size, or None if no size is feasible
+    """
+    while upper >= MIN_TRADE_SIZE and profit(upper) is None:
+        upper //= 2
+    if upper < MIN_TRADE_SIZE:
+        return None
+
+    def evaluate(size):
+        value = profit(size) if size > 0 else 0
+        return value if value is not None else -math.inf
+
+    # Without an edge at a small size there is no opportunity (the common case on most blocks)
+    probe = max(MIN_TRADE_SIZE, int(upper * PROBE_FRACTION))
+    probe_profit = evaluate(probe)
+    if probe_profit <= 0:
+        return {"size": probe, "profit": probe_profit}
+
+    low, high = 0, upper
+    left = int(high - GOLDEN_RATIO * (high - low))
+    right = int(low + GOLDEN_RATIO * (high - low))
+    left_profit, right_profit = evaluate(left), evaluate(right)
+
+    for _ in range(MAX_SEARCH_ITERATIONS):
+        if high - low <= max(MIN_TRADE_SIZE, upper * SEARCH_TOLERANCE):
+            break
+        if left_profit >= right_profit:
+            high, right, right_profit = right, left, left_profit
+            left = int(high - GOLDEN_RATIO * (high - low))
+            left_profit = evaluate(left)
+        else:
+            low, left, left_profit = left, right, right_profit
+            right = int(low + GOLDEN_RATIO * (high - low))
+            right_profit = evaluate(right)
+
+    size, best = (left, left_profit) if left_profit >= right_profit else (right, right_profit)
+    # The optimum can sit on the boundary of the interval
+    upper_profit = profit(upper)
+    if upper_profit is not None and upper_profit > best:
+        size, best = upper, upper_profit
+    return {"size": size, "profit": best}
+
+
+class SyntheticArbitrageSolver:
+    """Local model of both synthetic GNO arbitrage routes at one block"""
+
+    def __init__(self, balancer: BalancerPoolState, yes_pool: V3PoolSnapshot, no_pool: V3PoolSnapshot,
+                 sdai_yes_pool: V3PoolSnapshot, gno_per_wagno: int, sdai_rate: Optional[int] = None,
+                 block_number: Optional[int] = None):
+        """
+        Initialize the solver from pinned pool state.
+
+        Args:
+            balancer: State of the Balancer waGNO/sDAI pool
+            yes_pool: Snapshot of the GNO-YES/sDAI-YES pool
+            no_pool: Snapshot of the GNO-NO/sDAI-NO pool
+            sdai_yes_pool: Snapshot of the sDAI-YES/sDAI pool
+            gno_per_wagno: GNO wei per waGNO (waGNO convertToAssets(1e18))
+            sdai_rate: sDAI rate provider value, used to price gas in sDAI
+            block_number: Block the state was read at
+        """
+        self.balancer = balancer
+        self.yes_pool = yes_pool
+        self.no_pool = no_pool
+        self.sdai_yes_pool = sdai_yes_pool
+        self.gno_per_wagno = int(gno_per_wagno)
+        self.sdai_rate = sdai_rate
+        self.block_number = block_number
+
+        self.sdai = TOKEN_CONFIG["currency"]["address"]
+        self.sdai_yes = TOKEN_CONFIG["currency"]["yes_address"]
+        self.sdai_no = TOKEN_CONFIG["currency"]["no_address"]
+        self.gno_yes = TOKEN_CONFIG["company"]["yes_address"]
+        self.gno_no = TOKEN_CONFIG["company"]["no_address"]
+        self.wagno = TOKEN_CONFIG["wagno"]["address"]
+
+    @classmethod
+    def load(cls, w3, multicall, metadata=None, block_identifier: Any = "latest") -> "SyntheticArbitrageSolver":
+        """
+        Read every pool and rate the routes depend on, pinned to one block.
+
+        Args:
+            w3: Web3 instance
+            multicall: utils.multicall.Multicall instance
+            metadata: Optional MetadataCache for pool fees, spacings and tokens
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            SyntheticArbitrageSolver: Solver over the pinned state
+        """
+        balancer = BalancerPoolState.load(
+            w3, BALANCER_CONFIG["pool_address"], multicall=multicall, block_identifier=block_identifier
+        )
+        block_number = balancer.block_number
+
+        snapshots = [
+            V3PoolSnapshot.load(w3, address, multicall=multicall, metadata=metadata, block_identifier=block_number)
+            for address in (POOL_CONFIG_YES["address"], POOL_CONFIG_NO["address"], CONTRACT_ADDRESSES["sdaiYesPool"])
+        ]
+
+        wagno = w3.eth.contract(address=w3.to_checksum_address(TOKEN_CONFIG["wagno"]["address"]), abi=WAGNO_ABI)
+        rate_provider = w3.eth.contract(
+            address=w3.to_checksum_address(CONTRACT_ADDRESSES["sdaiRateProvider"]), abi=SDAI_RATE_PROVIDER_ABI
+        )
+        _, (gno_per_wagno, sdai_rate) = multicall.call_functions(
+            [wagno.functions.convertToAssets(ONE), rate_provider.functions.getRate()], block_number
+        )
+        if gno_per_wagno is None:
+            raise ValueError("Could not read the waGNO conversion rate")
+
+        return cls(balancer, *snapshots, gno_per_wagno, sdai_rate=sdai_rate, block_number=block_number)
+
+    def sell_synthetic(self, sdai_in: int) -> Optional[Dict[str, int]]:
+        """
+        Simulate the sell route: buy waGNO, unwrap, split, sell GNO-YES/NO,
+        balance sDAI-YES/NO on the sDAI-YES pool and merge.
+
+        Args:
+            sdai_in: sDAI spent, in wei
+
+        Returns:
+            dict: Amounts of every leg and "sdai_out", or None if a leg is out of range
+        """
+        try:
+            wagno = self.balancer.quote_exact_in(self.sdai, self.wagno, sdai_in)
+        except ValueError:
+            return None
+        gno = wagno * self.gno_per_wagno // ONE
+
+        yes_swap = self.yes_pool.quote_exact_input(self.gno_yes, gno)
+        no_swap = self.no_pool.quote_exact_input(self.gno_no, gno)
+        if not (yes_swap["complete"] and no_swap["complete"]):
+            return None
+        sdai_yes, sdai_no = yes_swap["amount_out"], no_swap["amount_out"]
+
+        # Sell the excess sDAI-YES (or buy the missing sDAI-YES), then merge sdai_no pairs
+        if sdai_yes > sdai_no:
+            balance = self.sdai_yes_pool.quote_exact_input(self.sdai_yes, sdai_yes - sdai_no)
+            if not balance["complete"]:
+                return None
+            balance_sdai = balance["amount_out"]
+        elif sdai_yes < sdai_no:
+            balance = self.sdai_yes_pool.quote_exact_output(self.sdai, sdai_no - sdai_yes)
+            if not balance["complete"]:
+                return None
+            balance_sdai = -balance["amount_in"]
+        else:
+            balance_sdai = 0
+        sdai_out = sdai_no + balance_sdai
+
+        return {
+            "sdai_in": sdai_in,
+            "wagno": wagno,
+            "gno": gno,
+            "sdai_yes": sdai_yes,
+            "sdai_no": sdai_no,
+            "balance_sdai": balance_sdai,
+            "sdai_out": sdai_out,
+        }
+
+    def buy_synthetic(self, gno_out: int) -> Optional[Dict[str, int]]:
+        """
+        Simulate the buy route for a target GNO amount: split sDAI, balance
+        sDAI-YES on the sDAI-YES pool, buy GNO-YES/NO, merge, wrap and sell
+        waGNO on Balancer.
+
+        Args:
+            gno_out: GNO-YES and GNO-NO bought (and GNO merged), in wei
+
+        Returns:
+            dict: Amounts of every leg with "sdai_in" and "sdai_out", or None if a leg is out of range
+        """
+        yes_swap = self.yes_pool.quote_exact_output(self.sdai_yes, gno_out)
+        no_swap = self.no_pool.quote_exact_output(self.sdai_no, gno_out)
+        if not (yes_swap["complete"] and no_swap["complete"]):
+            return None
+        sdai_yes, sdai_no = yes_swap["amount_in"], no_swap["amount_in"]
+
+        # Split enough sDAI for the NO leg, then buy or sell sDAI-YES to match the YES leg
+        if sdai_yes > sdai_no:
+            balance = self.sdai_yes_pool.quote_exact_output(self.sdai, sdai_yes - sdai_no)
+            if not balance["complete"]:
+                return None
+            balance_sdai = balance["amount_in"]
+        elif sdai_yes < sdai_no:
+            balance = self.sdai_yes_pool.quote_exact_input(self.sdai_yes, sdai_no - sdai_yes)
+            if not balance["complete"]:
+                return None
+            balance_sdai = -balance["amount_out"]
+        else:
+            balance_sdai = 0
+        sdai_in = sdai_no + balance_sdai
+
+        wagno = gno_out * ONE // self.gno_per_wagno
+        try:
+            sdai_out = self.balancer.quote_exact_in(self.wagno, self.sdai, wagno)
+        except ValueError:
+            return None
+
+        return {
+            "sdai_in": sdai_in,
+            "sdai_yes": sdai_yes,
+            "sdai_no": sdai_no,
+            "balance_sdai": balance_sdai,
+            "gno": gno_out,
+            "wagno": wagno,
+            "sdai_out": sdai_out,
+        }
+
+    def _result(self, direction: str, legs: Optional[Dict[str, int]], gas_cost: int) -> Dict[str, Any]:
+        """Build the solver result for a route and its best legs."""
+        if legs is None:
+            return {"direction": direction, "block_number": self.block_number, "profitable": False,
+                    "sdai_in": 0, "gross_profit": 0, "gas_cost": gas_cost, "profit": -gas_cost, "legs": None}
+
+        gross_profit = legs["sdai_out"] - legs["sdai_in"]
+        return {
+            "direction": direction,
+            "block_number": self.block_number,
+            "profitable": gross_profit > gas_cost,
+            "sdai_in": legs["sdai_in"],
+            "gross_profit": gross_profit,
+            "gas_cost": gas_cost,
+            "profit": gross_profit - gas_cost,
+            "legs": legs,
+        }
+
+    def optimize_sell(self, max_sdai_in: Optional[int] = None, gas_cost: int = 0) -> Dict[str, Any]:
+        """
+        Find the profit-maximizing sDAI input of the sell route.
+
+        Args:
+            max_sdai_in: Upper bound on the sDAI spent (e.g. the wallet balance), in wei
+            gas_cost: Gas cost of the route in sDAI wei
+
+        Returns:
+            dict: direction, block_number, profitable, sdai_in, gross_profit, gas_cost, profit and legs
+        """
+        def profit(size):
+            legs = self.sell_synthetic(size)
+            return legs["sdai_out"] - size if legs is not None else None
+
+        # Balancer rejects inputs above its max in ratio
+        upper = self.balancer.balances[self.balancer.index(self.sdai)] * MAX_IN_RATIO // ONE
+        upper = self.balancer.to_raw(upper, self.balancer.index(self.sdai))
+        if max_sdai_in is not None:
+            upper = min(upper, int(max_sdai_in))
+
+        best = maximize(profit, upper)
+        legs = self.sell_synthetic(best["size"]) if best is not None and best["profit"] > 0 else None
+        return self._result("sell", legs, gas_cost)
+
+    def optimize_buy(self, max_sdai_in: Optional[int] = None, gas_cost: int = 0) -> Dict[str, Any]:
+        """
+        Find the profit-maximizing size of the buy route.
+
+        Args:
+            max_sdai_in: Upper bound on the sDAI spent (e.g. the wallet balance), in wei
+            gas_cost: Gas cost of the route in sDAI wei
+
+        Returns:
+            dict: Same keys as optimize_sell; sdai_in is the sDAI the route spends
+        """
+        def profit(size):
+            legs = self.buy_synthetic(size)
+            if legs is None or (max_sdai_in is not None and legs["sdai_in"] > max_sdai_in):
+                return None
+            return legs["sdai_out"] - legs["sdai_in"]
+
+        # Sized in GNO; Balancer rejects waGNO inputs above its max in ratio
+        index = self.balancer.index(self.wagno)
+        max_wagno = self.balancer.to_raw(self.balancer.balances[index] * MAX_IN_RATIO // ONE, index)
+        upper = max_wagno * self.gno_per_wagno // ONE
+
+        best = maximize(profit, upper)
+        legs = self.buy_synthetic(best["size"]) if best is not None and best["profit"] > 0 else None
+        return self._result("buy", legs, gas_cost)
+
+    def evaluate_sell(self, sdai_in: int, gas_cost: int = 0) -> Dict[str, Any]:
+        """
+        Quote the sell route for a fixed sDAI input, without searching.
+
+        Args:
+            sdai_in: sDAI spent, in wei
+            gas_cost: Gas cost of the route in sDAI wei
+
+        Returns:
+            dict: Same keys as optimize_sell (legs is None if a leg is out of range)
+        """
+        return self._result("sell", self.sell_synthetic(int(sdai_in)), gas_cost)
+
+    def evaluate_buy(self, sdai_in: int, gas_cost: int = 0) -> Dict[str, Any]:
+        """
+        Quote the buy route spending at most a fixed sDAI amount, without searching for profit.
+
+        The route is sized in GNO, so the largest GNO amount whose legs cost no more
+        than sdai_in is found by bisection (the sDAI cost grows with the size).
+
+        Args:
+            sdai_in: Most sDAI to spend, in wei
+            gas_cost: Gas cost of the route in sDAI wei
+
+        Returns:
+            dict: Same keys as optimize_buy (legs is None if no size fits)
+        """
+        def fits(size):
+            legs = self.buy_synthetic(size)
+            return legs if legs is not None and legs["sdai_in"] <= sdai_in else None
+
+        index = self.balancer.index(self.wagno)
+        max_wagno = self.balancer.to_raw(self.balancer.balances[index] * MAX_IN_RATIO // ONE, index)
+        low, high = 0, max_wagno * self.gno_per_wagno // ONE
+        while high - low > MIN_TRADE_SIZE:
+            middle = (low + high) // 2
+            if fits(middle) is not None:
+                low = middle
+            else:
+                high = middle
+        return self._result("buy", fits(low) if low > 0 else None, gas_cost)
+
+    def optimize(self, max_sdai_in: Optional[int] = None, gas_price_wei: int = 0) -> Dict[str, Any]:
+        """
+        Solve both routes and return the more profitable one.
+
+        Args:
+            max_sdai_in: Upper bound on the sDAI spent, in wei
+            gas_price_wei: Gas price in xDAI wei (0 to ignore gas)
+
+        Returns:
+            dict: Result of optimize_sell or optimize_buy, whichever has the higher profit
+        """
+        sell = self.optimize_sell(max_sdai_in, gas_cost_in_sdai(SELL_SYNTHETIC_GAS, gas_price_wei, self.sdai_rate))
+        buy = self.optimize_buy(max_sdai_in, gas_cost_in_sdai(BUY_SYNTHETIC_GAS, gas_price_wei, self.sdai_rate))
+        return sell if sell["profit"] >= buy["profit"] else buy
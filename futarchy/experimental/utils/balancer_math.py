@@ -0,0 +1,453 @@
+"""
+Local Balancer V3 pool math.
+
+This module is currently in EXPERIMENTAL status.
+Loads everything a Balancer V3 swap reads (live balances, decimal scaling
+factors, token rates, static swap fee and the pool's weights or
+amplification) in one Multicall3 batch, then quotes swaps and solves for
+price-impact sizes locally with a port of the Vault's FixedPoint,
+WeightedMath and StableMath libraries. Weighted pools with equal weights and
+stable pools match the Vault to the wei; other weight ratios go through a
+high-precision power function and can differ by a few wei.
+"""
+
+import math
+from decimal import Decimal, localcontext
+from typing import Any, List, Optional, Sequence
+
+from futarchy.experimental.config.constants import (
+    CONTRACT_ADDRESSES, BALANCER_V3_VAULT_ABI, BALANCER_V3_POOL_ABI
+)
+
+ONE = 10**18
+TWO = 2 * ONE
+FOUR = 4 * ONE
+
+# FixedPoint.powUp error margin (relative, 18 decimals)
+MAX_POW_RELATIVE_ERROR = 10000
+
+# WeightedMath limits on the input as a fraction of the balance
+MAX_IN_RATIO = 30 * 10**16
+
+# StableMath amplification precision and iteration limit
+AMP_PRECISION = 1000
+MAX_STABLE_ITERATIONS = 255
+
+# Solver limits for price-impact sizes (Newton for weighted, bisection for stable)
+MAX_NEWTON_ITERATIONS = 8
+MAX_SOLVER_ITERATIONS = 256
+
+
+# --- FixedPoint ---
+
+def mul_down(a: int, b: int) -> int:
+    """a * b / 1e18 rounded down."""
+    return a * b // ONE
+
+
+def mul_up(a: int, b: int) -> int:
+    """a * b / 1e18 rounded up."""
+    product = a * b
+    return 0 if product == 0 else (product - 1) // ONE + 1
+
+
+def div_down(a: int, b: int) -> int:
+    """a * 1e18 / b rounded down."""
+    if b == 0:
+        raise ZeroDivisionError("FixedPoint division by zero")
+    return a * ONE // b
+
+
+def div_up(a: int, b: int) -> int:
+    """a * 1e18 / b rounded up."""
+    if b == 0:
+        raise ZeroDivisionError("FixedPoint division by zero")
+    return 0 if a == 0 else (a * ONE - 1) // b + 1
+
+
+def div_up_raw(a: int, b: int) -> int:
+    """a / b rounded up, without fixed point scaling."""
+    return 0 if a == 0 else (a - 1) // b + 1
+
+
+def complement(x: int) -> int:
+    """1 - x, floored at zero."""
+    return ONE - x if x < ONE else 0
+
+
+def pow_raw(x: int, y: int) -> int:
+    """x ** y in 18-decimal fixed point, rounded down (LogExpMath.pow equivalent)."""
+    if y == 0:
+        return ONE
+    if x == 0:
+        return 0
+    with localcontext() as context:
+        context.prec = 60
+        result = (Decimal(x) / ONE) ** (Decimal(y) / ONE)
+        return int(result * ONE)
+
+
+def pow_up(x: int, y: int) -> int:
+    """FixedPoint.powUp: x ** y rounded up, exact for exponents of 1, 2 and 4."""
+    if y == ONE:
+        return x
+    if y == TWO:
+        return mul_up(x, x)
+    if y == FOUR:
+        square = mul_up(x, x)
+        return mul_up(square, square)
+    raw = pow_raw(x, y)
+    return raw + mul_up(raw, MAX_POW_RELATIVE_ERROR) + 1
+
+
+# --- WeightedMath ---
+
+def weighted_out_given_exact_in(balance_in: int, weight_in: int, balance_out: int,
+                                weight_out: int, amount_in: int) -> int:
+    """
+    WeightedMath.computeOutGivenExactIn on scaled18 amounts.
+
+    Args:
+        balance_in: Live balance of the input token
+        weight_in: Normalized weight of the input token
+        balance_out: Live balance of the output token
+        weight_out: Normalized weight of the output token
+        amount_in: Input amount after the swap fee
+
+    Returns:
+        int: Output amount (scaled18)
+    """
+    if amount_in > mul_down(balance_in, MAX_IN_RATIO):
+        raise ValueError("Swap exceeds the weighted pool's max in ratio")
+
+    base = div_up(balance_in, balance_in + amount_in)
+    power = pow_up(base, div_down(weight_in, weight_out))
+    return mul_down(balance_out, complement(power))
+
+
+# --- StableMath ---
+
+def stable_invariant(amp: int, balances: Sequence[int]) -> int:
+    """
+    StableMath.computeInvariant.
+
+    Args:
+        amp: Amplification parameter including AMP_PRECISION
+        balances: Live balances (scaled18)
+
+    Returns:
+        int: Invariant D, rounded down
+    """
+    total = sum(balances)
+    if total == 0:
+        return 0
+
+    num_tokens = len(balances)
+    invariant = total
+    amp_times_total = amp * num_tokens
+
+    for _ in range(MAX_STABLE_ITERATIONS):
+        d_p = invariant
+        for balance in balances:
+            d_p = d_p * invariant // (balance * num_tokens)
+
+        previous = invariant
+        invariant = (
+            (amp_times_total * total // AMP_PRECISION + d_p * num_tokens) * invariant
+            // ((amp_times_total - AMP_PRECISION) * invariant // AMP_PRECISION + (num_tokens + 1) * d_p)
+        )
+        if abs(invariant - previous) <= 1:
+            return invariant
+
+    raise ValueError("Stable invariant did not converge")
+
+
+def stable_balance(amp: int, balances: Sequence[int], invariant: int, token_index: int) -> int:
+    """
+    StableMath.computeBalance: balance of one token that keeps the invariant.
+
+    Args:
+        amp: Amplification parameter including AMP_PRECISION
+        balances: Live balances (scaled18)
+        invariant: Invariant D
+        token_index: Index of the token to solve for
+
+    Returns:
+        int: Token balance, rounded up
+    """
+    num_tokens = len(balances)
+    amp_times_total = amp * num_tokens
+
+    total = balances[0]
+    p_d = balances[0] * num_tokens
+    for balance in balances[1:]:
+        p_d = p_d * balance * num_tokens // invariant
+        total += balance
+    total -= balances[token_index]
+
+    invariant_squared = invariant * invariant
+    c = div_up_raw(invariant_squared * AMP_PRECISION, amp_times_total * p_d) * balances[token_index]
+    b = total + invariant * AMP_PRECISION // amp_times_total
+
+    token_balance = div_up_raw(invariant_squared + c, invariant + b)
+    for _ in range(MAX_STABLE_ITERATIONS):
+        previous = token_balance
+        token_balance = div_up_raw(token_balance * token_balance + c, token_balance * 2 + b - invariant)
+        if abs(token_balance - previous) <= 1:
+            return token_balance
+
+    raise ValueError("Stable balance did not converge")
+
+
+def stable_out_given_exact_in(amp: int, balances: Sequence[int], index_in: int, index_out: int,
+                              amount_in: int, invariant: int) -> int:
+    """StableMath.computeOutGivenExactIn on scaled18 amounts."""
+    balances = list(balances)
+    balances[index_in] += amount_in
+    final_balance_out = stable_balance(amp, balances, invariant, index_out)
+    return balances[index_out] - final_balance_out - 1
+
+
+class BalancerPoolState:
+    """State of a Balancer V3 weighted or stable pool at one block, with local swap math"""
+
+    def __init__(self, tokens: Sequence[str], balances: Sequence[int], scaling_factors: Sequence[int],
+                 rates: Sequence[int], swap_fee: int, weights: Optional[Sequence[int]] = None,
+                 amp: Optional[int] = None, block_number: Optional[int] = None,
+                 pool_address: Optional[str] = None):
+        """
+        Initialize the pool state.
+
+        Args:
+            tokens: Pool token addresses in Vault order
+            balances: Live balances (scaled18, rates applied)
+            scaling_factors: Decimal scaling factors (10 ** (18 - decimals))
+            rates: Token rates (18 decimals, 1e18 for tokens without a rate provider)
+            swap_fee: Static swap fee percentage (18 decimals)
+            weights: Normalized weights for weighted pools
+            amp: Amplification parameter (including AMP_PRECISION) for stable pools
+            block_number: Block the state was read at
+            pool_address: Pool address
+        """
+        if (weights is None) == (amp is None):
+            raise ValueError("Pool state needs exactly one of weights or amp")
+
+        self.tokens = [token.lower() for token in tokens]
+        self.balances = [int(balance) for balance in balances]
+        self.scaling_factors = [int(factor) for factor in scaling_factors]
+        self.rates = [int(rate) for rate in rates]
+        self.swap_fee = int(swap_fee)
+        self.weights = [int(weight) for weight in weights] if weights is not None else None
+        self.amp = int(amp) if amp is not None else None
+        self.block_number = block_number
+        self.pool_address = pool_address
+
+    @classmethod
+    def load(cls, w3, pool_address: str, multicall=None, vault_address: Optional[str] = None,
+             block_identifier: Any = "latest") -> "BalancerPoolState":
+        """
+        Read a pool's swap state from the Balancer V3 Vault.
+
+        With a multicall all reads come from one eth_call at one block.
+
+        Args:
+            w3: Web3 instance
+            pool_address: Balancer V3 pool address
+            multicall: Optional utils.multicall.Multicall instance to batch the reads
+            vault_address: V3 Vault address (defaults to CONTRACT_ADDRESSES["balancerV3Vault"])
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            BalancerPoolState: Pool state at a single block
+        """
+        pool_address = w3.to_checksum_address(pool_address)
+        vault = w3.eth.contract(
+            address=w3.to_checksum_address(vault_address or CONTRACT_ADDRESSES["balancerV3Vault"]),
+            abi=BALANCER_V3_VAULT_ABI
+        )
+        pool = w3.eth.contract(address=pool_address, abi=BALANCER_V3_POOL_ABI)
+
+        functions = [
+            vault.functions.getPoolTokenInfo(pool_address),
+            vault.functions.getCurrentLiveBalances(pool_address),
+            vault.functions.getPoolTokenRates(pool_address),
+            vault.functions.getStaticSwapFeePercentage(pool_address),
+            pool.functions.getNormalizedWeights(),
+            pool.functions.getAmplificationParameter(),
+        ]
+
+        if multicall is not None:
+            block_number, results = multicall.call_functions(functions, block_identifier)
+        else:
+            block_number = w3.eth.block_number if block_identifier == "latest" else block_identifier
+            results = []
+            for function in functions:
+                try:
+                    results.append(function.call(block_identifier=block_number))
+                except Exception:
+                    # Only one of the weight/amp views exists on a given pool
+                    results.append(None)
+
+        token_info, balances, rates, swap_fee, weights, amp = results
+        if token_info is None or balances is None or rates is None or swap_fee is None:
+            raise ValueError(f"Could not read Balancer V3 state of pool {pool_address}")
+        if weights is None and amp is None:
+            raise ValueError(f"Pool {pool_address} is neither a weighted nor a stable pool")
+
+        return cls(
+            token_info[0], balances, rates[0], rates[1], swap_fee,
+            weights=list(weights) if weights is not None else None,
+            amp=amp[0] if weights is None else None,
+            block_number=block_number, pool_address=pool_address
+        )
+
+    @property
+    def is_weighted(self) -> bool:
+        """True for weighted pools, False for stable pools."""
+        return self.weights is not None
+
+    def index(self, token: str) -> int:
+        """Vault index of a pool token."""
+        try:
+            return self.tokens.index(token.lower())
+        except ValueError:
+            raise ValueError(f"Token {token} is not in pool {self.pool_address}")
+
+    def to_scaled18(self, amount: int, index: int) -> int:
+        """Raw token amount to scaled18, rounded down (toScaled18ApplyRateRoundDown)."""
+        return mul_down(amount * self.scaling_factors[index], self.rates[index])
+
+    def to_raw(self, amount: int, index: int, round_up: bool = False) -> int:
+        """Scaled18 amount to raw token units (toRawUndoRateRoundDown/Up)."""
+        divisor = self.scaling_factors[index] * self.rates[index]
+        return div_up(amount, divisor) if round_up else div_down(amount, divisor)
+
+    def _out_given_in(self, balances: List[int], index_in: int, index_out: int, amount_in: int) -> int:
+        """Pool output for a post-fee scaled18 input."""
+        if self.is_weighted:
+            return weighted_out_given_exact_in(
+                balances[index_in], self.weights[index_in],
+                balances[index_out], self.weights[index_out], amount_in
+            )
+        invariant = stable_invariant(self.amp, balances)
+        return stable_out_given_exact_in(self.amp, balances, index_in, index_out, amount_in, invariant)
+
+    def _swap(self, index_in: int, index_out: int, amount_in_scaled18: int):
+        """Apply the swap fee and the pool math; returns (amount_out_scaled18, new balances)."""
+        fee = mul_up(amount_in_scaled18, self.swap_fee)
+        amount_out = self._out_given_in(self.balances, index_in, index_out, amount_in_scaled18 - fee)
+
+        balances = list(self.balances)
+        # The LP share of the fee stays in the pool
+        balances[index_in] += amount_in_scaled18
+        balances[index_out] -= amount_out
+        return amount_out, balances
+
+    def quote_exact_in(self, token_in: str, token_out: str, amount_in: int) -> int:
+        """
+        Output of an exact-input swap, as querySwapExactIn would return it.
+
+        Args:
+            token_in: Token sold
+            token_out: Token bought
+            amount_in: Input amount in raw token units
+
+        Returns:
+            int: Output amount in raw token units
+        """
+        index_in, index_out = self.index(token_in), self.index(token_out)
+        amount_out, _ = self._swap(index_in, index_out, self.to_scaled18(amount_in, index_in))
+        return self.to_raw(amount_out, index_out)
+
+    def _spot_price(self, balances: Sequence[int], index_in: int, index_out: int) -> float:
+        """Marginal price of the output token in input token units, on scaled18 balances, before fees."""
+        if self.is_weighted:
+            return (balances[index_in] / self.weights[index_in]) / (balances[index_out] / self.weights[index_out])
+
+        # dx_in / dx_out along the StableSwap invariant
+        num_tokens = len(balances)
+        invariant = stable_invariant(self.amp, balances)
+        amp_times_total = self.amp * num_tokens / AMP_PRECISION
+        d_p = float(invariant)
+        for balance in balances:
+            d_p = d_p * invariant / (balance * num_tokens)
+        return (amp_times_total + d_p / balances[index_out]) / (amp_times_total + d_p / balances[index_in])
+
+    def spot_price(self, token_in: str, token_out: str) -> float:
+        """
+        Current marginal price of token_out in token_in units, excluding the swap fee.
+
+        Args:
+            token_in: Token sold
+            token_out: Token bought
+
+        Returns:
+            float: token_in per token_out (raw units)
+        """
+        index_in, index_out = self.index(token_in), self.index(token_out)
+        scaled_price = self._spot_price(self.balances, index_in, index_out)
+        return (
+            scaled_price
+            * (self.scaling_factors[index_out] * self.rates[index_out])
+            / (self.scaling_factors[index_in] * self.rates[index_in])
+        )
+
+    def amount_in_for_price_impact(self, token_in: str, token_out: str, price_impact: float) -> int:
+        """
+        Input amount that raises the spot price of token_out by price_impact.
+
+        Weighted pools are solved in closed form; stable pools by bisection on
+        the local swap math. No RPC calls are made.
+
+        Args:
+            token_in: Token sold
+            token_out: Token bought
+            price_impact: Relative move of the spot price (0.001 for 0.1%)
+
+        Returns:
+            int: Input amount in raw token units, including the swap fee
+        """
+        index_in, index_out = self.index(token_in), self.index(token_out)
+        if price_impact <= 0:
+            return 0
+
+        if self.is_weighted:
+            balance_in = self.balances[index_in]
+            ratio = self.weights[index_in] / self.weights[index_out]
+            fee = self.swap_fee / ONE
+            # The spot price moves by (1 + x/B) * (1 + x(1-f)/B) ** ratio for a
+            # gross input x: solve in log space, starting from the fee-free
+            # closed form, with a few Newton steps
+            target = math.log1p(price_impact)
+            gross_in = balance_in * ((1 + price_impact) ** (1 / (1 + ratio)) - 1) / (1 - fee)
+            for _ in range(MAX_NEWTON_ITERATIONS):
+                net_in = gross_in * (1 - fee)
+                error = math.log1p(gross_in / balance_in) + ratio * math.log1p(net_in / balance_in) - target
+                slope = 1 / (balance_in + gross_in) + ratio * (1 - fee) / (balance_in + net_in)
+                gross_in -= error / slope
+                if abs(error) < 1e-15:
+                    break
+            return self.to_raw(math.ceil(gross_in), index_in, round_up=True)
+
+        target = self._spot_price(self.balances, index_in, index_out) * (1 + price_impact)
+
+        def price_after(amount_in: int) -> float:
+            _, balances = self._swap(index_in, index_out, amount_in)
+            return self._spot_price(balances, index_in, index_out)
+
+        low, high = 0, max(self.balances[index_in] // 1000, 1)
+        while price_after(high) < target:
+            low, high = high, high * 2
+            if high > self.balances[index_out] * 1000:
+                raise ValueError("Price impact not reachable in this pool")
+
+        for _ in range(MAX_SOLVER_ITERATIONS):
+            if high - low <= 1:
+                break
+            middle = (low + high) // 2
+            if price_after(middle) < target:
+                low = middle
+            else:
+                high = middle
+
+        return self.to_raw(high, index_in, round_up=True)
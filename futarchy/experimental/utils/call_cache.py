@@ -0,0 +1,175 @@
+"""
+Per-block eth_call cache for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Provides a Web3 middleware that memoizes eth_call responses keyed on
+(to, from, calldata, block). Calls against "latest" are keyed on the current
+block number, so the cache is invalidated as soon as a new block arrives.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Block tags that always mean "the chain head as of now" ("safe" and
+# "finalized" lag behind the head, so they are not cached)
+HEAD_TAGS = (None, "latest")
+
+
+class BlockCallCache:
+    """Read-through cache for eth_call results, invalidated on every new block"""
+
+    def __init__(self, max_entries: int = 4096, block_poll_interval: float = 1.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached responses (least recently used are evicted)
+            block_poll_interval: Seconds a known head block number is trusted before re-checking
+        """
+        self.max_entries = max_entries
+        self.block_poll_interval = block_poll_interval
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._head_block: Optional[int] = None
+        self._head_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            dict: hits, misses, hit_rate, entries, invalidations and the current head block
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._entries),
+            "invalidations": self.invalidations,
+            "head_block": self._head_block,
+        }
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def _set_head_block(self, block_number: int):
+        """Record the chain head, dropping head-keyed entries when it moves."""
+        with self._lock:
+            if self._head_block is not None and block_number != self._head_block:
+                self._entries = OrderedDict(
+                    (key, value) for key, value in self._entries.items() if key[0] != "head"
+                )
+                self.invalidations += 1
+            self._head_block = block_number
+            self._head_checked_at = time.monotonic()
+
+    def _current_head(self, make_request) -> Optional[int]:
+        """Return the head block number, refreshing it if the last check is stale."""
+        if self._head_block is None or time.monotonic() - self._head_checked_at > self.block_poll_interval:
+            response = make_request("eth_blockNumber", [])
+            if "result" in response and response["result"] is not None:
+                self._set_head_block(int(response["result"], 16))
+        return self._head_block
+
+    def _cache_key(self, params, make_request) -> Optional[Tuple]:
+        """Build the cache key for eth_call params, or None if the call is not cacheable."""
+        if not params or not isinstance(params[0], dict):
+            return None
+
+        tx = params[0]
+        block = params[1] if len(params) > 1 else "latest"
+        call_key = (
+            str(tx.get("to", "")).lower(),
+            str(tx.get("from", "")).lower(),
+            str(tx.get("data", tx.get("input", ""))).lower(),
+            str(tx.get("value", "")),
+        )
+
+        if block in HEAD_TAGS:
+            head = self._current_head(make_request)
+            if head is None:
+                return None
+            return ("head", head) + call_key
+        if isinstance(block, int) or (isinstance(block, str) and block.startswith("0x") and len(block) < 66):
+            # Explicit block numbers never change, so these entries survive new blocks
+            block_number = block if isinstance(block, int) else int(block, 16)
+            return ("pinned", block_number) + call_key
+        # "pending", "safe", "finalized", "earliest" and block hashes are not cached
+        return None
+
+    def wrap_make_request(self, make_request):
+        """
+        Wrap a provider make_request function with the cache.
+
+        Args:
+            make_request: Next make_request in the middleware chain
+
+        Returns:
+            function: make_request with eth_call caching
+        """
+        def middleware(method, params):
+            if method == "eth_call":
+                key = self._cache_key(params, make_request)
+                if key is not None:
+                    with self._lock:
+                        cached = self._entries.get(key)
+                        if cached is not None:
+                            self._entries.move_to_end(key)
+                            self.hits += 1
+                            return dict(cached)
+                        self.misses += 1
+
+                    response = make_request(method, params)
+                    if "error" not in response:
+                        with self._lock:
+                            self._entries[key] = dict(response)
+                            while len(self._entries) > self.max_entries:
+                                self._entries.popitem(last=False)
+                    return response
+                return make_request(method, params)
+
+            response = make_request(method, params)
+
+            if method == "eth_blockNumber" and "result" in response and response["result"] is not None:
+                self._set_head_block(int(response["result"], 16))
+            elif method in ("eth_sendRawTransaction", "eth_sendTransaction"):
+                # Our own transaction may change state read at the head block
+                with self._lock:
+                    self._head_checked_at = 0.0
+                    self._head_block = None
+                    self._entries = OrderedDict(
+                        (key, value) for key, value in self._entries.items() if key[0] != "head"
+                    )
+
+            return response
+
+        return middleware
+
+    def middleware(self, make_request, w3):
+        """web3.py v6 style middleware factory."""
+        return self.wrap_make_request(make_request)
+
+    def as_web3_v7_middleware(self):
+        """
+        Build a web3.py v7 middleware class bound to this cache.
+
+        Returns:
+            type: Web3Middleware subclass to pass to middleware_onion.add
+        """
+        from web3.middleware import Web3Middleware
+
+        cache = self
+
+        class EthCallCacheMiddleware(Web3Middleware):
+            def wrap_make_request(self, make_request):
+                return cache.wrap_make_request(make_request)
+
+        return EthCallCacheMiddleware
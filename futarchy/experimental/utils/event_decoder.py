@@ -0,0 +1,384 @@
+"""
+Precompiled event log decoder for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Compiles the event entries of the project ABIs once into a topic0 ->
+layout table: for every field, whether it comes from a topic or from a
+fixed 32-byte word of the data, and how to convert it, generated as one
+straight-line function per event. Decoding a log is then a dict lookup
+plus bytes slicing into a per-event record class with `__slots__`, with
+no hex string round trips or per-log ABI parsing. Data
+types without a fixed layout (tuples, nested arrays) fall back to eth_abi.
+NumPy is optional: with it, records can be packed into structured arrays;
+without it, columns are plain lists.
+"""
+
+import keyword
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; columns fall back to plain Python lists
+    np = None
+
+from eth_abi import decode as abi_decode
+from eth_utils.abi import collapse_if_tuple, event_abi_to_log_topic
+
+from futarchy.experimental.config import abis
+from futarchy.experimental.config.contracts import CONTRACT_ADDRESSES
+from futarchy.experimental.config.tokens import TOKEN_CONFIG
+
+# ABIs whose events are decoded by default
+DEFAULT_EVENT_ABIS = ("ERC20_ABI", "UNISWAP_V3_POOL_ABI", "CONDITIONAL_TOKENS_ABI")
+
+_from_bytes = int.from_bytes
+
+
+def _as_bytes(value) -> bytes:
+    """Plain bytes of a HexBytes/bytes value or a 0x-prefixed hex string."""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+
+
+def _word_expression(abi_type: str, word: str) -> Optional[str]:
+    """Python expression converting the 32-byte word `word` for a static ABI type, None if not a single word."""
+    if "[" in abi_type or abi_type.startswith("("):
+        return None
+    if abi_type == "address":
+        return f'"0x" + {word}[12:].hex()'
+    if abi_type == "bool":
+        return f"{word}[31] != 0"
+    if abi_type.startswith("uint"):
+        return f'from_bytes({word}, "big")'
+    if abi_type.startswith("int"):
+        return f'from_bytes({word}, "big", signed=True)'
+    if abi_type.startswith("bytes") and abi_type != "bytes":
+        return f"{word}[:{int(abi_type[5:])}]"
+    return None
+
+
+def _hex_word_expression(abi_type: str, word: str) -> Optional[str]:
+    """Like _word_expression, for `word` being the 64 hex digits of the word."""
+    if "[" in abi_type or abi_type.startswith("("):
+        return None
+    if abi_type == "address":
+        return f'"0x" + {word}[24:].lower()'
+    if abi_type == "bool":
+        return f"int({word}, 16) != 0"
+    if abi_type.startswith("uint"):
+        return f"int({word}, 16)"
+    if abi_type.startswith("int"):
+        return f"signed(int({word}, 16))"
+    if abi_type.startswith("bytes") and abi_type != "bytes":
+        return f"fromhex({word}[:{2 * int(abi_type[5:])}])"
+    return None
+
+
+def _signed(value: int) -> int:
+    """Two's complement of a 256-bit word."""
+    return value - (1 << 256) if value >= 1 << 255 else value
+
+
+def _read_bytes(data: bytes, offset: int, string: bool):
+    """Dynamic bytes/string field whose head (the offset of its body) sits at offset."""
+    start = _from_bytes(data[offset:offset + 32], "big")
+    length = _from_bytes(data[start:start + 32], "big")
+    value = data[start + 32:start + 32 + length]
+    return value.decode("utf-8", "replace") if string else value
+
+
+def _read_array(data: bytes, offset: int, convert: Callable[[bytes], Any]) -> List[Any]:
+    """Dynamic array of single-word elements whose head sits at offset."""
+    start = _from_bytes(data[offset:offset + 32], "big")
+    count = _from_bytes(data[start:start + 32], "big")
+    items = start + 32
+    return [convert(data[items + 32 * i:items + 32 * i + 32]) for i in range(count)]
+
+
+def _slot_name(name: str, index: int, taken: set) -> str:
+    """Attribute name for an ABI input (keywords and clashes get a trailing underscore)."""
+    name = name or f"arg{index}"
+    while keyword.iskeyword(name) or name in taken:
+        name += "_"
+    taken.add(name)
+    return name
+
+
+class EventRecord:
+    """Base class of decoded event records; subclasses add one slot per event field"""
+
+    __slots__ = ("address", "contract", "block_number", "log_index", "transaction_hash")
+
+    event = None
+    fields: Tuple[str, ...] = ()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Record as a dict: event name, log metadata and fields."""
+        result = {"event": self.event}
+        for slot in EventRecord.__slots__ + self.fields:
+            result[slot] = getattr(self, slot)
+        return result
+
+    def __repr__(self):
+        values = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.fields)
+        return f"{self.event}({values}, block_number={self.block_number}, log_index={self.log_index})"
+
+
+class EventLayout:
+    """Compiled layout of one event: topic0, record class and a generated field decoder"""
+
+    __slots__ = ("topic", "name", "record_class", "types", "fill", "fill_hex", "topic_count", "data_size", "data_types")
+
+    def __init__(self, event_abi: Dict[str, Any]):
+        """
+        Compile an event ABI entry.
+
+        Every field becomes one line of a generated `fill(record, topics, data)`
+        function (a topic or a fixed data slice plus its conversion), so
+        decoding runs no per-field dispatch. Events made of single-word fields
+        also get `fill_hex`, which parses hex string logs without converting
+        them to bytes first.
+
+        Args:
+            event_abi: ABI entry with type "event"
+        """
+        self.topic = event_abi_to_log_topic(event_abi)
+        self.name = event_abi["name"]
+
+        taken = set(EventRecord.__slots__)
+        fields, types, indexed = [], [], []
+        for index, entry in enumerate(event_abi["inputs"]):
+            fields.append(_slot_name(entry.get("name", ""), index, taken))
+            types.append(collapse_if_tuple(entry))
+            indexed.append(bool(entry.get("indexed")))
+
+        namespace = {
+            "from_bytes": _from_bytes, "read_bytes": _read_bytes, "read_array": _read_array,
+            "signed": _signed, "fromhex": bytes.fromhex,
+        }
+        expressions, hex_expressions, data_types = [], [], []
+        topic_index = 0
+        for abi_type, is_indexed in zip(types, indexed):
+            if is_indexed:
+                topic_index += 1
+                word = f"topics[{topic_index}]"
+                # Indexed dynamic values are only present as their keccak hash
+                expressions.append(_word_expression(abi_type, word) or word)
+                hex_expressions.append(_hex_word_expression(abi_type, f"{word}[2:]") or f"fromhex({word}[2:])")
+                continue
+            offset = 32 * len(data_types)
+            data_types.append(abi_type)
+            hex_expressions.append(_hex_word_expression(abi_type, f"data[{2 + 2 * offset}:{66 + 2 * offset}]"))
+            expression = _word_expression(abi_type, f"data[{offset}:{offset + 32}]")
+            if expression is None and abi_type in ("bytes", "string"):
+                expression = f"read_bytes(data, {offset}, {abi_type == 'string'})"
+            elif expression is None and abi_type.endswith("[]") and _word_expression(abi_type[:-2], "word"):
+                item = f"item{len(namespace)}"
+                namespace[item] = eval(f"lambda word: {_word_expression(abi_type[:-2], 'word')}", namespace)
+                expression = f"read_array(data, {offset}, {item})"
+            expressions.append(expression)
+
+        self.topic_count = topic_index + 1
+        self.data_size = 32 * len(data_types)
+        self.data_types = None
+        if any(expression is None for expression in expressions):
+            # Some type has no fixed layout: decode the whole data with eth_abi instead
+            self.data_types = data_types
+            position = iter(range(len(data_types)))
+            expressions = [
+                expression if is_indexed else f"data[{next(position)}]"
+                for expression, is_indexed in zip(expressions, indexed)
+            ]
+
+        self.fill = self._compile("fill", fields, expressions, namespace)
+        self.fill_hex = None
+        if all(expression is not None for expression in hex_expressions):
+            self.fill_hex = self._compile("fill_hex", fields, hex_expressions, namespace)
+        self.types = dict(zip(fields, types))
+        self.record_class = type(self.name, (EventRecord,), {
+            "__slots__": tuple(fields), "event": self.name, "fields": tuple(fields),
+        })
+
+    @staticmethod
+    def _compile(name: str, fields: List[str], expressions: List[str], namespace: Dict[str, Any]):
+        """Generate `name(record, topics, data)` assigning each field its expression."""
+        lines = [f"    record.{field} = {expression}" for field, expression in zip(fields, expressions)]
+        exec(f"def {name}(record, topics, data):\n" + ("\n".join(lines) or "    pass"), namespace)
+        return namespace[name]
+
+
+def known_contracts() -> Dict[str, Dict[str, Any]]:
+    """
+    Metadata of the market's contracts.
+
+    Returns:
+        dict: Lowercase address -> name and decimals (None for contracts that aren't tokens)
+    """
+    contracts = {address.lower(): {"name": key, "decimals": None} for key, address in CONTRACT_ADDRESSES.items()}
+    for info in TOKEN_CONFIG.values():
+        contracts[info["address"].lower()] = {"name": info.get("symbol", info["name"]), "decimals": info["decimals"]}
+    return contracts
+
+
+class EventDecoder:
+    """Table-driven decoder of raw event logs into slotted records"""
+
+    def __init__(self, abi_names: Sequence[str] = DEFAULT_EVENT_ABIS, event_abis: Iterable[Dict[str, Any]] = ()):
+        """
+        Compile the layouts.
+
+        Args:
+            abi_names: Names of ABIs in futarchy.experimental.config.abis whose events are decoded
+            event_abis: Extra event ABI entries
+        """
+        entries = [entry for name in abi_names for entry in getattr(abis, name)] + list(event_abis)
+        self.layouts: Dict[Any, EventLayout] = {}
+        for entry in entries:
+            if entry.get("type") != "event" or entry.get("anonymous"):
+                continue
+            layout = EventLayout(entry)
+            # Keyed by raw topic0 and by its hex form so neither input needs converting
+            self.layouts.setdefault(layout.topic, layout)
+            self.layouts.setdefault("0x" + layout.topic.hex(), layout)
+        self.contracts = known_contracts()
+        self._names = {address: info["name"] for address, info in self.contracts.items()}
+
+    def layout(self, event: str) -> Optional[EventLayout]:
+        """Compiled layout of an event by name."""
+        for layout in self.layouts.values():
+            if layout.name == event:
+                return layout
+        return None
+
+    def decode(self, log: Dict[str, Any]) -> Optional[EventRecord]:
+        """
+        Decode one log.
+
+        Args:
+            log: Log from web3 (HexBytes fields) or raw JSON-RPC (hex strings)
+
+        Returns:
+            EventRecord: Record of the event's class (address is lowercase; transaction_hash as given),
+                or None for unknown topics and logs that don't match the layout
+        """
+        topics = log["topics"]
+        if not topics:
+            return None
+        topic0 = topics[0]
+        layout = self.layouts.get(topic0)
+        if layout is None and type(topic0) is str:
+            layout = self.layouts.get(topic0.lower())
+        if layout is None or len(topics) != layout.topic_count:
+            return None
+        data = log["data"]
+        record = layout.record_class.__new__(layout.record_class)
+        if type(topic0) is str and type(data) is str and layout.fill_hex is not None:
+            # Raw JSON-RPC logs: words are parsed straight from the hex strings
+            if len(data) < 2 + 2 * layout.data_size:
+                return None
+            layout.fill_hex(record, topics, data)
+        else:
+            topics = [topic if type(topic) is bytes else _as_bytes(topic) for topic in topics]
+            data = data if type(data) is bytes else _as_bytes(data)
+            if len(data) < layout.data_size:
+                return None
+            if layout.data_types is not None:
+                data = abi_decode(layout.data_types, data)
+            layout.fill(record, topics, data)
+        address = log["address"].lower()
+        record.address = address
+        record.contract = self._names.get(address)
+        block_number = log.get("blockNumber")
+        log_index = log.get("logIndex")
+        record.block_number = int(block_number, 16) if isinstance(block_number, str) else block_number
+        record.log_index = int(log_index, 16) if isinstance(log_index, str) else log_index
+        record.transaction_hash = log.get("transactionHash")
+        return record
+
+    def decode_many(self, logs: Iterable[Dict[str, Any]]) -> List[EventRecord]:
+        """
+        Decode logs, dropping the ones without a known layout.
+
+        Args:
+            logs: Raw logs
+
+        Returns:
+            list: Records in input order
+        """
+        decode = self.decode
+        return [record for record in map(decode, logs) if record is not None]
+
+    def scaled(self, record: EventRecord, field: str) -> float:
+        """
+        A token amount field scaled by the emitting token's decimals (18 if unknown).
+
+        Args:
+            record: Decoded record (e.g. a Transfer)
+            field: Field name (e.g. "value")
+
+        Returns:
+            float: Amount in token units
+        """
+        info = self.contracts.get(record.address)
+        decimals = info["decimals"] if info and info["decimals"] is not None else 18
+        return getattr(record, field) / 10 ** decimals
+
+
+def to_columns(records: Sequence[EventRecord]) -> Dict[str, Dict[str, List[Any]]]:
+    """
+    Group records by event into columns.
+
+    Args:
+        records: Decoded records
+
+    Returns:
+        dict: Event name -> {column: values}, with the log metadata columns first
+    """
+    tables: Dict[str, Dict[str, List[Any]]] = {}
+    for record in records:
+        columns = tables.get(record.event)
+        if columns is None:
+            columns = tables[record.event] = {slot: [] for slot in EventRecord.__slots__ + record.fields}
+        for slot, values in columns.items():
+            values.append(getattr(record, slot))
+    return tables
+
+
+def _numpy_dtype(abi_type: Optional[str]):
+    """Structured array dtype of a field (object for values wider than 64 bits)."""
+    if abi_type == "address":
+        return "U42"
+    if abi_type == "bool":
+        return "?"
+    if abi_type and abi_type.startswith("uint") and abi_type[4:].isdigit() and int(abi_type[4:]) <= 64:
+        return "u8"
+    if abi_type and abi_type.startswith("int") and abi_type[3:].isdigit() and int(abi_type[3:]) <= 64:
+        return "i8"
+    if abi_type and abi_type.startswith("bytes") and abi_type[5:].isdigit():
+        return f"S{abi_type[5:]}"
+    return object
+
+
+def to_arrays(records: Sequence[EventRecord], decoder: EventDecoder):
+    """
+    Pack records into one NumPy structured array per event.
+
+    Args:
+        records: Decoded records
+        decoder: Decoder that produced them (for field types)
+
+    Returns:
+        dict: Event name -> structured array, or the to_columns() lists without NumPy
+    """
+    tables = to_columns(records)
+    if np is None:
+        return tables
+    arrays = {}
+    for event, columns in tables.items():
+        types = decoder.layout(event).types
+        meta = {"address": "U42", "contract": object, "block_number": "i8", "log_index": "i8", "transaction_hash": object}
+        dtype = [(column, meta[column] if column in meta else _numpy_dtype(types.get(column))) for column in columns]
+        arrays[event] = np.array(list(zip(*columns.values())), dtype=dtype)
+    return arrays
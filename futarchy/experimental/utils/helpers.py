@@ -100,3 +100,18 @@ def truncate_address(address, chars=4):
     if not address:
         return ""
     return f"{address[:chars+2]}...{address[-chars:]}"
+
+def to_hex(value):
+    """
+    Normalize a HexBytes, bytes or hex string value to lowercase 0x-prefixed hex.
+    
+    Args:
+        value: HexBytes/bytes, hex string with or without 0x, or None
+        
+    Returns:
+        str: Lowercase 0x-prefixed hex string ("0x" for None or empty values)
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    value = str(value or "").lower()
+    return value if value.startswith("0x") else "0x" + value
@@ -0,0 +1,215 @@
+"""
+Shared HTTP connection pool for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+One keep-alive connection pool used by every RPC provider and REST client
+(CoW Swap API) in the project, so repeated requests to the same host reuse
+an open TCP+TLS connection instead of handshaking each time. Pool size per
+host, connect retries and timeouts are tunable in code or through the
+HTTP_TIMEOUT, HTTP_POOL_HOSTS, HTTP_POOL_MAXSIZE and HTTP2 environment
+variables. When httpx and h2 are installed and HTTP2=1, REST requests go
+over HTTP/2 instead; otherwise requests/urllib3 (HTTP/1.1) is used.
+"""
+
+import importlib.util
+import os
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web3 import HTTPProvider
+
+try:
+    import httpx
+    # httpx needs h2 for HTTP/2, but never calls it directly
+    HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpPool:
+    """Keep-alive HTTP sessions shared across threads"""
+
+    def __init__(self, timeout: Optional[float] = None, pool_hosts: Optional[int] = None,
+                 pool_maxsize: Optional[int] = None, connect_retries: int = 2,
+                 keepalive_timeout: float = 60, http2: Optional[bool] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            timeout: Default seconds before a request times out (env HTTP_TIMEOUT, default 10)
+            pool_hosts: Number of hosts with a cached connection pool (env HTTP_POOL_HOSTS, default 16)
+            pool_maxsize: Keep-alive connections kept per host (env HTTP_POOL_MAXSIZE, default 16)
+            connect_retries: Retries of failed connection attempts (requests are never re-sent)
+            keepalive_timeout: Seconds an idle connection is kept open (async sessions)
+            http2: Use HTTP/2 for REST requests when httpx and h2 are installed (env HTTP2)
+        """
+        self.timeout = timeout if timeout is not None else float(os.getenv("HTTP_TIMEOUT", 10))
+        self.pool_hosts = pool_hosts or int(os.getenv("HTTP_POOL_HOSTS", 16))
+        self.pool_maxsize = pool_maxsize or int(os.getenv("HTTP_POOL_MAXSIZE", 16))
+        self.connect_retries = connect_retries
+        self.keepalive_timeout = keepalive_timeout
+        if http2 is None:
+            http2 = os.getenv("HTTP2", "0").lower() in ("1", "true", "yes")
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._session = None
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """requests session with a pooled adapter, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_hosts,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=Retry(total=self.connect_retries, connect=self.connect_retries,
+                                          read=0, status=0, redirect=0, raise_on_status=False),
+                        pool_block=False,
+                    )
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._session = session
+        return self._session
+
+    @property
+    def client(self):
+        """HTTP/2 httpx client, or None when HTTP/2 is disabled or unavailable."""
+        if not self.http2:
+            return None
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        http2=True,
+                        timeout=self.timeout,
+                        limits=httpx.Limits(max_connections=self.pool_hosts * self.pool_maxsize,
+                                            max_keepalive_connections=self.pool_maxsize,
+                                            keepalive_expiry=self.keepalive_timeout),
+                    )
+        return self._client
+
+    def request(self, method: str, url: str, **kwargs):
+        """
+        Send a REST request over a pooled connection.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            **kwargs: Passed to requests (json, params, headers, timeout, ...)
+
+        Returns:
+            Response object with status_code, text and json()
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        client = self.client
+        if client is not None:
+            return client.request(method, url, **kwargs)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def provider(self, endpoint_uri: str, request_kwargs: Optional[Dict[str, Any]] = None) -> "PooledHTTPProvider":
+        """
+        Create a web3 HTTP provider that sends through this pool.
+
+        Args:
+            endpoint_uri: JSON-RPC endpoint URL
+            request_kwargs: Extra keyword arguments for the HTTP requests
+
+        Returns:
+            PooledHTTPProvider
+        """
+        return PooledHTTPProvider(endpoint_uri, request_kwargs=request_kwargs, pool=self)
+
+    def aiohttp_session(self, **kwargs):
+        """
+        Create an aiohttp session with the same limits, for async clients.
+
+        Must be called inside a running event loop; the caller closes it.
+
+        Returns:
+            aiohttp.ClientSession
+        """
+        import aiohttp
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_hosts * self.pool_maxsize,
+            limit_per_host=self.pool_maxsize,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        kwargs.setdefault("timeout", aiohttp.ClientTimeout(total=self.timeout))
+        return aiohttp.ClientSession(connector=connector, **kwargs)
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class PooledHTTPProvider(HTTPProvider):
+    """HTTPProvider sending through a shared HttpPool instead of web3's per-thread sessions"""
+
+    def __init__(self, endpoint_uri: str, request_kwargs: Optional[Dict[str, Any]] = None,
+                 pool: Optional[HttpPool] = None):
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self.pool = pool or get_http_pool()
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        kwargs = dict(self.get_request_kwargs())
+        kwargs.setdefault("timeout", self.pool.timeout)
+        # JSON-RPC always goes through the requests session: web3 expects its error semantics
+        response = self.pool.session.post(self.endpoint_uri, data=request_data, **kwargs)
+        response.raise_for_status()
+        return self.decode_rpc_response(response.content)
+
+
+_http_pool = None
+_http_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpPool:
+    """
+    Get the process-wide HTTP pool, creating it from the environment on first use.
+
+    Returns:
+        HttpPool
+    """
+    global _http_pool
+    if _http_pool is None:
+        with _http_pool_lock:
+            if _http_pool is None:
+                _http_pool = HttpPool()
+    return _http_pool
+
+
+def configure_http_pool(**kwargs) -> HttpPool:
+    """
+    Replace the process-wide HTTP pool with one using the given settings.
+
+    Args:
+        **kwargs: HttpPool arguments (timeout, pool_hosts, pool_maxsize, connect_retries, keepalive_timeout, http2)
+
+    Returns:
+        HttpPool: The new pool (providers created earlier keep the old one)
+    """
+    global _http_pool
+    with _http_pool_lock:
+        if _http_pool is not None:
+            _http_pool.close()
+        _http_pool = HttpPool(**kwargs)
+    return _http_pool
@@ -0,0 +1,200 @@
+"""
+Persistent cache for immutable on-chain metadata.
+
+This module is currently in EXPERIMENTAL status.
+Pool tokens, fee tier, tick spacing, token decimals and symbols never change
+for a deployed contract, so they are read once, stored on disk and reused on
+every later run.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from futarchy.experimental.config.network import CHAIN_ID
+from futarchy.experimental.config.abis.erc20 import ERC20_ABI
+from futarchy.experimental.config.abis.uniswap import UNISWAP_V3_POOL_ABI
+
+# Override with the FUTARCHY_METADATA_CACHE environment variable
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".futarchy", "metadata_cache.json")
+
+POOL_FIELDS = ("token0", "token1", "fee", "tickSpacing")
+
+_shared_caches: Dict[str, "MetadataCache"] = {}
+
+
+class MetadataCache:
+    """Lazily filled, disk-backed cache of contract metadata"""
+
+    def __init__(self, w3, path: Optional[str] = None, chain_id: int = CHAIN_ID):
+        """
+        Initialize the cache and load any previously saved entries.
+
+        Args:
+            w3: Web3 instance used to fetch missing values
+            path: JSON file to persist to (defaults to FUTARCHY_METADATA_CACHE or ~/.futarchy/metadata_cache.json)
+            chain_id: Chain the cached contracts live on
+        """
+        self.w3 = w3
+        self.path = path or os.environ.get("FUTARCHY_METADATA_CACHE", DEFAULT_CACHE_PATH)
+        self.chain_key = str(chain_id)
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load cached entries from disk (a missing or corrupt file starts an empty cache)."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except FileNotFoundError:
+            self._data = {}
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable metadata cache {self.path}: {e}")
+            self._data = {}
+
+    def save(self):
+        """Write the cache to disk atomically."""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Could not save metadata cache to {self.path}: {e}")
+
+    def _entry(self, address: str) -> Dict[str, Any]:
+        return self._data.setdefault(self.chain_key, {}).setdefault(address.lower(), {})
+
+    def peek(self, address: str, field: str) -> Any:
+        """Return a cached value without fetching it (None if missing)."""
+        return self._data.get(self.chain_key, {}).get(address.lower(), {}).get(field)
+
+    def set(self, address: str, field: str, value: Any, persist: bool = True):
+        """
+        Store a value in the cache.
+
+        Args:
+            address: Contract address
+            field: Metadata field name
+            value: Value to store (must be JSON serializable)
+            persist: Whether to write the cache to disk immediately
+        """
+        with self._lock:
+            self._entry(address)[field] = value
+            if persist:
+                self.save()
+
+    def get(self, address: str, field: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Return a cached value, fetching and persisting it on first use.
+
+        Args:
+            address: Contract address
+            field: Metadata field name
+            fetch: Zero-argument callable that reads the value from chain
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.peek(address, field)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(address, field, value)
+        return value
+
+    def _pool(self, address: str):
+        return self.w3.eth.contract(address=self.w3.to_checksum_address(address), abi=UNISWAP_V3_POOL_ABI)
+
+    def _token(self, address: str):
+        return self.w3.eth.contract(address=self.w3.to_checksum_address(address), abi=ERC20_ABI)
+
+    def token0(self, pool_address: str) -> str:
+        """Lowercase token0 address of a V3 pool."""
+        return self.get(pool_address, "token0", lambda: self._pool(pool_address).functions.token0().call().lower())
+
+    def token1(self, pool_address: str) -> str:
+        """Lowercase token1 address of a V3 pool."""
+        return self.get(pool_address, "token1", lambda: self._pool(pool_address).functions.token1().call().lower())
+
+    def pool_tokens(self, pool_address: str) -> Tuple[str, str]:
+        """(token0, token1) of a V3 pool."""
+        return self.token0(pool_address), self.token1(pool_address)
+
+    def fee(self, pool_address: str) -> int:
+        """Fee tier of a V3 pool in hundredths of a bip."""
+        return self.get(pool_address, "fee", lambda: int(self._pool(pool_address).functions.fee().call()))
+
+    def tick_spacing(self, pool_address: str) -> int:
+        """Tick spacing of a V3 pool."""
+        return self.get(pool_address, "tickSpacing", lambda: int(self._pool(pool_address).functions.tickSpacing().call()))
+
+    def decimals(self, token_address: str) -> int:
+        """ERC20 decimals."""
+        return self.get(token_address, "decimals", lambda: int(self._token(token_address).functions.decimals().call()))
+
+    def symbol(self, token_address: str) -> str:
+        """ERC20 symbol."""
+        return self.get(token_address, "symbol", lambda: self._token(token_address).functions.symbol().call())
+
+    def warm_pools(self, pool_addresses: Iterable[str], multicall=None):
+        """
+        Fill in missing pool metadata, in a single batch when a Multicall helper is given.
+
+        Args:
+            pool_addresses: V3 pool addresses
+            multicall: Optional utils.multicall.Multicall instance
+        """
+        missing = [
+            (address, field)
+            for address in pool_addresses
+            for field in POOL_FIELDS
+            if self.peek(address, field) is None
+        ]
+        if not missing:
+            return
+
+        if multicall is None:
+            for address, field in missing:
+                getattr(self, {"tickSpacing": "tick_spacing"}.get(field, field))(address)
+            return
+
+        functions = [getattr(self._pool(address).functions, field)() for address, field in missing]
+        try:
+            _, results = multicall.call_functions(functions)
+        except Exception as e:
+            print(f"⚠️ Could not prefetch pool metadata: {e}")
+            return
+
+        with self._lock:
+            for (address, field), value in zip(missing, results):
+                if value is None:
+                    continue
+                self._entry(address)[field] = value.lower() if isinstance(value, str) else int(value)
+            self.save()
+
+
+def get_metadata_cache(w3, path: Optional[str] = None) -> MetadataCache:
+    """
+    Return the process-wide metadata cache for a cache file, creating it on first use.
+
+    Args:
+        w3: Web3 instance used to fetch missing values
+        path: Cache file path (defaults to FUTARCHY_METADATA_CACHE or ~/.futarchy/metadata_cache.json)
+
+    Returns:
+        MetadataCache: Shared cache instance
+    """
+    path = path or os.environ.get("FUTARCHY_METADATA_CACHE", DEFAULT_CACHE_PATH)
+    cache = _shared_caches.get(path)
+    if cache is None:
+        cache = MetadataCache(w3, path)
+        _shared_caches[path] = cache
+    return cache
@@ -0,0 +1,214 @@
+"""
+Multicall3 helpers for batched contract reads.
+
+This module is currently in EXPERIMENTAL status.
+Bundles many view calls into a single `aggregate3` eth_call so that all
+results come from the same block and cost one RPC round trip.
+"""
+
+from typing import List, Tuple, Optional, Dict, Any, Sequence
+from eth_abi import encode, decode
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+from web3 import Web3
+
+from futarchy.experimental.config.contracts import CONTRACT_ADDRESSES
+from futarchy.experimental.config.abis.misc import MULTICALL3_ABI
+
+# Function selectors used for raw calldata
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")  # balanceOf(address)
+GET_BLOCK_NUMBER_SELECTOR = bytes.fromhex("42cbb15c")  # getBlockNumber()
+
+
+def encode_balance_of(owner: str) -> bytes:
+    """
+    Build calldata for an ERC20 `balanceOf(owner)` call.
+
+    Args:
+        owner: Address whose balance is queried
+
+    Returns:
+        bytes: ABI-encoded calldata
+    """
+    return BALANCE_OF_SELECTOR + encode(["address"], [Web3.to_checksum_address(owner)])
+
+
+def decode_uint256(data: bytes) -> Optional[int]:
+    """
+    Decode a single uint256 return value.
+
+    Args:
+        data: Raw return data of the call
+
+    Returns:
+        int: Decoded value, or None if the data is too short
+    """
+    if data is None or len(data) < 32:
+        return None
+    return decode(["uint256"], bytes(data[:32]))[0]
+
+
+def encode_call(contract_function) -> bytes:
+    """
+    Build calldata for a bound web3 contract function.
+
+    Args:
+        contract_function: e.g. pool.functions.slot0()
+
+    Returns:
+        bytes: ABI-encoded calldata
+    """
+    return bytes(HexBytes(contract_function._encode_transaction_data()))
+
+
+def decode_call(contract_function, data: bytes) -> Any:
+    """
+    Decode the return data of a bound web3 contract function.
+
+    Args:
+        contract_function: The function the data was returned by
+        data: Raw return data
+
+    Returns:
+        The single output value, or a tuple when the function has several outputs
+    """
+    output_types = [collapse_if_tuple(output) for output in contract_function.abi["outputs"]]
+    values = decode(output_types, bytes(data))
+    return values[0] if len(values) == 1 else values
+
+
+class Multicall:
+    """Thin wrapper around the Multicall3 `aggregate3` entry point"""
+
+    def __init__(self, w3: Web3, address: Optional[str] = None):
+        """
+        Initialize the Multicall helper.
+
+        Args:
+            w3: Web3 instance
+            address: Multicall3 address (defaults to CONTRACT_ADDRESSES["multicall3"])
+        """
+        self.w3 = w3
+        self.address = Web3.to_checksum_address(address or CONTRACT_ADDRESSES["multicall3"])
+        self.contract = w3.eth.contract(address=self.address, abi=MULTICALL3_ABI)
+
+    def _aggregate3_function(self, calls: Sequence[Tuple[str, bytes, bool]]):
+        """Bound aggregate3 call for a batch, with getBlockNumber() appended."""
+        batch = [
+            (Web3.to_checksum_address(target), bool(allow_failure), bytes(call_data))
+            for target, call_data, allow_failure in calls
+        ]
+        batch.append((self.address, False, GET_BLOCK_NUMBER_SELECTOR))
+        return self.contract.functions.aggregate3(batch)
+
+    @staticmethod
+    def _split_results(results) -> Tuple[int, List[Tuple[bool, bytes]]]:
+        """Separate the trailing block number from the aggregate3 results."""
+        block_number = decode_uint256(results[-1][1])
+        return block_number, [(bool(success), bytes(data)) for success, data in results[:-1]]
+
+    @staticmethod
+    def _function_calls(functions: Sequence[Any]) -> List[Tuple[str, bytes, bool]]:
+        return [(fn.address, encode_call(fn), True) for fn in functions]
+
+    @staticmethod
+    def _decode_functions(functions: Sequence[Any], results: List[Tuple[bool, bytes]]) -> List[Any]:
+        decoded = []
+        for fn, (success, data) in zip(functions, results):
+            try:
+                decoded.append(decode_call(fn, data) if success else None)
+            except Exception:
+                decoded.append(None)
+        return decoded
+
+    @staticmethod
+    def _balance_calls(tokens: Sequence[str], owners: Sequence[str]):
+        pairs = [(owner, token) for owner in owners for token in tokens]
+        return pairs, [(token, encode_balance_of(owner), True) for owner, token in pairs]
+
+    @staticmethod
+    def _decode_balances(owners: Sequence[str], pairs, results) -> Dict[str, Dict[str, Optional[int]]]:
+        balances: Dict[str, Dict[str, Optional[int]]] = {owner: {} for owner in owners}
+        for (owner, token), (success, data) in zip(pairs, results):
+            balances[owner][token] = decode_uint256(data) if success else None
+        return balances
+
+    def aggregate3(self, calls: Sequence[Tuple[str, bytes, bool]], block_identifier: Any = "latest") -> Tuple[int, List[Tuple[bool, bytes]]]:
+        """
+        Execute a batch of calls in one eth_call.
+
+        A `getBlockNumber()` call is appended to the batch so the caller learns
+        which block the results were read from without an extra round trip.
+
+        Args:
+            calls: List of (target, calldata, allow_failure) tuples
+            block_identifier: Block number or tag to execute the batch at
+
+        Returns:
+            tuple: (block_number, [(success, return_data), ...]) in call order
+        """
+        results = self._aggregate3_function(calls).call(block_identifier=block_identifier)
+        return self._split_results(results)
+
+    def call_functions(self, functions: Sequence[Any], block_identifier: Any = "latest") -> Tuple[int, List[Any]]:
+        """
+        Execute bound contract functions in one batch and decode their results.
+
+        Args:
+            functions: Bound web3 contract functions (e.g. token.functions.decimals())
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            tuple: (block_number, [decoded result or None if the call failed, ...])
+        """
+        block_number, results = self.aggregate3(self._function_calls(functions), block_identifier=block_identifier)
+        return block_number, self._decode_functions(functions, results)
+
+    def get_token_balances(self, tokens: Sequence[str], owners: Sequence[str], block_identifier: Any = "latest") -> Tuple[int, Dict[str, Dict[str, Optional[int]]]]:
+        """
+        Read `balanceOf` for every (owner, token) pair in a single call.
+
+        Args:
+            tokens: Token addresses
+            owners: Holder addresses
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            tuple: (block_number, {owner: {token: balance_wei or None}})
+        """
+        pairs, calls = self._balance_calls(tokens, owners)
+        block_number, results = self.aggregate3(calls, block_identifier=block_identifier)
+        return block_number, self._decode_balances(owners, pairs, results)
+
+
+class AsyncMulticall:
+    """Multicall3 batches executed through an AsyncWeb3 instance"""
+
+    def __init__(self, async_w3, multicall: Multicall):
+        """
+        Initialize the async Multicall helper.
+
+        Args:
+            async_w3: AsyncWeb3 instance the batches are sent through
+            multicall: Synchronous Multicall used to encode and decode batches
+        """
+        self.w3 = async_w3
+        self.multicall = multicall
+        self.address = multicall.address
+
+    async def aggregate3(self, calls: Sequence[Tuple[str, bytes, bool]], block_identifier: Any = "latest") -> Tuple[int, List[Tuple[bool, bytes]]]:
+        """Async counterpart of Multicall.aggregate3."""
+        function = self.multicall._aggregate3_function(calls)
+        data = await self.w3.eth.call({"to": self.address, "data": encode_call(function)}, block_identifier)
+        return Multicall._split_results(decode_call(function, data))
+
+    async def call_functions(self, functions: Sequence[Any], block_identifier: Any = "latest") -> Tuple[int, List[Any]]:
+        """Async counterpart of Multicall.call_functions."""
+        block_number, results = await self.aggregate3(Multicall._function_calls(functions), block_identifier)
+        return block_number, Multicall._decode_functions(functions, results)
+
+    async def get_token_balances(self, tokens: Sequence[str], owners: Sequence[str], block_identifier: Any = "latest") -> Tuple[int, Dict[str, Dict[str, Optional[int]]]]:
+        """Async counterpart of Multicall.get_token_balances."""
+        pairs, calls = Multicall._balance_calls(tokens, owners)
+        block_number, results = await self.aggregate3(calls, block_identifier)
+        return block_number, Multicall._decode_balances(owners, pairs, results)
@@ -0,0 +1,327 @@
+"""
+Local nonce allocator for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Tracks the next nonce for each sending account locally so dependent
+transactions can be signed and sent back to back, without re-reading
+eth_getTransactionCount or sleeping between them. The chain is only queried
+when an account is first seen and after a send fails with a nonce error.
+Only "pending" counts of the accounts we send from are answered locally;
+"latest" and historical counts, and every other address, go to the node.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import rlp
+from eth_account import Account
+from hexbytes import HexBytes
+
+# Node error messages that mean our view of the account nonce is wrong
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "already known",
+    "known transaction",
+    "replacement transaction underpriced",
+    "transaction underpriced",
+)
+
+
+def is_nonce_error(message) -> bool:
+    """
+    Check whether a node error message is about the transaction nonce.
+
+    Args:
+        message: Error message or error dict from the node
+
+    Returns:
+        bool: True if the message matches a known nonce error
+    """
+    if isinstance(message, dict):
+        message = message.get("message", "")
+    message = str(message).lower()
+    return any(error in message for error in NONCE_ERRORS)
+
+
+def decode_raw_transaction(raw_transaction) -> Tuple[str, int]:
+    """
+    Read the sender and nonce of a signed transaction.
+
+    Args:
+        raw_transaction: Signed transaction as bytes or a hex string
+
+    Returns:
+        tuple: (sender address, nonce)
+    """
+    data = bytes(HexBytes(raw_transaction))
+    if data[0] >= 0xc0:
+        # Legacy transaction: rlp([nonce, gasPrice, gas, ...])
+        nonce = rlp.decode(data)[0]
+    else:
+        # Typed transaction: type || rlp([chainId, nonce, ...])
+        nonce = rlp.decode(data[1:])[1]
+    return Account.recover_transaction(data), int.from_bytes(nonce, "big")
+
+
+class NonceManager:
+    """Thread-safe allocator of account nonces, reconciled with the chain on errors"""
+
+    def __init__(self, w3=None):
+        """
+        Initialize the nonce manager.
+
+        Args:
+            w3: Web3 instance used to sync accounts that are not tracked yet
+        """
+        self.w3 = w3
+        self.syncs = 0
+        self.resyncs = 0
+        self._next: Dict[str, int] = {}
+        self._pending: Dict[str, Dict[int, Optional[str]]] = {}
+        self._accounts = set()
+        self._lock = threading.Lock()
+
+    def track(self, address: str):
+        """
+        Answer the pending transaction count of an account we send from locally.
+
+        Accounts are also tracked once a nonce is handed out or a transaction
+        from them is sent.
+
+        Args:
+            address: Sending account
+        """
+        with self._lock:
+            self._accounts.add(address.lower())
+
+    def tracks(self, address: str) -> bool:
+        """Check whether the pending transaction count of an account is answered locally."""
+        with self._lock:
+            return address.lower() in self._accounts
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get nonce manager counters.
+
+        Returns:
+            dict: chain syncs, error resyncs, next nonce and in-flight nonces per account
+        """
+        with self._lock:
+            return {
+                "syncs": self.syncs,
+                "resyncs": self.resyncs,
+                "accounts": {
+                    address: {"next_nonce": nonce, "pending": sorted(self._pending.get(address, {}))}
+                    for address, nonce in self._next.items()
+                },
+            }
+
+    def _sync(self, address: str, chain_nonce: int) -> int:
+        """Merge a pending transaction count read from the chain, returning the next nonce."""
+        key = address.lower()
+        with self._lock:
+            self.syncs += 1
+            pending = self._pending.get(key, {})
+            for nonce in [nonce for nonce in pending if nonce < chain_nonce]:
+                del pending[nonce]
+            # Never step back below nonces we handed out but the node has not seen yet
+            self._next[key] = max(self._next.get(key, 0), chain_nonce)
+            return self._next[key]
+
+    def _fetch(self, address: str, make_request=None) -> int:
+        """Read the pending transaction count of an account and merge it."""
+        if make_request is not None:
+            response = make_request("eth_getTransactionCount", [address, "pending"])
+            if "error" in response or response.get("result") is None:
+                raise ValueError(f"eth_getTransactionCount failed: {response.get('error')}")
+            return self._sync(address, int(response["result"], 16))
+        if self.w3 is None:
+            raise ValueError("NonceManager needs a Web3 instance to sync accounts")
+        chain_nonce = self.w3.eth.get_transaction_count(address, "pending")
+        # With the middleware installed the read above has already been merged
+        nonce = self._known(address)
+        return nonce if nonce is not None else self._sync(address, chain_nonce)
+
+    def _known(self, address: str) -> Optional[int]:
+        """Return the locally tracked next nonce, or None if the account is not tracked."""
+        with self._lock:
+            return self._next.get(address.lower())
+
+    def get_nonce(self, address: str) -> int:
+        """
+        Get the nonce to use for the next transaction of an account.
+
+        The nonce is not reserved: it advances once a transaction with it is sent
+        through a Web3 instance carrying the middleware.
+
+        Args:
+            address: Sending account
+
+        Returns:
+            int: Next nonce
+        """
+        self.track(address)
+        nonce = self._known(address)
+        return nonce if nonce is not None else self._fetch(address)
+
+    def allocate(self, address: str, count: int = 1) -> List[int]:
+        """
+        Reserve consecutive nonces, e.g. to pre-sign several transactions.
+
+        Args:
+            address: Sending account
+            count: Number of nonces to reserve
+
+        Returns:
+            list: Reserved nonces in order
+        """
+        self.track(address)
+        if self._known(address) is None:
+            self._fetch(address)
+        key = address.lower()
+        with self._lock:
+            start = self._next[key]
+            self._next[key] = start + count
+            pending = self._pending.setdefault(key, {})
+            for nonce in range(start, start + count):
+                pending.setdefault(nonce, None)
+            return list(range(start, start + count))
+
+    def mark_sent(self, address: str, nonce: int, tx_hash: Optional[str] = None):
+        """
+        Record that a transaction with this nonce was accepted by the node.
+
+        Args:
+            address: Sending account
+            nonce: Nonce of the transaction
+            tx_hash: Transaction hash, if known
+        """
+        key = address.lower()
+        with self._lock:
+            self._accounts.add(key)
+            self._next[key] = max(self._next.get(key, 0), nonce + 1)
+            self._pending.setdefault(key, {})[nonce] = tx_hash
+
+    def release(self, address: str, nonce: int):
+        """
+        Give back a reserved nonce whose transaction was never sent.
+
+        Only the most recent reservation can be handed back; releasing an earlier
+        one would leave a gap, so the account is resynced from the chain instead.
+
+        Args:
+            address: Sending account
+            nonce: Reserved nonce
+        """
+        key = address.lower()
+        with self._lock:
+            pending = self._pending.get(key, {})
+            if pending.get(nonce, "sent") is not None:
+                return
+            del pending[nonce]
+            if self._next.get(key) == nonce + 1:
+                self._next[key] = nonce
+                return
+        self.resync(address)
+
+    def resync(self, address: Optional[str] = None):
+        """
+        Forget local state so the next request re-reads the chain.
+
+        Args:
+            address: Account to resync (all accounts if None)
+        """
+        with self._lock:
+            self.resyncs += 1
+            if address is None:
+                self._next.clear()
+                self._pending.clear()
+            else:
+                self._next.pop(address.lower(), None)
+                self._pending.pop(address.lower(), None)
+
+    def pending(self, address: str) -> Dict[int, Optional[str]]:
+        """
+        Get the nonces handed out or sent that the chain has not counted yet.
+
+        Args:
+            address: Sending account
+
+        Returns:
+            dict: nonce -> transaction hash (None for reservations not sent yet)
+        """
+        with self._lock:
+            return dict(self._pending.get(address.lower(), {}))
+
+    def wrap_make_request(self, make_request):
+        """
+        Wrap a provider make_request function with nonce tracking.
+
+        Args:
+            make_request: Next make_request in the middleware chain
+
+        Returns:
+            function: make_request that answers pending transaction counts of our
+            accounts locally and tracks sent transactions
+        """
+        def middleware(method, params):
+            if method == "eth_getTransactionCount" and params:
+                block = params[1] if len(params) > 1 else "latest"
+                # "latest" counts mined transactions only, so it must not see local sends
+                if block == "pending" and self.tracks(params[0]):
+                    nonce = self._known(params[0])
+                    if nonce is None:
+                        nonce = self._fetch(params[0], make_request)
+                    return {"jsonrpc": "2.0", "id": 0, "result": hex(nonce)}
+                return make_request(method, params)
+
+            if method != "eth_sendRawTransaction" or not params:
+                return make_request(method, params)
+
+            try:
+                sender, nonce = decode_raw_transaction(params[0])
+            except Exception as e:
+                print(f"⚠️ Could not decode transaction nonce: {e}")
+                return make_request(method, params)
+
+            try:
+                response = make_request(method, params)
+            except Exception as e:
+                if is_nonce_error(e):
+                    self.resync(sender)
+                raise
+
+            if "error" in response:
+                if is_nonce_error(response["error"]):
+                    print(f"⚠️ Nonce {nonce} rejected for {sender}, resyncing with the chain")
+                    self.resync(sender)
+                else:
+                    self.release(sender, nonce)
+            else:
+                self.mark_sent(sender, nonce, response.get("result"))
+            return response
+
+        return middleware
+
+    def middleware(self, make_request, w3):
+        """web3.py v6 style middleware factory."""
+        return self.wrap_make_request(make_request)
+
+    def as_web3_v7_middleware(self):
+        """
+        Build a web3.py v7 middleware class bound to this manager.
+
+        Returns:
+            type: Web3Middleware subclass to pass to middleware_onion.add
+        """
+        from web3.middleware import Web3Middleware
+
+        manager = self
+
+        class NonceManagerMiddleware(Web3Middleware):
+            def wrap_make_request(self, make_request):
+                return manager.wrap_make_request(make_request)
+
+        return NonceManagerMiddleware
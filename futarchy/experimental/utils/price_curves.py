@@ -0,0 +1,296 @@
+"""
+Vectorized price impact curves.
+
+This module is currently in EXPERIMENTAL status.
+Evaluates amountOut, effective price and price impact for many trade sizes
+at once. Uniswap V3 curves are precomputed from a V3PoolSnapshot as
+piecewise constant-liquidity segments and evaluated with NumPy; Balancer
+curves are quoted in a single Multicall3 batch. NumPy is optional: without
+it V3 curves fall back to one exact simulation per size and results are
+returned as lists.
+"""
+
+from typing import Any, Dict, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional; curves fall back to plain Python lists
+    np = None
+
+from futarchy.experimental.config.constants import BALANCER_BATCH_ROUTER_ABI
+from futarchy.experimental.utils.uniswap_v3_math import (
+    Q96, get_amount0_delta, get_amount1_delta, mul_div_rounding_up
+)
+
+FEE_DENOMINATOR = 1_000_000
+
+
+def _as_array(values: Sequence[float]):
+    """Convert trade sizes to a float64 array, or a list of floats without NumPy."""
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return [float(value) for value in values]
+
+
+def curve_result(amounts_in, amounts_out, spot_price: float) -> Dict[str, Any]:
+    """
+    Build the standard curve result from input and output amounts.
+
+    Args:
+        amounts_in: Input amounts (array or list, NaN/None where unavailable)
+        amounts_out: Output amounts (array or list, NaN/None where unavailable)
+        spot_price: Current price of the output token in input token units
+
+    Returns:
+        dict: amount_in, amount_out, effective_price (input per output) and
+              price_impact (percent versus spot_price) as arrays or lists
+    """
+    if np is not None:
+        amounts_in = np.asarray(amounts_in, dtype=np.float64)
+        amounts_out = np.asarray(amounts_out, dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            effective_price = np.where(amounts_out > 0, amounts_in / amounts_out, np.nan)
+            price_impact = (effective_price / spot_price - 1) * 100 if spot_price else np.full_like(effective_price, np.nan)
+    else:
+        effective_price = [
+            amount_in / amount_out if amount_out else None
+            for amount_in, amount_out in zip(amounts_in, amounts_out)
+        ]
+        price_impact = [
+            (price / spot_price - 1) * 100 if price is not None and spot_price else None
+            for price in effective_price
+        ]
+
+    return {
+        "spot_price": spot_price,
+        "amount_in": amounts_in,
+        "amount_out": amounts_out,
+        "effective_price": effective_price,
+        "price_impact": price_impact,
+    }
+
+
+class V3SwapCurve:
+    """Exact-input swap curve of a V3 pool in one direction, precomputed from a snapshot"""
+
+    def __init__(self, snapshot, zero_for_one: bool):
+        """
+        Precompute the curve segments.
+
+        Args:
+            snapshot: utils.uniswap_v3_simulator.V3PoolSnapshot
+            zero_for_one: True to sell token0 for token1
+        """
+        self.snapshot = snapshot
+        self.zero_for_one = zero_for_one
+        self.fee = snapshot.fee
+
+        # Per segment: cumulative gross input and output at its start, its
+        # starting sqrt price (as a real number) and its liquidity
+        in_start, out_start, sqrt_start, liquidity = [], [], [], []
+        total_in = total_out = 0
+        for sqrt_a, sqrt_b, range_liquidity in snapshot.liquidity_ranges(zero_for_one):
+            in_start.append(total_in)
+            out_start.append(total_out)
+            sqrt_start.append(sqrt_a / Q96)
+            liquidity.append(range_liquidity)
+
+            if zero_for_one:
+                amount_in = get_amount0_delta(sqrt_b, sqrt_a, range_liquidity, True)
+                amount_out = get_amount1_delta(sqrt_b, sqrt_a, range_liquidity, False)
+            else:
+                amount_in = get_amount1_delta(sqrt_a, sqrt_b, range_liquidity, True)
+                amount_out = get_amount0_delta(sqrt_a, sqrt_b, range_liquidity, False)
+            total_in += amount_in + mul_div_rounding_up(amount_in, self.fee, FEE_DENOMINATOR - self.fee)
+            total_out += amount_out
+
+        self.max_amount_in = total_in
+        self.max_amount_out = total_out
+        if np is not None:
+            self._in_start = np.asarray(in_start, dtype=np.float64)
+            self._out_start = np.asarray(out_start, dtype=np.float64)
+            self._sqrt_start = np.asarray(sqrt_start, dtype=np.float64)
+            self._liquidity = np.asarray(liquidity, dtype=np.float64)
+
+    @classmethod
+    def for_token_in(cls, snapshot, token_in: str) -> "V3SwapCurve":
+        """Curve for selling token_in into the snapshot's pool."""
+        return cls(snapshot, snapshot.is_token0(token_in))
+
+    @property
+    def spot_price(self) -> float:
+        """Current price of the output token in input token units."""
+        return self.snapshot.price(invert=self.zero_for_one)
+
+    def amounts_out(self, amounts_in):
+        """
+        Output amounts for exact-input swaps.
+
+        With NumPy the segments are evaluated in float64 (relative error around
+        1e-15); without it every size is simulated exactly. Sizes beyond the
+        loaded tick range give NaN (None without NumPy).
+
+        Args:
+            amounts_in: Input amounts in wei
+
+        Returns:
+            Array (or list) of output amounts in wei
+        """
+        amounts_in = _as_array(amounts_in)
+
+        if np is None:
+            token_in = self.snapshot.token0 if self.zero_for_one else self.snapshot.token1
+            results = [
+                self.snapshot.quote_exact_input(token_in, int(amount)) if amount > 0 else None
+                for amount in amounts_in
+            ]
+            return [
+                (result["amount_out"] if result["complete"] else None) if result is not None else 0
+                for result in results
+            ]
+
+        if len(self._in_start) == 0:
+            return np.full_like(amounts_in, np.nan)
+
+        index = np.clip(np.searchsorted(self._in_start, amounts_in, side="right") - 1, 0, len(self._in_start) - 1)
+        net_in = (amounts_in - self._in_start[index]) * (FEE_DENOMINATOR - self.fee) / FEE_DENOMINATOR
+        sqrt_price = self._sqrt_start[index]
+        liquidity = self._liquidity[index]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Closed forms of L * dSqrtP and L * d(1/sqrtP), rearranged to avoid cancellation
+            if self.zero_for_one:
+                # Selling token0: 1/sqrtP grows by amount0 / L
+                segment_out = liquidity * net_in * sqrt_price ** 2 / (liquidity + net_in * sqrt_price)
+            else:
+                # Selling token1: sqrtP grows by amount1 / L
+                segment_out = net_in / (sqrt_price * (sqrt_price + net_in / liquidity))
+            segment_out = np.where(liquidity > 0, segment_out, 0.0)
+
+        amounts_out = self._out_start[index] + segment_out
+        return np.where(amounts_in > float(self.max_amount_in), np.nan, amounts_out)
+
+    def evaluate(self, amounts_in) -> Dict[str, Any]:
+        """
+        Evaluate the curve for many input amounts.
+
+        Args:
+            amounts_in: Input amounts in wei
+
+        Returns:
+            dict: See curve_result
+        """
+        amounts_in = _as_array(amounts_in)
+        return curve_result(amounts_in, self.amounts_out(amounts_in), self.spot_price)
+
+
+def quote_balancer_curve(w3, multicall, batch_router_address: str, pool_address: str,
+                         token_in: str, token_out: str, amounts_in, spot_amount: int = 10**18,
+                         block_identifier: Any = "latest") -> Dict[str, Any]:
+    """
+    Quote many exact-input swaps on a Balancer pool in one Multicall3 batch.
+
+    Args:
+        w3: Web3 instance
+        multicall: utils.multicall.Multicall instance
+        batch_router_address: Balancer BatchRouter address
+        pool_address: Balancer pool address
+        token_in: Token sold
+        token_out: Token bought
+        amounts_in: Input amounts in wei
+        spot_amount: Small input amount used to measure the spot price
+        block_identifier: Block number or tag to quote at
+
+    Returns:
+        dict: See curve_result, plus the block_number the quotes were read at
+    """
+    batch_router = w3.eth.contract(address=w3.to_checksum_address(batch_router_address), abi=BALANCER_BATCH_ROUTER_ABI)
+    step = (w3.to_checksum_address(pool_address), w3.to_checksum_address(token_out), False)
+    token_in = w3.to_checksum_address(token_in)
+
+    amounts_in = _as_array(amounts_in)
+    # (tokenIn, [(pool, tokenOut, isBuffer)], exactAmountIn, minAmountOut)
+    functions = [
+        batch_router.functions.querySwapExactIn([(token_in, [step], int(amount), 0)], multicall.address, b'')
+        for amount in [spot_amount] + [int(amount) for amount in amounts_in]
+    ]
+    block_number, results = multicall.call_functions(functions, block_identifier)
+
+    quoted = [int(result[0][0]) if result is not None else None for result in results]
+    spot_out = quoted[0]
+    spot_price = spot_amount / spot_out if spot_out else 0
+    amounts_out = [amount if amount is not None else float("nan") for amount in quoted[1:]]
+    if np is None:
+        amounts_out = [None if amount != amount else amount for amount in amounts_out]
+
+    result = curve_result(amounts_in, amounts_out, spot_price)
+    result["block_number"] = block_number
+    return result
+
+
+def conditional_pool_curves(snapshot, company_token: str, currency_token: str, company_amounts) -> Dict[str, Any]:
+    """
+    Buy and sell curves of a conditional V3 pool for many company token amounts.
+
+    Buys are sized at the current price so both directions trade the same
+    company token amount.
+
+    Args:
+        snapshot: V3PoolSnapshot of the pool
+        company_token: Conditional company token address (e.g. GNO YES)
+        currency_token: Conditional currency token address (e.g. sDAI YES)
+        company_amounts: Company token amounts in whole tokens
+
+    Returns:
+        dict: block_number, "buy" (currency in) and "sell" (company in) curves
+    """
+    sell_curve = V3SwapCurve.for_token_in(snapshot, company_token)
+    buy_curve = V3SwapCurve.for_token_in(snapshot, currency_token)
+
+    company_wei = _as_array([amount * 10**18 for amount in company_amounts])
+    if np is not None:
+        currency_wei = company_wei * buy_curve.spot_price
+    else:
+        currency_wei = [amount * buy_curve.spot_price for amount in company_wei]
+
+    return {
+        "block_number": snapshot.block_number,
+        "buy": buy_curve.evaluate(currency_wei),
+        "sell": sell_curve.evaluate(company_wei),
+    }
+
+
+def balancer_pool_curves(w3, multicall, batch_router_address: str, pool_address: str,
+                         currency_token: str, company_token: str, company_amounts,
+                         block_identifier: Any = "latest") -> Dict[str, Any]:
+    """
+    Buy and sell curves of a Balancer pool for many company token amounts.
+
+    Args:
+        w3: Web3 instance
+        multicall: utils.multicall.Multicall instance
+        batch_router_address: Balancer BatchRouter address
+        pool_address: Balancer pool address
+        currency_token: Currency token address (e.g. sDAI)
+        company_token: Company token address (e.g. waGNO)
+        company_amounts: Company token amounts in whole tokens
+        block_identifier: Block number or tag to quote at
+
+    Returns:
+        dict: block_number, "buy" (currency in) and "sell" (company in) curves
+    """
+    company_wei = [amount * 10**18 for amount in company_amounts]
+    sell = quote_balancer_curve(
+        w3, multicall, batch_router_address, pool_address, company_token, currency_token,
+        company_wei, block_identifier=block_identifier
+    )
+
+    # Pin the buy quotes to the block of the sell quotes and size them at the spot price
+    currency_per_company = 1 / sell["spot_price"] if sell["spot_price"] else 0
+    buy = quote_balancer_curve(
+        w3, multicall, batch_router_address, pool_address, currency_token, company_token,
+        [amount * currency_per_company for amount in company_wei], block_identifier=sell["block_number"]
+    )
+
+    return {"block_number": sell["block_number"], "buy": buy, "sell": sell}
@@ -0,0 +1,351 @@
+"""
+RPC call metrics for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Provides a Web3 middleware that counts and times every JSON-RPC request
+that reaches the provider, broken down by method and, for eth_call, by
+target contract and function selector. Requests are attributed to the
+high-level operation running when they were sent (get_market_prices,
+swap_exact_in, "step 3" of an arbitrage, ...), set with rpc_operation(),
+track_operation() and rpc_step(). The summary can be printed as a table
+or written as JSON when the process exits.
+"""
+
+import atexit
+import contextvars
+import functools
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+# Label for requests sent outside of any tracked operation
+UNATTRIBUTED = "-"
+
+# Stack of [operation name, current step] frames for the running code
+_operations: contextvars.ContextVar = contextvars.ContextVar("rpc_operations", default=())
+
+
+def current_operation() -> str:
+    """
+    Get the label RPC requests are currently attributed to.
+
+    Returns:
+        str: Nested operations joined with " > " (e.g. "buy_gno [step 2] > swap_exact_in")
+    """
+    frames = _operations.get()
+    if not frames:
+        return UNATTRIBUTED
+    return " > ".join(f"{name} [{step}]" if step else name for name, step in frames)
+
+
+@contextmanager
+def rpc_operation(name: str):
+    """
+    Attribute RPC requests sent inside the block to an operation.
+
+    Operations nest: requests sent by get_balances while running the
+    "balances" command are counted under "balances > get_balances".
+
+    Args:
+        name: Operation name
+    """
+    token = _operations.set(_operations.get() + ([name, None],))
+    try:
+        yield
+    finally:
+        _operations.reset(token)
+
+
+def track_operation(name: Optional[str] = None):
+    """
+    Decorator attributing a function's RPC requests to an operation.
+
+    Args:
+        name: Operation name (defaults to the function name)
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with rpc_operation(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def rpc_step(step: Optional[str]):
+    """
+    Mark the current step of the innermost running operation.
+
+    Meant for long sequential procedures (e.g. the arbitrage commands)
+    where wrapping every step in a with block would not help readability.
+    The step ends when the next one starts or the operation returns.
+
+    Args:
+        step: Step label (e.g. "step 3"), or None to clear it
+    """
+    frames = _operations.get()
+    if frames:
+        frames[-1][1] = step
+
+
+class RpcMetrics:
+    """Counts and times JSON-RPC requests per operation, method and eth_call target"""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.started = time.time()
+        # (operation, method, to, selector) -> [count, errors, total seconds, max seconds]
+        self._counters: Dict[Tuple[str, str, Optional[str], Optional[str]], List[float]] = {}
+        self._lock = threading.Lock()
+        self._exit_registered = False
+
+    def record(self, method: str, params, elapsed: float, error: bool = False, operation: Optional[str] = None):
+        """
+        Record one request.
+
+        Args:
+            method: JSON-RPC method
+            params: Request params (eth_call target and selector are taken from them)
+            elapsed: Seconds the request took
+            error: Whether the request failed or returned an error
+            operation: Operation label (defaults to current_operation())
+        """
+        to = selector = None
+        if method in ("eth_call", "eth_estimateGas") and params and isinstance(params[0], dict):
+            to = str(params[0].get("to") or "").lower() or None
+            data = params[0].get("data", params[0].get("input"))
+            if isinstance(data, bytes):
+                data = "0x" + data.hex()
+            if isinstance(data, str) and len(data) >= 10:
+                selector = data[:10].lower()
+        key = (operation or current_operation(), method, to, selector)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [0, 0, 0.0, 0.0]
+            counter[0] += 1
+            counter[1] += 1 if error else 0
+            counter[2] += elapsed
+            counter[3] = max(counter[3], elapsed)
+
+    def reset(self):
+        """Drop all counters."""
+        with self._lock:
+            self._counters.clear()
+            self.started = time.time()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get overall counters.
+
+        Returns:
+            dict: requests, errors and total seconds spent waiting on the provider
+        """
+        with self._lock:
+            counters = list(self._counters.values())
+        return {
+            "requests": int(sum(counter[0] for counter in counters)),
+            "errors": int(sum(counter[1] for counter in counters)),
+            "seconds": round(sum(counter[2] for counter in counters), 3),
+        }
+
+    # ------------------------------------------------------------- summary
+
+    @staticmethod
+    def _row(counter: List[float]) -> Dict[str, Any]:
+        count, errors, total, longest = counter
+        return {
+            "calls": int(count),
+            "errors": int(errors),
+            "total_ms": round(total * 1000, 1),
+            "avg_ms": round(total * 1000 / count, 1) if count else 0.0,
+            "max_ms": round(longest * 1000, 1),
+        }
+
+    @staticmethod
+    def _merge(groups: Dict[Any, List[float]], key, counter: List[float]):
+        merged = groups.setdefault(key, [0, 0, 0.0, 0.0])
+        merged[0] += counter[0]
+        merged[1] += counter[1]
+        merged[2] += counter[2]
+        merged[3] = max(merged[3], counter[3])
+
+    @staticmethod
+    def _known_names() -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Map configured contract addresses and ABI function selectors to names."""
+        addresses, selectors = {}, {}
+        try:
+            from eth_utils import function_abi_to_4byte_selector
+            from futarchy.experimental.config import abis
+            from futarchy.experimental.config.contracts import CONTRACT_ADDRESSES
+        except ImportError:
+            return addresses, selectors
+        for name, address in CONTRACT_ADDRESSES.items():
+            addresses.setdefault(str(address).lower(), name)
+        for abi_name in abis._ABI_MODULES:
+            for entry in getattr(abis, abi_name):
+                if entry.get("type") == "function":
+                    selector = "0x" + function_abi_to_4byte_selector(entry).hex()
+                    selectors.setdefault(selector, entry["name"])
+        return addresses, selectors
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the recorded requests.
+
+        Returns:
+            dict: totals plus rows grouped by operation, by (operation, method)
+                and by eth_call target and function, slowest first
+        """
+        with self._lock:
+            counters = {key: list(counter) for key, counter in self._counters.items()}
+        addresses, selectors = self._known_names()
+
+        by_operation, by_method, by_call = {}, {}, {}
+        for (operation, method, to, selector), counter in counters.items():
+            self._merge(by_operation, operation, counter)
+            self._merge(by_method, (operation, method), counter)
+            if to is not None or selector is not None:
+                self._merge(by_call, (operation, method, to, selector), counter)
+
+        def ordered(groups):
+            return sorted(groups.items(), key=lambda item: item[1][2], reverse=True)
+
+        return {
+            "elapsed": round(time.time() - self.started, 3),
+            **self.stats(),
+            "operations": [
+                {"operation": operation, **self._row(counter)} for operation, counter in ordered(by_operation)
+            ],
+            "methods": [
+                {"operation": operation, "method": method, **self._row(counter)}
+                for (operation, method), counter in ordered(by_method)
+            ],
+            "calls": [
+                {
+                    "operation": operation,
+                    "method": method,
+                    "to": to,
+                    "contract": addresses.get(to),
+                    "selector": selector,
+                    "function": selectors.get(selector),
+                    **self._row(counter),
+                }
+                for (operation, method, to, selector), counter in ordered(by_call)
+            ],
+        }
+
+    def format_table(self, summary: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Format the summary as a text table.
+
+        Args:
+            summary: Summary to format (defaults to summary())
+
+        Returns:
+            str: Table with one line per (operation, method) and per eth_call target
+        """
+        summary = summary or self.summary()
+        lines = [
+            f"📡 RPC calls: {summary['requests']} requests, {summary['errors']} errors, "
+            f"{summary['seconds'] * 1000:.0f}ms waiting on the provider",
+            f"{'operation':<48} {'method':<26} {'calls':>6} {'err':>4} {'total ms':>10} {'avg ms':>8} {'max ms':>8}",
+        ]
+        for row in summary["methods"]:
+            lines.append(
+                f"{row['operation'][:48]:<48} {row['method'][:26]:<26} {row['calls']:>6} {row['errors']:>4} "
+                f"{row['total_ms']:>10.1f} {row['avg_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
+        if summary["calls"]:
+            lines.append("")
+            lines.append(f"{'operation':<48} {'target':<42} {'function':<32} {'calls':>6} {'total ms':>10}")
+            for row in summary["calls"]:
+                target = row["contract"] or row["to"] or ""
+                function = row["function"] or row["selector"] or ""
+                if row["method"] != "eth_call":
+                    function = f"{function} ({row['method']})"
+                lines.append(
+                    f"{row['operation'][:48]:<48} {target[:42]:<42} {function[:32]:<32} "
+                    f"{row['calls']:>6} {row['total_ms']:>10.1f}"
+                )
+        return "\n".join(lines)
+
+    def dump(self, fmt: str = "table", path: Optional[str] = None):
+        """
+        Write the summary.
+
+        Args:
+            fmt: "table" or "json"
+            path: File to write (defaults to stderr)
+        """
+        text = json.dumps(self.summary(), indent=2) if fmt == "json" else self.format_table()
+        if path:
+            with open(path, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text, file=sys.stderr)
+
+    def dump_at_exit(self, fmt: str = "table", path: Optional[str] = None):
+        """
+        Write the summary when the process exits.
+
+        Args:
+            fmt: "table" or "json"
+            path: File to write (defaults to stderr)
+        """
+        self.exit_format, self.exit_path = fmt, path
+        if not self._exit_registered:
+            self._exit_registered = True
+            atexit.register(lambda: self.dump(self.exit_format, self.exit_path))
+
+    # ---------------------------------------------------------- middleware
+
+    def wrap_make_request(self, make_request):
+        """
+        Wrap a provider make_request function with metrics.
+
+        Args:
+            make_request: Next make_request in the middleware chain
+
+        Returns:
+            function: make_request that records every request
+        """
+        def middleware(method, params):
+            start = time.perf_counter()
+            try:
+                response = make_request(method, params)
+            except Exception:
+                self.record(method, params, time.perf_counter() - start, error=True)
+                raise
+            self.record(method, params, time.perf_counter() - start, error="error" in response)
+            return response
+
+        return middleware
+
+    def middleware(self, make_request, w3):
+        """web3.py v6 style middleware factory."""
+        return self.wrap_make_request(make_request)
+
+    def as_web3_v7_middleware(self):
+        """
+        Build a web3.py v7 middleware class bound to these metrics.
+
+        Returns:
+            type: Web3Middleware subclass to pass to middleware_onion.inject
+        """
+        from web3.middleware import Web3Middleware
+
+        metrics = self
+
+        class RpcMetricsMiddleware(Web3Middleware):
+            def wrap_make_request(self, make_request):
+                return metrics.wrap_make_request(make_request)
+
+        return RpcMetricsMiddleware
@@ -0,0 +1,428 @@
+"""
+RPC endpoint pool for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+A web3 provider that spreads requests over several JSON-RPC endpoints. It
+keeps rolling latency (p50/p99) and error statistics per endpoint, routes
+each request to the fastest healthy one, fails over when an endpoint errors
+or times out, and can hedge slow read requests by sending a second copy to
+the next best endpoint. Endpoints that fail are cooled down, endpoints that
+lag behind the chain head are skipped, and a background thread can keep
+idle endpoints warm. Reads against "latest"/"pending" only go to endpoints
+that have reported the best known head, so a slightly lagging node that is
+still within max_block_lag never answers them with older state.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Sequence
+
+from web3.providers.base import JSONBaseProvider
+
+from futarchy.experimental.utils.http_pool import HttpPool, get_http_pool
+
+# Requests that change node or chain state are never duplicated
+NON_HEDGEABLE_METHODS = (
+    "eth_sendRawTransaction",
+    "eth_sendTransaction",
+    "eth_sign",
+    "eth_signTransaction",
+)
+
+# Filters live on the node that created them
+FILTER_CREATE_METHODS = ("eth_newFilter", "eth_newBlockFilter", "eth_newPendingTransactionFilter")
+FILTER_METHODS = ("eth_getFilterChanges", "eth_getFilterLogs", "eth_uninstallFilter")
+
+# Position of the block parameter of methods that read state at a block
+BLOCK_PARAM_INDEX = {
+    "eth_call": 1,
+    "eth_estimateGas": 1,
+    "eth_getBalance": 1,
+    "eth_getCode": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getStorageAt": 2,
+    "eth_getBlockByNumber": 0,
+    "eth_getBlockTransactionCountByNumber": 0,
+    "eth_feeHistory": 1,
+}
+
+# Block tags that move with the chain head (a missing block parameter means "latest")
+HEAD_TAGS = (None, "latest", "pending")
+
+# JSON-RPC errors that mean the endpoint, not the request, is at fault
+ENDPOINT_ERRORS = (
+    "rate limit",
+    "too many requests",
+    "capacity",
+    "header not found",
+    "timeout",
+    "timed out",
+    "internal error",
+    "service unavailable",
+)
+
+
+def is_endpoint_error(error) -> bool:
+    """
+    Check whether a JSON-RPC error should be retried on another endpoint.
+
+    Args:
+        error: Error dict from the response
+
+    Returns:
+        bool: True for rate limits and node-side failures, False for request errors such as reverts
+    """
+    if not isinstance(error, dict):
+        return True
+    if error.get("code") in (-32005, 429):
+        return True
+    message = str(error.get("message", "")).lower()
+    return any(text in message for text in ENDPOINT_ERRORS)
+
+
+def reads_head(method: str, params) -> bool:
+    """
+    Check whether a request reads state relative to the chain head.
+
+    Args:
+        method: JSON-RPC method
+        params: Request parameters
+
+    Returns:
+        bool: True for head block tags and for eth_blockNumber
+    """
+    if method == "eth_blockNumber":
+        return True
+    index = BLOCK_PARAM_INDEX.get(method)
+    if index is None:
+        return False
+    block = params[index] if params is not None and len(params) > index else None
+    return block in HEAD_TAGS
+
+
+class EndpointStats:
+    """Rolling latency and error statistics of one endpoint"""
+
+    def __init__(self, url: str, window: int = 200):
+        """
+        Initialize the statistics.
+
+        Args:
+            url: Endpoint URL
+            window: Number of recent requests kept
+        """
+        self.url = url
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.block_number = None
+
+    def record(self, latency: float, ok: bool):
+        """Record the latency and outcome of a request."""
+        self.requests += 1
+        self.outcomes.append(ok)
+        if ok:
+            self.latencies.append(latency)
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile over the window, or None without samples."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.5)
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+    def score(self) -> float:
+        """Expected cost of a request: median latency inflated by the error rate."""
+        p50 = self.p50
+        # Endpoints without samples are tried first so every endpoint gets measured
+        if p50 is None:
+            return 0.0
+        return p50 * (1 + 10 * self.error_rate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "p50_ms": round(self.p50 * 1000, 1) if self.p50 is not None else None,
+            "p99_ms": round(self.p99 * 1000, 1) if self.p99 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "block_number": self.block_number,
+            "cooling_down": self.cooldown_until > time.monotonic(),
+        }
+
+
+class RpcEndpointPool(JSONBaseProvider):
+    """web3 provider routing each request to the fastest healthy endpoint"""
+
+    def __init__(self, endpoints: Sequence[str], request_timeout: float = 10,
+                 hedge_reads: bool = True, hedge_delay: Optional[float] = None,
+                 min_hedge_delay: float = 0.05, cooldown: float = 30, max_block_lag: int = 3,
+                 max_attempts: int = 3, request_kwargs: Optional[Dict[str, Any]] = None,
+                 http_pool: Optional[HttpPool] = None):
+        """
+        Initialize the pool.
+
+        Args:
+            endpoints: JSON-RPC endpoint URLs
+            request_timeout: Seconds before a request to one endpoint times out
+            hedge_reads: Send a second copy of slow read requests to the next best endpoint
+            hedge_delay: Seconds before hedging (defaults to the primary endpoint's p99 latency)
+            min_hedge_delay: Lower bound of the adaptive hedge delay
+            cooldown: Seconds an endpoint is skipped after repeated failures
+            max_block_lag: Blocks an endpoint may trail the best known head before it is skipped
+            max_attempts: Endpoints tried per request before giving up
+            request_kwargs: Extra keyword arguments for the underlying HTTP requests
+            http_pool: Connection pool shared by the endpoints (defaults to the process-wide pool)
+        """
+        super().__init__()
+        if not endpoints:
+            raise ValueError("RpcEndpointPool needs at least one endpoint")
+        kwargs = dict(request_kwargs or {})
+        kwargs.setdefault("timeout", request_timeout)
+        http_pool = http_pool or get_http_pool()
+        self.providers = {url: http_pool.provider(url, request_kwargs=kwargs) for url in endpoints}
+        self.endpoints = {url: EndpointStats(url) for url in endpoints}
+        self.hedge_reads = hedge_reads and len(endpoints) > 1
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.cooldown = cooldown
+        self.max_block_lag = max_block_lag
+        self.max_attempts = max_attempts
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._filters: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(endpoints)), thread_name_prefix="rpc-pool")
+        self._keepalive = None
+        self._stop = threading.Event()
+
+    def __str__(self):
+        return f"RPC endpoint pool ({len(self.endpoints)} endpoints)"
+
+    @property
+    def endpoint_uri(self) -> str:
+        """URL of the currently preferred endpoint (for clients that need a single URL)."""
+        return self.ranked()[0]
+
+    def _head(self) -> Optional[int]:
+        heads = [stats.block_number for stats in self.endpoints.values() if stats.block_number is not None]
+        return max(heads) if heads else None
+
+    def at_head(self, url: str) -> bool:
+        """Whether an endpoint has reported the best known head (True while no head is known)."""
+        head = self._head()
+        block_number = self.endpoints[url].block_number
+        return head is None or (block_number is not None and block_number >= head)
+
+    def ranked(self, head_read: bool = False) -> List[str]:
+        """
+        Endpoints ordered by preference.
+
+        Healthy endpoints come first, fastest first; cooling-down or lagging
+        endpoints follow so a request can still be served if all are unhealthy.
+
+        Args:
+            head_read: Rank endpoints that reported the best known head before
+                all others, for reads against "latest" or "pending"
+
+        Returns:
+            list: Endpoint URLs
+        """
+        now = time.monotonic()
+        head = self._head()
+        with self._lock:
+            def unhealthy(stats):
+                lagging = head is not None and stats.block_number is not None and head - stats.block_number > self.max_block_lag
+                return stats.cooldown_until > now or lagging
+
+            def behind(stats):
+                return head_read and head is not None and (stats.block_number is None or stats.block_number < head)
+
+            return [stats.url for stats in sorted(
+                self.endpoints.values(), key=lambda stats: (behind(stats), unhealthy(stats), stats.score())
+            )]
+
+    def _send(self, url: str, method: str, params) -> Dict[str, Any]:
+        """Send one request to one endpoint and record the outcome."""
+        stats = self.endpoints[url]
+        start = time.perf_counter()
+        try:
+            response = self.providers[url].make_request(method, params)
+        except Exception:
+            self._record(stats, time.perf_counter() - start, False)
+            raise
+        ok = "error" not in response or not is_endpoint_error(response["error"])
+        self._record(stats, time.perf_counter() - start, ok)
+        if ok and method == "eth_blockNumber" and isinstance(response.get("result"), str):
+            stats.block_number = int(response["result"], 16)
+        return response
+
+    def _record(self, stats: EndpointStats, latency: float, ok: bool):
+        with self._lock:
+            stats.record(latency, ok)
+            if not ok and stats.consecutive_failures >= 2:
+                stats.cooldown_until = time.monotonic() + self.cooldown
+
+    def _delay(self, url: str) -> float:
+        """Seconds to wait for the primary before hedging."""
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        stats = self.endpoints[url]
+        p99 = stats.p99 if len(stats.latencies) >= 20 else None
+        return max(self.min_hedge_delay, p99 if p99 is not None else 1.0)
+
+    def _hedged(self, urls: List[str], method: str, params) -> Dict[str, Any]:
+        """Send to the best endpoint, adding the second best if the first is slow or fails."""
+        primary = self._executor.submit(self._send, urls[0], method, params)
+        done, _ = wait([primary], timeout=self._delay(urls[0]))
+        if (done and self._usable(primary)) or len(urls) < 2:
+            return primary.result()
+
+        with self._lock:
+            self.hedges += 1
+        pending = {self._executor.submit(self._send, urls[1], method, params): urls[1]}
+        if not done:
+            pending[primary] = urls[0]
+        fallback = primary if done else None
+        while pending:
+            finished, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for future in finished:
+                url = pending.pop(future)
+                if self._usable(future):
+                    if url != urls[0]:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+                fallback = fallback or future
+        # No copy succeeded: return the error response or raise the exception
+        return fallback.result()
+
+    @staticmethod
+    def _usable(future) -> bool:
+        if future.exception() is not None:
+            return False
+        response = future.result()
+        return "error" not in response or not is_endpoint_error(response["error"])
+
+    def make_request(self, method, params) -> Dict[str, Any]:
+        """
+        Route a JSON-RPC request.
+
+        Args:
+            method: JSON-RPC method
+            params: Request parameters
+
+        Returns:
+            dict: JSON-RPC response from the first endpoint that answered usefully
+        """
+        if method in FILTER_METHODS and params:
+            url = self._filters.get(str(params[0]))
+            if url is not None:
+                if method == "eth_uninstallFilter":
+                    self._filters.pop(str(params[0]), None)
+                return self._send(url, method, params)
+
+        head_read = reads_head(method, params)
+        urls = self.ranked(head_read)[:self.max_attempts]
+        # A hedge of a head read must not race a node that has not reached the head
+        hedgeable = len(urls) > 1 and (not head_read or self.at_head(urls[1]))
+        if (self.hedge_reads and hedgeable and method not in NON_HEDGEABLE_METHODS
+                and method not in FILTER_CREATE_METHODS):
+            try:
+                return self._hedged(urls, method, params)
+            except Exception as e:
+                urls = urls[2:]
+                if not urls:
+                    raise
+                print(f"⚠️ RPC {method} failed on the two best endpoints ({e}), failing over")
+
+        last_error = None
+        for url in urls:
+            try:
+                response = self._send(url, method, params)
+            except Exception as e:
+                last_error = e
+                continue
+            if "error" in response and is_endpoint_error(response["error"]) and url != urls[-1]:
+                continue
+            if method in FILTER_CREATE_METHODS and isinstance(response.get("result"), str):
+                self._filters[response["result"]] = url
+            return response
+        raise last_error or ConnectionError(f"No RPC endpoint answered {method}")
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        """True if at least one endpoint answers."""
+        return any(self.warm().values())
+
+    def warm(self) -> Dict[str, bool]:
+        """
+        Probe every endpoint concurrently with eth_blockNumber.
+
+        Returns:
+            dict: URL -> whether the endpoint answered
+        """
+        futures = {url: self._executor.submit(self._send, url, "eth_blockNumber", []) for url in self.endpoints}
+        results = {}
+        for url, future in futures.items():
+            try:
+                results[url] = "result" in future.result()
+            except Exception:
+                results[url] = False
+        return results
+
+    def start_keepalive(self, interval: float = 30):
+        """
+        Probe all endpoints in a background thread so idle ones stay warm and measured.
+
+        Args:
+            interval: Seconds between probes
+        """
+        if self._keepalive is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                self.warm()
+
+        self._keepalive = threading.Thread(target=run, name="rpc-pool-keepalive", daemon=True)
+        self._keepalive.start()
+
+    def stop(self):
+        """Stop the keep-alive thread."""
+        self._stop.set()
+        self._keepalive = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            dict: hedges sent and won, and per-endpoint request counts, latencies and health
+        """
+        with self._lock:
+            endpoints = {url: stats.to_dict() for url, stats in self.endpoints.items()}
+        return {"hedges": self.hedges, "hedge_wins": self.hedge_wins, "ranking": self.ranked(), "endpoints": endpoints}
@@ -0,0 +1,103 @@
+"""
+Startup profiler for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Measures where a command's startup time goes: the time spent importing
+each module (cumulative and self, like python -X importtime) and named
+startup phases such as connecting and running the command. Enabled with
+main.py --profile-startup; uses only the standard library so it can be
+installed before anything heavy is imported.
+"""
+
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """Times module imports and startup phases"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: Record anything at all (a disabled profiler makes phase() a no-op)
+        """
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.imports: Dict[str, Tuple[float, float]] = {}
+        self.phases: List[Tuple[str, float]] = []
+        self._stack: List[List[float]] = []
+        self._original_import = None
+
+    def start(self) -> "StartupProfiler":
+        """Start timing imports."""
+        if not self.enabled or self._original_import is not None:
+            return self
+        self._original_import = builtins.__import__
+        original = self._original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only the first import of a module does any work
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._stack.append([0.0])
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                children = self._stack.pop()[0]
+                if self._stack:
+                    self._stack[-1][0] += elapsed
+                if name not in self.imports:
+                    self.imports[name] = (elapsed, elapsed - children)
+
+        builtins.__import__ = timed_import
+        return self
+
+    def stop(self):
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a named startup phase.
+
+        Args:
+            name: Phase name shown in the report
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self.enabled:
+                self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, top: int = 15):
+        """
+        Print the slowest imports and the phase timings.
+
+        Args:
+            top: Number of imports to list
+        """
+        if not self.enabled:
+            return
+        self.stop()
+        total = time.perf_counter() - self.started
+        print("\n⏱️ Startup profile")
+        print(f"{'cumulative':>12} {'self':>10}  import")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        for name, (cumulative, own) in slowest:
+            print(f"{cumulative * 1000:>10.1f}ms {own * 1000:>8.1f}ms  {name}")
+        imported = sum(own for _, own in self.imports.values())
+        print(f"\n{'imports':<28} {imported * 1000:>9.1f}ms ({len(self.imports)} modules)")
+        for name, elapsed in self.phases:
+            print(f"{name:<28} {elapsed * 1000:>9.1f}ms")
+        print(f"{'total':<28} {total * 1000:>9.1f}ms")
@@ -0,0 +1,172 @@
+"""
+Tick bitmap scanner for the Futarchy Trading Bot.
+
+This module is currently in EXPERIMENTAL status.
+Finds every initialized tick of a Uniswap V3 pool in a tick range by
+reading the pool's tickBitmap words, then reads liquidityNet and
+liquidityGross of those ticks only. With Multicall3 the whole scan is a
+handful of eth_calls (slot0, the bitmap words and the ticks, 500 per
+batch) instead of one `ticks(t)` call per candidate tick.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+from futarchy.experimental.config.constants import UNISWAP_V3_POOL_ABI
+from futarchy.experimental.utils.uniswap_v3_math import MIN_TICK, MAX_TICK
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot, initialized_ticks, tick_position
+
+
+class LiquidityMap:
+    """Sorted initialized ticks of a pool with their liquidity, backed by flat arrays"""
+
+    def __init__(self, ticks: List[int], liquidity_net: List[int], liquidity_gross: List[int],
+                 tick_spacing: int, tick: Optional[int] = None, liquidity: Optional[int] = None,
+                 block_number: Optional[int] = None, pool_address: Optional[str] = None):
+        """
+        Initialize the map.
+
+        Args:
+            ticks: Initialized ticks in ascending order
+            liquidity_net: liquidityNet of each tick
+            liquidity_gross: liquidityGross of each tick
+            tick_spacing: Pool tick spacing
+            tick: Current pool tick
+            liquidity: Active liquidity at the current tick
+            block_number: Block the map was read at
+            pool_address: Pool address
+        """
+        self.ticks = array("i", ticks)
+        # liquidityNet is an int128, too wide for a typed array
+        self.liquidity_net = list(liquidity_net)
+        self.liquidity_gross = list(liquidity_gross)
+        self.tick_spacing = tick_spacing
+        self.tick = tick
+        self.liquidity = liquidity
+        self.block_number = block_number
+        self.pool_address = pool_address
+
+        # Liquidity active just above each tick, assuming no liquidity below the first scanned tick
+        self.cumulative = []
+        running = 0
+        for net in self.liquidity_net:
+            running += net
+            self.cumulative.append(running)
+
+    def __len__(self) -> int:
+        return len(self.ticks)
+
+    def is_initialized(self, tick: int) -> bool:
+        """Whether a tick is initialized."""
+        index = bisect_left(self.ticks, tick)
+        return index < len(self.ticks) and self.ticks[index] == tick
+
+    def liquidity_at(self, tick: int) -> int:
+        """
+        Active liquidity while the pool price is at a tick.
+
+        Only exact when the scan started below every position (e.g. a full range scan).
+
+        Args:
+            tick: Tick to evaluate
+
+        Returns:
+            int: Sum of liquidityNet of the initialized ticks at or below the tick
+        """
+        index = bisect_right(self.ticks, tick)
+        return self.cumulative[index - 1] if index else 0
+
+    def between(self, tick_lower: int, tick_upper: int) -> List[int]:
+        """Initialized ticks in [tick_lower, tick_upper]."""
+        return list(self.ticks[bisect_left(self.ticks, tick_lower):bisect_right(self.ticks, tick_upper)])
+
+    def nearest(self, tick: int, count: int = 1) -> Dict[str, List[int]]:
+        """
+        Closest initialized ticks on each side of a tick.
+
+        Args:
+            tick: Reference tick
+            count: Ticks to return per side
+
+        Returns:
+            dict: below (descending, at or below the tick) and above (ascending)
+        """
+        index = bisect_right(self.ticks, tick)
+        below = list(self.ticks[max(0, index - count):index])[::-1]
+        return {"below": below, "above": list(self.ticks[index:index + count])}
+
+    def rows(self) -> List[Dict[str, int]]:
+        """One dict per initialized tick: tick, liquidity_net, liquidity_gross and active liquidity above it."""
+        return [
+            {"tick": tick, "liquidity_net": net, "liquidity_gross": gross, "liquidity_above": above}
+            for tick, net, gross, above in zip(self.ticks, self.liquidity_net, self.liquidity_gross, self.cumulative)
+        ]
+
+
+def scan_initialized_ticks(w3, pool_address: str, multicall=None, tick_lower: Optional[int] = None,
+                           tick_upper: Optional[int] = None, metadata=None,
+                           block_identifier: Any = "latest") -> LiquidityMap:
+    """
+    Read every initialized tick of a pool in a range.
+
+    Args:
+        w3: Web3 instance
+        pool_address: V3 pool address
+        multicall: Optional utils.multicall.Multicall instance to batch the reads
+        tick_lower: Lowest tick to scan (defaults to MIN_TICK)
+        tick_upper: Highest tick to scan (defaults to MAX_TICK)
+        metadata: Optional MetadataCache for the tick spacing
+        block_identifier: Block number or tag to read at
+
+    Returns:
+        LiquidityMap: Initialized ticks in the range, all read at one block
+    """
+    pool = w3.eth.contract(address=w3.to_checksum_address(pool_address), abi=UNISWAP_V3_POOL_ABI)
+
+    tick_spacing = metadata.tick_spacing(pool_address) if metadata is not None else None
+    if multicall is not None:
+        functions = [pool.functions.slot0(), pool.functions.liquidity()]
+        if tick_spacing is None:
+            functions.append(pool.functions.tickSpacing())
+        block_number, results = multicall.call_functions(functions, block_identifier)
+        if any(result is None for result in results):
+            raise ValueError(f"Could not read slot0/liquidity of pool {pool_address}")
+        slot0, liquidity = results[0], results[1]
+        if tick_spacing is None:
+            tick_spacing = results[2]
+    else:
+        block_number = w3.eth.block_number if block_identifier == "latest" else block_identifier
+        slot0 = pool.functions.slot0().call(block_identifier=block_number)
+        liquidity = pool.functions.liquidity().call(block_identifier=block_number)
+        if tick_spacing is None:
+            tick_spacing = pool.functions.tickSpacing().call(block_identifier=block_number)
+    tick_spacing = int(tick_spacing)
+
+    tick_lower = MIN_TICK if tick_lower is None else max(tick_lower, MIN_TICK)
+    tick_upper = MAX_TICK if tick_upper is None else min(tick_upper, MAX_TICK)
+    lower_word, _ = tick_position(tick_lower // tick_spacing)
+    upper_word, _ = tick_position(tick_upper // tick_spacing)
+    words = list(range(lower_word, upper_word + 1))
+
+    word_values = V3PoolSnapshot._read_many(pool, "tickBitmap", words, multicall, block_number)
+    bitmap = {}
+    for word, value in zip(words, word_values):
+        if value is None:
+            # Reading it as 0 would silently drop every initialized tick in the word
+            raise ValueError(f"Could not read tick bitmap word {word} of pool {pool_address}")
+        bitmap[word] = int(value)
+    ticks = [tick for tick in initialized_ticks(bitmap, tick_spacing) if tick_lower <= tick <= tick_upper]
+
+    tick_infos = V3PoolSnapshot._read_many(pool, "ticks", ticks, multicall, block_number)
+    liquidity_net, liquidity_gross = [], []
+    for tick, info in zip(ticks, tick_infos):
+        if info is None:
+            raise ValueError(f"Could not read tick {tick} of pool {pool_address}")
+        liquidity_gross.append(int(info[0]))
+        liquidity_net.append(int(info[1]))
+
+    return LiquidityMap(
+        ticks, liquidity_net, liquidity_gross, tick_spacing, tick=int(slot0[1]), liquidity=int(liquidity),
+        block_number=block_number, pool_address=pool_address
+    )
@@ -0,0 +1,437 @@
+"""
+Uniswap V3 math in exact integer arithmetic.
+
+This module is currently in EXPERIMENTAL status.
+Python ports of the TickMath, SqrtPriceMath and FullMath libraries used by
+Uniswap V3 (and SushiSwap V3) pools. All functions operate on the same
+integers as the contracts and round the same way, so local results match
+on-chain results bit for bit.
+"""
+
+import math
+from fractions import Fraction
+from functools import lru_cache
+from typing import Tuple
+
+# TickMath bounds
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+Q96 = 1 << 96
+Q128 = 1 << 128
+Q192 = 1 << 192
+MAX_UINT160 = (1 << 160) - 1
+MAX_UINT256 = (1 << 256) - 1
+
+# Multipliers for each bit of |tick|: 2**128 / sqrt(1.0001) ** (2 ** i)
+_TICK_BIT_RATIOS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+_LOG_SQRT_1_0001 = math.log(1.0001) / 2
+
+
+# ---------------------------------------------------------------------------
+# FullMath
+# ---------------------------------------------------------------------------
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """floor(a * b / denominator) with full precision (FullMath.mulDiv)."""
+    if denominator <= 0:
+        raise ValueError("mul_div: denominator must be positive")
+    result = (a * b) // denominator
+    if result > MAX_UINT256:
+        raise OverflowError("mul_div: result exceeds uint256")
+    return result
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """ceil(a * b / denominator) with full precision (FullMath.mulDivRoundingUp)."""
+    if denominator <= 0:
+        raise ValueError("mul_div_rounding_up: denominator must be positive")
+    result = -((-a * b) // denominator)
+    if result > MAX_UINT256:
+        raise OverflowError("mul_div_rounding_up: result exceeds uint256")
+    return result
+
+
+def div_rounding_up(x: int, y: int) -> int:
+    """ceil(x / y) (UnsafeMath.divRoundingUp)."""
+    return -(-x // y)
+
+
+# ---------------------------------------------------------------------------
+# TickMath
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=1 << 16)
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """
+    Calculate sqrt(1.0001 ** tick) * 2 ** 96 (TickMath.getSqrtRatioAtTick).
+
+    Args:
+        tick: Tick between MIN_TICK and MAX_TICK
+
+    Returns:
+        int: sqrtPriceX96 as a Q64.96 integer
+    """
+    abs_tick = -tick if tick < 0 else tick
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"Tick {tick} out of range")
+
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 else 0x100000000000000000000000000000000
+    for bit, multiplier in _TICK_BIT_RATIOS:
+        if abs_tick & bit:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Round up when converting from Q128.128 to Q64.96
+    return (ratio >> 32) + (0 if ratio & 0xffffffff == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """
+    Calculate the greatest tick whose sqrt ratio is <= sqrt_price_x96 (TickMath.getTickAtSqrtRatio).
+
+    Args:
+        sqrt_price_x96: sqrtPriceX96 between MIN_SQRT_RATIO (inclusive) and MAX_SQRT_RATIO (exclusive)
+
+    Returns:
+        int: Tick
+    """
+    if not MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO:
+        raise ValueError(f"sqrtPriceX96 {sqrt_price_x96} out of range")
+
+    # Floating point estimate, then exact correction against getSqrtRatioAtTick
+    tick = math.floor((math.log(sqrt_price_x96) - math.log(Q96)) / _LOG_SQRT_1_0001)
+    tick = max(MIN_TICK, min(MAX_TICK, tick))
+    while tick > MIN_TICK and get_sqrt_ratio_at_tick(tick) > sqrt_price_x96:
+        tick -= 1
+    while tick < MAX_TICK and get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+# ---------------------------------------------------------------------------
+# SqrtPriceMath
+# ---------------------------------------------------------------------------
+
+def get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96: int, liquidity: int, amount: int, add: bool) -> int:
+    """New sqrt price after adding or removing `amount` of token0 (SqrtPriceMath)."""
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price_x96
+
+    if add:
+        # The contract takes the precise path only while product and denominator fit in 256 bits
+        if product <= MAX_UINT256:
+            denominator = numerator1 + product
+            if denominator <= MAX_UINT256:
+                return mul_div_rounding_up(numerator1, sqrt_price_x96, denominator)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount)
+
+    if product > MAX_UINT256 or numerator1 <= product:
+        raise ValueError("Insufficient liquidity for token0 output")
+    result = mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 - product)
+    if result > MAX_UINT160:
+        raise OverflowError("sqrt price exceeds uint160")
+    return result
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96: int, liquidity: int, amount: int, add: bool) -> int:
+    """New sqrt price after adding or removing `amount` of token1 (SqrtPriceMath)."""
+    if add:
+        result = sqrt_price_x96 + (amount << 96) // liquidity
+        if result > MAX_UINT160:
+            raise OverflowError("sqrt price exceeds uint160")
+        return result
+
+    quotient = div_rounding_up(amount << 96, liquidity)
+    if sqrt_price_x96 <= quotient:
+        raise ValueError("Insufficient liquidity for token1 output")
+    return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool) -> int:
+    """
+    New sqrt price after swapping `amount_in` into the pool.
+
+    Args:
+        sqrt_price_x96: Starting sqrt price
+        liquidity: Active liquidity
+        amount_in: Input amount (after fees)
+        zero_for_one: True if token0 is the input
+
+    Returns:
+        int: Next sqrtPriceX96
+    """
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("sqrt price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_in, True)
+    return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_in, True)
+
+
+def get_next_sqrt_price_from_output(sqrt_price_x96: int, liquidity: int, amount_out: int, zero_for_one: bool) -> int:
+    """
+    New sqrt price after taking `amount_out` out of the pool.
+
+    Args:
+        sqrt_price_x96: Starting sqrt price
+        liquidity: Active liquidity
+        amount_out: Output amount
+        zero_for_one: True if token0 is the input (token1 is taken out)
+
+    Returns:
+        int: Next sqrtPriceX96
+    """
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("sqrt price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_out, False)
+    return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_out, False)
+
+
+def get_amount0_delta(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool) -> int:
+    """
+    Amount of token0 between two sqrt prices for a liquidity amount.
+
+    Args:
+        sqrt_ratio_a_x96: One sqrt price bound
+        sqrt_ratio_b_x96: The other sqrt price bound
+        liquidity: Liquidity (unsigned)
+        round_up: Round the result up instead of down
+
+    Returns:
+        int: token0 amount
+    """
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    if sqrt_ratio_a_x96 <= 0:
+        raise ValueError("sqrt price must be positive")
+
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+
+    if round_up:
+        return div_rounding_up(mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b_x96), sqrt_ratio_a_x96)
+    return mul_div(numerator1, numerator2, sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int, round_up: bool) -> int:
+    """
+    Amount of token1 between two sqrt prices for a liquidity amount.
+
+    Args:
+        sqrt_ratio_a_x96: One sqrt price bound
+        sqrt_ratio_b_x96: The other sqrt price bound
+        liquidity: Liquidity (unsigned)
+        round_up: Round the result up instead of down
+
+    Returns:
+        int: token1 amount
+    """
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+    return mul_div(liquidity, sqrt_ratio_b_x96 - sqrt_ratio_a_x96, Q96)
+
+
+def get_amount0_delta_signed(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Signed token0 delta for a signed liquidity change (rounds up when adding liquidity)."""
+    if liquidity < 0:
+        return -get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, -liquidity, False)
+    return get_amount0_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+
+
+def get_amount1_delta_signed(sqrt_ratio_a_x96: int, sqrt_ratio_b_x96: int, liquidity: int) -> int:
+    """Signed token1 delta for a signed liquidity change (rounds up when adding liquidity)."""
+    if liquidity < 0:
+        return -get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, -liquidity, False)
+    return get_amount1_delta(sqrt_ratio_a_x96, sqrt_ratio_b_x96, liquidity, True)
+
+
+# ---------------------------------------------------------------------------
+# SwapMath
+# ---------------------------------------------------------------------------
+
+def compute_swap_step(sqrt_ratio_current_x96: int, sqrt_ratio_target_x96: int, liquidity: int,
+                      amount_remaining: int, fee_pips: int) -> Tuple[int, int, int, int]:
+    """
+    Compute one step of a swap within a single liquidity range (SwapMath.computeSwapStep).
+
+    Args:
+        sqrt_ratio_current_x96: Current sqrt price
+        sqrt_ratio_target_x96: Price the step may not go beyond
+        liquidity: Active liquidity
+        amount_remaining: Amount left to swap (positive for exact input, negative for exact output)
+        fee_pips: Pool fee in hundredths of a bip
+
+    Returns:
+        tuple: (sqrt_ratio_next_x96, amount_in, amount_out, fee_amount)
+    """
+    zero_for_one = sqrt_ratio_current_x96 >= sqrt_ratio_target_x96
+    exact_in = amount_remaining >= 0
+
+    if exact_in:
+        amount_remaining_less_fee = mul_div(amount_remaining, 1_000_000 - fee_pips, 1_000_000)
+        if zero_for_one:
+            amount_in = get_amount0_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, True)
+        else:
+            amount_in = get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, True)
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+        else:
+            sqrt_ratio_next_x96 = get_next_sqrt_price_from_input(
+                sqrt_ratio_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+            )
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(sqrt_ratio_target_x96, sqrt_ratio_current_x96, liquidity, False)
+        else:
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_target_x96, liquidity, False)
+        if -amount_remaining >= amount_out:
+            sqrt_ratio_next_x96 = sqrt_ratio_target_x96
+        else:
+            sqrt_ratio_next_x96 = get_next_sqrt_price_from_output(
+                sqrt_ratio_current_x96, liquidity, -amount_remaining, zero_for_one
+            )
+
+    reached_target = sqrt_ratio_target_x96 == sqrt_ratio_next_x96
+
+    if zero_for_one:
+        if not (reached_target and exact_in):
+            amount_in = get_amount0_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount1_delta(sqrt_ratio_next_x96, sqrt_ratio_current_x96, liquidity, False)
+    else:
+        if not (reached_target and exact_in):
+            amount_in = get_amount1_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount0_delta(sqrt_ratio_current_x96, sqrt_ratio_next_x96, liquidity, False)
+
+    # Cap the output amount to not exceed the remaining output amount
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+
+    if exact_in and sqrt_ratio_next_x96 != sqrt_ratio_target_x96:
+        # Didn't reach the target, so take the remainder of the maximum input as fee
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 1_000_000 - fee_pips)
+
+    return sqrt_ratio_next_x96, amount_in, amount_out, fee_amount
+
+
+# ---------------------------------------------------------------------------
+# Price helpers
+# ---------------------------------------------------------------------------
+
+def sqrt_price_x96_to_price(sqrt_price_x96: int, decimals0: int = 18, decimals1: int = 18, invert: bool = False) -> float:
+    """
+    Convert sqrtPriceX96 to the price of token0 in token1.
+
+    The division is done on exact integers, so the float is correctly rounded.
+
+    Args:
+        sqrt_price_x96: Pool sqrt price
+        decimals0: token0 decimals
+        decimals1: token1 decimals
+        invert: Return the price of token1 in token0 instead
+
+    Returns:
+        float: token1 per token0 (token0 per token1 if invert) in whole-token units
+    """
+    numerator = int(sqrt_price_x96) * int(sqrt_price_x96)
+    denominator = Q192
+    if decimals0 > decimals1:
+        numerator *= 10 ** (decimals0 - decimals1)
+    elif decimals1 > decimals0:
+        denominator *= 10 ** (decimals1 - decimals0)
+    if invert:
+        return denominator / numerator
+    return numerator / denominator
+
+
+def price_to_sqrt_price_x96(price) -> int:
+    """
+    Convert a raw token1/token0 price to sqrtPriceX96 (rounded down).
+
+    Args:
+        price: Price as int, float, Decimal or Fraction
+
+    Returns:
+        int: sqrtPriceX96
+    """
+    ratio = Fraction(price)
+    if ratio <= 0:
+        raise ValueError("Price must be positive")
+    return math.isqrt(ratio.numerator * Q192 // ratio.denominator)
+
+
+def tick_to_price(tick: int) -> float:
+    """Raw token1/token0 price at a tick (1.0001 ** tick, via the exact sqrt ratio)."""
+    return sqrt_price_x96_to_price(get_sqrt_ratio_at_tick(tick))
+
+
+def price_to_tick(price, round_up: bool = False) -> int:
+    """
+    Tick for a raw token1/token0 price.
+
+    Args:
+        price: Price as int, float, Decimal or Fraction
+        round_up: Return the smallest tick whose price is >= price instead of the largest tick <= price
+
+    Returns:
+        int: Tick
+    """
+    sqrt_price_x96 = price_to_sqrt_price_x96(price)
+    sqrt_price_x96 = max(MIN_SQRT_RATIO, min(MAX_SQRT_RATIO - 1, sqrt_price_x96))
+    tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+    if round_up and tick < MAX_TICK and get_sqrt_ratio_at_tick(tick) < sqrt_price_x96:
+        tick += 1
+    return tick
+
+
+def nearest_usable_ticks(tick_lower: int, tick_upper: int, tick_spacing: int) -> Tuple[int, int]:
+    """
+    Widen a tick range outwards to multiples of tick_spacing, clamped to the valid range.
+
+    Args:
+        tick_lower: Lower tick
+        tick_upper: Upper tick
+        tick_spacing: Pool tick spacing
+
+    Returns:
+        tuple: (tick_lower, tick_upper) aligned to tick_spacing
+    """
+    min_usable = -(MAX_TICK // tick_spacing) * tick_spacing
+    max_usable = (MAX_TICK // tick_spacing) * tick_spacing
+    lower = (tick_lower // tick_spacing) * tick_spacing
+    upper = -((-tick_upper) // tick_spacing) * tick_spacing
+    return max(min_usable, lower), min(max_usable, upper)
@@ -0,0 +1,374 @@
+"""
+Offline Uniswap V3 swap simulator.
+
+This module is currently in EXPERIMENTAL status.
+Loads a pool's slot0, active liquidity, tick bitmap and initialized ticks
+once, then replays the pool's swap loop locally with the exact integer math
+from uniswap_v3_math. Quotes for any number of trade sizes need no further
+RPC calls and match the Quoter contract to the wei.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from futarchy.experimental.config.constants import UNISWAP_V3_POOL_ABI
+from futarchy.experimental.utils.uniswap_v3_math import (
+    MIN_TICK, MAX_TICK, MIN_SQRT_RATIO, MAX_SQRT_RATIO,
+    get_sqrt_ratio_at_tick, get_tick_at_sqrt_ratio, compute_swap_step, sqrt_price_x96_to_price
+)
+
+# Bitmap words loaded on each side of the current word. With a tick spacing
+# of 60 this covers the whole tick range.
+DEFAULT_WORD_RADIUS = 64
+
+# Calls per Multicall3 batch when loading ticks
+MULTICALL_CHUNK_SIZE = 500
+
+MAX_INT256 = (1 << 255) - 1
+
+
+def tick_position(compressed_tick: int) -> Tuple[int, int]:
+    """Bitmap (word, bit) position of a compressed tick (TickBitmap.position)."""
+    return compressed_tick >> 8, compressed_tick & 0xff
+
+
+def initialized_ticks(bitmap: Dict[int, int], tick_spacing: int) -> List[int]:
+    """
+    Decode tickBitmap words into the initialized ticks they mark.
+
+    Args:
+        bitmap: tickBitmap words {word_position: word}
+        tick_spacing: Pool tick spacing
+
+    Returns:
+        list: Initialized ticks in ascending order
+    """
+    return [
+        ((word << 8) + bit) * tick_spacing
+        for word in sorted(bitmap) if bitmap[word]
+        for bit in range(256) if bitmap[word] >> bit & 1
+    ]
+
+
+class V3PoolSnapshot:
+    """Immutable copy of the state a V3 pool swap reads, with a local swap engine"""
+
+    def __init__(self, sqrt_price_x96: int, tick: int, liquidity: int, fee: int, tick_spacing: int,
+                 bitmap: Dict[int, int], ticks: Dict[int, int], token0: Optional[str] = None,
+                 token1: Optional[str] = None, block_number: Optional[int] = None,
+                 pool_address: Optional[str] = None, liquidity_gross: Optional[Dict[int, int]] = None):
+        """
+        Initialize the snapshot.
+
+        Args:
+            sqrt_price_x96: slot0 sqrtPriceX96
+            tick: slot0 tick
+            liquidity: Active liquidity
+            fee: Fee in hundredths of a bip
+            tick_spacing: Pool tick spacing
+            bitmap: Loaded tickBitmap words {word_position: word}
+            ticks: liquidityNet of every initialized tick in the loaded words {tick: liquidity_net}
+            token0: Lowercase token0 address
+            token1: Lowercase token1 address
+            block_number: Block the state was read at
+            pool_address: Pool address
+            liquidity_gross: liquidityGross of every initialized tick in the loaded words {tick: liquidity_gross}
+        """
+        self.sqrt_price_x96 = sqrt_price_x96
+        self.tick = tick
+        self.liquidity = liquidity
+        self.fee = fee
+        self.tick_spacing = tick_spacing
+        self.bitmap = bitmap
+        self.ticks = ticks
+        self.token0 = token0.lower() if token0 else None
+        self.token1 = token1.lower() if token1 else None
+        self.block_number = block_number
+        self.pool_address = pool_address
+        self.liquidity_gross = liquidity_gross
+
+    @classmethod
+    def load(cls, w3, pool_address: str, multicall=None, metadata=None,
+             word_radius: int = DEFAULT_WORD_RADIUS, block_identifier: Any = "latest") -> "V3PoolSnapshot":
+        """
+        Read a pool snapshot from chain.
+
+        Args:
+            w3: Web3 instance
+            pool_address: V3 pool address
+            multicall: Optional utils.multicall.Multicall instance to batch the reads
+            metadata: Optional MetadataCache for fee, tick spacing and tokens
+            word_radius: Bitmap words to load on each side of the current tick's word
+            block_identifier: Block number or tag to read at
+
+        Returns:
+            V3PoolSnapshot: Pool state at a single block
+        """
+        pool = w3.eth.contract(address=w3.to_checksum_address(pool_address), abi=UNISWAP_V3_POOL_ABI)
+
+        if metadata is not None:
+            fee = metadata.fee(pool_address)
+            tick_spacing = metadata.tick_spacing(pool_address)
+            token0, token1 = metadata.pool_tokens(pool_address)
+        else:
+            fee = pool.functions.fee().call()
+            tick_spacing = pool.functions.tickSpacing().call()
+            token0 = pool.functions.token0().call()
+            token1 = pool.functions.token1().call()
+
+        if multicall is not None:
+            block_number, (slot0, liquidity) = multicall.call_functions(
+                [pool.functions.slot0(), pool.functions.liquidity()], block_identifier
+            )
+            if slot0 is None or liquidity is None:
+                raise ValueError(f"Could not read slot0/liquidity of pool {pool_address}")
+        else:
+            block_number = w3.eth.block_number if block_identifier == "latest" else block_identifier
+            slot0 = pool.functions.slot0().call(block_identifier=block_number)
+            liquidity = pool.functions.liquidity().call(block_identifier=block_number)
+
+        sqrt_price_x96, tick = int(slot0[0]), int(slot0[1])
+
+        # Only scan words that can hold usable ticks
+        center_word, _ = tick_position(tick // tick_spacing)
+        min_word, _ = tick_position(MIN_TICK // tick_spacing)
+        max_word, _ = tick_position(MAX_TICK // tick_spacing)
+        words = list(range(max(min_word, center_word - word_radius), min(max_word, center_word + word_radius) + 1))
+
+        word_values = cls._read_many(pool, "tickBitmap", words, multicall, block_number)
+        bitmap = {word: int(value or 0) for word, value in zip(words, word_values)}
+
+        initialized = initialized_ticks(bitmap, tick_spacing)
+        tick_infos = cls._read_many(pool, "ticks", initialized, multicall, block_number)
+        ticks, liquidity_gross = {}, {}
+        for initialized_tick, info in zip(initialized, tick_infos):
+            if info is None:
+                raise ValueError(f"Could not read tick {initialized_tick} of pool {pool_address}")
+            liquidity_gross[initialized_tick] = int(info[0])
+            ticks[initialized_tick] = int(info[1])
+
+        return cls(
+            sqrt_price_x96, tick, int(liquidity), int(fee), int(tick_spacing), bitmap, ticks,
+            token0=token0, token1=token1, block_number=block_number, pool_address=pool_address,
+            liquidity_gross=liquidity_gross
+        )
+
+    @staticmethod
+    def _read_many(pool, function_name: str, args, multicall, block_number):
+        """Call a single-argument pool view for every arg, batched through Multicall3 when available."""
+        function = getattr(pool.functions, function_name)
+        if multicall is None:
+            return [function(arg).call(block_identifier=block_number) for arg in args]
+
+        results = []
+        for start in range(0, len(args), MULTICALL_CHUNK_SIZE):
+            chunk = args[start:start + MULTICALL_CHUNK_SIZE]
+            _, values = multicall.call_functions([function(arg) for arg in chunk], block_number)
+            results.extend(values)
+        return results
+
+    @property
+    def word_range(self) -> Tuple[int, int]:
+        """(lowest, highest) loaded bitmap word."""
+        return min(self.bitmap), max(self.bitmap)
+
+    def price(self, invert: bool = False) -> float:
+        """Current price of token0 in token1 (token1 in token0 if invert)."""
+        return sqrt_price_x96_to_price(self.sqrt_price_x96, invert=invert)
+
+    def _next_initialized_tick_within_one_word(self, tick: int, lte: bool) -> Optional[Tuple[int, bool]]:
+        """
+        TickBitmap.nextInitializedTickWithinOneWord over the loaded words.
+
+        Returns:
+            tuple: (next_tick, initialized), or None if the word was not loaded
+        """
+        compressed = tick // self.tick_spacing
+
+        if lte:
+            word_pos, bit_pos = tick_position(compressed)
+            word = self.bitmap.get(word_pos)
+            if word is None:
+                return None
+            masked = word & ((1 << bit_pos) - 1 + (1 << bit_pos))
+            if masked:
+                return (compressed - (bit_pos - (masked.bit_length() - 1))) * self.tick_spacing, True
+            return (compressed - bit_pos) * self.tick_spacing, False
+
+        word_pos, bit_pos = tick_position(compressed + 1)
+        word = self.bitmap.get(word_pos)
+        if word is None:
+            return None
+        masked = word & ~((1 << bit_pos) - 1)
+        if masked:
+            lowest_bit = (masked & -masked).bit_length() - 1
+            return (compressed + 1 + (lowest_bit - bit_pos)) * self.tick_spacing, True
+        return (compressed + 1 + (255 - bit_pos)) * self.tick_spacing, False
+
+    def swap(self, zero_for_one: bool, amount_specified: int, sqrt_price_limit_x96: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simulate UniswapV3Pool.swap against the snapshot (the snapshot is not modified).
+
+        Args:
+            zero_for_one: True to swap token0 for token1
+            amount_specified: Positive for exact input, negative for exact output
+            sqrt_price_limit_x96: Price limit (defaults to the extreme allowed price)
+
+        Returns:
+            dict: amount0/amount1 pool deltas, amount_in, amount_out, sqrt_price_x96_after,
+                  tick_after, liquidity_after, ticks_crossed, complete (whole amount was
+                  swapped) and out_of_range (the swap reached ticks that were not loaded)
+        """
+        if amount_specified == 0:
+            raise ValueError("amount_specified must not be zero")
+        if sqrt_price_limit_x96 is None:
+            sqrt_price_limit_x96 = MIN_SQRT_RATIO + 1 if zero_for_one else MAX_SQRT_RATIO - 1
+        if zero_for_one:
+            if not (MIN_SQRT_RATIO < sqrt_price_limit_x96 < self.sqrt_price_x96):
+                raise ValueError("Invalid price limit for zero_for_one swap")
+        elif not (self.sqrt_price_x96 < sqrt_price_limit_x96 < MAX_SQRT_RATIO):
+            raise ValueError("Invalid price limit for one_for_zero swap")
+
+        exact_input = amount_specified > 0
+        remaining = amount_specified
+        calculated = 0
+        sqrt_price_x96 = self.sqrt_price_x96
+        tick = self.tick
+        liquidity = self.liquidity
+        ticks_crossed = 0
+        out_of_range = False
+
+        while remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+            sqrt_price_start = sqrt_price_x96
+
+            next_tick = self._next_initialized_tick_within_one_word(tick, zero_for_one)
+            if next_tick is None:
+                out_of_range = True
+                break
+            tick_next, initialized = next_tick
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+            if (sqrt_price_next < sqrt_price_limit_x96) if zero_for_one else (sqrt_price_next > sqrt_price_limit_x96):
+                sqrt_price_target = sqrt_price_limit_x96
+            else:
+                sqrt_price_target = sqrt_price_next
+
+            sqrt_price_x96, amount_in, amount_out, fee_amount = compute_swap_step(
+                sqrt_price_x96, sqrt_price_target, liquidity, remaining, self.fee
+            )
+
+            if exact_input:
+                remaining -= amount_in + fee_amount
+                calculated -= amount_out
+            else:
+                remaining += amount_out
+                calculated += amount_in + fee_amount
+
+            if sqrt_price_x96 == sqrt_price_next:
+                if initialized:
+                    liquidity_net = self.ticks[tick_next]
+                    liquidity += -liquidity_net if zero_for_one else liquidity_net
+                    ticks_crossed += 1
+                tick = tick_next - 1 if zero_for_one else tick_next
+            elif sqrt_price_x96 != sqrt_price_start:
+                tick = get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+        if zero_for_one == exact_input:
+            amount0, amount1 = amount_specified - remaining, calculated
+        else:
+            amount0, amount1 = calculated, amount_specified - remaining
+
+        return {
+            "amount0": amount0,
+            "amount1": amount1,
+            "amount_in": amount0 if zero_for_one else amount1,
+            "amount_out": -(amount1 if zero_for_one else amount0),
+            "sqrt_price_x96_after": sqrt_price_x96,
+            "tick_after": tick,
+            "liquidity_after": liquidity,
+            "ticks_crossed": ticks_crossed,
+            "complete": remaining == 0,
+            "out_of_range": out_of_range,
+        }
+
+    def liquidity_ranges(self, zero_for_one: bool):
+        """
+        Walk the swap path from the current price to the edge of the loaded ticks.
+
+        Ranges end at initialized ticks and bitmap word boundaries, the same
+        points the pool's swap loop steps through.
+
+        Args:
+            zero_for_one: Direction of the walk (True for decreasing price)
+
+        Yields:
+            tuple: (sqrt_price_start_x96, sqrt_price_end_x96, liquidity) per range
+        """
+        sqrt_price_x96 = self.sqrt_price_x96
+        tick = self.tick
+        liquidity = self.liquidity
+
+        while True:
+            next_tick = self._next_initialized_tick_within_one_word(tick, zero_for_one)
+            if next_tick is None:
+                return
+            tick_next, initialized = next_tick
+            tick_next = max(MIN_TICK, min(MAX_TICK, tick_next))
+            sqrt_price_next = get_sqrt_ratio_at_tick(tick_next)
+
+            yield sqrt_price_x96, sqrt_price_next, liquidity
+
+            if tick_next in (MIN_TICK, MAX_TICK):
+                return
+            if initialized:
+                liquidity_net = self.ticks[tick_next]
+                liquidity += -liquidity_net if zero_for_one else liquidity_net
+            sqrt_price_x96 = sqrt_price_next
+            tick = tick_next - 1 if zero_for_one else tick_next
+
+    def swap_to_price(self, sqrt_price_target_x96: int) -> Dict[str, Any]:
+        """
+        Simulate the exact-input swap that moves the pool price to a target.
+
+        Args:
+            sqrt_price_target_x96: Target sqrt price
+
+        Returns:
+            dict: Result of swap(); the target was reached if sqrt_price_x96_after equals it
+        """
+        zero_for_one = sqrt_price_target_x96 < self.sqrt_price_x96
+        return self.swap(zero_for_one, MAX_INT256, sqrt_price_target_x96)
+
+    def is_token0(self, token_address: str) -> bool:
+        """Whether token_address is the pool's token0."""
+        if self.token0 is None:
+            raise ValueError("Snapshot was created without token addresses")
+        return token_address.lower() == self.token0
+
+    def quote_exact_input(self, token_in: str, amount_in: int, sqrt_price_limit_x96: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Local equivalent of Quoter.quoteExactInputSingle.
+
+        Args:
+            token_in: Address of the token sold
+            amount_in: Amount sold in wei
+            sqrt_price_limit_x96: Optional price limit
+
+        Returns:
+            dict: Result of swap()
+        """
+        return self.swap(self.is_token0(token_in), int(amount_in), sqrt_price_limit_x96)
+
+    def quote_exact_output(self, token_in: str, amount_out: int, sqrt_price_limit_x96: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Local equivalent of Quoter.quoteExactOutputSingle.
+
+        Args:
+            token_in: Address of the token sold
+            amount_out: Amount bought in wei
+            sqrt_price_limit_x96: Optional price limit
+
+        Returns:
+            dict: Result of swap()
+        """
+        return self.swap(self.is_token0(token_in), -int(amount_out), sqrt_price_limit_x96)
@@ -1,16 +1,38 @@
 import os
-import pkg_resources
+import web3
 from web3 import Web3
 from eth_account import Account
 from dotenv import load_dotenv
 
+from futarchy.experimental.utils.call_cache import BlockCallCache
+from futarchy.experimental.utils.nonce_manager import NonceManager
+from futarchy.experimental.utils.allowance_ledger import AllowanceLedger
+from futarchy.experimental.utils.rpc_pool import RpcEndpointPool
+from futarchy.experimental.utils.rpc_metrics import RpcMetrics
+from futarchy.experimental.utils.http_pool import get_http_pool
+from futarchy.experimental.config.constants import CONTRACT_ADDRESSES, DEFAULT_RPC_URLS
 
-def setup_web3_connection(rpc_url=None):
+
+def setup_web3_connection(rpc_url=None, enable_call_cache=True, enable_nonce_manager=True, enable_allowance_ledger=True,
+                          enable_rpc_pool=True, hedge_reads=True, keepalive_interval=30, enable_rpc_metrics=True):
     """
     Set up a Web3 connection with appropriate middleware for Gnosis Chain.
     
+    Several endpoints (a comma separated rpc_url / GNOSIS_RPC_URL, or DEFAULT_RPC_URLS
+    when nothing is configured) are served by an RpcEndpointPool
+    that routes each request to the fastest healthy endpoint (stats available as
+    w3.provider.stats()).
+    
     Args:
-        rpc_url: RPC URL to connect to (will use env var GNOSIS_RPC_URL if not provided)
+        rpc_url: RPC URL or comma separated URLs (will use env var GNOSIS_RPC_URL if not provided)
+        enable_call_cache: Cache eth_call results per block (stats available as w3.call_cache.stats())
+        enable_nonce_manager: Track account nonces locally (available as w3.nonce_manager)
+        enable_allowance_ledger: Track ERC20 and Permit2 allowances locally (available as w3.allowance_ledger)
+        enable_rpc_pool: Pool several endpoints instead of picking one
+        hedge_reads: Let the pool send slow read requests to a second endpoint
+        keepalive_interval: Seconds between background probes of pooled endpoints (None to disable)
+        enable_rpc_metrics: Count and time the requests that reach the provider (available as w3.rpc_metrics;
+            set RPC_METRICS=table|json and optionally RPC_METRICS_FILE to write a summary at exit)
         
     Returns:
         web3 instance
@@ -21,48 +43,35 @@ def setup_web3_connection(rpc_url=None):
     # Use provided RPC URL or get from environment
     if not rpc_url:
         rpc_url = os.getenv('GNOSIS_RPC_URL')
-        
-    # If no URL from env, try these endpoints in order
-    if not rpc_url:
-        rpc_endpoints = [
-            'https://rpc.gnosischain.com',       # Official Gnosis RPC
-            'https://gnosis.publicnode.com',     # Public Node
-            'https://gnosis-mainnet.public.blastapi.io',  # Blast API
-            'https://gnosis.drpc.org',           # DRPC
-            'https://rpc.ankr.com/gnosis'        # Ankr (last resort)
-        ]
-        
-        # Try each endpoint until one works
-        for endpoint in rpc_endpoints:
-            try:
-                print(f"Trying RPC endpoint: {endpoint}")
-                w3 = Web3(Web3.HTTPProvider(endpoint))
-                if w3.is_connected():
-                    print(f"Connected to Gnosis Chain using {endpoint}")
-                    rpc_url = endpoint
-                    break
-            except Exception as e:
-                print(f"Failed to connect to {endpoint}: {e}")
-                continue
-    
-    # If still no URL, use the first one as a fallback
-    if not rpc_url:
-        print("Warning: Could not find a working RPC endpoint. Using fallback.")
-        rpc_url = 'https://rpc.gnosischain.com'
+    endpoints = [url.strip() for url in rpc_url.split(',') if url.strip()] if rpc_url else list(DEFAULT_RPC_URLS)
     
-    # Create Web3 instance with verify=False to bypass SSL issues if needed
-    try:
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        if not w3.is_connected():
-            print(f"Warning: Connection failed with {rpc_url}. Trying with SSL verification disabled.")
-            w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'verify': False}))
-    except Exception as e:
-        print(f"Error connecting to {rpc_url}: {e}")
-        print("Trying with SSL verification disabled.")
-        w3 = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'verify': False}))
+    if enable_rpc_pool and len(endpoints) > 1:
+        pool = RpcEndpointPool(endpoints, hedge_reads=hedge_reads)
+        # Probe every endpoint concurrently so the first requests already go to the fastest one
+        healthy = [url for url, ok in pool.warm().items() if ok]
+        if healthy:
+            print(f"Connected to Gnosis Chain through {len(healthy)}/{len(endpoints)} pooled endpoints, fastest: {pool.endpoint_uri}")
+        else:
+            print("Warning: No RPC endpoint answered the initial probe.")
+        if keepalive_interval:
+            pool.start_keepalive(keepalive_interval)
+        w3 = Web3(pool)
+    else:
+        rpc_url = endpoints[0]
+        
+        # Create Web3 instance with verify=False to bypass SSL issues if needed
+        try:
+            w3 = Web3(get_http_pool().provider(rpc_url))
+            if not w3.is_connected():
+                print(f"Warning: Connection failed with {rpc_url}. Trying with SSL verification disabled.")
+                w3 = Web3(get_http_pool().provider(rpc_url, request_kwargs={'verify': False}))
+        except Exception as e:
+            print(f"Error connecting to {rpc_url}: {e}")
+            print("Trying with SSL verification disabled.")
+            w3 = Web3(get_http_pool().provider(rpc_url, request_kwargs={'verify': False}))
     
     # Add middleware for Gnosis Chain (PoA network)
-    web3_version = pkg_resources.get_distribution("web3").version
+    web3_version = web3.__version__
     print(f"Using web3.py version: {web3_version}")
     
     # Rest of the middleware setup remains the same...
@@ -105,6 +114,44 @@ def setup_web3_connection(rpc_url=None):
             w3.middleware_onion.inject(custom_poa_middleware, layer=0)
             print("Added custom PoA middleware as fallback")
     
+    # Cache repeated eth_calls within the same block
+    w3.call_cache = None
+    if enable_call_cache:
+        w3.call_cache = BlockCallCache()
+        if int(web3_version.split('.')[0]) >= 7:
+            w3.middleware_onion.add(w3.call_cache.as_web3_v7_middleware(), name="eth_call_cache")
+        else:
+            w3.middleware_onion.add(w3.call_cache.middleware, name="eth_call_cache")
+    
+    # Answer eth_getTransactionCount locally so back-to-back transactions don't wait on the node
+    w3.nonce_manager = None
+    if enable_nonce_manager:
+        w3.nonce_manager = NonceManager(w3)
+        if int(web3_version.split('.')[0]) >= 7:
+            w3.middleware_onion.add(w3.nonce_manager.as_web3_v7_middleware(), name="nonce_manager")
+        else:
+            w3.middleware_onion.add(w3.nonce_manager.middleware, name="nonce_manager")
+    
+    # Answer allowance reads from a ledger kept current by our own receipts
+    w3.allowance_ledger = None
+    if enable_allowance_ledger:
+        w3.allowance_ledger = AllowanceLedger(w3, CONTRACT_ADDRESSES["permit2"])
+        if int(web3_version.split('.')[0]) >= 7:
+            w3.middleware_onion.add(w3.allowance_ledger.as_web3_v7_middleware(), name="allowance_ledger")
+        else:
+            w3.middleware_onion.add(w3.allowance_ledger.middleware, name="allowance_ledger")
+    
+    # Count and time requests next to the provider, so cached and locally answered calls are not counted
+    w3.rpc_metrics = None
+    if enable_rpc_metrics:
+        w3.rpc_metrics = RpcMetrics()
+        if int(web3_version.split('.')[0]) >= 7:
+            w3.middleware_onion.inject(w3.rpc_metrics.as_web3_v7_middleware(), name="rpc_metrics", layer=0)
+        else:
+            w3.middleware_onion.inject(w3.rpc_metrics.middleware, name="rpc_metrics", layer=0)
+        if os.getenv('RPC_METRICS'):
+            w3.rpc_metrics.dump_at_exit(os.getenv('RPC_METRICS'), os.getenv('RPC_METRICS_FILE'))
+    
     return w3
 
 def get_account_from_private_key():
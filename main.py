@@ -12,42 +12,30 @@ import argparse
 from decimal import Decimal
 import time
 import json
-from web3 import Web3
-from dotenv import load_dotenv
-from futarchy.experimental.exchanges.sushiswap import SushiSwapExchange
-from futarchy.experimental.exchanges.passthrough_router import PassthroughRouter
-from futarchy.experimental.config.constants import (
-    CONTRACT_ADDRESSES,
-    TOKEN_CONFIG,
-    POOL_CONFIG_YES,
-    POOL_CONFIG_NO,
-    BALANCER_CONFIG,
-    DEFAULT_SWAP_CONFIG,
-    DEFAULT_PERMIT_CONFIG,
-    DEFAULT_RPC_URLS,
-    UNISWAP_V3_POOL_ABI,
-    UNISWAP_V3_PASSTHROUGH_ROUTER_ABI,
-    ERC20_ABI
-)
-from eth_account import Account
-from eth_account.signers.local import LocalAccount
 import math
 
 # Add the current directory to the path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from futarchy.experimental.core.futarchy_bot import FutarchyBot
-from futarchy.experimental.strategies.monitoring import simple_monitoring_strategy
-from futarchy.experimental.strategies.probability import probability_threshold_strategy
-from futarchy.experimental.strategies.arbitrage import arbitrage_strategy
+# Project modules are imported inside the functions that use them, so each
+# subcommand (and forwarding to a daemon) only pays for what it runs
 
-def parse_args():
-    """Parse command line arguments"""
+# Commands that need the passthrough router
+ROUTER_COMMANDS = (
+    'swap_gno_yes_to_sdai_yes', 'swap_sdai_yes_to_gno_yes',
+    'swap_gno_no_to_sdai_no', 'swap_sdai_no_to_gno_no', 'test_swaps'
+)
+
+def build_parser():
+    """Build the command line parser"""
     parser = argparse.ArgumentParser(description='Futarchy Trading Bot')
     
     # General options
     parser.add_argument('--rpc', type=str, help='RPC URL for Gnosis Chain')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose output')
+    parser.add_argument('--profile-startup', action='store_true', help='Report import and startup phase times')
+    parser.add_argument('--rpc-stats', nargs='?', const='table', choices=['table', 'json'], help='Print RPC calls per operation at exit (table or json; env RPC_METRICS_FILE writes it to a file)')
+    parser.add_argument('--daemon', type=str, help='Run the command on a `serve` daemon (http://host:port or Unix socket path, env FUTARCHY_DAEMON)')
     
     # Command mode
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
@@ -55,10 +43,18 @@ def parse_args():
     # Interactive mode (default)
     interactive_parser = subparsers.add_parser('interactive', help='Run in interactive mode')
     
+    # Daemon mode
+    serve_parser = subparsers.add_parser('serve', help='Keep the bot running and accept commands over local HTTP or a Unix socket')
+    serve_parser.add_argument('--host', type=str, default='127.0.0.1', help='HTTP interface to bind (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8765, help='HTTP port (default: 8765)')
+    serve_parser.add_argument('--socket', type=str, default=None, help='Serve on this Unix socket path instead of HTTP')
+    serve_parser.add_argument('--no-follow', dest='follow_blocks', action='store_false', help='Do not refresh prices on every new block')
+    
     # Monitor mode
     monitor_parser = subparsers.add_parser('monitor', help='Run monitoring strategy')
     monitor_parser.add_argument('--iterations', type=int, default=5, help='Number of monitoring iterations')
-    monitor_parser.add_argument('--interval', type=int, default=60, help='Interval between updates (seconds)')
+    monitor_parser.add_argument('--interval', type=int, default=None, help='Interval between updates in seconds (default: once per new block)')
+    monitor_parser.add_argument('--async', dest='use_async', action='store_true', help='Read prices and balances concurrently with AsyncWeb3')
     
     # Probability strategy mode
     prob_parser = subparsers.add_parser('prices', help='Show current market prices and probabilities')
@@ -100,12 +96,14 @@ def parse_args():
     # Add the arbitrage synthetic GNO command (sell direction)
     arbitrage_sell_synthetic_gno_parser = subparsers.add_parser('arbitrage_sell_synthetic_gno', 
                                 help='Execute full arbitrage: buy GNO spot → split → sell YES/NO → balance & merge')
-    arbitrage_sell_synthetic_gno_parser.add_argument('amount', type=float, help='Amount of sDAI to use for arbitrage')
+    arbitrage_sell_synthetic_gno_parser.add_argument('amount', type=float, nargs='?', default=None, help='Amount of sDAI to use for arbitrage (default: solved optimal size)')
+    arbitrage_sell_synthetic_gno_parser.add_argument('--pipelined', action='store_true', help='Pre-sign independent legs and broadcast them together')
     
     # Add the arbitrage synthetic GNO command (buy direction)
     arbitrage_buy_synthetic_gno_parser = subparsers.add_parser('arbitrage_buy_synthetic_gno', 
                                 help='Execute full arbitrage: buy sDAI-YES/NO → buy GNO-YES/NO → merge → wrap → sell')
-    arbitrage_buy_synthetic_gno_parser.add_argument('amount', type=float, help='Amount of sDAI to use for arbitrage')
+    arbitrage_buy_synthetic_gno_parser.add_argument('amount', type=float, nargs='?', default=None, help='Maximum amount of sDAI to use for arbitrage (default: solved optimal size)')
+    arbitrage_buy_synthetic_gno_parser.add_argument('--pipelined', action='store_true', help='Pre-sign independent legs and broadcast them together')
     
     # Add the four new passthrough router swap commands
     swap_gno_yes_to_sdai_yes_parser = subparsers.add_parser('swap_gno_yes_to_sdai_yes', help='Swap GNO YES to sDAI YES using passthrough router')
@@ -132,6 +130,23 @@ def parse_args():
     buy_sdai_yes_parser = subparsers.add_parser('buy_sdai_yes', help='Buy sDAI-YES tokens with sDAI using the dedicated sDAI/sDAI-YES pool')
     buy_sdai_yes_parser.add_argument('amount', type=float, help='Amount of sDAI to spend')
     
+    # Add index_logs command
+    index_logs_parser = subparsers.add_parser('index_logs', help='Backfill Transfer/Swap/Split/Merge logs into a local SQLite store')
+    index_logs_parser.add_argument('--from-block', type=int, help='First block (default: resume after the last indexed block)')
+    index_logs_parser.add_argument('--to-block', type=int, help='Last block (default: head minus confirmations)')
+    index_logs_parser.add_argument('--db', help='SQLite file (default: FUTARCHY_LOG_DB or ~/.futarchy/logs.sqlite)')
+    index_logs_parser.add_argument('--workers', type=int, default=4, help='Concurrent eth_getLogs requests (default: 4)')
+    index_logs_parser.add_argument('--chunk', type=int, default=2000, help='Initial blocks per request (default: 2000)')
+    
+    # Add reconcile command
+    reconcile_parser = subparsers.add_parser('reconcile', help='Analyze many transactions with batched RPC and summarize token deltas')
+    reconcile_parser.add_argument('tx_hashes', nargs='*', help='Transaction hashes to analyze')
+    reconcile_parser.add_argument('--tx-file', help='File with one transaction hash per line')
+    reconcile_parser.add_argument('--address', help='Account to reconcile (default: the bot account)')
+    reconcile_parser.add_argument('--from-block', type=int, help='Analyze the account\'s transactions from this block')
+    reconcile_parser.add_argument('--to-block', type=int, help='Last block (default: latest)')
+    reconcile_parser.add_argument('--csv', help='Directory to write one CSV per table to')
+    
     # Add debug command
     debug_parser = subparsers.add_parser('debug', help='Run in debug mode with additional output')
     
@@ -139,21 +154,125 @@ def parse_args():
     test_swaps_parser = subparsers.add_parser('test_swaps', help='Test all swap functions with small amounts')
     test_swaps_parser.add_argument('--amount', type=float, default=0.001, help='Amount to use for testing (default: 0.001)')
     
-    return parser.parse_args()
+    return parser
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    return build_parser().parse_args(argv)
 
 def main():
     """Main entry point"""
     args = parse_args()
     
-    # Initialize the bot with optional RPC URL
-    bot = FutarchyBot(rpc_url=args.rpc, verbose=args.verbose)
+    from futarchy.experimental.utils.startup_profiler import StartupProfiler
+    profiler = StartupProfiler(enabled=args.profile_startup).start()
     
-    # Initialize passthrough router for conditional token swaps
-    router = PassthroughRouter(
+    try:
+        # Hand the command to a running daemon instead of starting a bot
+        daemon_address = args.daemon or os.environ.get("FUTARCHY_DAEMON")
+        if daemon_address and args.command not in (None, 'serve', 'interactive'):
+            with profiler.phase("daemon round trip"):
+                exit_code = forward_to_daemon(daemon_address, sys.argv[1:])
+            if exit_code is not None:
+                sys.exit(exit_code)
+        
+        with profiler.phase("load bot modules"):
+            from futarchy.experimental.core.futarchy_bot import FutarchyBot
+        
+        # Initialize the bot with optional RPC URL
+        with profiler.phase("connect"):
+            bot = FutarchyBot(rpc_url=args.rpc, verbose=args.verbose)
+        if args.rpc_stats and bot.w3.rpc_metrics is not None:
+            bot.w3.rpc_metrics.dump_at_exit(args.rpc_stats, os.environ.get("RPC_METRICS_FILE"))
+        
+        # Initialize passthrough router for conditional token swaps (only for commands that use it)
+        router = make_router(bot) if args.command in ROUTER_COMMANDS + ('serve',) else None
+        
+        if args.command == 'serve':
+            serve_commands(bot, router, args)
+            return
+        
+        from futarchy.experimental.utils.rpc_metrics import rpc_operation
+        with profiler.phase(f"run {args.command}"), rpc_operation(args.command):
+            run_command(bot, router, args)
+    finally:
+        profiler.report()
+
+def make_router(bot):
+    """
+    Create the passthrough router for conditional token swaps.
+    
+    Args:
+        bot: FutarchyBot instance
+        
+    Returns:
+        PassthroughRouter
+    """
+    from futarchy.experimental.exchanges.passthrough_router import PassthroughRouter
+    return PassthroughRouter(
         bot.w3,
         os.environ.get("PRIVATE_KEY"),
         os.environ.get("V3_PASSTHROUGH_ROUTER_ADDRESS")
     )
+
+def forward_to_daemon(address, argv):
+    """
+    Run a command on a `serve` daemon and print its output.
+    
+    Args:
+        address: Daemon address (http://host:port or Unix socket path)
+        argv: Command line arguments to run
+        
+    Returns:
+        int: Exit code, or None if the daemon is unreachable (run locally instead)
+    """
+    from futarchy.experimental.cli.daemon import DaemonUnavailable, send_request
+    try:
+        response = send_request(address, {"argv": argv})
+    except DaemonUnavailable as e:
+        print(f"⚠️ Daemon at {address} unreachable ({e}), running locally")
+        return None
+    except (OSError, ValueError) as e:
+        # The request was sent: the command may have run, so never run it again here
+        print(f"❌ Lost the daemon at {address} after sending the command ({e}); check its state before retrying")
+        return 1
+    print(response.get("output") or response.get("error", ""), end="")
+    return 0 if response.get("ok") else 1
+
+def serve_commands(bot, router, args):
+    """
+    Serve commands on the already initialized bot until interrupted.
+    
+    Args:
+        bot: FutarchyBot instance
+        router: PassthroughRouter instance
+        args: Parsed `serve` arguments
+    """
+    from futarchy.experimental.cli.daemon import BotDaemon, serve
+    from futarchy.experimental.utils.rpc_metrics import rpc_operation
+    # Build every contract now so the first command does not pay for it
+    bot.initialize_contracts()
+    parser = build_parser()
+    
+    def run(argv):
+        command_args = parser.parse_args(argv)
+        with rpc_operation(command_args.command):
+            run_command(bot, router, command_args)
+    
+    daemon = BotDaemon(bot, run, follow_blocks=args.follow_blocks)
+    serve(daemon, host=args.host, port=args.port, socket_path=args.socket)
+
+def run_command(bot, router, args):
+    """
+    Run one parsed command on an initialized bot.
+    
+    Args:
+        bot: FutarchyBot instance
+        router: PassthroughRouter instance
+        args: Parsed command line arguments
+    """
+    from futarchy.experimental.config.constants import TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, BALANCER_CONFIG, UNISWAP_V3_POOL_ABI
+    from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
     
     if args.command == 'debug':
         # Debug mode - check pool configuration and balances
@@ -196,6 +315,44 @@ def main():
         bot.print_balances(balances)
         return
     
+    elif args.command == 'reconcile':
+        from futarchy.experimental.core.batch_analyzer import BatchAnalyzer, read_hashes, totals, write_csv
+        analyzer = BatchAnalyzer(bot.w3)
+        tx_hashes = list(args.tx_hashes)
+        if args.tx_file:
+            with open(args.tx_file) as f:
+                tx_hashes += read_hashes(f)
+        address = args.address or bot.address
+        if tx_hashes:
+            tables = analyzer.analyze(tx_hashes, account=args.address)
+        elif args.from_block is not None:
+            to_block = args.to_block if args.to_block is not None else bot.w3.eth.block_number
+            tables = analyzer.analyze_account(address, args.from_block, to_block)
+        else:
+            print("❌ Give transaction hashes, --tx-file or --from-block")
+            return
+        
+        result = totals(tables)
+        print(f"\n📒 {result['transactions']} transactions ({result['failed']} failed), "
+              f"fees {bot.w3.from_wei(result['fee'], 'ether')} xDAI")
+        for name, delta in sorted(result['deltas'].items()):
+            print(f"  {name}: {delta / 10**18:+.6f}")
+        if args.csv:
+            for path in write_csv(tables, args.csv):
+                print(f"  wrote {path}")
+        return
+    
+    elif args.command == 'index_logs':
+        from futarchy.experimental.core.log_indexer import LogIndexer
+        indexer = LogIndexer(bot.w3, db_path=args.db, chunk_size=args.chunk, workers=args.workers)
+        try:
+            result = indexer.backfill(args.from_block, args.to_block)
+        finally:
+            indexer.close()
+        print(f"\n✅ Indexed {result['logs']} logs from blocks {result['from_block']}-{result['to_block']} "
+              f"in {result['seconds']}s ({result['requests']} requests, {result['splits']} range splits)")
+        return
+    
     # Check if command needs an amount and if it's provided
     if hasattr(args, 'amount') and not args.amount and args.command not in ['test_swaps']:
         print("❌ Amount is required for this command")
@@ -203,8 +360,13 @@ def main():
     
     # Run the appropriate command
     if args.command == 'monitor':
-        print(f"Running monitoring strategy for {args.iterations} iterations every {args.interval} seconds")
-        bot.run_strategy(lambda b: simple_monitoring_strategy(b, args.iterations, args.interval))
+        from futarchy.experimental.strategies.monitoring import simple_monitoring_strategy, async_monitoring_strategy
+        cadence = f"every {args.interval} seconds" if args.interval else "once per new block"
+        print(f"Running monitoring strategy for {args.iterations} iterations {cadence}")
+        if args.use_async:
+            bot.run_strategy(lambda b: async_monitoring_strategy(b, args.iterations, args.interval))
+        else:
+            bot.run_strategy(lambda b: simple_monitoring_strategy(b, args.iterations, args.interval))
     
     elif args.command == 'prices':
         # Show market prices using the bot's print_market_prices method
@@ -214,6 +376,7 @@ def main():
         return
     
     elif args.command == 'arbitrage':
+        from futarchy.experimental.strategies.arbitrage import arbitrage_strategy
         print(f"Running arbitrage strategy (min diff: {args.diff}, amount: {args.amount})")
         bot.run_strategy(lambda b: arbitrage_strategy(b, args.diff, args.amount))
     
@@ -236,10 +399,12 @@ def main():
     elif args.command == 'buy_gno':
         # Buy waGNO and automatically unwrap it to GNO
         from futarchy.experimental.exchanges.balancer.swap import BalancerSwapHandler
+        from futarchy.experimental.utils.rpc_metrics import rpc_step
         try:
             print(f"\n🔄 Buying and unwrapping GNO using {args.amount} sDAI...")
             
             # Step 1: Buy waGNO
+            rpc_step("step 1")
             balancer = BalancerSwapHandler(bot)
             result = balancer.swap_sdai_to_wagno(args.amount)
             if not result or not result.get('success'):
@@ -250,6 +415,7 @@ def main():
             print(f"\n✅ Successfully bought {wagno_received:.18f} waGNO")
             
             # Step 2: Unwrap waGNO to GNO
+            rpc_step("step 2")
             print(f"\n🔹 Step 2: Unwrapping {wagno_received:.18f} waGNO to GNO...")
             
             # Get GNO balance before unwrapping
@@ -345,7 +511,7 @@ def main():
         print(f"sDAI: {TOKEN_CONFIG['currency']['address']}")
         
         # Calculate the actual price from sqrtPriceX96
-        price = (current_sqrt_price ** 2) / (2 ** 192)
+        price = sqrt_price_x96_to_price(current_sqrt_price)
         print(f"Current price: {price:.6f} (price of token1 in terms of token0)")
         if token0.lower() == TOKEN_CONFIG['currency']['yes_address'].lower():
             print(f"This means 1 sDAI-YES = {price:.6f} sDAI")
@@ -547,11 +713,17 @@ def main():
     
     elif args.command == 'arbitrage_sell_synthetic_gno':
         # This function executes a full arbitrage operation
-        execute_arbitrage_sell_synthetic_gno(bot, args.amount)
+        if args.pipelined:
+            execute_pipelined_synthetic_arbitrage(bot, "sell", args.amount)
+        else:
+            execute_arbitrage_sell_synthetic_gno(bot, args.amount)
     
     elif args.command == 'arbitrage_buy_synthetic_gno':
         # This function executes a full arbitrage operation to buy synthetic GNO
-        execute_arbitrage_buy_synthetic_gno(bot, args.amount)
+        if args.pipelined:
+            execute_pipelined_synthetic_arbitrage(bot, "buy", args.amount)
+        else:
+            execute_arbitrage_buy_synthetic_gno(bot, args.amount)
     
     else:
         # Default to showing help
@@ -566,6 +738,10 @@ def sell_sdai_yes(bot, amount):
         bot: FutarchyBot instance
         amount: Amount of sDAI-YES to sell
     """
+    from futarchy.experimental.config.constants import CONTRACT_ADDRESSES, TOKEN_CONFIG, UNISWAP_V3_POOL_ABI
+    from futarchy.experimental.exchanges.passthrough_router import PassthroughRouter
+    from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
+    
     # Function to floor a number to 6 decimal places
     def floor_to_6(val):
         # Convert to string with 6 decimal places, then back to float
@@ -610,7 +786,7 @@ def sell_sdai_yes(bot, amount):
     print(f"sDAI: {TOKEN_CONFIG['currency']['address']}")
     
     # Calculate the actual price from sqrtPriceX96
-    price = (current_sqrt_price ** 2) / (2 ** 192)
+    price = sqrt_price_x96_to_price(current_sqrt_price)
     print(f"Current price: {price:.6f} (price of token1 in terms of token0)")
     
     # Determine which token is which in the pool
@@ -698,6 +874,8 @@ def buy_sdai_yes(bot, amount_in_sdai):
         bot: FutarchyBot instance
         amount_in_sdai (float): Amount of sDAI to use for buying sDAI-YES
     """
+    from futarchy.experimental.config.constants import CONTRACT_ADDRESSES, TOKEN_CONFIG, UNISWAP_V3_POOL_ABI, UNISWAP_V3_PASSTHROUGH_ROUTER_ABI
+    
     def floor_to_6(num):
         # Convert decimal to float if needed
         if hasattr(num, 'is_finite') and num.is_finite():  # Check if it's a Decimal
@@ -796,7 +974,7 @@ def buy_sdai_yes(bot, amount_in_sdai):
                 'from': account,
                 'gas': 500000,
                 'gasPrice': bot.w3.eth.gas_price,
-                'nonce': bot.w3.eth.get_transaction_count(account),
+                'nonce': bot.w3.eth.get_transaction_count(account, 'pending'),
                 'chainId': bot.w3.eth.chain_id,
             })
             
@@ -850,7 +1028,7 @@ def buy_sdai_yes(bot, amount_in_sdai):
             'from': account,
             'gas': 500000,
             'gasPrice': bot.w3.eth.gas_price,
-            'nonce': bot.w3.eth.get_transaction_count(account),
+            'nonce': bot.w3.eth.get_transaction_count(account, 'pending'),
             'chainId': bot.w3.eth.chain_id,
         })
         
@@ -893,7 +1071,7 @@ def buy_sdai_yes(bot, amount_in_sdai):
             'from': account,
             'gas': 500000,
             'gasPrice': bot.w3.eth.gas_price,
-            'nonce': bot.w3.eth.get_transaction_count(account),
+            'nonce': bot.w3.eth.get_transaction_count(account, 'pending'),
             'chainId': bot.w3.eth.chain_id,
         })
         
@@ -952,6 +1130,134 @@ def buy_sdai_yes(bot, amount_in_sdai):
         print(f"Consider using the split_sdai command to split sDAI into YES/NO tokens at 1:1 ratio.")
         return False
 
+def solve_synthetic_arbitrage(bot, direction, sdai_amount=None, solver=None, max_sdai_in=None):
+    """
+    Solve the profit-maximizing size of a synthetic GNO arbitrage route.
+    
+    All pools are read once at a single block and every leg is quoted locally.
+    
+    Args:
+        bot: The FutarchyBot instance
+        direction: "sell" (buy spot GNO, sell conditional GNO) or "buy" (the reverse)
+        sdai_amount: Amount of sDAI to quote instead of searching for the optimal size
+            (None to solve for the optimal size)
+        solver: Already loaded SyntheticArbitrageSolver (loaded here if None)
+        max_sdai_in: Cap on the sDAI spent by the search, in wei (defaults to the wallet balance)
+        
+    Returns:
+        dict: Solver result (see SyntheticArbitrageSolver.optimize_sell), or None if the pools could not be read
+    """
+    from futarchy.experimental.utils.arbitrage_solver import SyntheticArbitrageSolver, gas_cost_in_sdai, SELL_SYNTHETIC_GAS, BUY_SYNTHETIC_GAS
+    
+    try:
+        if solver is None:
+            solver = SyntheticArbitrageSolver.load(bot.w3, bot.multicall, bot.metadata)
+        gas_price = bot.w3.eth.gas_price
+    except Exception as e:
+        print(f"⚠️ Could not load pool state for the arbitrage solver: {e}")
+        return None
+    
+    if max_sdai_in is None and sdai_amount is None:
+        balances = bot.get_balances()
+        if balances:
+            max_sdai_in = bot.w3.to_wei(Decimal(str(balances['currency']['wallet'])), 'ether')
+    
+    gas_units = SELL_SYNTHETIC_GAS if direction == "sell" else BUY_SYNTHETIC_GAS
+    gas_cost = gas_cost_in_sdai(gas_units, gas_price, solver.sdai_rate)
+    start = time.perf_counter()
+    if sdai_amount is not None:
+        # The caller chose the size: quote it as is instead of searching
+        amount = bot.w3.to_wei(Decimal(str(sdai_amount)), 'ether')
+        evaluate = solver.evaluate_sell if direction == "sell" else solver.evaluate_buy
+        result = evaluate(amount, gas_cost)
+        title = f"{direction.capitalize()} with {sdai_amount} sDAI"
+    else:
+        optimize = solver.optimize_sell if direction == "sell" else solver.optimize_buy
+        result = optimize(max_sdai_in, gas_cost)
+        title = f"Optimal {direction} size"
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    print(f"\n🧮 {title} at block {result['block_number']} (solved in {elapsed_ms:.2f} ms):")
+    if result['legs'] is None and sdai_amount is not None:
+        print(f"⚠️ {sdai_amount} sDAI is outside the range the pools can quote")
+    print(f"sDAI in: {bot.w3.from_wei(result['sdai_in'], 'ether'):.6f}")
+    print(f"Expected profit: {result['gross_profit'] / 10**18:.6f} sDAI before gas, "
+          f"{result['profit'] / 10**18:.6f} sDAI after {gas_cost / 10**18:.6f} sDAI gas")
+    
+    return result
+
+def execute_pipelined_synthetic_arbitrage(bot, direction, sdai_amount=None):
+    """
+    Execute a synthetic GNO arbitrage route as a pipelined transaction plan.
+    
+    Legs that don't need the output of an earlier leg are pre-signed with
+    consecutive nonces and broadcast together, and amounts are taken from
+    receipts instead of balance re-reads (see SyntheticArbitragePlanner).
+    
+    Args:
+        bot: The FutarchyBot instance
+        direction: "sell" or "buy"
+        sdai_amount: sDAI to spend on the sell route, or the most sDAI to spend on
+            the buy route (None to use the solved optimal size)
+        
+    Returns:
+        dict: Pipeline result (see TransactionPipeline.run), or None if nothing was executed
+    """
+    from futarchy.experimental.utils.arbitrage_solver import SyntheticArbitrageSolver
+    from futarchy.experimental.strategies.pipelined_arbitrage import SyntheticArbitragePlanner
+    
+    try:
+        solver = SyntheticArbitrageSolver.load(bot.w3, bot.multicall, bot.metadata)
+    except Exception as e:
+        print(f"⚠️ Could not load pool state for the arbitrage solver: {e}")
+        return None
+    
+    initial_balances = bot.get_balances()
+    wallet_sdai = bot.w3.to_wei(Decimal(str(initial_balances['currency']['wallet'])), 'ether')
+    max_sdai_in = wallet_sdai
+    if sdai_amount is not None:
+        max_sdai_in = min(wallet_sdai, bot.w3.to_wei(Decimal(str(sdai_amount)), 'ether'))
+    
+    quote_amount = sdai_amount
+    if direction == "buy" and sdai_amount is not None:
+        # The buy route is sized to spend at most the amount, capped at the wallet balance
+        quote_amount = bot.w3.from_wei(max_sdai_in, 'ether')
+    
+    solution = solve_synthetic_arbitrage(bot, direction, quote_amount, solver=solver, max_sdai_in=max_sdai_in)
+    if direction == "sell" and sdai_amount is not None:
+        sdai_in = bot.w3.to_wei(Decimal(str(sdai_amount)), 'ether')
+        if sdai_in > wallet_sdai:
+            print(f"❌ Insufficient sDAI balance. Required: {sdai_amount}, Available: {initial_balances['currency']['wallet']}")
+            return None
+    elif solution is None or not solution['profitable']:
+        print(f"⚠️ No profitable synthetic GNO {direction} arbitrage at the current block.")
+        return None
+    
+    planner = SyntheticArbitragePlanner(bot, solver)
+    try:
+        if direction == "sell":
+            pipeline = planner.sell_plan(sdai_in if sdai_amount is not None else solution['sdai_in'])
+        else:
+            pipeline = planner.buy_plan(solution['legs']['gno'])
+    except Exception as e:
+        print(f"❌ Could not plan the {direction} route: {e}")
+        return None
+    
+    waves = pipeline.waves()
+    print(f"\n🧭 Plan: {sum(len(wave) for wave in waves)} transactions in {len(waves)} waves")
+    for index, wave in enumerate(waves):
+        print(f"  Wave {index + 1}: {', '.join(wave)}")
+    
+    result = pipeline.run()
+    
+    final_balances = bot.get_balances()
+    sdai_change = float(final_balances['currency']['wallet']) - float(initial_balances['currency']['wallet'])
+    print(f"\n📊 sDAI change: {sdai_change:+.6f}")
+    if result['success'] and solution is not None:
+        print(f"Expected profit: {solution['gross_profit'] / 10**18:.6f} sDAI before gas")
+    bot.print_balances(final_balances)
+    return result
+
 def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     """
     Execute a full arbitrage operation:
@@ -968,8 +1274,19 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     
     Args:
         bot: The FutarchyBot instance
-        sdai_amount: Amount of sDAI to use for arbitrage
+        sdai_amount: Amount of sDAI to use for arbitrage (None to use the solved optimal size)
     """
+    from futarchy.experimental.config.constants import TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, UNISWAP_V3_POOL_ABI
+    from futarchy.experimental.exchanges.passthrough_router import PassthroughRouter
+    from futarchy.experimental.utils.rpc_metrics import rpc_step
+    
+    solution = solve_synthetic_arbitrage(bot, "sell", sdai_amount)
+    if sdai_amount is None:
+        if solution is None or not solution['profitable']:
+            print("⚠️ No profitable synthetic GNO sell arbitrage at the current block.")
+            return
+        sdai_amount = float(bot.w3.from_wei(solution['sdai_in'], 'ether'))
+    
     print(f"\n🔄 Starting synthetic GNO arbitrage with {sdai_amount} sDAI")
     
     # Get initial balances and prices
@@ -983,14 +1300,16 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     
     # Get initial market prices for reporting only
     print("\n📊 Initial market prices:")
-    market_prices = bot.get_market_prices()
-    synthetic_price, spot_price = bot.calculate_synthetic_price()
+    snapshot = bot.get_market_snapshot()
+    market_prices = bot.get_market_prices(snapshot)
+    synthetic_price, spot_price = bot.calculate_synthetic_price(snapshot)
     
     print(f"GNO Spot Price: {spot_price:.6f} sDAI")
     print(f"GNO Synthetic Price: {synthetic_price:.6f} sDAI")
     print(f"Price Difference: {((synthetic_price / spot_price) - 1) * 100:.2f}%")
     
     # Step 1: Buy waGNO with sDAI using existing command implementation
+    rpc_step("step 1")
     print(f"\n🔹 Step 1: Buying waGNO with {sdai_amount} sDAI")
     
     # Buy waGNO with sDAI
@@ -1029,6 +1348,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
             print(f"✅ Successfully bought {wagno_received:.6f} waGNO")
     
     # Step 2: Unwrap waGNO to GNO using existing command implementation
+    rpc_step("step 2")
     print(f"\n🔹 Step 2: Unwrapping waGNO to GNO")
     
     # Get the current balance after buying waGNO
@@ -1059,6 +1379,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     print(f"✅ Received {gno_amount:.6f} GNO after unwrapping")
     
     # Step 3: Split GNO into YES/NO tokens using existing command implementation
+    rpc_step("step 3")
     print(f"\n🔹 Step 3: Splitting GNO into YES/NO tokens")
     
     # Get current GNO balance to split
@@ -1098,6 +1419,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     print(f"📊 Total available: {total_gno_yes:.6f} GNO-YES and {total_gno_no:.6f} GNO-NO tokens")
     
     # Step 4: Sell GNO-YES for sDAI-YES using existing swap_gno_yes_to_sdai_yes command
+    rpc_step("step 4")
     print(f"\n🔹 Step 4: Selling {total_gno_yes:.6f} GNO-YES for sDAI-YES")
     
     # Get current sDAI-YES balance before swap
@@ -1138,15 +1460,13 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
         print("⚠️ Continuing with arbitrage despite GNO-YES selling error")
     
     # Step 5: Sell GNO-NO for sDAI-NO using existing swap_gno_no command
+    rpc_step("step 5")
     print(f"\n🔹 Step 5: Selling {total_gno_no:.6f} GNO-NO for sDAI-NO")
     
     # Get current sDAI-NO balance before swap
     sdai_no_before = float(intermediate_balances['currency']['no'])
     
     try:
-        # Add a small delay to avoid nonce too low errors
-        time.sleep(2)
-        
         # Create a PassthroughRouter instance directly
         passthrough = PassthroughRouter(
             bot.w3,
@@ -1181,6 +1501,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
         print("⚠️ Continuing with arbitrage despite GNO-NO selling error")
     
     # Step 6: Balance YES/NO tokens before merging
+    rpc_step("step 6")
     # Get latest balances after swaps
     post_swap_balances = bot.get_balances()
     sdai_yes_after = float(post_swap_balances['currency']['yes'])
@@ -1248,6 +1569,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     
     
     # Step 7: Merge sDAI-YES and sDAI-NO tokens into sDAI
+    rpc_step("step 7")
     # Recalculate merge amount after balancing
     post_balance_balances = bot.get_balances()
     sdai_yes_final = float(post_balance_balances['currency']['yes'])
@@ -1280,7 +1602,8 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     
     # Calculate remaining value locked in YES/NO tokens
     # This is a rough estimate using the current market probability
-    market_prices_final = bot.get_market_prices()
+    snapshot_final = bot.get_market_snapshot()
+    market_prices_final = bot.get_market_prices(snapshot_final)
     probability = market_prices_final.get('probability', 0.5)
     
     estimated_value_of_yes = sdai_yes_final * probability
@@ -1297,7 +1620,7 @@ def execute_arbitrage_sell_synthetic_gno(bot, sdai_amount):
     total_profit_loss_percent = (total_profit_loss / initial_sdai) * 100 if initial_sdai > 0 else 0
     
     # Get updated market prices for reporting only
-    synthetic_price_final, spot_price_final = bot.calculate_synthetic_price()
+    synthetic_price_final, spot_price_final = bot.calculate_synthetic_price(snapshot_final)
     
     # Print summary
     print("\n📈 Arbitrage Operation Summary")
@@ -1345,12 +1668,22 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     
     Args:
         bot: The FutarchyBot instance
-        sdai_amount: Amount of sDAI to use for arbitrage
+        sdai_amount: Amount of sDAI to use for arbitrage (None to use the solved optimal size)
     """
+    from futarchy.experimental.config.constants import TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, UNISWAP_V3_POOL_ABI
+    from futarchy.experimental.exchanges.passthrough_router import PassthroughRouter
+    from futarchy.experimental.utils.rpc_metrics import rpc_step
+    
+    solution = solve_synthetic_arbitrage(bot, "buy", sdai_amount)
+    if sdai_amount is None:
+        if solution is None or not solution['profitable']:
+            print("⚠️ No profitable synthetic GNO buy arbitrage at the current block.")
+            return
+        sdai_amount = float(bot.w3.from_wei(solution['sdai_in'], 'ether'))
+    
     print(f"\n🔄 Starting synthetic GNO buying arbitrage with {sdai_amount} sDAI")
     
     # Import needed modules
-    import time
     from exchanges.passthrough_router import PassthroughRouter
     from config.constants import TOKEN_CONFIG, POOL_CONFIG_YES, POOL_CONFIG_NO, UNISWAP_V3_POOL_ABI
     import os
@@ -1364,16 +1697,18 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
         return
     
     # Step 1: Get market prices (YES pool, NO pool, probability)
+    rpc_step("step 1")
     print("\n🔹 Step 1: Getting market prices and calculating optimal amounts")
     
     # Get market prices
-    market_prices = bot.get_market_prices()
+    snapshot = bot.get_market_snapshot()
+    market_prices = bot.get_market_prices(snapshot)
     
     # Extract relevant values
     yes_price = market_prices['yes_price']
     no_price = market_prices['no_price']
     probability = market_prices['probability']
-    synthetic_price, spot_price = bot.calculate_synthetic_price()
+    synthetic_price, spot_price = bot.calculate_synthetic_price(snapshot)
     
     print(f"YES Price: {yes_price:.6f} sDAI")
     print(f"NO Price: {no_price:.6f} sDAI")
@@ -1383,6 +1718,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"Price Difference: {((synthetic_price / spot_price) - 1) * 100:.2f}%")
     
     # Step 2: Calculate optimal amounts of sDAI-YES and sDAI-NO (x, y)
+    rpc_step("step 2")
     print("\n🔹 Step 2: Calculating optimal amounts of sDAI-YES and sDAI-NO")
     
     # From the equations:
@@ -1403,6 +1739,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"sDAI-NO (y): {y:.6f}")
     
     # Step 3: Balance sDAI-YES and sDAI-NO amounts
+    rpc_step("step 3")
     print(f"\n🔹 Step 3: Balancing sDAI-YES and sDAI-NO amounts")
     
     # If x > y, we need more YES tokens than would be acquired from just splitting
@@ -1427,6 +1764,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
         print(f"No direct sDAI-YES purchase needed (x <= y)")
     
     # Step 4: Use y sDAI to split into sDAI-YES and sDAI-NO tokens
+    rpc_step("step 4")
     print(f"\n🔹 Step 4: Splitting {y:.6f} sDAI into YES/NO tokens")
     
     # Add sDAI as collateral (split into YES/NO tokens)
@@ -1449,6 +1787,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"sDAI-NO: {sdai_no_after_split:.6f}")
     
     # Step 5: If x < y, sell excess sDAI-YES back to sDAI
+    rpc_step("step 5")
     if x < y:
         print(f"\n🔹 Step 5: Selling excess sDAI-YES back to sDAI")
         
@@ -1477,6 +1816,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     sdai_no_available = float(pre_swap_balances['currency']['no'])
     
     # Step 6: Buy GNO-YES with all sDAI-YES
+    rpc_step("step 6")
     print(f"\n🔹 Step 6: Buying GNO-YES with {sdai_yes_available:.6f} sDAI-YES")
     
     try:
@@ -1514,12 +1854,10 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
         print("⚠️ Continuing with arbitrage despite GNO-YES buying error")
     
     # Step 7: Buy GNO-NO with all sDAI-NO
+    rpc_step("step 7")
     print(f"\n🔹 Step 7: Buying GNO-NO with {sdai_no_available:.6f} sDAI-NO")
     
     try:
-        # Add a small delay to avoid nonce too low errors
-        time.sleep(2)
-        
         # Create a PassthroughRouter instance directly
         passthrough = PassthroughRouter(
             bot.w3,
@@ -1562,6 +1900,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"GNO-NO received: {gno_no_amount:.6f}")
     
     # Step 8: Merge GNO-YES and GNO-NO back into GNO
+    rpc_step("step 8")
     print(f"\n🔹 Step 8: Merging GNO-YES and GNO-NO back into GNO")
     
     # Calculate how much we can merge (minimum of YES and NO)
@@ -1588,6 +1927,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"GNO balance after merging: {gno_amount:.6f}")
     
     # Step 9: Wrap GNO into waGNO
+    rpc_step("step 9")
     print(f"\n🔹 Step 9: Wrapping GNO into waGNO")
     
     try:
@@ -1605,6 +1945,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     print(f"waGNO balance after wrapping: {wagno_amount:.6f}")
     
     # Step 10: Sell waGNO for sDAI
+    rpc_step("step 10")
     print(f"\n🔹 Step 10: Selling waGNO for sDAI")
     
     if wagno_amount > 0:
@@ -1634,7 +1975,8 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     sdai_no_final = float(final_balances['currency']['no'])
     
     # This is a rough estimate using the current market probability
-    market_prices_final = bot.get_market_prices()
+    snapshot_final = bot.get_market_snapshot()
+    market_prices_final = bot.get_market_prices(snapshot_final)
     final_probability = market_prices_final.get('probability', 0.5)
     
     # Estimate the value of remaining tokens
@@ -1661,7 +2003,7 @@ def execute_arbitrage_buy_synthetic_gno(bot, sdai_amount):
     total_profit_loss_percent = (total_profit_loss / initial_sdai) * 100 if initial_sdai > 0 else 0
     
     # Get updated market prices for reporting only
-    synthetic_price_final, spot_price_final = bot.calculate_synthetic_price()
+    synthetic_price_final, spot_price_final = bot.calculate_synthetic_price(snapshot_final)
     
     # Print summary
     print("\n📈 Arbitrage Operation Summary")
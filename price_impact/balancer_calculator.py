@@ -5,6 +5,8 @@ Module for calculating price impact in Balancer pools.
 import os
 import json
 from .utils.web3_utils import simulate_transaction_with_eth_call
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.price_curves import balancer_pool_curves
 
 class BalancerPriceImpactCalculator:
     """Class to calculate price impact for Balancer pools."""
@@ -66,6 +68,37 @@ class BalancerPriceImpactCalculator:
         # If we get here, we couldn't find the file
         raise FileNotFoundError(f"BatchRouter ABI file not found. Tried: {possible_paths}")
     
+    def calculate_price_impact_curve(self, gno_amounts):
+        """
+        Calculate price impact for many GNO amounts at once in the Balancer pool.
+        
+        All buy quotes and all sell quotes are each fetched in a single
+        Multicall3 batch at the same block.
+        
+        Args:
+            gno_amounts: Sequence of GNO amounts to trade
+            
+        Returns:
+            dict: "buy" (sDAI in) and "sell" (waGNO in) curves with amount_in, amount_out,
+                  effective_price and price_impact arrays (see utils.price_curves.curve_result)
+        """
+        try:
+            wagno_amounts = [amount * self.gno_to_wagno_rate for amount in gno_amounts]
+            result = balancer_pool_curves(
+                self.w3, Multicall(self.w3), self.batch_router_address, self.balancer_pool_address,
+                self.sdai_address, self.wagno_address, wagno_amounts
+            )
+            result["pool"] = "Balancer sDAI/waGNO"
+            result["gno_amounts"] = list(gno_amounts)
+            result["wagno_amounts"] = wagno_amounts
+            return result
+        except Exception as e:
+            print(f"Error calculating Balancer price impact curve: {e}")
+            return {
+                "pool": "Balancer sDAI/waGNO",
+                "error": str(e)
+            }
+    
     def calculate_price_impact(self, gno_amount):
         """
         Calculate price impact for a fixed GNO amount in the Balancer pool.
@@ -65,8 +65,18 @@ from config.constants import (
     UNISWAP_V3_POOL_ABI,
     ERC20_ABI
 )
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
+from futarchy.experimental.core.pool_tracker import tracked_snapshot
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.price_curves import conditional_pool_curves, balancer_pool_curves
 import argparse
 
+try:
+    from futarchy.experimental.utils.metadata_cache import get_metadata_cache
+except ImportError:
+    # Metadata cache is optional when running the scripts standalone
+    get_metadata_cache = None
+
 # Price impact percentage to calculate (0.1%)
 PRICE_IMPACT_PERCENTAGE = 0.1
 
@@ -121,6 +131,9 @@ class PriceImpactCalculator:
         self.gno_yes_address = self.w3.to_checksum_address(TOKEN_CONFIG["company"]["yes_address"])
         self.gno_no_address = self.w3.to_checksum_address(TOKEN_CONFIG["company"]["no_address"])
         
+        # Pool states for local swap simulation, kept current from pool logs, keyed by pool address
+        self.pool_trackers = {}
+        
         # Load ABIs
         self.load_abis()
         
@@ -440,7 +453,11 @@ class PriceImpactCalculator:
     
     def simulate_swap_v3(self, token_in, token_out, amount_in, pool_fee=3000):
         """
-        Simulate a swap using the Uniswap V3 Quoter contract.
+        Simulate a swap in a conditional pool.
+        
+        The swap is simulated locally from the pool's tick snapshot. The Quoter
+        contract is only used if the snapshot is unavailable or does not cover
+        the whole trade.
         
         Args:
             token_in: Address of the input token
@@ -451,56 +468,56 @@ class PriceImpactCalculator:
         Returns:
             tuple: (amount_out, price_impact_percentage) or (None, None) if simulation fails
         """
-        if self.quoter is None:
-            return None, None
-            
         try:
-            # Get current price from the pool
-            # We'll use the pool's slot0 data to get the current price
-            if token_in.lower() == self.gno_yes_address.lower() or token_in.lower() == self.gno_no_address.lower():
-                pool = self.yes_pool if token_in.lower() == self.gno_yes_address.lower() else self.no_pool
-                slot0 = pool.functions.slot0().call()
-                sqrt_price_x96 = slot0[0]
-                current_price = (sqrt_price_x96 / (2**96))**2
-                
-                # Determine if token_in is token0 or token1
-                token0 = pool.functions.token0().call()
-                if token_in.lower() == token0.lower():
-                    # token_in is token0, so price is token1/token0
-                    current_price = 1 / current_price if current_price != 0 else float('inf')
+            yes_tokens = (self.gno_yes_address.lower(), self.sdai_yes_address.lower())
+            no_tokens = (self.gno_no_address.lower(), self.sdai_no_address.lower())
+            if token_in.lower() in yes_tokens:
+                pool = self.yes_pool
+            elif token_in.lower() in no_tokens:
+                pool = self.no_pool
             else:
-                # For other pools, we would need to get the price differently
-                # For now, we'll just set a placeholder
-                current_price = 0
-                
-            # Simulate the swap using the Quoter contract
-            try:
-                # Use quoteExactInputSingle for a single-hop swap
-                result = self.quoter.functions.quoteExactInputSingle(
-                    self.w3.to_checksum_address(token_in),
-                    self.w3.to_checksum_address(token_out),
-                    pool_fee,
-                    amount_in,
-                    0  # No price limit
-                ).call()
-                
-                # Extract the amount out
-                amount_out = result[0]
-                
-                # Calculate the effective price
-                effective_price = amount_in / amount_out if amount_out != 0 else float('inf')
-                
-                # Calculate price impact
-                if current_price > 0:
-                    price_impact_percentage = abs((effective_price - current_price) / current_price) * 100
-                else:
-                    price_impact_percentage = None
-                    
-                return amount_out, price_impact_percentage
+                pool = None
+            
+            snapshot = tracked_snapshot(self.w3, self.pool_trackers, pool.address) if pool is not None else None
+            
+            # Current price of token_out in token_in
+            current_price = snapshot.price(invert=snapshot.is_token0(token_in)) if snapshot is not None else 0
+            
+            amount_out = None
+            if snapshot is not None:
+                quote = snapshot.quote_exact_input(token_in, amount_in)
+                if quote["complete"]:
+                    amount_out = quote["amount_out"]
+                    if self.verbose:
+                        print(f"Simulated locally: {quote['ticks_crossed']} ticks crossed, final sqrtPriceX96 {quote['sqrt_price_x96_after']}")
+            
+            if amount_out is None:
+                if self.quoter is None:
+                    return None, None
+                try:
+                    # Use quoteExactInputSingle for a single-hop swap
+                    result = self.quoter.functions.quoteExactInputSingle(
+                        self.w3.to_checksum_address(token_in),
+                        self.w3.to_checksum_address(token_out),
+                        pool_fee,
+                        amount_in,
+                        0  # No price limit
+                    ).call()
+                    amount_out = result[0]
+                except Exception as e:
+                    print(f"Error simulating swap with Quoter: {e}")
+                    return None, None
+            
+            # Calculate the effective price
+            effective_price = amount_in / amount_out if amount_out != 0 else float('inf')
+            
+            # Calculate price impact
+            if current_price > 0:
+                price_impact_percentage = abs((effective_price - current_price) / current_price) * 100
+            else:
+                price_impact_percentage = None
                 
-            except Exception as e:
-                print(f"Error simulating swap with Quoter: {e}")
-                return None, None
+            return amount_out, price_impact_percentage
                 
         except Exception as e:
             print(f"Error in simulate_swap_v3: {e}")
@@ -525,9 +542,12 @@ class PriceImpactCalculator:
         print(f"Trade amount: {gno_amount} GNO")
         
         try:
-            # Get token0 and token1
-            token0 = pool_contract.functions.token0().call()
-            token1 = pool_contract.functions.token1().call()
+            # Get token0 and token1 (cached on disk when available)
+            if get_metadata_cache is not None:
+                token0, token1 = get_metadata_cache(self.w3).pool_tokens(pool_address)
+            else:
+                token0 = pool_contract.functions.token0().call()
+                token1 = pool_contract.functions.token1().call()
             
             # Identify token names
             token0_name = self.get_token_name(token0)
@@ -544,7 +564,7 @@ class PriceImpactCalculator:
                 tick = slot0[1]
                 
                 # Calculate price from sqrtPriceX96
-                price = (sqrt_price_x96 / (2**96))**2
+                price = sqrt_price_x96_to_price(sqrt_price_x96)
                 
                 print(f"sqrtPriceX96: {sqrt_price_x96}")
                 print(f"tick: {tick}")
@@ -580,22 +600,21 @@ class PriceImpactCalculator:
                 gno_amount_wei = self.w3.to_wei(gno_amount, 'ether')
                 sdai_amount_wei = self.w3.to_wei(sdai_amount_for_gno, 'ether')
                 
-                # Try to simulate swaps using the Quoter contract
+                # Simulate swaps against the local pool snapshot (Quoter as fallback)
                 buy_amount_out = None
                 buy_price_impact = None
                 sell_amount_out = None
                 sell_price_impact = None
                 
-                if self.quoter is not None:
-                    # Simulate buying GNO with sDAI
-                    buy_amount_out, buy_price_impact = self.simulate_swap_v3(
-                        sdai_token, gno_token, sdai_amount_wei
-                    )
-                    
-                    # Simulate selling GNO for sDAI
-                    sell_amount_out, sell_price_impact = self.simulate_swap_v3(
-                        gno_token, sdai_token, gno_amount_wei
-                    )
+                # Simulate buying GNO with sDAI
+                buy_amount_out, buy_price_impact = self.simulate_swap_v3(
+                    sdai_token, gno_token, sdai_amount_wei
+                )
+                
+                # Simulate selling GNO for sDAI
+                sell_amount_out, sell_price_impact = self.simulate_swap_v3(
+                    gno_token, sdai_token, gno_amount_wei
+                )
                 
                 # For concentrated liquidity pools, price impact increases with trade size
                 # and depends on the distribution of liquidity across price ranges
@@ -665,6 +684,44 @@ class PriceImpactCalculator:
                 "error": str(e)
             }
     
+    def calculate_price_impact_curves(self, gno_amounts):
+        """
+        Calculate price impact curves for many GNO amounts in all three pools.
+        
+        The conditional pools are evaluated vectorized against cached tick
+        snapshots and the Balancer pool is quoted in one batch per direction.
+        
+        Args:
+            gno_amounts: Sequence of GNO amounts to trade
+            
+        Returns:
+            dict: {"balancer": ..., "yes": ..., "no": ...}, each with "buy" and "sell"
+                  curves (see utils.price_curves.curve_result) or an "error"
+        """
+        curves = {}
+        
+        try:
+            wagno_amounts = [amount * self.gno_to_wagno_rate for amount in gno_amounts]
+            curves["balancer"] = balancer_pool_curves(
+                self.w3, Multicall(self.w3), self.batch_router_address, self.balancer_pool_address,
+                self.sdai_address, self.wagno_address, wagno_amounts
+            )
+        except Exception as e:
+            print(f"Error calculating Balancer price impact curve: {e}")
+            curves["balancer"] = {"error": str(e)}
+        
+        for name, pool, gno_token, sdai_token in (
+            ("yes", self.yes_pool, self.gno_yes_address, self.sdai_yes_address),
+            ("no", self.no_pool, self.gno_no_address, self.sdai_no_address),
+        ):
+            snapshot = tracked_snapshot(self.w3, self.pool_trackers, pool.address)
+            if snapshot is None:
+                curves[name] = {"error": "Could not load pool snapshot"}
+                continue
+            curves[name] = conditional_pool_curves(snapshot, gno_token, sdai_token, gno_amounts)
+        
+        return curves
+    
     def get_token_name(self, address):
         """Get a human-readable name for a token address."""
         address_lower = address.lower()
@@ -683,6 +740,12 @@ class PriceImpactCalculator:
             return "GNO YES"
         elif address_lower == self.gno_no_address.lower():
             return "GNO NO"
+        elif get_metadata_cache is not None:
+            # Fall back to the on-chain symbol, fetched once and cached on disk
+            try:
+                return get_metadata_cache(self.w3).symbol(address)
+            except Exception:
+                return "Unknown"
         else:
             return "Unknown"
     
@@ -738,6 +801,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="Calculate price impact for fixed trade sizes in Balancer and SushiSwap pools")
     parser.add_argument("--amount", type=float, default=0.01, help="Trade amount in GNO equivalent (default: 0.01)")
+    parser.add_argument("--amounts", type=str, help="Comma-separated GNO amounts to print a price impact curve for (e.g. 0.01,0.1,1)")
     parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
     
     args = parser.parse_args()
@@ -745,6 +809,22 @@ def main():
     # Initialize the price impact calculator
     calculator = PriceImpactCalculator(verbose=args.verbose)
     
+    if args.amounts:
+        gno_amounts = [float(amount) for amount in args.amounts.split(",")]
+        curves = calculator.calculate_price_impact_curves(gno_amounts)
+        
+        print(f"\n=== Price Impact Curves ===")
+        for name, label in (("balancer", "Balancer sDAI/waGNO"), ("yes", "SushiSwap YES"), ("no", "SushiSwap NO")):
+            print(f"\n{label}:")
+            if "error" in curves[name]:
+                print(f"  Error: {curves[name]['error']}")
+                continue
+            buy_impacts = curves[name]["buy"]["price_impact"]
+            sell_impacts = curves[name]["sell"]["price_impact"]
+            for gno_amount, buy_impact, sell_impact in zip(gno_amounts, buy_impacts, sell_impacts):
+                print(f"  {gno_amount:>12} GNO  buy impact: {buy_impact}%  sell impact: {sell_impact}%")
+        return
+    
     # Calculate price impact for the specified GNO amount
     print(f"\nCalculating price impact for {args.amount} GNO equivalent...")
     
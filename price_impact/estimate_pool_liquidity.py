@@ -21,7 +21,6 @@ Options:
 
 import os
 import sys
-import math
 from decimal import Decimal
 from web3 import Web3
 from utils.web3_utils import setup_web3_connection
@@ -33,8 +32,18 @@ from config.constants import (
     POOL_CONFIG_NO, 
     UNISWAP_V3_POOL_ABI
 )
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price, price_to_sqrt_price_x96
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.balancer_math import BalancerPoolState
 import argparse
 
+try:
+    from futarchy.experimental.utils.metadata_cache import get_metadata_cache
+except ImportError:
+    # Metadata cache is optional when running the scripts standalone
+    get_metadata_cache = None
+
 # Price impact percentage to calculate (0.1%)
 PRICE_IMPACT_PERCENTAGE = 0.1
 
@@ -68,6 +77,9 @@ class PoolLiquidityEstimator:
         # Initialize contracts
         self.init_contracts()
         
+        # Balancer pool state for local swap math, loaded on first use
+        self.balancer_state = None
+        
         # Calculate GNO to waGNO conversion rate
         self.gno_to_wagno_rate = self.calculate_gno_to_wagno_rate()
         
@@ -145,6 +157,29 @@ class PoolLiquidityEstimator:
             # Default to 1:1 if there's an error
             return 1.0
     
+    def get_balancer_state(self, refresh=False):
+        """
+        Load the Balancer pool's balances, rates, fee and weights once for local swap math.
+        
+        Args:
+            refresh: Reload the state even if it is cached
+            
+        Returns:
+            BalancerPoolState: Pool state, or None if it could not be loaded
+        """
+        if refresh or self.balancer_state is None:
+            try:
+                self.balancer_state = BalancerPoolState.load(
+                    self.w3, self.balancer_pool_address, multicall=Multicall(self.w3)
+                )
+                if self.verbose:
+                    pool_type = "weighted" if self.balancer_state.is_weighted else "stable"
+                    print(f"Loaded {pool_type} Balancer pool state at block {self.balancer_state.block_number}")
+            except Exception as e:
+                print(f"Error loading Balancer pool state: {e}")
+                self.balancer_state = None
+        return self.balancer_state
+    
     def estimate_balancer_pool_liquidity(self):
         """
         Estimate liquidity in the Balancer sDAI/waGNO pool.
@@ -172,14 +207,19 @@ class PoolLiquidityEstimator:
         
         # Query current price (1 sDAI -> ? waGNO)
         try:
-            result = self.batch_router.functions.querySwapExactIn(
-                paths,
-                self.w3.to_checksum_address("0x0000000000000000000000000000000000000000"),  # Zero address as sender
-                '0x'  # Empty user data
-            ).call()
-            
-            # Extract expected output amount
-            expected_output = result[0][0]
+            # Read the pool state once; quotes and impact sizes are then computed locally
+            state = self.get_balancer_state(refresh=True)
+            if state is not None:
+                expected_output = state.quote_exact_in(self.sdai_address, self.wagno_address, self.w3.to_wei(1, 'ether'))
+            else:
+                result = self.batch_router.functions.querySwapExactIn(
+                    paths,
+                    self.w3.to_checksum_address("0x0000000000000000000000000000000000000000"),  # Zero address as sender
+                    '0x'  # Empty user data
+                ).call()
+                
+                # Extract expected output amount
+                expected_output = result[0][0]
             expected_output_eth = self.w3.from_wei(expected_output, 'ether')
             
             # Current price: 1 sDAI = ? waGNO
@@ -238,7 +278,12 @@ class PoolLiquidityEstimator:
     
     def binary_search_balancer_impact(self, token_in, token_out, current_price, target_price, is_price_up):
         """
-        Use binary search to find amount needed for desired price impact.
+        Find the amount needed for desired price impact.
+        
+        The amount is solved locally from the Balancer pool state: it is the
+        input that moves the pool's spot price by target_price/current_price.
+        Binary search over querySwapExactIn calls is only used if the state
+        could not be loaded.
         
         Args:
             token_in: Address of input token
@@ -250,6 +295,23 @@ class PoolLiquidityEstimator:
         Returns:
             float: Approximate amount needed for the desired price impact
         """
+        state = self.get_balancer_state()
+        if state is not None and current_price:
+            try:
+                price_impact = abs(target_price / current_price - 1)
+                amount = state.amount_in_for_price_impact(token_in, token_out, price_impact)
+                best_amount = float(self.w3.from_wei(amount, 'ether'))
+                
+                if self.verbose:
+                    print(f"\nLocal solve for price impact ({'UP' if is_price_up else 'DOWN'}):")
+                    print(f"Spot price move: {price_impact * 100}%, amount: {best_amount}")
+                    output_amount = state.quote_exact_in(token_in, token_out, amount)
+                    print(f"Amount out: {self.w3.from_wei(output_amount, 'ether')}")
+                
+                return best_amount
+            except Exception as e:
+                print(f"Error solving Balancer price impact locally, falling back to RPC search: {e}")
+        
         # Define search range - start with a smaller range
         min_amount = 0.001  # Start with a small amount
         max_amount = 100  # Start with a more reasonable upper bound
@@ -405,9 +467,12 @@ class PoolLiquidityEstimator:
         print(f"\n=== SushiSwap {pool_name} Conditional Pool Liquidity ===")
         
         try:
-            # Get token0 and token1
-            token0 = pool_contract.functions.token0().call()
-            token1 = pool_contract.functions.token1().call()
+            # Get token0 and token1 (cached on disk when available)
+            if get_metadata_cache is not None:
+                token0, token1 = get_metadata_cache(self.w3).pool_tokens(pool_address)
+            else:
+                token0 = pool_contract.functions.token0().call()
+                token1 = pool_contract.functions.token1().call()
             
             # Identify token names
             token0_name = self.get_token_name(token0)
@@ -417,17 +482,19 @@ class PoolLiquidityEstimator:
             print(f"Token0: {token0} ({token0_name})")
             print(f"Token1: {token1} ({token1_name})")
             
-            # Get slot0 data for current price
+            # Load slot0, liquidity and initialized ticks once for local simulation
             try:
-                slot0 = pool_contract.functions.slot0().call()
-                sqrt_price_x96 = slot0[0]
-                tick = slot0[1]
+                metadata = get_metadata_cache(self.w3) if get_metadata_cache is not None else None
+                snapshot = V3PoolSnapshot.load(self.w3, pool_address, multicall=Multicall(self.w3), metadata=metadata)
+                sqrt_price_x96 = snapshot.sqrt_price_x96
+                tick = snapshot.tick
                 
                 # Calculate price from sqrtPriceX96
-                price = (sqrt_price_x96 / (2**96))**2
+                price = sqrt_price_x96_to_price(sqrt_price_x96)
                 
                 print(f"sqrtPriceX96: {sqrt_price_x96}")
                 print(f"tick: {tick}")
+                print(f"Active liquidity: {snapshot.liquidity} ({len(snapshot.ticks)} initialized ticks loaded)")
                 print(f"Current Price ({token1_name}/{token0_name}): {price}")
                 print(f"Current Price ({token0_name}/{token1_name}): {1/price if price != 0 else 'infinity'}")
                 
@@ -436,34 +503,22 @@ class PoolLiquidityEstimator:
                 target_price_down = price * (1 - PRICE_IMPACT_PERCENTAGE/100)
                 
                 # Calculate sqrt price for target prices
-                target_sqrt_price_up = int(math.sqrt(target_price_up) * (2**96))
-                target_sqrt_price_down = int(math.sqrt(target_price_down) * (2**96))
+                target_sqrt_price_up = price_to_sqrt_price_x96(target_price_up)
+                target_sqrt_price_down = price_to_sqrt_price_x96(target_price_down)
                 
-                # Calculate tick for target prices
-                # Formula: tick = log(sqrt_price_x96 / 2^96) / log(sqrt(1.0001))
-                target_tick_up = math.log(target_sqrt_price_up / (2**96)) / math.log(math.sqrt(1.0001))
-                target_tick_down = math.log(target_sqrt_price_down / (2**96)) / math.log(math.sqrt(1.0001))
+                # Simulate the swaps that move the price to each target across the loaded ticks.
+                # Moving the price up sells token1 into the pool, moving it down sells token0.
+                up = snapshot.swap_to_price(target_sqrt_price_up)
+                down = snapshot.swap_to_price(target_sqrt_price_down)
                 
-                # For Uniswap V3 style pools, we would need to calculate the amount needed to move the price
-                # This is complex and depends on the liquidity distribution across ticks
-                # For a simplified estimate, we can use a constant product formula (x * y = k)
-                
-                # Note: This is a simplified approach and may not be accurate for concentrated liquidity pools
-                # A more accurate approach would require analyzing the liquidity distribution
-                
-                # For now, we'll provide a rough estimate based on the current price and target price
-                # This assumes uniform liquidity distribution, which is not accurate for Uniswap V3
-                
-                print(f"\nNote: For Uniswap V3 style pools, liquidity is concentrated and varies across price ranges.")
-                print(f"The following estimates are rough approximations assuming uniform liquidity.")
-                
-                # Estimate amount needed for price impact (very rough approximation)
-                # For a 0.1% price change in a constant product pool, approximately sqrt(0.001) * liquidity is needed
-                # This is a very rough estimate and should be refined with actual liquidity data
-                
-                # Since we don't have direct access to the liquidity at each tick, we'll use a placeholder
-                estimated_amount_up = "Requires detailed liquidity analysis"
-                estimated_amount_down = "Requires detailed liquidity analysis"
+                if up["sqrt_price_x96_after"] == target_sqrt_price_up:
+                    estimated_amount_up = f"{self.w3.from_wei(up['amount_in'], 'ether')} {token1_name} ({up['ticks_crossed']} ticks crossed)"
+                else:
+                    estimated_amount_up = "Not enough liquidity in the loaded tick range"
+                if down["sqrt_price_x96_after"] == target_sqrt_price_down:
+                    estimated_amount_down = f"{self.w3.from_wei(down['amount_in'], 'ether')} {token0_name} ({down['ticks_crossed']} ticks crossed)"
+                else:
+                    estimated_amount_down = "Not enough liquidity in the loaded tick range"
                 
                 print(f"\nTo move price UP by {PRICE_IMPACT_PERCENTAGE}% ({token1_name}/{token0_name} = {target_price_up}):")
                 print(f"Estimated amount needed: {estimated_amount_up}")
@@ -517,6 +572,12 @@ class PoolLiquidityEstimator:
             return "GNO YES"
         elif address_lower == self.gno_no_address.lower():
             return "GNO NO"
+        elif get_metadata_cache is not None:
+            # Fall back to the on-chain symbol, fetched once and cached on disk
+            try:
+                return get_metadata_cache(self.w3).symbol(address)
+            except Exception:
+                return "Unknown"
         else:
             return "Unknown"
 
@@ -3,6 +3,15 @@ Module for calculating price impact in SushiSwap pools.
 """
 
 from .config.constants import UNISWAP_V3_POOL_ABI, UNISWAP_V3_QUOTER_ABI, SUSHISWAP_QUOTER_ADDRESS
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
+from futarchy.experimental.core.pool_tracker import tracked_snapshot
+from futarchy.experimental.utils.price_curves import conditional_pool_curves
+
+try:
+    from futarchy.experimental.utils.metadata_cache import get_metadata_cache
+except ImportError:
+    # Metadata cache is optional when running the scripts standalone
+    get_metadata_cache = None
 
 class SushiSwapPriceImpactCalculator:
     """Class to calculate price impact for SushiSwap pools."""
@@ -32,6 +41,9 @@ class SushiSwapPriceImpactCalculator:
         self.gno_no_address = self.w3.to_checksum_address(gno_no_address)
         self.verbose = verbose
         
+        # Pool states for local swap simulation, kept current from pool logs, keyed by pool address
+        self.pool_trackers = {}
+        
         # Initialize contracts
         self.init_contracts()
         
@@ -80,12 +92,22 @@ class SushiSwapPriceImpactCalculator:
             return "GNO YES"
         elif address_lower == self.gno_no_address.lower():
             return "GNO NO"
+        elif get_metadata_cache is not None:
+            # Fall back to the on-chain symbol, fetched once and cached on disk
+            try:
+                return get_metadata_cache(self.w3).symbol(address)
+            except Exception:
+                return "Unknown"
         else:
             return "Unknown"
     
     def simulate_swap_v3(self, token_in, token_out, amount_in, pool_fee=3000):
         """
-        Simulate a swap using the Uniswap V3 Quoter contract.
+        Simulate a swap in a conditional pool.
+        
+        The swap is simulated locally from the pool's tick snapshot. The Quoter
+        contract is only used if the snapshot is unavailable or does not cover
+        the whole trade.
         
         Args:
             token_in: Address of the input token
@@ -96,61 +118,94 @@ class SushiSwapPriceImpactCalculator:
         Returns:
             tuple: (amount_out, price_impact_percentage) or (None, None) if simulation fails
         """
-        if self.quoter is None:
-            return None, None
-            
         try:
-            # Get current price from the pool
-            # We'll use the pool's slot0 data to get the current price
-            if token_in.lower() == self.gno_yes_address.lower() or token_in.lower() == self.gno_no_address.lower():
-                pool = self.yes_pool if token_in.lower() == self.gno_yes_address.lower() else self.no_pool
-                slot0 = pool.functions.slot0().call()
-                sqrt_price_x96 = slot0[0]
-                current_price = (sqrt_price_x96 / (2**96))**2
-                
-                # Determine if token_in is token0 or token1
-                token0 = pool.functions.token0().call()
-                if token_in.lower() == token0.lower():
-                    # token_in is token0, so price is token1/token0
-                    current_price = 1 / current_price if current_price != 0 else float('inf')
+            yes_tokens = (self.gno_yes_address.lower(), self.sdai_yes_address.lower())
+            no_tokens = (self.gno_no_address.lower(), self.sdai_no_address.lower())
+            if token_in.lower() in yes_tokens:
+                pool = self.yes_pool
+            elif token_in.lower() in no_tokens:
+                pool = self.no_pool
             else:
-                # For other pools, we would need to get the price differently
-                # For now, we'll just set a placeholder
-                current_price = 0
-                
-            # Simulate the swap using the Quoter contract
-            try:
-                # Use quoteExactInputSingle for a single-hop swap
-                result = self.quoter.functions.quoteExactInputSingle(
-                    self.w3.to_checksum_address(token_in),
-                    self.w3.to_checksum_address(token_out),
-                    pool_fee,
-                    amount_in,
-                    0  # No price limit
-                ).call()
-                
-                # Extract the amount out
-                amount_out = result[0]
-                
-                # Calculate the effective price
-                effective_price = amount_in / amount_out if amount_out != 0 else float('inf')
-                
-                # Calculate price impact
-                if current_price > 0:
-                    price_impact_percentage = abs((effective_price - current_price) / current_price) * 100
-                else:
-                    price_impact_percentage = None
-                    
-                return amount_out, price_impact_percentage
+                pool = None
+            
+            snapshot = tracked_snapshot(self.w3, self.pool_trackers, pool.address) if pool is not None else None
+            
+            # Current price of token_out in token_in
+            current_price = snapshot.price(invert=snapshot.is_token0(token_in)) if snapshot is not None else 0
+            
+            amount_out = None
+            if snapshot is not None:
+                quote = snapshot.quote_exact_input(token_in, amount_in)
+                if quote["complete"]:
+                    amount_out = quote["amount_out"]
+                    if self.verbose:
+                        print(f"Simulated locally: {quote['ticks_crossed']} ticks crossed, final sqrtPriceX96 {quote['sqrt_price_x96_after']}")
+            
+            if amount_out is None:
+                if self.quoter is None:
+                    return None, None
+                try:
+                    # Use quoteExactInputSingle for a single-hop swap
+                    result = self.quoter.functions.quoteExactInputSingle(
+                        self.w3.to_checksum_address(token_in),
+                        self.w3.to_checksum_address(token_out),
+                        pool_fee,
+                        amount_in,
+                        0  # No price limit
+                    ).call()
+                    amount_out = result[0]
+                except Exception as e:
+                    print(f"Error simulating swap with Quoter: {e}")
+                    return None, None
+            
+            # Calculate the effective price
+            effective_price = amount_in / amount_out if amount_out != 0 else float('inf')
+            
+            # Calculate price impact
+            if current_price > 0:
+                price_impact_percentage = abs((effective_price - current_price) / current_price) * 100
+            else:
+                price_impact_percentage = None
                 
-            except Exception as e:
-                print(f"Error simulating swap with Quoter: {e}")
-                return None, None
+            return amount_out, price_impact_percentage
                 
         except Exception as e:
             print(f"Error in simulate_swap_v3: {e}")
             return None, None
     
+    def calculate_price_impact_curve(self, gno_amounts, is_yes_pool):
+        """
+        Calculate price impact for many GNO amounts at once in a conditional token pool.
+        
+        Every amount is evaluated against the same cached pool snapshot, without
+        further RPC calls.
+        
+        Args:
+            gno_amounts: Sequence of GNO amounts to trade
+            is_yes_pool: True for YES pool, False for NO pool
+            
+        Returns:
+            dict: "buy" and "sell" curves with amount_in, amount_out, effective_price
+                  and price_impact arrays (see utils.price_curves.curve_result)
+        """
+        pool_name = "YES" if is_yes_pool else "NO"
+        pool_contract = self.yes_pool if is_yes_pool else self.no_pool
+        
+        snapshot = tracked_snapshot(self.w3, self.pool_trackers, pool_contract.address)
+        if snapshot is None:
+            return {
+                "pool": f"SushiSwap {pool_name} Conditional Pool",
+                "error": "Could not load pool snapshot"
+            }
+        
+        gno_token = self.gno_yes_address if is_yes_pool else self.gno_no_address
+        sdai_token = self.sdai_yes_address if is_yes_pool else self.sdai_no_address
+        
+        result = conditional_pool_curves(snapshot, gno_token, sdai_token, gno_amounts)
+        result["pool"] = f"SushiSwap {pool_name} Conditional Pool"
+        result["gno_amounts"] = list(gno_amounts)
+        return result
+    
     def calculate_price_impact(self, gno_amount, is_yes_pool):
         """
         Calculate price impact for a fixed GNO amount in a conditional token pool.
@@ -170,9 +225,12 @@ class SushiSwapPriceImpactCalculator:
         print(f"Trade amount: {gno_amount} GNO")
         
         try:
-            # Get token0 and token1
-            token0 = pool_contract.functions.token0().call()
-            token1 = pool_contract.functions.token1().call()
+            # Get token0 and token1 (cached on disk when available)
+            if get_metadata_cache is not None:
+                token0, token1 = get_metadata_cache(self.w3).pool_tokens(pool_address)
+            else:
+                token0 = pool_contract.functions.token0().call()
+                token1 = pool_contract.functions.token1().call()
             
             # Identify token names
             token0_name = self.get_token_name(token0)
@@ -189,7 +247,7 @@ class SushiSwapPriceImpactCalculator:
                 tick = slot0[1]
                 
                 # Calculate price from sqrtPriceX96
-                price = (sqrt_price_x96 / (2**96))**2
+                price = sqrt_price_x96_to_price(sqrt_price_x96)
                 
                 print(f"sqrtPriceX96: {sqrt_price_x96}")
                 print(f"tick: {tick}")
@@ -225,22 +283,21 @@ class SushiSwapPriceImpactCalculator:
                 gno_amount_wei = self.w3.to_wei(gno_amount, 'ether')
                 sdai_amount_wei = self.w3.to_wei(sdai_amount_for_gno, 'ether')
                 
-                # Try to simulate swaps using the Quoter contract
+                # Simulate swaps against the local pool snapshot (Quoter as fallback)
                 buy_amount_out = None
                 buy_price_impact = None
                 sell_amount_out = None
                 sell_price_impact = None
                 
-                if self.quoter is not None:
-                    # Simulate buying GNO with sDAI
-                    buy_amount_out, buy_price_impact = self.simulate_swap_v3(
-                        sdai_token, gno_token, sdai_amount_wei
-                    )
-                    
-                    # Simulate selling GNO for sDAI
-                    sell_amount_out, sell_price_impact = self.simulate_swap_v3(
-                        gno_token, sdai_token, gno_amount_wei
-                    )
+                # Simulate buying GNO with sDAI
+                buy_amount_out, buy_price_impact = self.simulate_swap_v3(
+                    sdai_token, gno_token, sdai_amount_wei
+                )
+                
+                # Simulate selling GNO for sDAI
+                sell_amount_out, sell_price_impact = self.simulate_swap_v3(
+                    gno_token, sdai_token, gno_amount_wei
+                )
                 
                 # For concentrated liquidity pools, price impact increases with trade size
                 # and depends on the distribution of liquidity across price ranges
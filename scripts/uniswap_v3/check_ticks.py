@@ -13,10 +13,17 @@ Usage:
 """
 
 import os
+import sys
 import argparse
 from web3 import Web3
 from dotenv import load_dotenv
 
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.tick_scanner import scan_initialized_ticks
+
 # Load environment variables
 load_dotenv()
 
@@ -49,30 +56,6 @@ ERC20_ABI = [
     {"constant": True, "inputs": [], "name": "decimals", "outputs": [{"name": "", "type": "uint8"}], "payable": False, "stateMutability": "view", "type": "function"}
 ]
 
-def check_tick_initialized(w3, pool_contract, tick):
-    """
-    Check if a tick is initialized.
-    
-    In Uniswap V3, a tick must be initialized before it can be used as a boundary
-    for a liquidity position. This function checks if a specific tick is initialized
-    by calling the 'ticks' function on the pool contract and checking the 'initialized'
-    boolean in the returned data.
-    
-    Args:
-        w3: Web3 instance
-        pool_contract: Pool contract instance
-        tick: Tick to check
-        
-    Returns:
-        bool: True if initialized, False otherwise
-    """
-    try:
-        tick_info = pool_contract.functions.ticks(tick).call()
-        return tick_info[7]  # initialized boolean
-    except Exception as e:
-        print(f"Error checking tick {tick}: {e}")
-        return False
-
 def check_ticks(w3, pool_address, ticks_to_check):
     """
     Check if specific ticks are initialized in a pool.
@@ -85,6 +68,9 @@ def check_ticks(w3, pool_address, ticks_to_check):
     When a pool is new or has low liquidity, many ticks may not be initialized yet,
     which can cause transactions to fail when trying to add liquidity.
     
+    Initialized ticks are read from the pool's tick bitmap in a few batched
+    calls, however many ticks are checked.
+    
     Args:
         w3: Web3 instance
         pool_address: Address of the pool
@@ -131,15 +117,22 @@ def check_ticks(w3, pool_address, ticks_to_check):
     print(f"Fee: {fee/10000}%")
     print(f"Tick Spacing: {tick_spacing}")
     
+    # Read every initialized tick between the lowest and highest tick of interest
+    adjusted_ticks = [(tick // tick_spacing) * tick_spacing for tick in ticks_to_check]
+    current_base = (current_tick // tick_spacing) * tick_spacing
+    nearby_ticks = [current_base + (i * tick_spacing) for i in range(-5, 6)]
+    liquidity_map = scan_initialized_ticks(
+        w3, pool_address, multicall=Multicall(w3),
+        tick_lower=min(adjusted_ticks + nearby_ticks), tick_upper=max(adjusted_ticks + nearby_ticks)
+    )
+    
     # Check the ticks
     print("\nChecking ticks:")
     
     results = {}
-    for tick in ticks_to_check:
-        # Make sure tick is a multiple of tick spacing
-        adjusted_tick = (tick // tick_spacing) * tick_spacing
-        
-        is_initialized = check_tick_initialized(w3, pool_contract, adjusted_tick)
+    for adjusted_tick in adjusted_ticks:
+        # Ticks are rounded down to a multiple of the tick spacing
+        is_initialized = liquidity_map.is_initialized(adjusted_tick)
         results[adjusted_tick] = is_initialized
         
         print(f"Tick {adjusted_tick}: {'Initialized' if is_initialized else 'Not Initialized'}")
@@ -147,12 +140,13 @@ def check_ticks(w3, pool_address, ticks_to_check):
     # Check some ticks around the current tick
     print("\nChecking ticks around current tick:")
     
-    for i in range(-5, 6):
-        tick = current_tick + (i * tick_spacing)
-        is_initialized = check_tick_initialized(w3, pool_contract, tick)
+    for tick in nearby_ticks:
+        is_initialized = liquidity_map.is_initialized(tick)
         results[tick] = is_initialized
         
-        print(f"Tick {tick} ({i * tick_spacing} from current): {'Initialized' if is_initialized else 'Not Initialized'}")
+        print(f"Tick {tick} ({tick - current_tick} from current): {'Initialized' if is_initialized else 'Not Initialized'}")
+    
+    print(f"\nInitialized ticks in scanned range: {liquidity_map.between(min(results), max(results))}")
     
     # Summary
     initialized_count = sum(1 for v in results.values() if v)
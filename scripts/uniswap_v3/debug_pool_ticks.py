@@ -1,10 +1,17 @@
 import os
+import sys
 import json
 import argparse
 from web3 import Web3
 from dotenv import load_dotenv
 import math
 
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+from futarchy.experimental.utils.multicall import Multicall
+from futarchy.experimental.utils.tick_scanner import scan_initialized_ticks
+
 # Load environment variables
 load_dotenv()
 
@@ -106,28 +113,19 @@ def get_detailed_pool_info(w3, pool_address):
         else:
             tick_spacing = 60  # Default
     
-    # Check if current tick is initialized
-    current_tick_initialized = False
+    # Find initialized ticks from the tick bitmap (a few batched calls for the whole pool)
+    liquidity_map = None
     try:
-        tick_info = pool_contract.functions.ticks(tick).call()
-        current_tick_initialized = tick_info[7]  # initialized boolean
+        liquidity_map = scan_initialized_ticks(w3, pool_address, multicall=Multicall(w3))
     except Exception as e:
-        print(f"Warning: Could not check if current tick is initialized: {e}")
+        print(f"Warning: Could not scan the tick bitmap: {e}")
+    
+    current_tick_initialized = liquidity_map is not None and liquidity_map.is_initialized(tick)
     
-    # Calculate nearest initialized ticks
+    # Initialized ticks within 10 tick spacings of the current tick
     nearest_initialized_ticks = []
-    try:
-        # Check ticks around the current tick
-        for i in range(-10, 11):
-            check_tick = tick + (i * tick_spacing)
-            try:
-                tick_info = pool_contract.functions.ticks(check_tick).call()
-                if tick_info[7]:  # initialized
-                    nearest_initialized_ticks.append(check_tick)
-            except:
-                pass
-    except Exception as e:
-        print(f"Warning: Error checking nearby ticks: {e}")
+    if liquidity_map is not None:
+        nearest_initialized_ticks = liquidity_map.between(tick - 10 * tick_spacing, tick + 10 * tick_spacing)
     
     # Calculate price range for a few ticks around current tick
     price_ranges = []
@@ -168,6 +166,7 @@ def get_detailed_pool_info(w3, pool_address):
         'tickSpacing': tick_spacing,
         'current_tick_initialized': current_tick_initialized,
         'nearest_initialized_ticks': nearest_initialized_ticks,
+        'initialized_ticks': liquidity_map.rows() if liquidity_map is not None else [],
         'price_ranges': price_ranges,
         'recommended_tick_range': {
             'lower': valid_lower_tick,
@@ -243,6 +242,9 @@ def main():
     print("\n=== Tick Information ===")
     print(f"Current Tick Initialized: {pool_info['current_tick_initialized']}")
     print(f"Nearest Initialized Ticks: {pool_info['nearest_initialized_ticks']}")
+    print(f"Initialized Ticks in Pool: {len(pool_info['initialized_ticks'])}")
+    for row in pool_info['initialized_ticks']:
+        print(f"  Tick {row['tick']}: liquidityNet {row['liquidity_net']}, liquidityGross {row['liquidity_gross']}")
     
     # Print recommended tick range
     print("\n=== Recommended Tick Range for Adding Liquidity ===")
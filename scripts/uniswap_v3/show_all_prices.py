@@ -13,6 +13,7 @@ from eth_account import Account
 from dotenv import load_dotenv
 from price_impact.config.constants import BALANCER_CONFIG, TOKEN_CONFIG
 from config.constants import CONTRACT_ADDRESSES
+from futarchy.experimental.utils.uniswap_v3_math import sqrt_price_x96_to_price
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
@@ -43,16 +44,14 @@ def setup_web3():
     return w3
 
 def calculate_price_from_sqrt_price_x96(sqrt_price_x96, token0_decimals, token1_decimals):
-    """Calculate price from sqrtPriceX96"""
-    # Convert sqrtPriceX96 to a decimal
-    sqrt_price = int(sqrt_price_x96) / (1 << 96)
-    price = sqrt_price * sqrt_price
+    """
+    Calculate price from sqrtPriceX96 (token1 per token0, exact integer math).
     
-    # Adjust for decimals
-    decimal_adjustment = 10 ** (token1_decimals - token0_decimals)
-    price = price * decimal_adjustment
-    
-    return price
+    The raw ratio is scaled by 10**(token0_decimals - token1_decimals); the former
+    10**(token1_decimals - token0_decimals) was inverted, which only went unnoticed
+    because every pool here pairs 18 decimal tokens.
+    """
+    return sqrt_price_x96_to_price(int(sqrt_price_x96), token0_decimals, token1_decimals)
 
 def get_uniswap_v3_pool_price(pool_address):
     """Get price from a Uniswap V3 pool in terms of sDAI per GNO"""
@@ -0,0 +1,178 @@
+"""
+Tests for the allowance ledger.
+"""
+
+import time
+import unittest
+from unittest.mock import MagicMock
+from eth_account import Account
+from futarchy.experimental.core.transaction import TRANSFER_TOPIC
+from futarchy.experimental.utils.allowance_ledger import (
+    AllowanceLedger, ERC20_APPROVAL_TOPIC, PERMIT2_PERMIT_TOPIC, MAX_UINT256, decode_transaction_target
+)
+
+ACCOUNT = Account.from_key("0x" + "11" * 32)
+OWNER = ACCOUNT.address.lower()
+TOKEN = "0x00000000000000000000000000000000000000a0"
+ROUTER = "0x00000000000000000000000000000000000000b1"
+PERMIT2 = "0x000000000022d473030f116ddee9f6b43ac78ba3"
+TX_HASH = "0x" + "ab" * 32
+
+
+def word(value):
+    return format(value, "064x")
+
+
+def topic(address):
+    return "0x" + address[2:].lower().rjust(64, "0")
+
+
+def sign(to, dynamic_fee=True):
+    tx = {"to": to, "value": 0, "gas": 21000, "nonce": 0, "chainId": 100}
+    if dynamic_fee:
+        tx.update({"maxFeePerGas": 2 * 10**9, "maxPriorityFeePerGas": 10**9})
+    else:
+        tx["gasPrice"] = 10**9
+    return "0x" + bytes(ACCOUNT.sign_transaction(tx).rawTransaction).hex()
+
+
+def allowance_call(token, spender, owner=OWNER):
+    return [{"to": token, "data": "0xdd62ed3e" + word(int(owner, 16)) + word(int(spender, 16))}, "latest"]
+
+
+def permit2_call(token, spender):
+    return [{"to": PERMIT2, "data": "0x927da105" + word(int(OWNER, 16)) + word(int(token, 16)) + word(int(spender, 16))}, "latest"]
+
+
+class FakeNode:
+    """make_request mock holding on-chain allowances and one receipt."""
+
+    def __init__(self, allowance=10**18, permit2=(0, 0, 3)):
+        self.allowance = allowance
+        self.permit2 = permit2
+        self.receipt = None
+        self.make_request = MagicMock(side_effect=self.handle)
+
+    def handle(self, method, params):
+        if method == "eth_call":
+            data = params[0]["data"]
+            if data.startswith("0x927da105"):
+                return {"jsonrpc": "2.0", "id": 1, "result": "0x" + "".join(word(value) for value in self.permit2)}
+            return {"jsonrpc": "2.0", "id": 1, "result": "0x" + word(self.allowance)}
+        if method == "eth_sendRawTransaction":
+            return {"jsonrpc": "2.0", "id": 1, "result": TX_HASH}
+        if method == "eth_getTransactionReceipt":
+            return {"jsonrpc": "2.0", "id": 1, "result": self.receipt}
+        return {"jsonrpc": "2.0", "id": 1, "result": None}
+
+    def calls(self, method="eth_call"):
+        return sum(1 for call in self.make_request.call_args_list if call[0][0] == method)
+
+
+def receipt(status=1, logs=()):
+    return {"transactionHash": TX_HASH, "status": hex(status), "logs": list(logs)}
+
+
+class TestDecoding(unittest.TestCase):
+    """Test cases for raw transaction decoding."""
+
+    def test_decodes_recipient(self):
+        router = Account.from_key("0x" + "33" * 32).address
+        self.assertEqual(decode_transaction_target(sign(router)), (ACCOUNT.address, router.lower()))
+        self.assertEqual(decode_transaction_target(sign(router, dynamic_fee=False)), (ACCOUNT.address, router.lower()))
+
+
+class TestAllowanceLedger(unittest.TestCase):
+    """Test cases for AllowanceLedger used as middleware."""
+
+    def setUp(self):
+        self.ledger = AllowanceLedger(permit2_address=PERMIT2)
+        self.ledger.track(OWNER)
+        self.node = FakeNode()
+        self.make_request = self.ledger.wrap_make_request(self.node.make_request)
+
+    def read(self, token=TOKEN, spender=ROUTER, owner=OWNER):
+        return int(self.make_request("eth_call", allowance_call(token, spender, owner))["result"], 16)
+
+    def test_allowance_is_read_once(self):
+        self.assertEqual(self.read(), 10**18)
+        self.assertEqual(self.read(), 10**18)
+        self.assertEqual(self.node.calls(), 1)
+        self.assertEqual(self.ledger.stats()["hits"], 1)
+
+    def test_other_owners_go_to_the_node(self):
+        self.read(owner=ROUTER)
+        self.read(owner=ROUTER)
+        self.assertEqual(self.node.calls(), 2)
+        self.assertIsNone(self.ledger.known_allowance(ROUTER, TOKEN, ROUTER))
+
+    def test_entries_expire(self):
+        self.read()
+        self.ledger.ttl = 0
+        time.sleep(0.01)
+        self.node.allowance = 5
+
+        self.assertEqual(self.read(), 5)
+        self.assertEqual(self.node.calls(), 2)
+
+    def test_failed_estimate_rereads_the_chain(self):
+        self.read()
+        self.node.make_request.side_effect = lambda method, params: (
+            {"jsonrpc": "2.0", "id": 1, "error": {"message": "execution reverted: STF"}}
+            if method == "eth_estimateGas" else self.node.handle(method, params)
+        )
+        self.make_request("eth_estimateGas", [{"from": ACCOUNT.address, "to": ROUTER, "data": "0x"}])
+        self.node.allowance = 5
+
+        self.assertEqual(self.read(), 5)
+
+    def test_trade_deducts_allowance(self):
+        self.read()
+        self.ledger.record_sent(TX_HASH, OWNER, ROUTER)
+        self.ledger.apply_receipt(receipt(logs=[{
+            "address": TOKEN, "topics": [TRANSFER_TOPIC, topic(OWNER), topic(ROUTER)], "data": "0x" + word(4 * 10**17),
+        }]))
+
+        self.assertEqual(self.read(), 6 * 10**17)
+        self.assertEqual(self.node.calls(), 1)
+
+    def test_approval_log_sets_allowance(self):
+        self.read()
+        self.ledger.record_sent(TX_HASH, OWNER, TOKEN)
+        self.ledger.apply_receipt(receipt(logs=[{
+            "address": TOKEN, "topics": [ERC20_APPROVAL_TOPIC, topic(OWNER), topic(ROUTER)], "data": "0x" + word(MAX_UINT256),
+        }]))
+
+        self.assertEqual(self.read(), MAX_UINT256)
+        self.assertEqual(self.node.calls(), 1)
+
+    def test_revert_rereads_the_chain(self):
+        self.read()
+        self.make_request("eth_sendRawTransaction", [sign(Account.from_key("0x" + "33" * 32).address)])
+        self.node.receipt = receipt(status=0)
+        self.make_request("eth_getTransactionReceipt", [TX_HASH])
+        self.node.allowance = 5
+
+        self.assertEqual(self.read(), 5)
+        self.assertEqual(self.node.calls(), 2)
+
+    def test_permit_log_updates_permit2_allowance(self):
+        expiration = int(time.time()) + 3600
+        self.make_request("eth_call", permit2_call(TOKEN, ROUTER))
+        self.assertFalse(self.ledger.has_permit2_allowance(OWNER, TOKEN, ROUTER, 1))
+
+        self.ledger.record_sent(TX_HASH, OWNER, PERMIT2)
+        self.ledger.apply_receipt(receipt(logs=[{
+            "address": PERMIT2, "topics": [PERMIT2_PERMIT_TOPIC, topic(OWNER), topic(TOKEN), topic(ROUTER)],
+            "data": "0x" + word(10**18) + word(expiration) + word(3),
+        }]))
+
+        self.assertTrue(self.ledger.has_permit2_allowance(OWNER, TOKEN, ROUTER, 10**18))
+        self.assertFalse(self.ledger.has_permit2_allowance(OWNER, TOKEN, ROUTER, 10**18, margin=7200))
+        result = self.make_request("eth_call", permit2_call(TOKEN, ROUTER))["result"]
+        self.assertEqual(int(result[2 + 128:], 16), 4)
+        self.assertEqual(self.node.calls(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
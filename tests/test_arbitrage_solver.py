@@ -0,0 +1,109 @@
+"""
+Tests for the synthetic GNO arbitrage size solver.
+"""
+
+import math
+import unittest
+from futarchy.experimental.config.constants import TOKEN_CONFIG
+from futarchy.experimental.utils.uniswap_v3_math import get_sqrt_ratio_at_tick, price_to_tick
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot, tick_position
+from futarchy.experimental.utils.balancer_math import BalancerPoolState
+from futarchy.experimental.utils.arbitrage_solver import SyntheticArbitrageSolver, maximize, gas_cost_in_sdai
+
+ONE = 10**18
+
+
+def full_range_pool(token0, token1, price, liquidity):
+    """V3 snapshot with one full-range position at the given token1-per-token0 price."""
+    ticks = {-887220: liquidity, 887220: -liquidity}
+    bitmap = {word: 0 for word in range(-58, 58)}
+    for tick in ticks:
+        word, bit = tick_position(tick // 60)
+        bitmap[word] |= 1 << bit
+    tick = price_to_tick(price)
+    return V3PoolSnapshot(get_sqrt_ratio_at_tick(tick), tick, liquidity, 3000, 60, bitmap, ticks, token0=token0, token1=token1)
+
+
+def make_solver(yes_price, no_price, spot_price=100.0, probability=0.5):
+    """Solver over a 50/50 Balancer pool and full-range conditional pools."""
+    currency, company = TOKEN_CONFIG["currency"], TOKEN_CONFIG["company"]
+    yes_pool = full_range_pool(company["yes_address"], currency["yes_address"], yes_price, int(math.sqrt(yes_price)) * 10**21)
+    no_pool = full_range_pool(currency["no_address"], company["no_address"], 1 / no_price, int(math.sqrt(no_price)) * 10**21)
+    sdai_yes_pool = full_range_pool(currency["yes_address"], currency["address"], probability, 10**22)
+    balancer = BalancerPoolState(
+        [currency["address"], TOKEN_CONFIG["wagno"]["address"]], [int(spot_price * 1000) * ONE, 1000 * ONE],
+        [1, 1], [ONE, ONE], 3 * 10**15, weights=[ONE // 2, ONE // 2]
+    )
+    return SyntheticArbitrageSolver(balancer, yes_pool, no_pool, sdai_yes_pool, ONE, sdai_rate=ONE, block_number=1)
+
+
+class TestMaximize(unittest.TestCase):
+    """Test cases for the size search."""
+
+    def test_finds_interior_maximum(self):
+        best = maximize(lambda size: size - size * size // (4 * 10**21), 10**22)
+        self.assertAlmostEqual(best["size"] / 2e21, 1, places=2)
+
+    def test_skips_infeasible_sizes(self):
+        best = maximize(lambda size: size if size <= 10**20 else None, 10**22)
+        # The bound is halved until feasible, and profit grows up to it
+        self.assertEqual(best["size"], 10**22 // 128)
+
+    def test_gas_cost_in_sdai(self):
+        self.assertEqual(gas_cost_in_sdai(10**6, 10**9, 2 * ONE), 5 * 10**14)
+
+
+class TestSyntheticArbitrageSolver(unittest.TestCase):
+    """Test cases for SyntheticArbitrageSolver."""
+
+    def assert_local_maximum(self, route, size, profit):
+        for factor in (0.9, 1.1):
+            legs = route(int(size * factor))
+            self.assertGreaterEqual(profit, legs["sdai_out"] - legs["sdai_in"])
+
+    def test_sell_route_when_synthetic_is_rich(self):
+        solver = make_solver(yes_price=110, no_price=95)
+        result = solver.optimize_sell()
+
+        self.assertEqual(result["direction"], "sell")
+        self.assertTrue(result["profitable"])
+        self.assertEqual(result["block_number"], 1)
+        self.assert_local_maximum(solver.sell_synthetic, result["sdai_in"], result["gross_profit"])
+        # The buy route loses money in the same market
+        self.assertFalse(solver.optimize_buy()["profitable"])
+
+    def test_buy_route_when_synthetic_is_cheap(self):
+        solver = make_solver(yes_price=95, no_price=90)
+        result = solver.optimize_buy()
+
+        self.assertTrue(result["profitable"])
+        self.assert_local_maximum(solver.buy_synthetic, result["legs"]["gno"], result["gross_profit"])
+        self.assertEqual(solver.optimize(gas_price_wei=10**9)["direction"], "buy")
+
+    def test_no_opportunity_in_aligned_market(self):
+        result = make_solver(yes_price=100, no_price=100).optimize(gas_price_wei=10**9)
+
+        self.assertFalse(result["profitable"])
+        self.assertIsNone(result["legs"])
+        self.assertLess(result["profit"], 0)
+
+    def test_wallet_balance_caps_the_size(self):
+        solver = make_solver(yes_price=110, no_price=95)
+        result = solver.optimize_sell(max_sdai_in=50 * ONE)
+        self.assertLessEqual(result["sdai_in"], 50 * ONE)
+        self.assertTrue(result["profitable"])
+
+    def test_fixed_amount_is_quoted_without_search(self):
+        solver = make_solver(yes_price=95, no_price=90)
+        sell = solver.evaluate_sell(10 * ONE)
+        buy = solver.evaluate_buy(10 * ONE)
+
+        self.assertEqual(sell["sdai_in"], 10 * ONE)
+        self.assertEqual(sell["legs"], solver.sell_synthetic(10 * ONE))
+        self.assertLessEqual(buy["sdai_in"], 10 * ONE)
+        self.assertGreater(buy["sdai_in"], 9 * ONE)
+        self.assertEqual(buy["legs"], solver.buy_synthetic(buy["legs"]["gno"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Tests for the async engine and AsyncMulticall.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from eth_abi import encode
+from eth_account import Account
+from hexbytes import HexBytes
+from web3 import Web3
+from futarchy.experimental.core.async_engine import AsyncFutarchyEngine
+from futarchy.experimental.utils.multicall import AsyncMulticall, Multicall
+
+ACCOUNT = Account.from_key("0x" + "11" * 32).address
+TOKEN = Account.from_key("0x" + "22" * 32).address
+RTT = 0.1
+
+
+def aggregate3_result(batch_size, block_number, value=None):
+    """Encoded aggregate3 return data: every call fails unless value is given, then getBlockNumber()."""
+    results = [(value is not None, encode(["uint256"], [value or 0])) for _ in range(batch_size)]
+    results.append((True, encode(["uint256"], [block_number])))
+    return encode(["(bool,bytes)[]"], [results])
+
+
+def batch_size(tx):
+    """Number of calls in an aggregate3 eth_call, excluding getBlockNumber()."""
+    multicall = Multicall(Web3())
+    _, args = multicall.contract.decode_function_input(tx["data"])
+    return len(args["calls"]) - 1
+
+
+def make_engine(value=None):
+    bot = MagicMock()
+    bot.w3 = Web3()
+    bot.multicall = Multicall(bot.w3)
+    bot.address = ACCOUNT
+    bot.metadata.token0.return_value = TOKEN.lower()
+    bot._balance_token_contracts.return_value = [("currency", "wallet", bot.w3.eth.contract(address=TOKEN, abi=[]))]
+    bot._format_balances.side_effect = lambda addresses, raw, block: raw
+    bot._get_wagno_sdai_price_from_vault.return_value = 100.0
+
+    in_flight = {"now": 0, "max": 0}
+
+    async def call(tx, block_identifier):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(RTT)
+        in_flight["now"] -= 1
+        return aggregate3_result(batch_size(tx), 77, value)
+
+    engine = AsyncFutarchyEngine(bot, rpc_url="http://localhost:8545")
+    engine.w3 = MagicMock()
+    engine.w3.eth.call = AsyncMock(side_effect=call)
+    engine.multicall.w3 = engine.w3
+    engine.in_flight = in_flight
+    return engine
+
+
+class TestAsyncMulticall(unittest.TestCase):
+    """Test cases for AsyncMulticall."""
+
+    def test_token_balances(self):
+        engine = make_engine(value=5 * 10**18)
+        multicall = AsyncMulticall(engine.w3, engine.bot.multicall)
+
+        block_number, balances = asyncio.run(multicall.get_token_balances([TOKEN], [ACCOUNT]))
+
+        self.assertEqual(block_number, 77)
+        self.assertEqual(balances, {ACCOUNT: {TOKEN: 5 * 10**18}})
+
+
+class TestAsyncFutarchyEngine(unittest.TestCase):
+    """Test cases for AsyncFutarchyEngine reads."""
+
+    def test_market_state_reads_run_concurrently(self):
+        engine = make_engine()
+
+        state = asyncio.run(engine.get_market_state())
+
+        # The market and balance batches are in flight at the same time
+        self.assertEqual(engine.w3.eth.call.await_count, 2)
+        self.assertEqual(engine.in_flight["max"], 2)
+        self.assertEqual(state["prices"]["block_number"], 77)
+        self.assertEqual(state["prices"]["wagno_price"], 100.0)
+        self.assertEqual(state["balances"], {TOKEN: None})
+        self.assertIsNone(state["cow_gno_price"])
+
+    def test_send_without_nonce_manager_uses_pending_count(self):
+        engine = make_engine()
+        engine.bot.nonces = None
+        engine.bot.allowances = None
+        engine.w3.eth.get_transaction_count = AsyncMock(return_value=4)
+        engine.w3.eth.send_raw_transaction = AsyncMock(side_effect=[HexBytes(b"\x01"), HexBytes(b"\x02")])
+        call = MagicMock()
+
+        hashes = asyncio.run(engine.send_transactions([call, call], {"gasPrice": 1, "chainId": 100}, [21000, 21000]))
+
+        self.assertEqual(hashes, [HexBytes(b"\x01"), HexBytes(b"\x02")])
+        self.assertEqual([c[0][0]["nonce"] for c in call.build_transaction.call_args_list], [4, 5])
+        engine.w3.eth.get_transaction_count.assert_awaited_once_with(ACCOUNT, "pending")
+
+
+if __name__ == '__main__':
+    unittest.main()
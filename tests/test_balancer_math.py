@@ -0,0 +1,132 @@
+"""
+Tests for the local Balancer V3 pool math.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.balancer_math import (
+    ONE, BalancerPoolState, mul_up, div_up, pow_up, weighted_out_given_exact_in,
+    stable_invariant, stable_balance
+)
+
+TOKEN_A = "0x00000000000000000000000000000000000000a0"
+TOKEN_B = "0x00000000000000000000000000000000000000b1"
+FEE = 3 * 10**15  # 0.3%
+
+
+def make_weighted(balances=(1000 * ONE, 250 * ONE), weights=(ONE // 2, ONE // 2), rates=(ONE, ONE)):
+    return BalancerPoolState([TOKEN_A, TOKEN_B], balances, [1, 1], rates, FEE, weights=weights)
+
+
+def make_stable(balances=(1000 * ONE, 900 * ONE), amp=200 * 1000):
+    return BalancerPoolState([TOKEN_A, TOKEN_B], balances, [1, 1], [ONE, ONE], 10**14, amp=amp)
+
+
+def spot_move(state, token_in, token_out, amount_in):
+    """Relative spot price move caused by a swap."""
+    index_in, index_out = state.index(token_in), state.index(token_out)
+    _, balances = state._swap(index_in, index_out, state.to_scaled18(amount_in, index_in))
+    return state._spot_price(balances, index_in, index_out) / state._spot_price(state.balances, index_in, index_out) - 1
+
+
+class TestFixedPoint(unittest.TestCase):
+    """Test cases for the FixedPoint helpers."""
+
+    def test_rounding(self):
+        self.assertEqual(mul_up(1, 1), 1)
+        self.assertEqual(div_up(1, 3 * ONE), 1)
+        self.assertEqual(pow_up(ONE // 2, ONE), ONE // 2)
+        self.assertEqual(pow_up(ONE // 2, 2 * ONE), ONE // 4)
+        # Non-trivial exponents are rounded up by the Vault's error margin
+        self.assertGreater(pow_up(ONE // 2, ONE // 2), 707106781186547524)
+
+
+class TestWeightedPool(unittest.TestCase):
+    """Test cases for weighted pools."""
+
+    def test_equal_weights_match_constant_product(self):
+        state = make_weighted()
+        amount_in = 10 * ONE
+        net_in = amount_in - mul_up(amount_in, FEE)
+        # balance_out * (1 - balance_in / (balance_in + net_in)), with the Vault's rounding
+        expected = 250 * ONE * (ONE - div_up(1000 * ONE, 1000 * ONE + net_in)) // ONE
+        self.assertEqual(state.quote_exact_in(TOKEN_A, TOKEN_B, amount_in), expected)
+        self.assertEqual(state.spot_price(TOKEN_A, TOKEN_B), 4.0)
+
+    def test_rates_are_applied(self):
+        state = make_weighted(rates=(2 * ONE, ONE))
+        # One token A is worth two scaled units, so it buys as much as two units at rate 1
+        self.assertEqual(state.quote_exact_in(TOKEN_A, TOKEN_B, ONE), make_weighted().quote_exact_in(TOKEN_A, TOKEN_B, 2 * ONE))
+
+    def test_max_in_ratio(self):
+        with self.assertRaises(ValueError):
+            weighted_out_given_exact_in(100 * ONE, ONE // 2, 100 * ONE, ONE // 2, 31 * ONE)
+
+    def test_amount_for_price_impact(self):
+        for weights in ((ONE // 2, ONE // 2), (8 * ONE // 10, 2 * ONE // 10)):
+            state = make_weighted(weights=weights)
+            for token_in, token_out in ((TOKEN_A, TOKEN_B), (TOKEN_B, TOKEN_A)):
+                amount = state.amount_in_for_price_impact(token_in, token_out, 0.001)
+                self.assertAlmostEqual(spot_move(state, token_in, token_out, amount), 0.001, places=9)
+
+
+class TestStablePool(unittest.TestCase):
+    """Test cases for stable pools."""
+
+    def test_invariant_round_trip(self):
+        balances = [1000 * ONE, 900 * ONE]
+        invariant = stable_invariant(200 * 1000, balances)
+        self.assertAlmostEqual(stable_balance(200 * 1000, balances, invariant, 1), 900 * ONE, delta=2)
+        # Balanced pools have an invariant equal to the sum of balances
+        self.assertAlmostEqual(stable_invariant(200 * 1000, [ONE, ONE]), 2 * ONE, delta=1)
+
+    def test_quote_near_parity(self):
+        state = make_stable()
+        self.assertLess(state.quote_exact_in(TOKEN_A, TOKEN_B, ONE), ONE)
+        # A tiny trade fills at the marginal price plus the fee
+        amount_out = state.quote_exact_in(TOKEN_A, TOKEN_B, 10**12)
+        self.assertAlmostEqual(10**12 / amount_out, state.spot_price(TOKEN_A, TOKEN_B) / (1 - 1e-4), places=6)
+
+    def test_amount_for_price_impact(self):
+        state = make_stable()
+        amount = state.amount_in_for_price_impact(TOKEN_A, TOKEN_B, 0.001)
+        self.assertAlmostEqual(spot_move(state, TOKEN_A, TOKEN_B, amount), 0.001, places=9)
+
+
+class TestLoad(unittest.TestCase):
+    """Test cases for BalancerPoolState.load."""
+
+    def test_load_with_multicall(self):
+        w3 = MagicMock()
+        w3.to_checksum_address = lambda x: x
+        multicall = MagicMock()
+        multicall.call_functions.return_value = (42, [
+            ([TOKEN_A, TOKEN_B], [(0, TOKEN_A, False), (0, TOKEN_B, False)], [1, 2], [1, 2]),
+            [1000 * ONE, 250 * ONE],
+            ([1, 1], [ONE, ONE]),
+            FEE,
+            [ONE // 2, ONE // 2],
+            None,  # Weighted pools have no amplification parameter
+        ])
+
+        state = BalancerPoolState.load(w3, TOKEN_A, multicall=multicall)
+
+        self.assertEqual(multicall.call_functions.call_count, 1)
+        self.assertEqual(state.block_number, 42)
+        self.assertTrue(state.is_weighted)
+        self.assertEqual(state.quote_exact_in(TOKEN_A, TOKEN_B, 10 * ONE), make_weighted().quote_exact_in(TOKEN_A, TOKEN_B, 10 * ONE))
+
+    def test_load_rejects_unknown_pool_type(self):
+        w3 = MagicMock()
+        w3.to_checksum_address = lambda x: x
+        multicall = MagicMock()
+        multicall.call_functions.return_value = (42, [
+            ([TOKEN_A, TOKEN_B], [], [1, 2], [1, 2]), [ONE, ONE], ([1, 1], [ONE, ONE]), FEE, None, None
+        ])
+
+        with self.assertRaises(ValueError):
+            BalancerPoolState.load(w3, TOKEN_A, multicall=multicall)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for the batch transaction analyzer.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from futarchy.experimental.core.batch_analyzer import BatchAnalyzer, find_transactions, rpc_batch, totals
+from futarchy.experimental.core.transaction import SPLIT_TOPIC, SWAP_TOPIC, TRANSFER_TOPIC
+
+ACCOUNT = "0x00000000000000000000000000000000000000c1"
+POOL = "0x6e33153115ab58dab0e0f1e3a2ccda6e67fa5cd7"
+GNO_NO = "0xf1b3e5ffc0219a4f8c0ac69ec98c97709edfb6c9"
+SDAI_NO = "0xe1133ef862f3441880adadc2096ab67c63f6e102"
+
+
+def word(value):
+    return (value % (1 << 256)).to_bytes(32, "big").hex()
+
+
+def topic(value):
+    return "0x" + word(int(value, 16) if isinstance(value, str) else value)
+
+
+def log(address, index, topics, data):
+    return {"address": address, "topics": topics, "data": "0x" + "".join(word(v) for v in data), "logIndex": hex(index)}
+
+
+def receipt(logs, status=1):
+    return {"status": hex(status), "gasUsed": hex(100000), "effectiveGasPrice": hex(10**9), "blockNumber": hex(7), "logs": logs}
+
+
+def make_node(transactions):
+    """Fake JSON-RPC endpoint answering batches of tx/receipt lookups."""
+    def post(url, json, timeout):
+        replies = []
+        for request in json:
+            tx = transactions.get(request["params"][0])
+            result = None if tx is None else tx[0] if request["method"] == "eth_getTransactionByHash" else tx[1]
+            replies.append({"jsonrpc": "2.0", "id": request["id"], "result": result})
+        response = MagicMock()
+        response.json.return_value = replies[::-1]
+        return response
+    return post
+
+
+class TestBatchAnalyzer(unittest.TestCase):
+    """Test cases for BatchAnalyzer."""
+
+    def setUp(self):
+        swap_logs = [
+            log(GNO_NO, 0, [TRANSFER_TOPIC, topic(ACCOUNT), topic(POOL)], [10**18]),
+            log(SDAI_NO, 1, [TRANSFER_TOPIC, topic(POOL), topic(ACCOUNT)], [95 * 10**18]),
+            log(POOL, 2, [SWAP_TOPIC, topic(ACCOUNT), topic(ACCOUNT)], [-95 * 10**18, 10**18, 2**96, 10**20, -120]),
+        ]
+        split_logs = [log("0xceafdd6bc0bef976fdcd1112955828e00543c0ce", 0,
+                          [SPLIT_TOPIC, topic(ACCOUNT), topic(0), topic(9)],
+                          [int(SDAI_NO, 16), 0x60, 5 * 10**17, 2, 1, 2])]
+        self.transactions = {
+            "0x01": ({"from": ACCOUNT, "to": POOL, "gasPrice": hex(10**9)}, receipt(swap_logs)),
+            "0x02": ({"from": ACCOUNT, "to": None, "gasPrice": hex(10**9)}, receipt(split_logs, status=0)),
+        }
+        self.w3 = MagicMock()
+        self.w3.provider.endpoint_uri = "http://node"
+        self.pool = MagicMock()
+        self.pool.session.post.side_effect = make_node(self.transactions)
+        patcher = patch("futarchy.experimental.core.batch_analyzer.get_http_pool", return_value=self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_analyze_decodes_all_tables_in_one_batch(self):
+        tables = BatchAnalyzer(self.w3).analyze(["0x01", "0x02", "0x03"])
+
+        self.assertEqual(self.pool.session.post.call_count, 1)
+        self.assertEqual(tables["transactions"]["tx_hash"], ["0x01", "0x02"])
+        self.assertEqual(tables["transactions"]["fee"], [10**14, 10**14])
+        self.assertEqual(tables["transfers"]["name"], ["GNO-NO", "sDAI-NO"])
+        self.assertEqual((tables["swaps"]["amount0"], tables["swaps"]["tick"]), ([-95 * 10**18], [-120]))
+        self.assertEqual((tables["splits"]["kind"], tables["splits"]["amount"]), (["split"], [5 * 10**17]))
+        self.assertEqual(dict(zip(tables["deltas"]["name"], tables["deltas"]["delta"])),
+                         {"GNO-NO": -10**18, "sDAI-NO": 95 * 10**18})
+        self.assertEqual(totals(tables)["failed"], 1)
+
+    def test_batches_are_split_and_fall_back_to_single_calls(self):
+        calls = [("eth_getTransactionReceipt", [h]) for h in ("0x01", "0x02", "0x01")]
+        self.assertEqual(len(rpc_batch(self.w3, calls, batch_size=2)), 3)
+        self.assertEqual(self.pool.session.post.call_count, 2)
+
+        self.pool.session.post.side_effect = ConnectionError("batch rejected")
+        self.w3.provider.make_request.return_value = {"result": "ok"}
+        self.assertEqual(rpc_batch(self.w3, calls), ["ok", "ok", "ok"])
+
+    def test_find_transactions_orders_unique_hashes(self):
+        self.w3.eth.get_logs.side_effect = lambda query: [
+            {"transactionHash": bytes.fromhex("02" * 32), "blockNumber": 9, "transactionIndex": 0},
+            {"transactionHash": bytes.fromhex("01" * 32), "blockNumber": 8, "transactionIndex": 3},
+        ]
+        hashes = find_transactions(self.w3, ACCOUNT, 0, 100)
+        self.assertEqual(hashes, ["0x" + "01" * 32, "0x" + "02" * 32])
+
+    @patch("futarchy.experimental.core.batch_analyzer.time.sleep")
+    def test_find_transactions_retries_rate_limits_without_shrinking(self, sleep):
+        self.w3.eth.get_logs.side_effect = [ValueError("429 Too Many Requests"), [], []]
+
+        self.assertEqual(find_transactions(self.w3, ACCOUNT, 0, 100), [])
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual([call[0][0]["toBlock"] for call in self.w3.eth.get_logs.call_args_list], [100, 100, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+Tests for the new-block stream and block-driven monitoring.
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, PropertyMock, patch
+from futarchy.experimental.core.block_stream import BlockStream
+from futarchy.experimental.strategies.monitoring import simple_monitoring_strategy
+
+
+def polling_w3(numbers):
+    w3 = MagicMock()
+    type(w3.eth).block_number = PropertyMock(side_effect=numbers)
+    return w3
+
+
+def head(number):
+    return json.dumps({"jsonrpc": "2.0", "method": "eth_subscription",
+                       "params": {"subscription": "0x1", "result": {"number": hex(number)}}})
+
+
+class FakeSocket:
+    """Sync websocket returning queued messages; exceptions in the queue are raised."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.sent = []
+        self.closed = False
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def recv(self, timeout=None):
+        message = self.messages.pop(0)
+        if isinstance(message, BaseException):
+            raise message
+        return message
+
+    def close(self):
+        self.closed = True
+
+
+class TestBlockStream(unittest.TestCase):
+    """Test cases for BlockStream."""
+
+    def test_polling_yields_each_new_block_once(self):
+        stream = BlockStream(polling_w3([10, 10, 11, 11, 11, 14]), use_websocket=False, poll_interval=0, block_time=0)
+
+        self.assertEqual(list(stream.blocks(limit=3)), [10, 11, 14])
+        self.assertEqual(stream.mode, "polling")
+        self.assertEqual(stream.skipped, 2)
+
+    def test_websocket_coalesces_heads_and_falls_back_to_polling(self):
+        socket = FakeSocket([
+            json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0x1"}),
+            head(5), TimeoutError(),
+            head(6), head(7), TimeoutError(),
+            ConnectionError("closed"),
+        ])
+        stream = BlockStream(polling_w3([7, 8]), ws_url="ws://localhost:8546", poll_interval=0, block_time=0)
+
+        with patch("websockets.sync.client.connect", return_value=socket):
+            blocks = list(stream.blocks(limit=3))
+
+        self.assertEqual(socket.sent[0]["params"], ["newHeads"])
+        self.assertEqual(blocks, [5, 7, 8])
+        self.assertEqual(stream.skipped, 1)
+        self.assertEqual(stream.mode, "polling")
+        self.assertTrue(socket.closed)
+
+
+class TestBlockDrivenMonitoring(unittest.TestCase):
+    """Test cases for simple_monitoring_strategy following new blocks."""
+
+    def test_reads_once_per_block_at_that_block(self):
+        bot = MagicMock()
+        bot.get_market_prices.return_value = {"probability": 0.5, "yes_price": 1.0, "no_price": 1.0}
+        stream = MagicMock(skipped=0, mode="websocket")
+        stream.blocks.return_value = iter([100, 101])
+
+        simple_monitoring_strategy(bot, iterations=2, stream=stream)
+
+        stream.blocks.assert_called_once_with(limit=2)
+        snapshot_blocks = [call[0][0] for call in bot.get_market_snapshot.call_args_list[1:]]
+        self.assertEqual(snapshot_blocks, [100, 101])
+        balance_blocks = [call[1].get("block_identifier") for call in bot.get_balances.call_args_list[1:]]
+        self.assertEqual(balance_blocks, [100, 101])
+
+
+if __name__ == '__main__':
+    unittest.main()
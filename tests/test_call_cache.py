@@ -0,0 +1,91 @@
+"""
+Tests for the per-block eth_call cache middleware.
+"""
+
+import unittest
+from futarchy.experimental.utils.call_cache import BlockCallCache
+
+CALL = {"to": "0x9a14d28909f42823ee29847f87a15fb3b6e8aed3", "data": "0x3850c7bd"}
+
+
+class FakeNode:
+    """Minimal make_request stand-in that counts requests per method."""
+
+    def __init__(self):
+        self.block = 100
+        self.requests = []
+
+    def __call__(self, method, params):
+        self.requests.append(method)
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(self.block)}
+        if method == "eth_call":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(self.block)}
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x0"}
+
+    def count(self, method):
+        return self.requests.count(method)
+
+
+class TestBlockCallCache(unittest.TestCase):
+    """Test cases for BlockCallCache."""
+
+    def setUp(self):
+        self.node = FakeNode()
+        # Re-check the head on every call so tests are not timing dependent
+        self.cache = BlockCallCache(block_poll_interval=-1)
+        self.make_request = self.cache.wrap_make_request(self.node)
+
+    def test_hits_within_block(self):
+        first = self.make_request("eth_call", [CALL, "latest"])
+        second = self.make_request("eth_call", [CALL, "latest"])
+
+        self.assertEqual(first["result"], second["result"])
+        self.assertEqual(self.node.count("eth_call"), 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_invalidates_on_new_block(self):
+        self.make_request("eth_call", [CALL, "latest"])
+        self.node.block = 101
+        response = self.make_request("eth_call", [CALL, "latest"])
+
+        self.assertEqual(response["result"], hex(101))
+        self.assertEqual(self.node.count("eth_call"), 2)
+        self.assertEqual(self.cache.invalidations, 1)
+
+    def test_pinned_block_survives_new_block(self):
+        self.make_request("eth_call", [CALL, hex(90)])
+        self.node.block = 101
+        self.make_request("eth_call", [CALL, hex(90)])
+
+        self.assertEqual(self.node.count("eth_call"), 1)
+        self.assertEqual(self.node.count("eth_blockNumber"), 0)
+
+    def test_pending_and_errors_not_cached(self):
+        self.make_request("eth_call", [CALL, "pending"])
+        self.make_request("eth_call", [CALL, "pending"])
+        self.assertEqual(self.node.count("eth_call"), 2)
+
+        failing = self.cache.wrap_make_request(lambda method, params: {"error": {"code": -32000}} if method == "eth_call" else {"result": "0x1"})
+        failing("eth_call", [CALL, "latest"])
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_lagging_tags_are_not_served_head_results(self):
+        self.make_request("eth_call", [CALL, "latest"])
+        self.make_request("eth_call", [CALL, "finalized"])
+        self.make_request("eth_call", [CALL, "safe"])
+
+        self.assertEqual(self.node.count("eth_call"), 3)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_send_transaction_clears_head_entries(self):
+        self.make_request("eth_call", [CALL, "latest"])
+        self.make_request("eth_sendRawTransaction", ["0x00"])
+        self.make_request("eth_call", [CALL, "latest"])
+
+        self.assertEqual(self.node.count("eth_call"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""
+Tests for the bot daemon and its control servers.
+"""
+
+import http.client
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from futarchy.experimental.cli.daemon import (
+    BotDaemon, DaemonUnavailable, create_token, make_http_server, make_unix_server, send_request
+)
+
+
+def make_daemon():
+    bot = MagicMock()
+    bot.address = "0x0000000000000000000000000000000000000001"
+    bot.get_market_prices.return_value = {"probability": 0.6}
+    bot.w3.provider = MagicMock(spec=[])
+    bot.w3.call_cache = None
+    runs = []
+
+    def run_command(argv):
+        runs.append(argv)
+        if argv[0] == "fail":
+            print("❌ Amount is required for this command", file=sys.stderr)
+            sys.exit(1)
+        if argv[0] == "crash":
+            raise RuntimeError("boom")
+        print(f"ran {' '.join(argv)}")
+
+    daemon = BotDaemon(bot, run_command, follow_blocks=False)
+    daemon.runs = runs
+    return daemon
+
+
+class TestBotDaemon(unittest.TestCase):
+    """Test cases for command execution."""
+
+    def test_captures_output_and_exit_codes(self):
+        daemon = make_daemon()
+
+        self.assertEqual(daemon.execute(["balances"])["output"], "ran balances\n")
+        failed = daemon.execute(["fail"])
+        crashed = daemon.execute(["crash"])
+
+        self.assertFalse(failed["ok"])
+        self.assertIn("Amount is required", failed["output"])
+        self.assertFalse(crashed["ok"])
+        self.assertIn("boom", crashed["output"])
+        self.assertEqual((daemon.commands, daemon.errors), (3, 2))
+
+    def test_output_of_other_threads_is_not_captured(self):
+        daemon = make_daemon()
+        started, printed = threading.Event(), threading.Event()
+
+        def noisy():
+            started.wait()
+            print("follower noise")
+            printed.set()
+
+        def run_command(argv):
+            started.set()
+            printed.wait(5)
+            print("command output")
+
+        daemon.run_command = run_command
+        thread = threading.Thread(target=noisy)
+        thread.start()
+        stdout = sys.stdout
+        result = daemon.execute(["balances"])
+        thread.join()
+
+        self.assertEqual(result["output"], "command output\n")
+        self.assertIs(sys.stdout, stdout)
+
+    def test_rejects_terminal_commands(self):
+        daemon = make_daemon()
+
+        self.assertFalse(daemon.handle({"argv": ["interactive"]})["ok"])
+        self.assertFalse(daemon.handle({})["ok"])
+        self.assertEqual(daemon.runs, [])
+
+    def test_queries(self):
+        daemon = make_daemon()
+
+        self.assertEqual(daemon.handle({"query": "prices"})["result"], {"probability": 0.6})
+        self.assertEqual(daemon.handle({"query": "status"})["result"]["address"], daemon.bot.address)
+
+
+class TestControlServers(unittest.TestCase):
+    """Test cases for the HTTP and Unix socket transports."""
+
+    def serve(self, server):
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+    def setUp(self):
+        self.token_file = os.path.join(tempfile.mkdtemp(), "daemon.token")
+        patcher = patch.dict(os.environ, {"FUTARCHY_DAEMON_TOKEN_FILE": self.token_file})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, server, headers, body=b'{"argv": ["balances"]}'):
+        connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        connection.request("POST", "/command", body=body, headers=headers)
+        response = connection.getresponse()
+        status, reply = response.status, json.loads(response.read())
+        connection.close()
+        return status, reply
+
+    def test_http_round_trip(self):
+        daemon = make_daemon()
+        server = make_http_server(daemon, port=0)
+        self.serve(server)
+        address = f"http://127.0.0.1:{server.server_address[1]}"
+        self.assertEqual(stat.S_IMODE(os.stat(self.token_file).st_mode), 0o600)
+
+        response = send_request(address, {"argv": ["swap_gno_yes", "0.1"]}, timeout=5)
+
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["output"], "ran swap_gno_yes 0.1\n")
+        self.assertEqual(send_request(address, {"query": "prices"}, timeout=5)["result"], {"probability": 0.6})
+
+    def test_http_rejects_unauthenticated_and_cross_origin_requests(self):
+        daemon = make_daemon()
+        server = make_http_server(daemon, port=0)
+        self.serve(server)
+        token = create_token()
+        json_headers = {"Content-Type": "application/json"}
+
+        self.assertEqual(self.post(server, json_headers)[0], 401)
+        self.assertEqual(self.post(server, dict(json_headers, **{"X-Futarchy-Token": "wrong"}))[0], 401)
+        self.assertEqual(self.post(server, dict(json_headers, **{"X-Futarchy-Token": token, "Origin": "http://evil"}))[0], 403)
+        self.assertEqual(self.post(server, {"Content-Type": "text/plain", "X-Futarchy-Token": token})[0], 415)
+        self.assertEqual(daemon.runs, [])
+        self.assertEqual(self.post(server, dict(json_headers, **{"X-Futarchy-Token": token}))[0], 200)
+
+    def test_unreachable_daemon_is_reported_before_sending(self):
+        with self.assertRaises(DaemonUnavailable):
+            send_request(os.path.join(tempfile.mkdtemp(), "missing.sock"), {"argv": ["balances"]}, timeout=5)
+        server = make_http_server(make_daemon(), port=0)
+        port = server.server_address[1]
+        server.server_close()
+        with self.assertRaises(DaemonUnavailable):
+            send_request(f"http://127.0.0.1:{port}", {"argv": ["balances"]}, timeout=5)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Unix sockets required")
+    def test_unix_socket_round_trip(self):
+        daemon = make_daemon()
+        path = os.path.join(tempfile.mkdtemp(), "futarchy.sock")
+        server = make_unix_server(daemon, path)
+        self.serve(server)
+
+        response = send_request(path, {"argv": ["balances"]}, timeout=5)
+
+        self.assertTrue(response["ok"])
+        self.assertEqual(daemon.runs, [["balances"]])
+
+
+if __name__ == '__main__':
+    unittest.main()
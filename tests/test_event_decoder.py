@@ -0,0 +1,109 @@
+"""
+Tests for the precompiled event decoder.
+"""
+
+import unittest
+from eth_abi import encode
+from hexbytes import HexBytes
+from futarchy.experimental.core.transaction import SPLIT_TOPIC, SWAP_TOPIC, TRANSFER_TOPIC, process_log
+from futarchy.experimental.utils import event_decoder
+from futarchy.experimental.utils.event_decoder import EventDecoder, to_arrays, to_columns
+
+SDAI_NO = "0xE1133Ef862f3441880adADC2096AB67c63f6E102"
+POOL = "0x6E33153115Ab58dab0e0F1E3a2ccda6e67FA5cD7"
+ACCOUNT = "0x00000000000000000000000000000000000000c1"
+
+
+def word(value):
+    return (value % (1 << 256)).to_bytes(32, "big")
+
+
+def topic(address):
+    return word(int(address, 16))
+
+
+def as_json(log):
+    """The same log as raw JSON-RPC returns it."""
+    return {
+        "address": log["address"].lower(), "topics": ["0x" + bytes(t).hex() for t in log["topics"]],
+        "data": "0x" + bytes(log["data"]).hex(), "blockNumber": hex(log["blockNumber"]), "logIndex": hex(log["logIndex"]),
+    }
+
+
+class TestEventDecoder(unittest.TestCase):
+    """Test cases for EventDecoder."""
+
+    def setUp(self):
+        self.decoder = EventDecoder()
+        self.transfer = {
+            "address": SDAI_NO, "topics": [HexBytes(TRANSFER_TOPIC), HexBytes(topic(ACCOUNT)), HexBytes(topic(POOL))],
+            "data": HexBytes(word(3 * 10**18)), "blockNumber": 5, "logIndex": 0, "transactionHash": HexBytes(word(1)),
+        }
+        self.swap = {
+            "address": POOL, "topics": [HexBytes(SWAP_TOPIC), HexBytes(topic(ACCOUNT)), HexBytes(topic(ACCOUNT))],
+            "data": HexBytes(word(-5) + word(4) + word(2**96) + word(10**20) + word(-887272)),
+            "blockNumber": 5, "logIndex": 1, "transactionHash": HexBytes(word(1)),
+        }
+
+    def test_matches_process_log(self):
+        transfer, swap = self.decoder.decode_many([self.transfer, self.swap])
+        expected = process_log(self.swap)
+
+        self.assertEqual((transfer.event, transfer.from_, transfer.to, transfer.value),
+                         ("Transfer", ACCOUNT, POOL.lower(), 3 * 10**18))
+        self.assertEqual((transfer.contract, self.decoder.scaled(transfer, "value")), ("sDAI-NO", 3.0))
+        self.assertEqual(
+            (swap.amount0, swap.amount1, swap.sqrtPriceX96, swap.liquidity, swap.tick),
+            (expected["amount0"], expected["amount1"], expected["sqrtPriceX96"], expected["liquidity"], expected["tick"])
+        )
+
+    def test_hex_input_decodes_the_same(self):
+        for log in (self.transfer, self.swap):
+            self.assertEqual(self.decoder.decode(as_json(log)).as_dict(),
+                             dict(self.decoder.decode(log).as_dict(), transaction_hash=None))
+
+    def test_dynamic_fields_and_rejects(self):
+        split = {
+            "address": "0xceafdd6bc0bef976fdcd1112955828e00543c0ce",
+            "topics": [SPLIT_TOPIC, "0x" + topic(ACCOUNT).hex(), "0x" + word(0).hex(), "0x" + word(9).hex()],
+            "data": "0x" + encode(["address", "uint256[]", "uint256"], [SDAI_NO, [1, 2], 10**18]).hex(),
+            "blockNumber": "0x7", "logIndex": "0x0",
+        }
+        record = self.decoder.decode(split)
+        self.assertEqual((record.event, record.partition, record.amount, record.conditionId),
+                         ("PositionSplit", [1, 2], 10**18, word(9)))
+        self.assertEqual(record.collateralToken, SDAI_NO.lower())
+
+        nft = dict(self.transfer, topics=self.transfer["topics"] + [HexBytes(word(7))], data=HexBytes(b""))
+        unknown = dict(self.transfer, topics=[HexBytes(word(1))])
+        self.assertEqual(self.decoder.decode_many([nft, unknown, dict(self.transfer, topics=[])]), [])
+
+    def test_types_without_fixed_layout_fall_back_to_eth_abi(self):
+        event = {"type": "event", "name": "Moved", "anonymous": False, "inputs": [
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "amounts", "type": "uint256[2]"},
+            {"indexed": False, "name": "note", "type": "string"},
+        ]}
+        decoder = EventDecoder(abi_names=(), event_abis=[event])
+        layout = decoder.layout("Moved")
+        self.assertEqual(layout.data_types, ["uint256[2]", "string"])
+        log = {"address": POOL, "topics": [layout.topic, topic(ACCOUNT)], "data": encode(["uint256[2]", "string"], [(1, 2), "hi"])}
+
+        record = decoder.decode(log)
+
+        self.assertEqual((record.to, record.amounts, record.note), (ACCOUNT, (1, 2), "hi"))
+
+    def test_columns(self):
+        records = self.decoder.decode_many([self.transfer, self.swap, self.transfer])
+        columns = to_columns(records)
+
+        self.assertEqual(columns["Transfer"]["value"], [3 * 10**18] * 2)
+        self.assertEqual(columns["Swap"]["tick"], [-887272])
+        if event_decoder.np is None:
+            self.assertEqual(to_arrays(records, self.decoder), columns)
+        else:
+            self.assertEqual(list(to_arrays(records, self.decoder)["Swap"]["tick"]), [-887272])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the shared HTTP pool.
+"""
+
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.http_pool import HttpPool, PooledHTTPProvider
+
+
+def rpc_response(result):
+    response = MagicMock()
+    response.content = json.dumps({"jsonrpc": "2.0", "id": 0, "result": result}).encode()
+    return response
+
+
+class TestHttpPool(unittest.TestCase):
+    """Test cases for HttpPool and PooledHTTPProvider."""
+
+    def test_adapter_limits(self):
+        pool = HttpPool(timeout=3, pool_hosts=4, pool_maxsize=8, http2=False)
+        adapter = pool.session.get_adapter("https://api.cow.fi")
+
+        self.assertIs(adapter, pool.session.get_adapter("http://localhost:8545"))
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 8)
+        self.assertEqual(adapter.max_retries.read, 0)
+
+    def test_request_uses_default_timeout(self):
+        pool = HttpPool(timeout=3, http2=False)
+        pool._session = MagicMock()
+
+        pool.post("https://api.cow.fi/xdai/api/v1/quote", json={"kind": "sell"})
+        pool.get("https://api.cow.fi/xdai/api/v1/orders/0x01", timeout=1)
+
+        self.assertEqual(pool._session.request.call_args_list[0][1]["timeout"], 3)
+        self.assertEqual(pool._session.request.call_args_list[1][1]["timeout"], 1)
+
+    def test_providers_share_one_session_across_threads(self):
+        pool = HttpPool(timeout=3, http2=False)
+        pool._session = MagicMock()
+        pool._session.post.return_value = rpc_response("0x64")
+        first = PooledHTTPProvider("https://rpc.gnosischain.com", pool=pool)
+        second = pool.provider("https://rpc.ankr.com/gnosis", request_kwargs={"timeout": 1})
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(first.make_request("eth_chainId", [])))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        second.make_request("eth_blockNumber", [])
+
+        self.assertEqual([response["result"] for response in results], ["0x64"] * 4)
+        self.assertEqual(pool._session.post.call_count, 5)
+        self.assertEqual(pool._session.post.call_args_list[0][1]["timeout"], 3)
+        self.assertEqual(pool._session.post.call_args_list[-1][0][0], "https://rpc.ankr.com/gnosis")
+        self.assertEqual(pool._session.post.call_args_list[-1][1]["timeout"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
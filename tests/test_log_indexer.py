@@ -0,0 +1,122 @@
+"""
+Tests for the historical log indexer.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+from futarchy.experimental.core.log_indexer import LogIndexer, is_range_error, is_transient_error
+from futarchy.experimental.core.transaction import SPLIT_TOPIC, SWAP_TOPIC, TRANSFER_TOPIC
+
+TOKEN = "0x00000000000000000000000000000000000000b0"
+POOL = "0x00000000000000000000000000000000000000a0"
+ALICE = "0x00000000000000000000000000000000000000c1"
+BOB = "0x00000000000000000000000000000000000000c2"
+MAX_RANGE = 300
+
+
+def word(value):
+    return (value % (1 << 256)).to_bytes(32, "big").hex()
+
+
+def log(address, block, index, topics, data):
+    return {
+        "address": address, "topics": topics, "data": "0x" + "".join(word(value) for value in data),
+        "blockNumber": block, "logIndex": index, "transactionHash": f"0x{block:064x}",
+    }
+
+
+def transfer(block, sender, recipient, value):
+    topics = [TRANSFER_TOPIC, "0x" + word(int(sender, 16)), "0x" + word(int(recipient, 16))]
+    return log(TOKEN, block, 0, topics, [value])
+
+
+def make_w3(logs):
+    """Node rejecting ranges wider than MAX_RANGE blocks."""
+    w3 = MagicMock()
+    w3.eth.block_number = 2000
+
+    def get_logs(query):
+        if query["toBlock"] - query["fromBlock"] + 1 > MAX_RANGE:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        return [entry for entry in logs if query["fromBlock"] <= entry["blockNumber"] <= query["toBlock"]]
+
+    w3.eth.get_logs.side_effect = get_logs
+    return w3
+
+
+class TestLogIndexer(unittest.TestCase):
+    """Test cases for LogIndexer."""
+
+    def setUp(self):
+        self.logs = [
+            transfer(10, ALICE, BOB, 5 * 10**18),
+            transfer(500, BOB, ALICE, 2 * 10**18),
+            log(POOL, 900, 1, [SWAP_TOPIC, "0x" + word(1), "0x" + word(int(BOB, 16))],
+                [-3, 4, 2**96, 10**18, -60]),
+            log("0xceafdd6bc0bef976fdcd1112955828e00543c0ce", 1500, 2,
+                [SPLIT_TOPIC, "0x" + word(int(ALICE, 16)), "0x" + word(0), "0x" + word(7)],
+                [int(TOKEN, 16), 0x60, 10**18, 2, 1, 2]),
+        ]
+        self.w3 = make_w3(self.logs)
+        self.sources = [{"address": [TOKEN, POOL], "topics": [[TRANSFER_TOPIC, SWAP_TOPIC]]}]
+        self.indexer = LogIndexer(self.w3, db_path=":memory:", sources=self.sources, chunk_size=1000, workers=3)
+
+    def tearDown(self):
+        self.indexer.close()
+
+    def test_backfill_splits_ranges_and_stores_decoded_logs(self):
+        result = self.indexer.backfill(0, 1999, progress=False)
+
+        self.assertEqual(result["logs"], 4)
+        self.assertGreater(result["splits"], 0)
+        self.assertLessEqual(self.indexer.chunk_size, MAX_RANGE * 2)
+        self.assertEqual(self.indexer.indexed_to(), 1999)
+        self.assertEqual(self.indexer.token_flows(ALICE), {TOKEN: -3 * 10**18})
+        swap = self.indexer.swaps(POOL)[0]
+        self.assertEqual((swap["amount0"], swap["tick"], swap["recipient"]), ("-3", -60, BOB))
+        kind, amount = self.indexer.db.execute("SELECT kind, amount FROM splits").fetchone()
+        self.assertEqual((kind, amount), ("split", str(10**18)))
+
+    def test_backfill_resumes_after_last_indexed_block(self):
+        self.indexer.backfill(0, 599, progress=False)
+        self.w3.eth.get_logs.reset_mock()
+
+        result = self.indexer.backfill(to_block=1200, progress=False)
+
+        self.assertEqual(result["from_block"], 600)
+        self.assertEqual(self.indexer.indexed_to(), 1200)
+        first_blocks = [call[0][0]["fromBlock"] for call in self.w3.eth.get_logs.call_args_list]
+        self.assertEqual(min(first_blocks), 600)
+        # Reindexing a range replaces rows instead of duplicating them
+        self.indexer.backfill(0, 1200, progress=False)
+        self.assertEqual(self.indexer.db.execute("SELECT COUNT(*) FROM transfers").fetchone()[0], 2)
+
+    @patch("futarchy.experimental.core.log_indexer.time.sleep")
+    def test_other_errors_are_retried(self, sleep):
+        self.w3.eth.get_logs.side_effect = [ConnectionError("reset by peer"), []]
+        self.indexer.retries = 2
+        self.indexer.backfill(0, 99, progress=False)
+        self.assertEqual(self.w3.eth.get_logs.call_count, 2)
+
+    @patch("futarchy.experimental.core.log_indexer.time.sleep")
+    def test_rate_limits_back_off_without_splitting(self, sleep):
+        rate_limited = ValueError({"code": -32005, "message": "Too many requests, exceeded rate limit"})
+        self.w3.eth.get_logs.side_effect = [rate_limited, rate_limited, []]
+
+        result = self.indexer.backfill(0, 99, progress=False)
+
+        self.assertEqual(result["splits"], 0)
+        self.assertEqual(self.w3.eth.get_logs.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_error_classification(self):
+        self.assertTrue(is_range_error(ValueError("query returned more than 10000 results")))
+        self.assertTrue(is_range_error(ValueError("exceed maximum block range: 5000")))
+        for error in (ValueError("daily request limit exceeded, too many requests"), TimeoutError("read timed out"),
+                      ValueError({"code": 429, "message": "rate limit"})):
+            self.assertFalse(is_range_error(error))
+            self.assertTrue(is_transient_error(error))
+
+
+if __name__ == '__main__':
+    unittest.main()
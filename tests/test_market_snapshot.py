@@ -0,0 +1,61 @@
+"""
+Tests for MarketSnapshot price derivation.
+"""
+
+import unittest
+from futarchy.experimental.core.market_snapshot import MarketSnapshot, ONE_TOKEN
+from futarchy.experimental.config.constants import TOKEN_CONFIG
+
+Q96 = 2**96
+
+
+def pool(price, token0):
+    """Pool state with token1/token0 price `price` and the given token0."""
+    return {"sqrt_price_x96": int((price ** 0.5) * Q96), "tick": 0, "token0": token0.lower()}
+
+
+class TestMarketSnapshot(unittest.TestCase):
+    """Test cases for MarketSnapshot.to_prices."""
+
+    def setUp(self):
+        self.pools = {
+            # GNO-YES is token0, priced at 120 sDAI-YES
+            "yes": pool(120.0, TOKEN_CONFIG["company"]["yes_address"]),
+            # sDAI-NO is token0, GNO-NO priced at 80 sDAI-NO
+            "no": pool(1 / 80.0, TOKEN_CONFIG["currency"]["no_address"]),
+            # sDAI-YES is token0, worth 0.6 sDAI
+            "sdai_yes": pool(0.6, TOKEN_CONFIG["currency"]["yes_address"]),
+        }
+
+    def test_prices(self):
+        snapshot = MarketSnapshot(123, self.pools, 110 * ONE_TOKEN, ONE_TOKEN, 12 * ONE_TOKEN // 10)
+        prices = snapshot.to_prices()
+
+        self.assertEqual(prices["block_number"], 123)
+        self.assertAlmostEqual(prices["yes_price"], 120.0, places=6)
+        self.assertAlmostEqual(prices["no_price"], 80.0, places=6)
+        self.assertAlmostEqual(prices["probability"], 0.6, places=6)
+        self.assertAlmostEqual(prices["synthetic_price"], 120 * 0.6 + 80 * 0.4, places=4)
+        self.assertAlmostEqual(prices["wagno_price"], 110.0)
+        self.assertAlmostEqual(prices["gno_price"], 110.0)
+        self.assertAlmostEqual(prices["sdai_rate"], 1.2)
+
+    def test_fallbacks(self):
+        self.pools["sdai_yes"]["sqrt_price_x96"] = None
+        snapshot = MarketSnapshot(1, self.pools, None, None, None)
+
+        self.assertIsNone(snapshot.wagno_price())
+        prices = snapshot.to_prices(wagno_price=105.0)
+        self.assertEqual(prices["probability"], 0.5)
+        self.assertEqual(prices["wagno_gno_ratio"], 1.0)
+        self.assertEqual(prices["gno_price"], 105.0)
+
+    def test_probability_capped(self):
+        self.pools["sdai_yes"] = pool(1.2, TOKEN_CONFIG["currency"]["yes_address"])
+        prices = MarketSnapshot(1, self.pools, ONE_TOKEN, ONE_TOKEN, None).to_prices()
+        self.assertEqual(prices["probability"], 1.0)
+        self.assertAlmostEqual(prices["raw_probability"], 1.2, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests for the persistent metadata cache.
+"""
+
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.metadata_cache import MetadataCache
+
+POOL = "0x9a14d28909f42823ee29847f87a15fb3b6e8aed3"
+TOKEN = "0x177304d505eCA60E1aE0dAF1bba4A4c4181dB8Ad"
+
+
+class TestMetadataCache(unittest.TestCase):
+    """Test cases for MetadataCache."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "nested", "metadata.json")
+
+        self.w3 = MagicMock()
+        self.w3.to_checksum_address = lambda x: x
+        self.contract = MagicMock()
+        self.contract.functions.token0.return_value.call.return_value = TOKEN
+        self.contract.functions.symbol.return_value.call.return_value = "GNO-YES"
+        self.w3.eth.contract.return_value = self.contract
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_fetches_once_and_persists(self):
+        cache = MetadataCache(self.w3, self.path)
+
+        self.assertEqual(cache.token0(POOL), TOKEN.lower())
+        self.assertEqual(cache.token0(POOL), TOKEN.lower())
+        self.assertEqual(self.contract.functions.token0.return_value.call.call_count, 1)
+
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved["100"][POOL]["token0"], TOKEN.lower())
+
+    def test_loads_from_disk(self):
+        MetadataCache(self.w3, self.path).symbol(TOKEN)
+
+        fresh_w3 = MagicMock()
+        cache = MetadataCache(fresh_w3, self.path)
+        self.assertEqual(cache.symbol(TOKEN), "GNO-YES")
+        fresh_w3.eth.contract.assert_not_called()
+
+    def test_warm_pools_with_multicall(self):
+        multicall = MagicMock()
+        multicall.call_functions.return_value = (1, [TOKEN, TOKEN, 3000, None])
+
+        cache = MetadataCache(self.w3, self.path)
+        cache.warm_pools([POOL], multicall)
+
+        self.assertEqual(cache.peek(POOL, "token0"), TOKEN.lower())
+        self.assertEqual(cache.peek(POOL, "fee"), 3000)
+        self.assertIsNone(cache.peek(POOL, "tickSpacing"))
+
+    def test_corrupt_file_starts_empty(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        cache = MetadataCache(self.w3, self.path)
+        self.assertIsNone(cache.peek(POOL, "token0"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests for the Multicall3 batching helpers.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from eth_abi import encode
+from web3 import Web3
+from futarchy.experimental.utils.multicall import (
+    Multicall,
+    encode_balance_of,
+    decode_uint256,
+    GET_BLOCK_NUMBER_SELECTOR
+)
+
+OWNER_A = "0x1111111111111111111111111111111111111111"
+OWNER_B = "0x2222222222222222222222222222222222222222"
+TOKEN_X = "0xaf204776c7245bF4147c2612BF6e5972Ee483701"
+TOKEN_Y = "0x9C58BAcC331c9aa871AFD802DB6379a98e80CEdb"
+
+
+def uint(value):
+    return encode(["uint256"], [value])
+
+
+class TestMulticallEncoding(unittest.TestCase):
+    """Test calldata helpers."""
+
+    def test_encode_balance_of(self):
+        data = encode_balance_of(OWNER_A)
+        self.assertEqual(data[:4].hex(), "70a08231")
+        self.assertEqual(len(data), 36)
+        self.assertEqual(data[-20:], bytes.fromhex(OWNER_A[2:]))
+
+    def test_decode_uint256(self):
+        self.assertEqual(decode_uint256(uint(12345)), 12345)
+        self.assertIsNone(decode_uint256(b""))
+
+
+class TestMulticallBalances(unittest.TestCase):
+    """Test batched balance reads against a mocked aggregate3."""
+
+    def setUp(self):
+        self.w3 = MagicMock()
+        self.multicall = Multicall(self.w3)
+        self.aggregate3 = self.multicall.contract.functions.aggregate3
+
+    def test_get_token_balances(self):
+        self.aggregate3.return_value.call.return_value = [
+            (True, uint(1)),
+            (True, uint(2)),
+            (False, b""),
+            (True, uint(4)),
+            (True, uint(999)),
+        ]
+
+        block, balances = self.multicall.get_token_balances(
+            [TOKEN_X, TOKEN_Y], [OWNER_A, OWNER_B], block_identifier=999
+        )
+
+        self.assertEqual(block, 999)
+        self.assertEqual(balances[OWNER_A], {TOKEN_X: 1, TOKEN_Y: 2})
+        self.assertEqual(balances[OWNER_B], {TOKEN_X: None, TOKEN_Y: 4})
+
+        batch = self.aggregate3.call_args[0][0]
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch[0][0], Web3.to_checksum_address(TOKEN_X))
+        self.assertEqual(batch[-1][2], GET_BLOCK_NUMBER_SELECTOR)
+        self.aggregate3.return_value.call.assert_called_once_with(block_identifier=999)
+
+
+if __name__ == '__main__':
+    unittest.main()
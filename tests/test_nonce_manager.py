@@ -0,0 +1,120 @@
+"""
+Tests for the local nonce allocator.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from eth_account import Account
+from futarchy.experimental.utils.nonce_manager import NonceManager, decode_raw_transaction, is_nonce_error
+
+ACCOUNT = Account.from_key("0x" + "11" * 32)
+RECIPIENT = Account.from_key("0x" + "22" * 32).address
+
+
+def sign(nonce, dynamic_fee=True):
+    tx = {"to": RECIPIENT, "value": 0, "gas": 21000, "nonce": nonce, "chainId": 100}
+    if dynamic_fee:
+        tx.update({"maxFeePerGas": 2 * 10**9, "maxPriorityFeePerGas": 10**9})
+    else:
+        tx["gasPrice"] = 10**9
+    return "0x" + bytes(ACCOUNT.sign_transaction(tx).rawTransaction).hex()
+
+
+def make_node(chain_nonce=5):
+    """make_request mock that reports a pending count and accepts every transaction."""
+    def make_request(method, params):
+        if method == "eth_getTransactionCount":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(chain_nonce)}
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x" + "ab" * 32}
+    return MagicMock(side_effect=make_request)
+
+
+def count_calls(make_request, method):
+    return sum(1 for call in make_request.call_args_list if call[0][0] == method)
+
+
+class TestDecoding(unittest.TestCase):
+    """Test cases for raw transaction decoding."""
+
+    def test_decodes_typed_and_legacy_transactions(self):
+        self.assertEqual(decode_raw_transaction(sign(7)), (ACCOUNT.address, 7))
+        self.assertEqual(decode_raw_transaction(sign(300, dynamic_fee=False)), (ACCOUNT.address, 300))
+
+    def test_nonce_errors(self):
+        self.assertTrue(is_nonce_error({"code": -32000, "message": "Nonce too low"}))
+        self.assertTrue(is_nonce_error(ValueError("already known")))
+        self.assertFalse(is_nonce_error({"message": "execution reverted"}))
+
+
+class TestNonceManager(unittest.TestCase):
+    """Test cases for NonceManager used as middleware."""
+
+    def setUp(self):
+        self.manager = NonceManager()
+        self.node = make_node()
+        self.make_request = self.manager.wrap_make_request(self.node)
+
+    def transaction_count(self, block="pending", address=ACCOUNT.address):
+        return int(self.make_request("eth_getTransactionCount", [address, block])["result"], 16)
+
+    def test_back_to_back_transactions(self):
+        self.manager.track(ACCOUNT.address)
+        self.assertEqual(self.transaction_count(), 5)
+        self.make_request("eth_sendRawTransaction", [sign(5)])
+        # The next count is answered locally, before the node has mined anything
+        self.assertEqual(self.transaction_count(), 6)
+        self.make_request("eth_sendRawTransaction", [sign(6)])
+        self.assertEqual(self.transaction_count(), 7)
+
+        self.assertEqual(count_calls(self.node, "eth_getTransactionCount"), 1)
+        self.assertEqual(sorted(self.manager.pending(ACCOUNT.address)), [5, 6])
+
+    def test_latest_historical_and_other_accounts_go_to_the_node(self):
+        self.make_request("eth_sendRawTransaction", [sign(5)])
+        self.assertEqual(self.transaction_count("latest"), 5)
+        self.transaction_count(hex(100))
+        self.assertEqual(self.transaction_count(address=RECIPIENT), 5)
+        self.assertEqual(count_calls(self.node, "eth_getTransactionCount"), 3)
+        self.assertFalse(self.manager.tracks(RECIPIENT))
+        # Sending from an account tracks it
+        self.assertEqual(self.transaction_count(), 6)
+
+    def test_nonce_error_resyncs(self):
+        self.make_request("eth_sendRawTransaction", [sign(5)])
+        self.node.side_effect = lambda method, params: (
+            {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "nonce too low"}}
+            if method == "eth_sendRawTransaction" else {"jsonrpc": "2.0", "id": 1, "result": hex(9)}
+        )
+
+        self.make_request("eth_sendRawTransaction", [sign(6)])
+
+        # Someone else used the account; the chain count wins after the error
+        self.assertEqual(self.transaction_count(), 9)
+        self.assertEqual(self.manager.pending(ACCOUNT.address), {})
+
+    def test_allocate_and_release(self):
+        self.manager.w3 = MagicMock()
+        self.manager.w3.eth.get_transaction_count.return_value = 5
+
+        self.assertEqual(self.manager.allocate(ACCOUNT.address, 3), [5, 6, 7])
+        self.assertEqual(self.manager.get_nonce(ACCOUNT.address), 8)
+
+        # Only the last reservation can be handed back without leaving a gap
+        self.manager.release(ACCOUNT.address, 7)
+        self.assertEqual(self.manager.get_nonce(ACCOUNT.address), 7)
+        self.manager.release(ACCOUNT.address, 5)
+        self.assertEqual(self.manager.stats()["accounts"], {})
+
+    def test_failed_send_releases_reservation(self):
+        self.manager.w3 = MagicMock()
+        self.manager.w3.eth.get_transaction_count.return_value = 5
+        nonce = self.manager.allocate(ACCOUNT.address)[0]
+        self.node.side_effect = lambda method, params: {"jsonrpc": "2.0", "id": 1, "error": {"message": "execution reverted"}}
+
+        self.make_request("eth_sendRawTransaction", [sign(nonce)])
+
+        self.assertEqual(self.manager.get_nonce(ACCOUNT.address), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Tests for the pipelined transaction executor and the synthetic arbitrage plans.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from eth_account import Account
+from hexbytes import HexBytes
+from web3 import Web3
+from futarchy.experimental.core.pipeline import TransactionPipeline
+from futarchy.experimental.core.transaction import TRANSFER_TOPIC, get_token_delta
+from futarchy.experimental.utils.nonce_manager import NonceManager, decode_raw_transaction
+from futarchy.experimental.utils.allowance_ledger import AllowanceLedger
+from futarchy.experimental.strategies.pipelined_arbitrage import SyntheticArbitragePlanner
+from tests.test_arbitrage_solver import make_solver
+
+ACCOUNT = Account.from_key("0x" + "11" * 32)
+TOKEN = "0x00000000000000000000000000000000000000a0"
+TARGET = Account.from_key("0x" + "22" * 32).address
+
+
+def transfer_log(token, sender, recipient, value):
+    return {
+        "address": token,
+        "topics": [HexBytes(TRANSFER_TOPIC), HexBytes("0x" + sender[2:].rjust(64, "0")), HexBytes("0x" + recipient[2:].rjust(64, "0"))],
+        "data": HexBytes(value.to_bytes(32, "big")),
+    }
+
+
+class FakeChain:
+    """Records broadcasts and mines every sent transaction in the next block."""
+
+    def __init__(self, logs_for_nonce=None, reverted=()):
+        self.events = []
+        self.block = 100
+        self.logs_for_nonce = logs_for_nonce or {}
+        self.reverted = reverted
+        self.sent = {}
+        self.w3 = MagicMock()
+        self.w3.eth.gas_price = 10**9
+        self.w3.eth.chain_id = 100
+        self.w3.eth.get_transaction_count.return_value = 7
+        self.w3.eth.send_raw_transaction.side_effect = self.send
+        self.w3.eth.wait_for_transaction_receipt.side_effect = self.receipt
+
+    def send(self, raw):
+        _, nonce = decode_raw_transaction(raw)
+        tx_hash = HexBytes(nonce.to_bytes(32, "big"))
+        self.sent[tx_hash] = nonce
+        if self.events and self.events[-1][0] == "wait":
+            self.block += 1
+        self.events.append(("send", nonce))
+        return tx_hash
+
+    def receipt(self, tx_hash, **kwargs):
+        nonce = self.sent[tx_hash]
+        self.events.append(("wait", nonce))
+        return {
+            "status": 0 if nonce in self.reverted else 1, "blockNumber": self.block, "gasUsed": 21000,
+            "logs": self.logs_for_nonce.get(nonce, []),
+        }
+
+
+def call(outputs=None):
+    return {"to": TARGET, "data": "0x"}
+
+
+class TestTransactionPipeline(unittest.TestCase):
+    """Test cases for TransactionPipeline."""
+
+    def make_pipeline(self, chain):
+        return TransactionPipeline(chain.w3, ACCOUNT, NonceManager(chain.w3), poll_latency=0)
+
+    def test_waves_follow_data_dependencies(self):
+        pipeline = self.make_pipeline(FakeChain())
+        pipeline.add("approve", call)
+        pipeline.add("swap", call, after=["approve"])
+        pipeline.add("unwrap", call, needs=["swap"])
+        pipeline.add("split", call, after=["unwrap"])
+        pipeline.add("sell_yes", call, after=["split"])
+        pipeline.add("sell_no", call, after=["split"])
+        pipeline.add("merge", call, needs=["sell_yes", "sell_no"])
+
+        self.assertEqual(pipeline.waves(), [["approve", "swap"], ["unwrap", "split", "sell_yes", "sell_no"], ["merge"]])
+
+    def test_unknown_dependency(self):
+        pipeline = self.make_pipeline(FakeChain())
+        with self.assertRaises(ValueError):
+            pipeline.add("swap", call, needs=["approve"])
+
+    def test_run_broadcasts_each_wave_together(self):
+        chain = FakeChain(logs_for_nonce={8: [transfer_log(TOKEN, TARGET, ACCOUNT.address, 1234)]})
+        pipeline = self.make_pipeline(chain)
+        seen = {}
+
+        def use_amount(outputs):
+            seen["amount"] = outputs["swap"]["amount"]
+            return call()
+
+        pipeline.add("approve", call)
+        pipeline.add("swap", call, outputs=lambda receipt, outputs: {"amount": get_token_delta(receipt, TOKEN, ACCOUNT.address)})
+        pipeline.add("unwrap", use_amount, needs=["swap"])
+        pipeline.add("split", call, after=["unwrap"])
+
+        result = pipeline.run()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(seen["amount"], 1234)
+        # Consecutive nonces, one chain read, and no receipt wait inside a wave
+        self.assertEqual(chain.events, [
+            ("send", 7), ("send", 8), ("wait", 7), ("wait", 8),
+            ("send", 9), ("send", 10), ("wait", 9), ("wait", 10),
+        ])
+        self.assertEqual(chain.w3.eth.get_transaction_count.call_count, 1)
+        self.assertEqual(len(result["blocks"]), 2)
+
+    def test_failed_step_stops_the_plan(self):
+        chain = FakeChain(reverted=(8,))
+        pipeline = self.make_pipeline(chain)
+        pipeline.add("authorize", call, required=False)
+        pipeline.add("swap", call)
+        pipeline.add("unwrap", call, needs=["swap"])
+
+        result = pipeline.run()
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["failed_step"], "swap")
+        self.assertNotIn("unwrap", result["steps"])
+        self.assertNotIn(("send", 9), chain.events)
+
+    def test_optional_step_may_revert(self):
+        chain = FakeChain(reverted=(7,))
+        pipeline = self.make_pipeline(chain)
+        pipeline.add("authorize", call, required=False)
+        pipeline.add("swap", call)
+        self.assertTrue(pipeline.run()["success"])
+
+    def test_skipped_step_uses_no_nonce(self):
+        chain = FakeChain()
+        pipeline = self.make_pipeline(chain)
+        pipeline.add("balance", lambda outputs: None)
+        pipeline.add("merge", call, after=["balance"])
+
+        result = pipeline.run()
+
+        self.assertTrue(result["steps"]["balance"]["skipped"])
+        self.assertEqual(chain.events, [("send", 7), ("wait", 7)])
+
+
+class TestSyntheticArbitragePlanner(unittest.TestCase):
+    """Test cases for the pipelined arbitrage plans."""
+
+    def make_planner(self, allowance=0):
+        bot = MagicMock()
+        bot.w3 = Web3()
+        bot.address = ACCOUNT.address
+        bot.allowances = AllowanceLedger()
+        bot.multicall.call_functions.side_effect = lambda functions, *args: (1, [allowance] * len(functions))
+        return SyntheticArbitragePlanner(bot, make_solver(yes_price=110, no_price=95), router_address=TARGET)
+
+    def test_sell_plan_takes_three_waves(self):
+        waves = self.make_planner().sell_plan(10**19).waves()
+
+        self.assertEqual(len(waves), 3)
+        self.assertEqual(waves[0][-1], "buy_wagno")
+        self.assertEqual(waves[1], ["unwrap_wagno", "split_gno", "sell_gno_yes", "sell_gno_no"])
+        self.assertEqual(waves[2], ["balance_sdai_yes", "merge_sdai"])
+
+    def test_buy_plan_takes_two_waves(self):
+        waves = self.make_planner(allowance=2**256 - 1).buy_plan(10**17).waves()
+
+        # Approvals are already in place, so only pool authorizations precede the legs
+        self.assertEqual(waves[0][:3], ["authorize_yes_pool", "authorize_no_pool", "authorize_sdai_yes_pool"])
+        self.assertEqual(waves[1], ["sell_wagno"])
+        self.assertEqual(len(waves), 2)
+
+    def test_unfillable_size_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.make_planner().sell_plan(10**30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Tests for the event-sourced pool state tracker.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+from futarchy.experimental.core.pool_tracker import BURN_TOPIC, MINT_TOPIC, SWAP_TOPIC, PoolStateTracker, tracked_snapshot
+from futarchy.experimental.utils.uniswap_v3_math import get_sqrt_ratio_at_tick
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot, tick_position
+
+POOL = "0x00000000000000000000000000000000000000a0"
+TOKEN0 = "0x00000000000000000000000000000000000000b0"
+TOKEN1 = "0x00000000000000000000000000000000000000b1"
+SPACING = 60
+LIQUIDITY = 10**20
+
+
+def make_snapshot(positions, tick=30, block_number=100):
+    """Snapshot holding positions {(lower, upper): liquidity}, with every word loaded."""
+    ticks, gross = {}, {}
+    for (lower, upper), amount in positions.items():
+        for edge, net in ((lower, amount), (upper, -amount)):
+            ticks[edge] = ticks.get(edge, 0) + net
+            gross[edge] = gross.get(edge, 0) + amount
+    bitmap = {word: 0 for word in range(-58, 58)}
+    for initialized in ticks:
+        word, bit = tick_position(initialized // SPACING)
+        bitmap[word] |= 1 << bit
+    liquidity = sum(amount for (lower, upper), amount in positions.items() if lower <= tick < upper)
+    return V3PoolSnapshot(
+        get_sqrt_ratio_at_tick(tick), tick, liquidity, 3000, SPACING, bitmap, ticks,
+        token0=TOKEN0, token1=TOKEN1, block_number=block_number, pool_address=POOL, liquidity_gross=gross
+    )
+
+
+def word(value):
+    return (value % (1 << 256)).to_bytes(32, "big").hex()
+
+
+def log(topic, block, index, topics=(), data=()):
+    return {
+        "topics": [topic] + ["0x" + word(value) for value in topics],
+        "data": "0x" + "".join(word(value) for value in data),
+        "blockNumber": block, "logIndex": index, "blockHash": f"0x{block:064x}",
+    }
+
+
+def mint(block, index, lower, upper, amount):
+    return log(MINT_TOPIC, block, index, topics=(0, lower, upper), data=(0, amount, 1, 1))
+
+
+def burn(block, index, lower, upper, amount):
+    return log(BURN_TOPIC, block, index, topics=(0, lower, upper), data=(amount, 1, 1))
+
+
+def make_w3(logs_by_block):
+    w3 = MagicMock()
+    w3.to_checksum_address = lambda x: x
+    w3.eth.get_block.side_effect = lambda number: {"hash": f"0x{number:064x}", "parentHash": f"0x{number - 1:064x}"}
+    w3.eth.get_logs.side_effect = lambda query: [
+        entry for number in range(query["fromBlock"], query["toBlock"] + 1) for entry in logs_by_block.get(number, [])
+    ]
+    return w3
+
+
+class TestPoolStateTracker(unittest.TestCase):
+    """Test cases for PoolStateTracker."""
+
+    def setUp(self):
+        self.positions = {(-600, 600): LIQUIDITY}
+        patcher = patch.object(V3PoolSnapshot, "load", side_effect=self.load)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load(self, w3, pool_address, block_identifier="latest", **kwargs):
+        return make_snapshot(self.positions, block_number=100 if block_identifier == "latest" else block_identifier)
+
+    def test_mint_burn_and_swap_match_a_fresh_snapshot(self):
+        after_swap = get_sqrt_ratio_at_tick(-200)
+        w3 = make_w3({
+            101: [mint(101, 0, -120, 120, LIQUIDITY // 2), mint(101, 1, 1200, 1800, 7)],
+            102: [log(SWAP_TOPIC, 102, 0, topics=(0, 0), data=(5, -4, after_swap, LIQUIDITY, -200))],
+            103: [burn(103, 0, 1200, 1800, 7)],
+        })
+        tracker = PoolStateTracker(w3, POOL, verify_every=0)
+
+        tracker.sync(100)
+        tracker.sync(101)
+        expected = make_snapshot({(-600, 600): LIQUIDITY, (-120, 120): LIQUIDITY // 2, (1200, 1800): 7})
+        self.assertEqual((tracker.liquidity, tracker.snapshot().ticks), (expected.liquidity, expected.ticks))
+        self.assertEqual(tracker.snapshot().bitmap, expected.bitmap)
+
+        snapshot = tracker.sync(103)
+        self.assertEqual((snapshot.sqrt_price_x96, snapshot.tick, snapshot.liquidity), (after_swap, -200, LIQUIDITY))
+        self.assertNotIn(1200, snapshot.ticks)
+        self.assertEqual(snapshot.bitmap, make_snapshot({(-600, 600): LIQUIDITY, (-120, 120): 1}).bitmap)
+        self.assertEqual((tracker.events_applied, tracker.resyncs), (4, 1))
+        # One header and one getLogs request per followed step
+        self.assertEqual(w3.eth.get_logs.call_count, 2)
+
+    def test_reorg_triggers_resync(self):
+        w3 = make_w3({})
+        tracker = PoolStateTracker(w3, POOL, verify_every=0)
+        tracker.sync(100)
+        w3.eth.get_block.side_effect = lambda number: {"hash": "0xbeef", "parentHash": "0xdead"}
+
+        tracker.sync(101)
+
+        self.assertEqual((tracker.reorgs, tracker.resyncs, tracker.block_number), (1, 2, 101))
+
+    def test_verify_resyncs_on_mismatch(self):
+        w3 = make_w3({101: [mint(101, 0, -60, 60, 5)]})
+        tracker = PoolStateTracker(w3, POOL, multicall=MagicMock(), verify_every=1)
+        tracker.sync(100)
+        # The chain disagrees: the position was never minted
+        tracker.multicall.call_functions.return_value = (101, [(tracker.sqrt_price_x96, 30, 0, 0, 0, 0, True), LIQUIDITY])
+
+        tracker.sync(101)
+
+        self.assertEqual((tracker.checks, tracker.mismatches, tracker.resyncs), (1, 1, 2))
+        self.assertEqual(tracker.liquidity, LIQUIDITY)
+
+    def test_concurrent_syncs_apply_logs_once(self):
+        w3 = make_w3({101: [mint(101, 0, -60, 60, 5)]})
+        get_logs = w3.eth.get_logs.side_effect
+
+        def slow_get_logs(query):
+            time.sleep(0.05)
+            return get_logs(query)
+
+        w3.eth.get_logs.side_effect = slow_get_logs
+        tracker = PoolStateTracker(w3, POOL, verify_every=0)
+        tracker.sync(100)
+
+        threads = [threading.Thread(target=tracker.sync, args=(101,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((tracker.events_applied, tracker.liquidity), (1, LIQUIDITY + 5))
+        self.assertEqual(w3.eth.get_logs.call_count, 1)
+
+    def test_verify_treats_a_failed_read_as_unverified(self):
+        w3 = make_w3({})
+        tracker = PoolStateTracker(w3, POOL, multicall=MagicMock(), verify_every=1)
+        tracker.sync(100)
+        tracker.multicall.call_functions.return_value = (100, [None, None])
+
+        self.assertFalse(tracker.verify())
+        self.assertEqual((tracker.mismatches, tracker.resyncs), (0, 1))
+
+    def test_tracked_snapshot_reuses_the_tracker(self):
+        w3 = make_w3({})
+        trackers = {}
+
+        with patch("futarchy.experimental.core.pool_tracker.get_metadata_cache"):
+            first = tracked_snapshot(w3, trackers, POOL)
+            second = tracked_snapshot(w3, trackers, POOL)
+
+        self.assertEqual(list(trackers), [POOL])
+        self.assertEqual((first.block_number, second.block_number), (100, 100))
+        self.assertEqual(trackers[POOL].resyncs, 1)
+
+    def test_tracked_snapshot_returns_none_on_error(self):
+        w3 = make_w3({})
+        trackers = {POOL: PoolStateTracker(w3, POOL, verify_every=0)}
+        V3PoolSnapshot.load.side_effect = RuntimeError("rpc down")
+
+        self.assertIsNone(tracked_snapshot(w3, trackers, POOL))
+
+
+if __name__ == '__main__':
+    unittest.main()
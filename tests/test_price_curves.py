@@ -0,0 +1,87 @@
+"""
+Tests for the vectorized price impact curves.
+"""
+
+import math
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.uniswap_v3_math import get_sqrt_ratio_at_tick
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot, tick_position
+from futarchy.experimental.utils.price_curves import V3SwapCurve, quote_balancer_curve, conditional_pool_curves
+
+TOKEN0 = "0x00000000000000000000000000000000000000a0"
+TOKEN1 = "0x00000000000000000000000000000000000000b1"
+LIQUIDITY = 10**20
+
+
+def make_snapshot():
+    """Two overlapping positions around tick 30, with three bitmap words loaded."""
+    ticks = {-600: LIQUIDITY, 600: -LIQUIDITY, -120: LIQUIDITY, 0: -LIQUIDITY}
+    bitmap = {word: 0 for word in range(-2, 2)}
+    for tick in ticks:
+        word, bit = tick_position(tick // 60)
+        bitmap[word] |= 1 << bit
+    return V3PoolSnapshot(get_sqrt_ratio_at_tick(30), 30, LIQUIDITY, 3000, 60, bitmap, ticks, token0=TOKEN0, token1=TOKEN1)
+
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class TestV3SwapCurve(unittest.TestCase):
+    """Test cases for V3SwapCurve."""
+
+    def setUp(self):
+        self.snapshot = make_snapshot()
+
+    def test_matches_exact_simulation(self):
+        amounts = [10**15 * i for i in range(1, 4000, 97)]
+        for token_in in (TOKEN0, TOKEN1):
+            curve = V3SwapCurve.for_token_in(self.snapshot, token_in)
+            amounts_out = list(curve.amounts_out(amounts))
+            for amount, amount_out in zip(amounts, amounts_out):
+                exact = self.snapshot.quote_exact_input(token_in, amount)
+                if exact["complete"]:
+                    self.assertLess(abs(amount_out - exact["amount_out"]) / exact["amount_out"], 1e-12)
+                else:
+                    self.assertTrue(is_missing(amount_out))
+
+    def test_sizes_beyond_loaded_ticks(self):
+        curve = V3SwapCurve.for_token_in(self.snapshot, TOKEN0)
+        amounts_out = list(curve.amounts_out([curve.max_amount_in * 2]))
+        self.assertTrue(is_missing(amounts_out[0]))
+
+    def test_price_impact_grows_with_size(self):
+        result = conditional_pool_curves(self.snapshot, TOKEN0, TOKEN1, [0.001, 0.1, 1])
+        sell_impacts = list(result["sell"]["price_impact"])
+        buy_impacts = list(result["buy"]["price_impact"])
+
+        self.assertAlmostEqual(sell_impacts[0], 0.3, places=2)  # 0.3% fee, negligible slippage
+        self.assertLess(sell_impacts[0], sell_impacts[1])
+        self.assertLess(sell_impacts[1], sell_impacts[2])
+        self.assertLess(buy_impacts[0], buy_impacts[2])
+
+
+class TestBalancerCurve(unittest.TestCase):
+    """Test cases for quote_balancer_curve."""
+
+    def test_batches_all_sizes_in_one_call(self):
+        w3 = MagicMock()
+        w3.to_checksum_address = lambda x: x
+        multicall = MagicMock()
+        multicall.address = "0xca11bde05977b3631167028862be2a173976ca11"
+        # Spot quote, then two sizes (the last one failed)
+        multicall.call_functions.return_value = (77, [([2 * 10**18],), ([19 * 10**17],), None])
+
+        result = quote_balancer_curve(w3, multicall, TOKEN0, TOKEN1, TOKEN0, TOKEN1, [10**18, 10**20])
+
+        self.assertEqual(multicall.call_functions.call_count, 1)
+        self.assertEqual(len(multicall.call_functions.call_args[0][0]), 3)
+        self.assertEqual(result["block_number"], 77)
+        self.assertEqual(result["spot_price"], 0.5)
+        self.assertAlmostEqual(list(result["price_impact"])[0], (1 / 1.9 / 0.5 - 1) * 100)
+        self.assertTrue(is_missing(list(result["amount_out"])[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for the RPC call metrics middleware and operation attribution.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from futarchy.experimental.utils.rpc_metrics import (
+    RpcMetrics, current_operation, rpc_operation, rpc_step, track_operation
+)
+
+# ERC20 balanceOf(address)
+BALANCE_OF = "0x70a08231"
+TOKEN = "0x00000000000000000000000000000000000000aa"
+
+
+def fake_make_request(method, params):
+    if method == "eth_getBalance":
+        return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "boom"}}
+    if method == "eth_chainId":
+        raise ConnectionError("down")
+    return {"jsonrpc": "2.0", "id": 1, "result": "0x1"}
+
+
+class TestOperations(unittest.TestCase):
+    """Test cases for operation labels."""
+
+    def test_nested_operations_and_steps(self):
+        @track_operation()
+        def get_balances():
+            return current_operation()
+
+        self.assertEqual(current_operation(), "-")
+        with rpc_operation("arbitrage"):
+            rpc_step("step 2")
+            self.assertEqual(get_balances(), "arbitrage [step 2] > get_balances")
+            rpc_step("step 3")
+            self.assertEqual(current_operation(), "arbitrage [step 3]")
+        self.assertEqual(current_operation(), "-")
+
+
+class TestRpcMetrics(unittest.TestCase):
+    """Test cases for RpcMetrics."""
+
+    def setUp(self):
+        self.metrics = RpcMetrics()
+        self.make_request = self.metrics.wrap_make_request(fake_make_request)
+
+    def test_counts_methods_and_call_targets_per_operation(self):
+        call = [{"to": TOKEN, "data": BALANCE_OF + "00" * 32}, "latest"]
+        with rpc_operation("get_market_prices"):
+            self.make_request("eth_call", call)
+            self.make_request("eth_call", call)
+            self.make_request("eth_blockNumber", [])
+        self.make_request("eth_getBalance", [TOKEN, "latest"])
+        with self.assertRaises(ConnectionError):
+            self.make_request("eth_chainId", [])
+
+        summary = self.metrics.summary()
+
+        self.assertEqual((summary["requests"], summary["errors"]), (5, 2))
+        operations = {row["operation"]: row["calls"] for row in summary["operations"]}
+        self.assertEqual(operations, {"get_market_prices": 3, "-": 2})
+        methods = {(row["operation"], row["method"]): row["calls"] for row in summary["methods"]}
+        self.assertEqual(methods[("get_market_prices", "eth_call")], 2)
+        [call_row] = summary["calls"]
+        self.assertEqual((call_row["to"], call_row["selector"], call_row["function"]), (TOKEN, BALANCE_OF, "balanceOf"))
+
+    def test_table_and_json_dump(self):
+        with rpc_operation("swap_exact_in"):
+            self.make_request("eth_estimateGas", [{"to": TOKEN, "data": BALANCE_OF}])
+        path = os.path.join(tempfile.mkdtemp(), "rpc.json")
+
+        self.metrics.dump("json", path)
+        table = self.metrics.format_table()
+
+        with open(path) as f:
+            self.assertEqual(json.load(f)["methods"][0]["method"], "eth_estimateGas")
+        self.assertIn("swap_exact_in", table)
+        self.assertIn("balanceOf (eth_estimateGas)", table)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for the RPC endpoint pool.
+"""
+
+import time
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.rpc_pool import RpcEndpointPool, is_endpoint_error
+
+FAST = "https://fast.example"
+SLOW = "https://slow.example"
+SPARE = "https://spare.example"
+
+
+class FakeEndpoint:
+    """make_request mock answering after a fixed delay."""
+
+    def __init__(self, delay=0.0, block_number=100, error=None, exception=None):
+        self.delay = delay
+        self.block_number = block_number
+        self.error = error
+        self.exception = exception
+        self.make_request = MagicMock(side_effect=self.handle)
+
+    def handle(self, method, params):
+        time.sleep(self.delay)
+        if self.exception is not None:
+            raise self.exception
+        if self.error is not None:
+            return {"jsonrpc": "2.0", "id": 1, "error": self.error}
+        if method == "eth_blockNumber":
+            return {"jsonrpc": "2.0", "id": 1, "result": hex(self.block_number)}
+        if method == "eth_newBlockFilter":
+            return {"jsonrpc": "2.0", "id": 1, "result": "0xf1"}
+        return {"jsonrpc": "2.0", "id": 1, "result": "0x01"}
+
+    def calls(self, method):
+        return sum(1 for call in self.make_request.call_args_list if call[0][0] == method)
+
+
+def make_pool(endpoints, **kwargs):
+    pool = RpcEndpointPool(list(endpoints), **kwargs)
+    for url, endpoint in endpoints.items():
+        pool.providers[url] = endpoint
+    return pool
+
+
+class TestEndpointErrors(unittest.TestCase):
+    """Test cases for endpoint error classification."""
+
+    def test_classification(self):
+        self.assertTrue(is_endpoint_error({"code": 429, "message": "Too Many Requests"}))
+        self.assertTrue(is_endpoint_error({"code": -32000, "message": "header not found"}))
+        self.assertFalse(is_endpoint_error({"code": 3, "message": "execution reverted"}))
+
+
+class TestRpcEndpointPool(unittest.TestCase):
+    """Test cases for routing, failover and hedging."""
+
+    def test_routes_to_fastest_endpoint(self):
+        fast, slow = FakeEndpoint(delay=0.0), FakeEndpoint(delay=0.05)
+        pool = make_pool({SLOW: slow, FAST: fast}, hedge_reads=False)
+        pool.warm()
+
+        self.assertEqual(pool.ranked(), [FAST, SLOW])
+        pool.make_request("eth_call", [{}, "latest"])
+        self.assertEqual(fast.calls("eth_call"), 1)
+        self.assertEqual(slow.calls("eth_call"), 0)
+
+    def test_lagging_endpoint_is_skipped(self):
+        fast, slow = FakeEndpoint(delay=0.0, block_number=90), FakeEndpoint(delay=0.02, block_number=100)
+        pool = make_pool({FAST: fast, SLOW: slow}, hedge_reads=False)
+        pool.warm()
+
+        self.assertEqual(pool.endpoint_uri, SLOW)
+
+    def test_head_reads_go_to_the_endpoint_at_the_head(self):
+        behind, current = FakeEndpoint(delay=0.0, block_number=99), FakeEndpoint(delay=0.02, block_number=100)
+        pool = make_pool({FAST: behind, SLOW: current}, hedge_delay=0.001)
+        pool.warm()
+        behind.make_request.reset_mock()
+
+        self.assertEqual(pool.ranked(), [FAST, SLOW])
+        pool.make_request("eth_call", [{}, "latest"])
+        pool.make_request("eth_getBalance", ["0x00"])
+        self.assertEqual(current.calls("eth_call") + current.calls("eth_getBalance"), 2)
+        self.assertEqual(behind.make_request.call_count, 0)
+        self.assertEqual(pool.hedges, 0)
+
+        pool.make_request("eth_call", [{}, hex(90)])
+        self.assertEqual(behind.calls("eth_call"), 1)
+
+    def test_fails_over_on_rate_limit_and_exception(self):
+        limited = FakeEndpoint(error={"code": 429, "message": "rate limit exceeded"})
+        broken = FakeEndpoint(exception=ConnectionError("refused"))
+        spare = FakeEndpoint(delay=0.01)
+        pool = make_pool({FAST: limited, SLOW: broken, SPARE: spare}, hedge_reads=False)
+
+        response = pool.make_request("eth_sendRawTransaction", ["0x00"])
+
+        self.assertEqual(response["result"], "0x01")
+        self.assertEqual(spare.calls("eth_sendRawTransaction"), 1)
+        self.assertEqual(pool.endpoints[FAST].failures, 1)
+        self.assertEqual(pool.endpoints[SLOW].failures, 1)
+
+    def test_repeated_failures_cool_endpoint_down(self):
+        broken, spare = FakeEndpoint(exception=ConnectionError("refused")), FakeEndpoint(delay=0.01)
+        pool = make_pool({FAST: broken, SPARE: spare}, hedge_reads=False)
+
+        pool.make_request("eth_chainId", [])
+        pool.make_request("eth_chainId", [])
+
+        self.assertEqual(pool.ranked()[0], SPARE)
+        self.assertTrue(pool.stats()["endpoints"][FAST]["cooling_down"])
+
+    def test_slow_read_is_hedged(self):
+        stalled, spare = FakeEndpoint(delay=0.5), FakeEndpoint(delay=0.0)
+        pool = make_pool({SLOW: stalled, SPARE: spare}, hedge_delay=0.05)
+        pool.endpoints[SLOW].record(0.001, True)
+        pool.endpoints[SPARE].record(0.002, True)
+
+        start = time.perf_counter()
+        response = pool.make_request("eth_call", [{}, "latest"])
+
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertEqual(response["result"], "0x01")
+        self.assertEqual((pool.hedges, pool.hedge_wins), (1, 1))
+
+    def test_transactions_are_never_hedged(self):
+        stalled, spare = FakeEndpoint(delay=0.1), FakeEndpoint(delay=0.0)
+        pool = make_pool({SLOW: stalled, SPARE: spare}, hedge_delay=0.01)
+        pool.endpoints[SLOW].record(0.001, True)
+        pool.endpoints[SPARE].record(0.002, True)
+
+        pool.make_request("eth_sendRawTransaction", ["0x00"])
+
+        self.assertEqual(stalled.calls("eth_sendRawTransaction"), 1)
+        self.assertEqual(spare.calls("eth_sendRawTransaction"), 0)
+        self.assertEqual(pool.hedges, 0)
+
+    def test_filters_stay_on_their_endpoint(self):
+        first, second = FakeEndpoint(), FakeEndpoint()
+        pool = make_pool({FAST: first, SLOW: second})
+        pool.endpoints[FAST].record(0.001, True)
+        pool.endpoints[SLOW].record(0.002, True)
+
+        filter_id = pool.make_request("eth_newBlockFilter", [])["result"]
+        # The other endpoint becomes faster, but filter polls must not move
+        pool.endpoints[SLOW].latencies.clear()
+        pool.make_request("eth_getFilterChanges", [filter_id])
+
+        self.assertEqual(first.calls("eth_getFilterChanges"), 1)
+        self.assertEqual(second.calls("eth_getFilterChanges"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
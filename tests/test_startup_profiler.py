@@ -0,0 +1,63 @@
+"""
+Tests for the startup profiler and lazily loaded ABIs.
+"""
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from futarchy.experimental.utils.startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Test cases for StartupProfiler."""
+
+    def test_times_first_imports_and_phases(self):
+        directory = tempfile.mkdtemp()
+        with open(os.path.join(directory, "profiled_outer.py"), "w") as f:
+            f.write("import time\nimport profiled_inner\ntime.sleep(0.02)\n")
+        with open(os.path.join(directory, "profiled_inner.py"), "w") as f:
+            f.write("import time\ntime.sleep(0.03)\n")
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+
+        profiler = StartupProfiler().start()
+        try:
+            with profiler.phase("load"):
+                import profiled_outer  # noqa: F401
+        finally:
+            profiler.stop()
+
+        outer_cumulative, outer_self = profiler.imports["profiled_outer"]
+        inner_cumulative, _ = profiler.imports["profiled_inner"]
+        self.assertGreaterEqual(inner_cumulative, 0.03)
+        self.assertGreaterEqual(outer_cumulative, 0.05)
+        self.assertLess(outer_self, outer_cumulative - 0.025)
+        self.assertEqual([name for name, _ in profiler.phases], ["load"])
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = StartupProfiler(enabled=False).start()
+        with profiler.phase("load"):
+            importlib.import_module("json")
+        self.assertEqual((profiler.imports, profiler.phases), ({}, []))
+
+
+class TestLazyAbis(unittest.TestCase):
+    """Test cases for ABIs loaded on first access."""
+
+    def test_abi_submodule_loads_on_access(self):
+        for name in [name for name in sys.modules if name.startswith("futarchy.experimental.config.abis")]:
+            del sys.modules[name]
+        abis = importlib.import_module("futarchy.experimental.config.abis")
+        self.assertNotIn("futarchy.experimental.config.abis.balancer", sys.modules)
+
+        self.assertIsInstance(abis.BALANCER_VAULT_ABI, list)
+        self.assertIn("futarchy.experimental.config.abis.balancer", sys.modules)
+        self.assertNotIn("futarchy.experimental.config.abis.sushiswap", sys.modules)
+        with self.assertRaises(AttributeError):
+            abis.NOT_AN_ABI
+
+
+if __name__ == '__main__':
+    unittest.main()
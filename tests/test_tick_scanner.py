@@ -0,0 +1,102 @@
+"""
+Tests for the tick bitmap scanner.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.tick_scanner import LiquidityMap, scan_initialized_ticks
+from futarchy.experimental.utils.uniswap_v3_simulator import tick_position
+
+SPACING = 60
+POOL = "0x00000000000000000000000000000000000000a0"
+# Two positions: [-600, 600) and [-120, 60000)
+POSITIONS = {-600: (10, 10), 600: (10, -10), -120: (5, 5), 60000: (5, -5)}
+
+
+class FakePool:
+    """Pool contract whose functions return (name, args) so the fake multicall can answer them."""
+
+    def __init__(self):
+        self.functions = self
+
+    def __getattr__(self, name):
+        return lambda *args: (name, args)
+
+
+def fake_multicall():
+    bitmap = {}
+    for tick in POSITIONS:
+        word, bit = tick_position(tick // SPACING)
+        bitmap[word] = bitmap.get(word, 0) | 1 << bit
+
+    def answer(name, args):
+        if name == "slot0":
+            return (0, 30, 0, 0, 0, 0, True)
+        if name == "liquidity":
+            return 15
+        if name == "tickSpacing":
+            return SPACING
+        if name == "tickBitmap":
+            return bitmap.get(args[0], 0)
+        gross, net = POSITIONS[args[0]]
+        return (gross, net, 0, 0, 0, 0, 0, True)
+
+    multicall = MagicMock()
+    multicall.call_functions.side_effect = lambda functions, block: (77, [answer(*f) for f in functions])
+    return multicall
+
+
+class TestScanInitializedTicks(unittest.TestCase):
+    """Test cases for scan_initialized_ticks."""
+
+    def setUp(self):
+        self.w3 = MagicMock()
+        self.w3.to_checksum_address = lambda x: x
+        self.w3.eth.contract.return_value = FakePool()
+        self.multicall = fake_multicall()
+
+    def test_full_range_scan_in_a_few_calls(self):
+        liquidity_map = scan_initialized_ticks(self.w3, POOL, multicall=self.multicall)
+
+        self.assertEqual(list(liquidity_map.ticks), [-600, -120, 600, 60000])
+        self.assertEqual(liquidity_map.liquidity_gross, [10, 5, 10, 5])
+        self.assertEqual((liquidity_map.tick, liquidity_map.block_number), (30, 77))
+        # slot0 batch, 116 bitmap words in one batch, 4 ticks in one batch
+        self.assertEqual(self.multicall.call_functions.call_count, 3)
+        self.assertEqual(liquidity_map.liquidity_at(liquidity_map.tick), liquidity_map.liquidity)
+        self.assertEqual(liquidity_map.liquidity_at(-601), 0)
+
+    def test_range_scan_filters_ticks(self):
+        liquidity_map = scan_initialized_ticks(self.w3, POOL, multicall=self.multicall, tick_lower=-300, tick_upper=1000)
+
+        self.assertEqual(list(liquidity_map.ticks), [-120, 600])
+        for call in self.multicall.call_functions.call_args_list[1:]:
+            self.assertEqual(call[0][1], 77)
+
+    def test_failed_bitmap_read_raises(self):
+        answer = self.multicall.call_functions.side_effect
+
+        def failing(functions, block):
+            block_number, results = answer(functions, block)
+            return block_number, [None if f[0] == "tickBitmap" and f[1][0] == -1 else r for f, r in zip(functions, results)]
+
+        self.multicall.call_functions.side_effect = failing
+        with self.assertRaises(ValueError):
+            scan_initialized_ticks(self.w3, POOL, multicall=self.multicall)
+
+
+class TestLiquidityMap(unittest.TestCase):
+    """Test cases for LiquidityMap lookups."""
+
+    def test_lookups(self):
+        liquidity_map = LiquidityMap([-600, -120, 600], [10, 5, -10], [10, 5, 10], SPACING)
+
+        self.assertTrue(liquidity_map.is_initialized(-120))
+        self.assertFalse(liquidity_map.is_initialized(0))
+        self.assertEqual(liquidity_map.between(-600, 0), [-600, -120])
+        self.assertEqual(liquidity_map.nearest(0, count=2), {"below": [-120, -600], "above": [600]})
+        self.assertEqual(liquidity_map.rows()[-1]["liquidity_above"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for receipt decoding in core.transaction.
+"""
+
+import unittest
+from hexbytes import HexBytes
+from futarchy.experimental.core.transaction import (
+    TRANSFER_TOPIC, SWAP_TOPIC, decode_receipt, get_token_delta, process_log
+)
+
+ACCOUNT = "0x19E7E376E7C213B7E7e7e46cc70A5dD086DAff2A"
+POOL = "0x6E33153115Ab58dab0e0F1E3a2ccda6e67FA5cD7"
+TOKEN_IN = "0x00000000000000000000000000000000000000a0"
+TOKEN_OUT = "0x00000000000000000000000000000000000000B1"
+
+
+def topic(address):
+    return HexBytes("0x" + address[2:].lower().rjust(64, "0"))
+
+
+def word(value):
+    return (value % 2**256).to_bytes(32, "big")
+
+
+def transfer(token, sender, recipient, value):
+    return {"address": token, "topics": [HexBytes(TRANSFER_TOPIC), topic(sender), topic(recipient)], "data": HexBytes(word(value))}
+
+
+def swap(amount0, amount1):
+    data = word(amount0) + word(amount1) + word(2**96) + word(10**20) + word(0)
+    return {"address": POOL, "topics": [HexBytes(SWAP_TOPIC), topic(POOL), topic(ACCOUNT)], "data": HexBytes(data)}
+
+
+class TestDecodeReceipt(unittest.TestCase):
+    """Test cases for decode_receipt."""
+
+    def setUp(self):
+        self.receipt = {"status": 1, "logs": [
+            transfer(TOKEN_IN, ACCOUNT, POOL, 10**18),
+            transfer(TOKEN_OUT, POOL, ACCOUNT, 3 * 10**17 + 1),
+            swap(10**18, -(3 * 10**17 + 1)),
+            # Transfers between other accounts don't count
+            transfer(TOKEN_OUT, POOL, TOKEN_IN, 5),
+        ]}
+
+    def test_exact_token_deltas(self):
+        result = decode_receipt(self.receipt, ACCOUNT)
+
+        self.assertEqual(result["token_deltas"], {TOKEN_IN: -10**18, TOKEN_OUT.lower(): 3 * 10**17 + 1})
+        self.assertEqual(len(result["transfers"]), 2)
+        self.assertEqual(result["swaps"][0]["amount1"], -(3 * 10**17 + 1))
+        self.assertEqual(get_token_delta(self.receipt, TOKEN_OUT, ACCOUNT.lower()), 3 * 10**17 + 1)
+
+    def test_round_trip_nets_out(self):
+        self.receipt["logs"].append(transfer(TOKEN_IN, POOL, ACCOUNT, 10**18))
+        self.assertEqual(get_token_delta(self.receipt, TOKEN_IN, ACCOUNT), 0)
+
+    def test_ignores_nft_transfers(self):
+        log = transfer(TOKEN_IN, POOL, ACCOUNT, 0)
+        log["topics"].append(HexBytes(word(7)))
+        log["data"] = HexBytes(b"")
+        self.assertNotIn("type", process_log(log))
+        self.assertEqual(decode_receipt({"logs": [log]}, ACCOUNT)["token_deltas"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
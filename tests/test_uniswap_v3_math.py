@@ -0,0 +1,94 @@
+"""
+Tests for the exact integer Uniswap V3 math module.
+"""
+
+import math
+import unittest
+from futarchy.experimental.utils.uniswap_v3_math import (
+    MIN_TICK, MAX_TICK, MIN_SQRT_RATIO, MAX_SQRT_RATIO, Q96,
+    get_sqrt_ratio_at_tick, get_tick_at_sqrt_ratio,
+    get_amount0_delta, get_amount1_delta,
+    get_next_sqrt_price_from_input, get_next_sqrt_price_from_output,
+    sqrt_price_x96_to_price, price_to_sqrt_price_x96, price_to_tick, nearest_usable_ticks
+)
+
+ONE = 10**18
+
+
+class TestTickMath(unittest.TestCase):
+    """Test cases for TickMath."""
+
+    def test_known_values(self):
+        self.assertEqual(get_sqrt_ratio_at_tick(0), Q96)
+        self.assertEqual(get_sqrt_ratio_at_tick(MIN_TICK), MIN_SQRT_RATIO)
+        self.assertEqual(get_sqrt_ratio_at_tick(MAX_TICK), MAX_SQRT_RATIO)
+        self.assertEqual(get_sqrt_ratio_at_tick(50), 79426470787362580746886972461)
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            get_sqrt_ratio_at_tick(MAX_TICK + 1)
+        with self.assertRaises(ValueError):
+            get_tick_at_sqrt_ratio(MAX_SQRT_RATIO)
+
+    def test_tick_round_trip(self):
+        for tick in (MIN_TICK, -50000, -1, 0, 1, 6932, 50000, MAX_TICK - 1):
+            sqrt_price = get_sqrt_ratio_at_tick(tick)
+            self.assertEqual(get_tick_at_sqrt_ratio(sqrt_price), tick)
+            self.assertEqual(get_tick_at_sqrt_ratio(get_sqrt_ratio_at_tick(tick + 1) - 1), tick)
+
+
+class TestSqrtPriceMath(unittest.TestCase):
+    """Test cases for SqrtPriceMath."""
+
+    def test_amount_deltas(self):
+        price_1 = Q96
+        price_121_100 = 87150978765690771352898345369  # sqrt(1.21) * 2**96
+        self.assertEqual(get_amount0_delta(price_1, price_121_100, ONE, True), 90909090909090910)
+        self.assertEqual(get_amount0_delta(price_1, price_121_100, ONE, False), 90909090909090909)
+        self.assertEqual(get_amount1_delta(price_1, price_121_100, ONE, True), 100000000000000000)
+        self.assertEqual(get_amount1_delta(price_1, price_121_100, ONE, False), 99999999999999999)
+        self.assertEqual(get_amount0_delta(price_1, price_1, ONE, True), 0)
+
+    def test_next_sqrt_price(self):
+        # 0.1 token1 in at liquidity 1 from price 1 moves sqrt price by exactly 0.1 * 2**96
+        self.assertEqual(get_next_sqrt_price_from_input(Q96, ONE, ONE // 10, False), 87150978765690771352898345369)
+        self.assertEqual(get_next_sqrt_price_from_input(Q96, ONE, ONE // 10, True), 72025602285694852357767227579)
+        self.assertEqual(get_next_sqrt_price_from_output(Q96, ONE, ONE // 10, True), 71305346262837903834189555302)
+        with self.assertRaises(ValueError):
+            get_next_sqrt_price_from_output(Q96, 1, 4, False)
+
+
+class TestPriceHelpers(unittest.TestCase):
+    """Test cases for price conversion helpers."""
+
+    def test_price_conversion(self):
+        self.assertEqual(sqrt_price_x96_to_price(Q96), 1.0)
+        self.assertEqual(sqrt_price_x96_to_price(2 * Q96), 4.0)
+        self.assertEqual(sqrt_price_x96_to_price(2 * Q96, invert=True), 0.25)
+        self.assertEqual(sqrt_price_x96_to_price(Q96, decimals0=18, decimals1=6), 1e12)
+        self.assertEqual(price_to_sqrt_price_x96(4), 2 * Q96)
+
+    def test_decimal_adjustment_direction(self):
+        # 1 token0 (6 decimals) worth 2000 token1 (18 decimals): the raw ratio is 2000e18 / 1e6
+        raw_ratio = 2000 * 10**18 // 10**6
+        sqrt_price_x96 = math.isqrt(raw_ratio << 192)
+
+        price = sqrt_price_x96_to_price(sqrt_price_x96, decimals0=6, decimals1=18)
+
+        self.assertAlmostEqual(price, 2000, places=6)
+        # The former show_all_prices adjustment, raw * 10**(decimals1 - decimals0), is off by 10**24
+        old_price = (sqrt_price_x96 / Q96) ** 2 * 10 ** (18 - 6)
+        self.assertAlmostEqual(old_price / price, 1e24, delta=1e15)
+
+    def test_price_to_tick(self):
+        self.assertEqual(price_to_tick(1), 0)
+        self.assertEqual(price_to_tick(1.1), 953)
+        self.assertEqual(price_to_tick(1.1, round_up=True), 954)
+
+    def test_nearest_usable_ticks(self):
+        self.assertEqual(nearest_usable_ticks(-954, 954, 60), (-960, 960))
+        self.assertEqual(nearest_usable_ticks(MIN_TICK, MAX_TICK, 60), (-887220, 887220))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests for the offline Uniswap V3 swap simulator.
+"""
+
+import unittest
+from unittest.mock import MagicMock
+from futarchy.experimental.utils.uniswap_v3_math import (
+    get_sqrt_ratio_at_tick, get_next_sqrt_price_from_input, get_amount1_delta, mul_div
+)
+from futarchy.experimental.utils.uniswap_v3_simulator import V3PoolSnapshot, tick_position
+
+TOKEN0 = "0x00000000000000000000000000000000000000a0"
+TOKEN1 = "0x00000000000000000000000000000000000000b1"
+LIQUIDITY = 10**20
+FEE = 3000
+SPACING = 60
+
+
+def make_snapshot(ticks, liquidity, tick=30, words=range(-3, 3)):
+    """Build a snapshot from {tick: liquidity_net} with the given bitmap words loaded."""
+    bitmap = {word: 0 for word in words}
+    for initialized_tick in ticks:
+        word, bit = tick_position(initialized_tick // SPACING)
+        bitmap[word] |= 1 << bit
+    return V3PoolSnapshot(
+        get_sqrt_ratio_at_tick(tick), tick, liquidity, FEE, SPACING, bitmap, ticks,
+        token0=TOKEN0, token1=TOKEN1
+    )
+
+
+class TestV3PoolSnapshot(unittest.TestCase):
+    """Test cases for V3PoolSnapshot."""
+
+    def setUp(self):
+        # One wide position plus a narrower one that ends at tick 0
+        self.snapshot = make_snapshot({-600: LIQUIDITY, 600: -LIQUIDITY, -120: LIQUIDITY, 0: -LIQUIDITY}, LIQUIDITY)
+
+    def test_swap_within_one_range_matches_closed_form(self):
+        amount_in = 10**16
+        result = self.snapshot.quote_exact_input(TOKEN0, amount_in)
+
+        start = self.snapshot.sqrt_price_x96
+        after = get_next_sqrt_price_from_input(start, LIQUIDITY, mul_div(amount_in, 10**6 - FEE, 10**6), True)
+        self.assertEqual(result["sqrt_price_x96_after"], after)
+        self.assertEqual(result["amount_out"], get_amount1_delta(after, start, LIQUIDITY, False))
+        self.assertEqual(result["amount_in"], amount_in)
+        self.assertEqual(result["ticks_crossed"], 0)
+        self.assertTrue(result["complete"])
+
+    def test_crossing_ticks_changes_liquidity(self):
+        result = self.snapshot.quote_exact_input(TOKEN0, 10**18)
+
+        self.assertEqual(result["ticks_crossed"], 1)
+        self.assertEqual(result["liquidity_after"], 2 * LIQUIDITY)
+        self.assertLess(result["tick_after"], 0)
+        # The snapshot itself is not modified
+        self.assertEqual(self.snapshot.liquidity, LIQUIDITY)
+
+    def test_exact_output_round_trip(self):
+        exact_in = self.snapshot.quote_exact_input(TOKEN1, 10**18)
+        exact_out = self.snapshot.quote_exact_output(TOKEN1, exact_in["amount_out"])
+
+        self.assertEqual(exact_out["amount_out"], exact_in["amount_out"])
+        self.assertLessEqual(exact_out["amount_in"], exact_in["amount_in"])
+        self.assertGreaterEqual(exact_out["amount_in"], exact_in["amount_in"] - 1)
+
+    def test_swap_to_price(self):
+        target = get_sqrt_ratio_at_tick(-300)
+        result = self.snapshot.swap_to_price(target)
+
+        self.assertEqual(result["sqrt_price_x96_after"], target)
+        self.assertEqual(result["ticks_crossed"], 2)
+        self.assertEqual(result["liquidity_after"], LIQUIDITY)
+        self.assertGreater(result["amount_in"], 0)
+
+    def test_out_of_range(self):
+        snapshot = make_snapshot({-600: LIQUIDITY, 600: -LIQUIDITY}, LIQUIDITY, words=range(-1, 1))
+        result = snapshot.quote_exact_input(TOKEN0, 10**24)
+
+        self.assertTrue(result["out_of_range"])
+        self.assertFalse(result["complete"])
+
+    def test_load_with_multicall(self):
+        w3 = MagicMock()
+        w3.to_checksum_address = lambda x: x
+        metadata = MagicMock()
+        metadata.fee.return_value = FEE
+        metadata.tick_spacing.return_value = SPACING
+        metadata.pool_tokens.return_value = (TOKEN0, TOKEN1)
+
+        word, bit = tick_position(-600 // SPACING)
+        info = (LIQUIDITY, LIQUIDITY, 0, 0, 0, 0, 0, True)
+
+        def call_functions(functions, block_identifier="latest"):
+            if len(functions) == 2:
+                return 123, [(get_sqrt_ratio_at_tick(30), 30, 0, 0, 0, 0, True), LIQUIDITY]
+            if len(functions) > 1:
+                return 123, [1 << bit if i == word + 58 else 0 for i in range(len(functions))]
+            return 123, [info]
+
+        multicall = MagicMock()
+        multicall.call_functions.side_effect = call_functions
+
+        snapshot = V3PoolSnapshot.load(w3, TOKEN0, multicall=multicall, metadata=metadata)
+
+        self.assertEqual(snapshot.block_number, 123)
+        self.assertEqual(snapshot.ticks, {-600: LIQUIDITY})
+        # With a spacing of 60 the default radius covers every usable word
+        self.assertEqual(snapshot.word_range, (-58, 57))
+
+
+if __name__ == '__main__':
+    unittest.main()